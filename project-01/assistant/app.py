@@ -46,25 +46,81 @@ from assistant.core.nlu.nlu import NLU
 from assistant.core.audio.playback import Playback
 from assistant.core.audio.billy_bass import BillyBass
 from assistant.core.tts.tts import TTS
+from assistant.core.tts.cache import get_tts_cache
 from assistant.core.stt.stt import STT
 from assistant.skills.echo import EchoSkill
-from assistant.skills.chat import ChatSkill
+from assistant.skills.chat import ChatSkill, GROQ_CHAT_URL
 
+# Queued-dispatch settings per pipeline topic: (workers, overflow policy).
+# One worker per subscriber keeps events in order within a stage; the
+# microphone path drops stale work instead of blocking the recorder.
+PIPELINE_TOPICS = {
+    "audio.recorded": (1, "drop_oldest"),
+    "stt.transcript": (1, "block"),
+    "nlu.intent": (1, "block"),
+    "skill.request": (2, "block"),
+    "skill.response": (1, "block"),
+    "tts.request": (1, "block"),
+    "tts.audio": (1, "block"),
+    "audio.playback.start": (1, "block"),
+    "audio.playback.end": (1, "block"),
+    "ux.state": (1, "drop_oldest"),
+}
 
-async def _start_core_components(bus: Bus, stt_adapter, tts_adapter, skip_playback: bool = False) -> None:
-    """Internal helper to start core components with given adapters."""
+
+def configure_bus(bus: Bus) -> None:
+    """Enable queued dispatch for pipeline topics when BUS_DISPATCH=queued."""
+    if Config.BUS_DISPATCH != "queued":
+        return
+    for topic, (workers, overflow) in PIPELINE_TOPICS.items():
+        bus.configure_topic(topic, queue_size=Config.BUS_QUEUE_SIZE, workers=workers, overflow=overflow)
+
+
+_prewarm_task = None
+
+
+def prewarm_http(*adapters, chat: bool = False) -> None:
+    """
+    Open pooled HTTP connections to the remote servers in the background.
+    
+    Targets the /health endpoint of every adapter with a server_url, the
+    client (server mode with CLIENT_SERVER_URL) and the chat API, so the
+    first real request doesn't pay TCP/TLS setup.
+    """
+    global _prewarm_task
+    if not Config.HTTP_PREWARM:
+        return
+    from assistant.core.http import get_http_clients
+    urls = [f"{a.server_url.rstrip('/')}/health" for a in adapters if getattr(a, "server_url", None)]
+    if Config.DEPLOYMENT_MODE == "server" and Config.CLIENT_SERVER_URL:
+        urls.append(f"{Config.CLIENT_SERVER_URL.rstrip('/')}/health")
+    if chat:
+        urls.append(GROQ_CHAT_URL)
+    if urls:
+        _prewarm_task = asyncio.ensure_future(get_http_clients().prewarm(urls))
+
+
+def create_router(bus: Bus) -> Router:
+    """Router with the intents that fall back to the chat skill."""
     router = Router(bus)
     router.register_intent("unknown", "chat")
     router.register_intent("smalltalk", "chat")
     router.register_intent("joke", "chat")
+    return router
+
+
+async def _start_core_components(bus: Bus, stt_adapter, tts_adapter, skip_playback: bool = False, chat_skill=None) -> None:
+    """Internal helper to start core components with given adapters."""
+    configure_bus(bus)
+    router = create_router(bus)
     
     stt = STT(bus, adapter=stt_adapter)
     nlu = NLU(bus)
     playback = Playback(bus) if not skip_playback else None
     billy_bass = BillyBass(bus, enabled=Config.BILLY_BASS_ENABLED)
-    tts = TTS(bus, adapter=tts_adapter)
+    tts = TTS(bus, adapter=tts_adapter, cache=get_tts_cache() if Config.TTS_CACHE else None)
     echo_skill = EchoSkill(bus)
-    chat_skill = ChatSkill(bus)
+    chat_skill = chat_skill or ChatSkill(bus)
 
     await stt.start()
     await nlu.start()
@@ -74,38 +130,69 @@ async def _start_core_components(bus: Bus, stt_adapter, tts_adapter, skip_playba
     await tts.start()
     await echo_skill.start()
     await chat_skill.start()
+    prewarm_http(stt_adapter, tts_adapter, chat=bool(getattr(chat_skill, "api_key", None)))
 
 
-async def start_full_components(bus: Bus) -> None:
-    """Start all components for full mode (everything local)."""
-    stt_adapter = Config.get_stt_adapter()
-    tts_adapter = Config.get_tts_adapter()
-    await _start_core_components(bus, stt_adapter, tts_adapter)
+async def start_full_components(bus: Bus, stt_adapter=None, tts_adapter=None, chat_skill=None, skip_playback: bool = False) -> None:
+    """
+    Start all components for full mode (everything local).
+    
+    Adapters and the chat skill default to the configured ones; the
+    benchmark passes stubs, and skip_playback to use its own sink.
+    """
+    stt_adapter = stt_adapter or Config.get_stt_adapter()
+    tts_adapter = tts_adapter or Config.get_tts_adapter()
+    await _start_core_components(bus, stt_adapter, tts_adapter, skip_playback=skip_playback, chat_skill=chat_skill)
 
 
 async def start_server_components(bus: Bus) -> None:
     """Start components for server mode (microphone + full pipeline + HTTP server)."""
     # Use local adapters (server processes everything locally)
-    from assistant.core.stt.whisper_adapter import WhisperAdapter
     from assistant.core.tts.pyttsx3_adapter import Pyttsx3Adapter
     
-    stt_adapter = WhisperAdapter(model_size=Config.STT_MODEL_SIZE)
+    if Config.STT_PROCESSES > 0:
+        # The worker processes /api/stt/transcribe uses (server.get_stt_adapter)
+        from assistant.core.stt.process_pool import get_stt_process_pool
+        stt_adapter = get_stt_process_pool()
+    else:
+        from assistant.core.stt.whisper_adapter import WhisperAdapter
+        stt_adapter = WhisperAdapter(model_size=Config.STT_MODEL_SIZE)
     tts_adapter = Pyttsx3Adapter(voice=Config.TTS_VOICE)
     
-    # If CLIENT_SERVER_URL is configured, skip local playback (audio goes to client)
-    skip_playback = bool(Config.CLIENT_SERVER_URL)
+    # If a client is configured, skip local playback (audio goes to client)
+    skip_playback = bool(Config.CLIENT_SERVER_URL) or Config.BRIDGE
     await _start_core_components(bus, stt_adapter, tts_adapter, skip_playback=skip_playback)
     
+    # With the bridge on, replies go to clients connected to /ws/bus
+    if Config.BRIDGE:
+        from assistant.core.bridge import BusBridge, SERVER_TOPICS, set_bus_bridge
+        set_bus_bridge(BusBridge(bus, SERVER_TOPICS, heartbeat_s=Config.BRIDGE_HEARTBEAT_S))
+        logging.info("Bus bridge enabled, clients connect to /ws/bus")
     # If CLIENT_SERVER_URL is configured, push audio to client instead of playing locally
-    if Config.CLIENT_SERVER_URL:
+    elif Config.CLIENT_SERVER_URL:
         from assistant.core.audio.client_push import ClientAudioPush
         client_push = ClientAudioPush(bus)
         await client_push.start()
         logging.info("Client audio push enabled, audio will be sent to: %s", Config.CLIENT_SERVER_URL)
 
 
+async def start_converse_components(bus: Bus) -> None:
+    """Start NLU, router and skills for the server's /api/converse pipeline (no audio I/O)."""
+    create_router(bus)
+    await NLU(bus).start()
+    await EchoSkill(bus).start()
+    await ChatSkill(bus).start()
+
+
 async def start_client_components(bus: Bus) -> None:
     """Start components for client mode (playback + motors + remote adapters)."""
+    if Config.CLIENT_PIPELINE == "converse":
+        await _start_converse_client(bus)
+        return
+    if Config.CLIENT_PIPELINE == "bridge":
+        await _start_bridge_client(bus)
+        return
+    
     # Client uses remote adapters to call server
     stt_adapter = Config.get_stt_adapter()  # Will return RemoteSTTAdapter if STT_MODE=remote
     tts_adapter = Config.get_tts_adapter()  # Will return RemoteTTSAdapter if TTS_MODE=remote
@@ -129,18 +216,17 @@ async def start_client_components(bus: Bus) -> None:
             timeout=Config.TTS_TIMEOUT,
         )
     
+    configure_bus(bus)
+    
     # Create components - client only needs playback and motors
     # STT/TTS are still needed for the pipeline, but they use remote adapters
-    router = Router(bus)
-    router.register_intent("unknown", "chat")
-    router.register_intent("smalltalk", "chat")
-    router.register_intent("joke", "chat")
+    router = create_router(bus)
     
     stt = STT(bus, adapter=stt_adapter)
     nlu = NLU(bus)
     playback = Playback(bus)  # listens on tts.audio → plays audio
     billy_bass = BillyBass(bus, enabled=Config.BILLY_BASS_ENABLED)  # listens on audio.playback.start/end → controls mouth motor
-    tts = TTS(bus, adapter=tts_adapter)
+    tts = TTS(bus, adapter=tts_adapter, cache=get_tts_cache() if Config.TTS_CACHE else None)
     echo_skill = EchoSkill(bus)
     chat_skill = ChatSkill(bus)
 
@@ -152,10 +238,49 @@ async def start_client_components(bus: Bus) -> None:
     await tts.start()
     await echo_skill.start()
     await chat_skill.start()
+    prewarm_http(stt_adapter, tts_adapter, chat=bool(chat_skill.api_key))
+
 
+async def _start_converse_client(bus: Bus) -> None:
+    """Client mode with one /api/converse request per turn instead of local NLU/skills."""
+    from assistant.core.converse import ConverseClient
+    configure_bus(bus)
+    converse_client = ConverseClient(
+        bus,
+        server_url=Config.STT_SERVER_URL,
+        model_size=Config.STT_MODEL_SIZE,
+        timeout=Config.CONVERSE_TIMEOUT,
+    )
+    playback = Playback(bus)
+    billy_bass = BillyBass(bus, enabled=Config.BILLY_BASS_ENABLED)
+
+    await converse_client.start()
+    await playback.start()
+    await billy_bass.start()
+    prewarm_http(converse_client)
 
-async def start_components(bus: Bus) -> None:
-    """Subscribe components to the bus based on deployment mode."""
+
+async def _start_bridge_client(bus: Bus) -> None:
+    """Client mode as a terminal of the server's bus: playback and motors only."""
+    from assistant.core.bridge import BusBridge, CLIENT_TOPICS, bridge_url, set_bus_bridge
+    configure_bus(bus)
+    playback = Playback(bus)
+    billy_bass = BillyBass(bus, enabled=Config.BILLY_BASS_ENABLED)
+    await playback.start()
+    await billy_bass.start()
+
+    bridge = BusBridge(bus, CLIENT_TOPICS, heartbeat_s=Config.BRIDGE_HEARTBEAT_S)
+    bridge.connect(Config.BRIDGE_URL or bridge_url(Config.STT_SERVER_URL))
+    set_bus_bridge(bridge)
+
+
+async def start_components(bus: Bus, **overrides) -> None:
+    """
+    Subscribe components to the bus based on deployment mode.
+    
+    Overrides (stt_adapter, tts_adapter, chat_skill, skip_playback) apply to
+    full mode; see start_full_components.
+    """
     mode = Config.DEPLOYMENT_MODE
     
     if mode == "server":
@@ -163,7 +288,7 @@ async def start_components(bus: Bus) -> None:
     elif mode == "client":
         await start_client_components(bus)
     else:  # mode == "full"
-        await start_full_components(bus)
+        await start_full_components(bus, **overrides)
 
 
 async def repl(bus: Bus) -> None:
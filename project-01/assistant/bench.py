@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Pipeline Benchmark
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Replays a directory of recorded utterances through the full pipeline
+(start_components in full mode) and reports per-stage and end-to-end latency
+distributions, throughput and peak RSS as JSON. Each adapter can be the real
+one or a stub with a fixed delay, so the orchestration overhead can be
+measured without models or network, and the real stages one at a time.
+Results can be saved as a baseline and later runs compared against it.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.config import Config
+from assistant.core.contracts import AudioRecorded, SkillRequest, SkillResponse, same_trace
+from assistant.core.tracing import Tracer, latency_distribution
+
+log = logging.getLogger("bench")
+
+DEFAULT_TRANSCRIPT = "tell me a joke"  # routed to chat, so every turn gets a reply
+DEFAULT_REPLY = "Why did the fish blush? Because it saw the ocean's bottom."
+TURN_TIMEOUT_S = 30.0
+REGRESSION_TOLERANCE = 0.10  # relative change counted as a regression
+MIN_DELTA_MS = 1.0           # ignore smaller latency changes (timer noise)
+
+
+class StubSTTAdapter:
+    """
+    STT stand-in: sleeps for a fixed time and returns the utterance's
+    sidecar transcript (<name>.txt next to the WAV) or a default text.
+    """
+
+    def __init__(self, delay_s: float = 0.0, transcripts: Optional[Dict[int, str]] = None):
+        self.delay_s = delay_s
+        self.transcripts = transcripts or {}  # frames -> text, to recognise buffers
+
+    def _text(self, frames: int) -> str:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return self.transcripts.get(frames, DEFAULT_TRANSCRIPT)
+
+    def transcribe(self, path) -> str:
+        return self._text(sf.info(str(path)).frames)
+
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000) -> str:
+        return self._text(len(audio))
+
+
+class StubTTSAdapter:
+    """TTS stand-in: sleeps for a fixed time and writes silence (60 ms per character)."""
+
+    def __init__(self, delay_s: float = 0.0, sample_rate: int = 22050):
+        self.delay_s = delay_s
+        self.sample_rate = sample_rate
+
+    def synth(self, text: str) -> str:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        fd, path = tempfile.mkstemp(prefix="bench-tts-", suffix=".wav")
+        os.close(fd)
+        frames = max(1, int(0.06 * len(text) * self.sample_rate))
+        sf.write(path, np.zeros(frames, dtype=np.int16), self.sample_rate, subtype="PCM_16")
+        return path
+
+
+class StubChatSkill:
+    """Chat skill stand-in: answers every chat request with a fixed reply after a delay."""
+
+    def __init__(self, bus, delay_s: float = 0.0, reply: str = DEFAULT_REPLY):
+        self.bus = bus
+        self.delay_s = delay_s
+        self.reply = reply
+
+    async def start(self):
+        self.bus.subscribe("skill.request", self._on_request)
+
+    async def _on_request(self, payload: dict):
+        try:
+            req = SkillRequest(**payload)
+        except Exception:
+            return
+        if req.skill != "chat":
+            return
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)  # network-bound: doesn't block the loop
+        resp = SkillResponse(skill="chat", say=self.reply)
+        same_trace(req, resp)
+        await self.bus.publish(resp.topic, resp.dict())
+
+
+def load_corpus(paths: List[Path]) -> List[Tuple[Path, np.ndarray, int, Optional[str]]]:
+    """
+    Decode WAV files (directories are expanded) into mono int16 arrays.
+    
+    Returns:
+        List of (path, pcm, sample_rate, sidecar transcript or None)
+    """
+    files: List[Path] = []
+    for path in paths:
+        files.extend(sorted(Path(path).glob("*.wav")) if Path(path).is_dir() else [Path(path)])
+    corpus = []
+    for path in files:
+        data, sr = sf.read(str(path), dtype="int16", always_2d=True)
+        pcm = np.ascontiguousarray(data[:, 0]) if data.shape[1] == 1 else data.mean(axis=1).astype(np.int16)
+        sidecar = path.with_suffix(".txt")
+        text = sidecar.read_text(encoding="utf-8").strip() if sidecar.exists() else None
+        corpus.append((path, pcm, sr, text))
+    return corpus
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _build_adapters(bus: Bus, corpus, stt: str, tts: str, chat: str, stub_delays: Dict[str, float]) -> Dict[str, Any]:
+    """start_full_components overrides for the chosen real/stub adapters."""
+    overrides: Dict[str, Any] = {}
+    if stt == "stub":
+        transcripts = {len(pcm): text for _, pcm, _, text in corpus if text}
+        overrides["stt_adapter"] = StubSTTAdapter(stub_delays.get("stt", 0.0), transcripts)
+    if tts == "stub":
+        overrides["tts_adapter"] = StubTTSAdapter(stub_delays.get("tts", 0.0))
+    if chat == "stub":
+        overrides["chat_skill"] = StubChatSkill(bus, stub_delays.get("chat", 0.0))
+    return overrides
+
+
+async def run_bench(
+    paths: List[Path],
+    iterations: int = 1,
+    concurrency: int = 1,
+    stt: str = "real",
+    tts: str = "real",
+    chat: str = "stub",
+    playback: str = "sink",
+    stub_delays: Optional[Dict[str, float]] = None,
+    turn_timeout: float = TURN_TIMEOUT_S,
+) -> Dict[str, Any]:
+    """
+    Replay a WAV corpus through the pipeline and measure it.
+    
+    Every file is published as an in-process audio.recorded buffer, ITERATIONS
+    times, with at most CONCURRENCY turns in flight. A turn ends at its final
+    tts.audio chunk (playback="sink": the clips are dropped) or final
+    audio.playback.end (playback="device"), or at an empty transcript.
+    
+    Args:
+        paths: WAV files or directories of them
+        stt, tts, chat: "real" (configured adapter) or "stub"
+        playback: "sink" or "device"
+        stub_delays: Seconds each stub takes, by "stt"/"tts"/"chat"
+        turn_timeout: Seconds before a turn without a reply counts as timed out
+    
+    Returns:
+        JSON-serializable results (see README "Benchmarking")
+    """
+    from assistant.app import start_components
+
+    corpus = load_corpus(paths)
+    if not corpus:
+        raise ValueError("No WAV files found")
+
+    bus = Bus()
+    bus.tracer = Tracer(max_traces=max(1, iterations * len(corpus)))
+    registry = get_buffer_registry()
+    pending: Dict[str, Tuple[asyncio.Event, list]] = {}  # corr_id -> (done, [end time])
+
+    def _finish(corr_id: Optional[str]) -> None:
+        entry = pending.get(corr_id)
+        if entry is not None and not entry[0].is_set():
+            entry[1].append(time.perf_counter())
+            entry[0].set()
+
+    async def on_transcript(payload: dict):
+        if not payload.get("partial") and not (payload.get("text") or "").strip():
+            _finish(payload.get("corr_id"))
+
+    async def on_audio(payload: dict):
+        if playback == "sink":
+            registry.release(payload.get("buffer_id"))
+        if payload.get("final", True):
+            _finish(payload.get("corr_id"))
+
+    bus.subscribe("stt.transcript", on_transcript)
+    bus.subscribe("tts.audio" if playback == "sink" else "audio.playback.end", on_audio)
+
+    overrides = _build_adapters(bus, corpus, stt, tts, chat, stub_delays or {})
+    mode = Config.DEPLOYMENT_MODE
+    Config.DEPLOYMENT_MODE = "full"  # the whole pipeline in this process
+    started = time.perf_counter()
+    try:
+        await start_components(bus, skip_playback=(playback == "sink"), **overrides)
+    finally:
+        Config.DEPLOYMENT_MODE = mode
+    startup_s = time.perf_counter() - started
+
+    latencies: List[float] = []
+    counts = {"completed": 0, "timeouts": 0, "errors": 0}
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def turn(pcm: np.ndarray, sr: int) -> None:
+        async with limit:
+            event = AudioRecorded(buffer_id=registry.put(pcm, sr), duration_s=len(pcm) / sr)
+            done = asyncio.Event()
+            pending[event.corr_id] = (done, [])
+            start = time.perf_counter()
+            try:
+                await bus.publish(event.topic, event.dict())
+                await asyncio.wait_for(done.wait(), turn_timeout)
+                latencies.append(pending[event.corr_id][1][0] - start)
+                counts["completed"] += 1
+            except asyncio.TimeoutError:
+                log.warning("Turn %s got no reply within %.0fs", event.corr_id, turn_timeout)
+                counts["timeouts"] += 1
+            except Exception:
+                log.exception("Turn %s failed", event.corr_id)
+                counts["errors"] += 1
+            finally:
+                pending.pop(event.corr_id, None)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(turn(pcm, sr) for _ in range(iterations) for _, pcm, sr, _ in corpus))
+    wall_s = time.perf_counter() - started
+    await bus.join()
+
+    return {
+        "config": {
+            "files": len(corpus),
+            "iterations": iterations,
+            "concurrency": concurrency,
+            "adapters": {"stt": stt, "tts": tts, "chat": chat, "playback": playback},
+            "stub_delays": stub_delays or {},
+            "bus_dispatch": Config.BUS_DISPATCH,
+        },
+        "turns": iterations * len(corpus),
+        **counts,
+        "startup_s": round(startup_s, 3),
+        "wall_s": round(wall_s, 3),
+        "throughput_turns_per_s": round(counts["completed"] / wall_s, 3) if wall_s > 0 else 0.0,
+        "end_to_end": latency_distribution(latencies),
+        "stages": bus.tracer.summary(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _metrics(results: Dict[str, Any]) -> Dict[str, Tuple[float, bool]]:
+    """Flatten comparable metrics: name -> (value, higher_is_better)."""
+    metrics: Dict[str, Tuple[float, bool]] = {}
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        if key in results.get("end_to_end", {}):
+            metrics[f"end_to_end.{key}"] = (results["end_to_end"][key], False)
+    for stage, stats in results.get("stages", {}).items():
+        for key in ("p50_ms", "p95_ms"):
+            if key in stats:
+                metrics[f"stages.{stage}.{key}"] = (stats[key], False)
+    if "throughput_turns_per_s" in results:
+        metrics["throughput_turns_per_s"] = (results["throughput_turns_per_s"], True)
+    if results.get("peak_rss_mb") is not None:
+        metrics["peak_rss_mb"] = (results["peak_rss_mb"], False)
+    return metrics
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = REGRESSION_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline run.
+    
+    Returns:
+        One entry per metric present in both: {"metric", "baseline", "current",
+        "change" (relative, positive = worse), "regression"}
+    """
+    current = _metrics(results)
+    rows = []
+    for name, (before, higher_is_better) in _metrics(baseline).items():
+        if name not in current:
+            continue
+        after = current[name][0]
+        worse = before - after if higher_is_better else after - before
+        change = worse / before if before else (1.0 if worse > 0 else 0.0)
+        regression = change > tolerance and not (name.endswith("_ms") and worse < MIN_DELTA_MS)
+        rows.append({
+            "metric": name,
+            "baseline": before,
+            "current": after,
+            "change": round(change, 3),
+            "regression": regression,
+        })
+    return rows
+
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Any], path: Path) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
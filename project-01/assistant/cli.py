@@ -36,7 +36,7 @@ loop, server mode, and client mode.
 import typer
 import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 app = typer.Typer(help="Fish Assistant CLI")
 
@@ -66,6 +66,119 @@ def stt_transcribe(path: Path, model_size: str = "tiny"):
     text = transcribe_file(path, model_size=model_size)
     typer.echo(text)
 
+@app.command("vad:bench")
+def vad_bench(
+    paths: List[Path] = typer.Argument(..., help="16 kHz mono WAV files or directories of them"),
+    aggressiveness: int = typer.Option(2, "--aggressiveness", "-a"),
+):
+    """Compare VAD backends (frames/sec and agreement) on a WAV corpus."""
+    from assistant.core.audio.vad import VAD_BACKENDS, bench_vad
+    files = []
+    for path in paths:
+        files.extend(sorted(path.glob("*.wav")) if path.is_dir() else [path])
+    if not files:
+        typer.echo("No WAV files found")
+        raise typer.Exit(1)
+    results = bench_vad(files, [b for b in VAD_BACKENDS if b != "auto"], aggressiveness)
+    typer.echo(f"{len(files)} file(s)")
+    for name, r in results.items():
+        typer.echo(
+            f"{name:>7}  {r['frames_per_s']:>10.0f} frames/s  speech={r['speech_ratio']:.1%}  "
+            f"agreement={r['agreement']:.1%}"
+        )
+
+@app.command("bench")
+def bench(
+    paths: List[Path] = typer.Argument(..., help="WAV files or directories of them"),
+    iterations: int = typer.Option(1, "--iterations", "-n", help="Passes over the corpus"),
+    concurrency: int = typer.Option(1, "--concurrency", "-c", help="Turns in flight at once"),
+    stt: str = typer.Option("real", help="real or stub"),
+    tts: str = typer.Option("real", help="real or stub"),
+    chat: str = typer.Option("stub", help="real (Groq) or stub"),
+    playback: str = typer.Option("sink", help="sink (drop clips) or device"),
+    stub_stt_ms: float = typer.Option(0.0, help="Delay of the stub STT"),
+    stub_tts_ms: float = typer.Option(0.0, help="Delay of the stub TTS"),
+    stub_chat_ms: float = typer.Option(0.0, help="Delay of the stub chat skill"),
+    turn_timeout: float = typer.Option(30.0, help="Seconds before a turn counts as timed out"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write results JSON here"),
+    baseline: Optional[Path] = typer.Option(None, help="Compare with this results file; exit 1 on regression"),
+    save_baseline: Optional[Path] = typer.Option(None, help="Store the results as a baseline"),
+    tolerance: float = typer.Option(0.10, help="Relative change counted as a regression"),
+):
+    """Replay WAVs through the pipeline and report latency, throughput and RSS as JSON."""
+    import json
+    from assistant import bench as bench_mod
+
+    for name, value in (("stt", stt), ("tts", tts), ("chat", chat)):
+        if value not in ("real", "stub"):
+            raise typer.BadParameter(f"--{name} must be 'real' or 'stub'")
+    if playback not in ("sink", "device"):
+        raise typer.BadParameter("--playback must be 'sink' or 'device'")
+
+    try:
+        results = asyncio.run(bench_mod.run_bench(
+            paths, iterations=iterations, concurrency=concurrency,
+            stt=stt, tts=tts, chat=chat, playback=playback,
+            stub_delays={"stt": stub_stt_ms / 1000, "tts": stub_tts_ms / 1000, "chat": stub_chat_ms / 1000},
+            turn_timeout=turn_timeout,
+        ))
+    except ValueError as e:
+        typer.echo(str(e))
+        raise typer.Exit(1)
+
+    if save_baseline is not None:
+        bench_mod.save_baseline(results, save_baseline)
+    if baseline is not None:
+        rows = bench_mod.compare(results, bench_mod.load_baseline(baseline), tolerance)
+        results["comparison"] = {"baseline": str(baseline), "tolerance": tolerance, "metrics": rows}
+    text = json.dumps(results, indent=2)
+    typer.echo(text)
+    if output is not None:
+        output.write_text(text + "\n", encoding="utf-8")
+
+    regressions = [r for r in results.get("comparison", {}).get("metrics", []) if r["regression"]]
+    for r in regressions:
+        typer.echo(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']:+.0%})", err=True)
+    if regressions:
+        raise typer.Exit(1)
+
+@app.command("loadtest")
+def loadtest(
+    url: Optional[str] = typer.Option(None, help="Server URL; default: run the server app in-process"),
+    clients: int = typer.Option(4, "--clients", "-m", help="Simulated fish"),
+    duration: float = typer.Option(60.0, "--duration", "-d", help="Seconds to run"),
+    turns: Optional[int] = typer.Option(None, help="Stop each client after this many turns"),
+    utterance_min: float = typer.Option(1.0, help="Shortest utterance (s)"),
+    utterance_max: float = typer.Option(4.0, help="Longest utterance (s)"),
+    think_min: float = typer.Option(2.0, help="Shortest pause between turns (s)"),
+    think_max: float = typer.Option(8.0, help="Longest pause between turns (s)"),
+    tts: bool = typer.Option(True, help="Also synthesize a reply each turn"),
+    corpus: Optional[Path] = typer.Option(None, help="Upload these WAVs instead of synthetic speech"),
+    model_size: Optional[str] = typer.Option(None, help="model_size sent with each upload"),
+    interval: float = typer.Option(0.5, help="Queue depth sampling period (s)"),
+    seed: Optional[int] = typer.Option(None, help="Random seed for repeatable runs"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write results JSON here"),
+):
+    """Load-test the STT/TTS server with simulated fish; report latency, 503s and queue depth as JSON."""
+    import json
+    from assistant.loadgen import LoadGenerator, LoadProfile
+
+    profile = LoadProfile(
+        clients=clients, duration_s=duration, turns=turns,
+        utterance_s=(utterance_min, utterance_max), think_s=(think_min, think_max),
+        tts=tts, model_size=model_size, sample_interval_s=interval, seed=seed,
+    )
+    app_under_test = None
+    if url is None:
+        from assistant.server import create_app
+        app_under_test = create_app()
+    generator = LoadGenerator(profile, base_url=url, app=app_under_test, corpus=[corpus] if corpus else None)
+    results = asyncio.run(generator.run())
+    text = json.dumps(results, indent=2)
+    typer.echo(text)
+    if output is not None:
+        output.write_text(text + "\n", encoding="utf-8")
+
 @app.command("demo:record-and-transcribe")
 def demo_record_and_transcribe(
     duration: float = typer.Option(5.0, "--duration", "-d"),
@@ -181,6 +294,9 @@ def server(
     from assistant.core.bus import Bus
     from assistant.core.ux.conversation_loop import ConversationLoop
     from assistant.app import start_server_components
+    from assistant.core.bridge import get_bus_bridge
+    from assistant.core.http import get_http_clients
+    from assistant.core.stt.process_pool import close_stt_process_pool
     from assistant.server import create_app
     
     # Configure logging
@@ -216,8 +332,15 @@ def server(
         typer.echo("📡 API endpoints available at:")
         typer.echo(f"   - POST /api/stt/transcribe")
         typer.echo(f"   - POST /api/tts/synthesize")
+        typer.echo(f"   - POST /api/converse")
+        if Config.BRIDGE:
+            typer.echo(f"   - WS   /ws/bus")
+        typer.echo(f"   - GET  /api/stats")
+        typer.echo(f"   - GET  /api/traces (/summary, /chrome)")
         typer.echo(f"   - GET  /health")
-        if Config.CLIENT_SERVER_URL:
+        if Config.BRIDGE:
+            typer.echo("🔌 Bus bridge enabled: clients connect to /ws/bus")
+        elif Config.CLIENT_SERVER_URL:
             typer.echo(f"📤 Client audio push enabled: {Config.CLIENT_SERVER_URL}")
         
         # Start server components
@@ -245,7 +368,11 @@ def server(
                 pass
         if conversation_loop:
             await conversation_loop.stop()
+        if get_bus_bridge():
+            await get_bus_bridge().close()
         bus.clear()
+        await get_http_clients().aclose()
+        close_stt_process_pool()
         typer.echo("✅ Stopped.")
     
     # Create app with lifespan
@@ -271,6 +398,8 @@ def client(
     from assistant.core.config import Config
     from assistant.core.bus import Bus
     from assistant.app import start_client_components
+    from assistant.core.bridge import get_bus_bridge
+    from assistant.core.http import get_http_clients
     from assistant.client_server import create_client_app
     
     # Configure logging
@@ -314,7 +443,10 @@ def client(
         
         # Shutdown
         typer.echo("\n🛑 Stopping client...")
+        if get_bus_bridge():
+            await get_bus_bridge().close()
         bus.clear()
+        await get_http_clients().aclose()
         typer.echo("✅ Stopped.")
     
     # Create client HTTP app with lifespan
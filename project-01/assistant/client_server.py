@@ -43,10 +43,12 @@ try:
     import soundfile as sf
 except ImportError:
     sf = None
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from assistant.core.audio.buffers import get_decode_cache
 from assistant.core.bus import Bus
 from assistant.core.contracts import TTSAudio
+from assistant.core.tracing import create_trace_router
 
 logger = logging.getLogger("client_server")
 
@@ -87,15 +89,21 @@ def create_client_app(bus: Bus, lifespan=None) -> FastAPI:
         """Health check endpoint."""
         return {"status": "ok", "mode": "client"}
     
+    app.include_router(create_trace_router())
+    
     @app.post("/api/audio/play")
     async def receive_audio(
-        audio: UploadFile = File(..., description="WAV audio file to play")
+        audio: UploadFile = File(..., description="WAV audio file to play"),
+        corr_id: Optional[str] = Form(default=None, description="Trace id of the reply"),
+        seq: int = Form(default=0, description="Chunk index within a streamed reply"),
+        final: bool = Form(default=True, description="Last chunk of the reply"),
     ):
         """
         Receive audio file and trigger playback.
         
         Accepts multipart/form-data with:
         - audio: WAV file
+        - corr_id, seq, final: Optional streamed-reply metadata
         
         Returns success status.
         """
@@ -128,8 +136,10 @@ def create_client_app(bus: Bus, lifespan=None) -> FastAPI:
             duration_s = 0.01
             try:
                 if sf:
-                    info = sf.info(temp_path)
-                    duration_s = info.frames / float(info.samplerate) if info.samplerate else 0.01
+                    # Decode once into the shared cache; Playback reuses it
+                    decode_cache = get_decode_cache()
+                    duration_s = decode_cache.acquire(temp_path).duration_s or 0.01
+                    decode_cache.release(temp_path)
                 else:
                     with wave.open(temp_path, 'rb') as wf:
                         duration_s = wf.getnframes() / float(wf.getframerate())
@@ -138,7 +148,9 @@ def create_client_app(bus: Bus, lifespan=None) -> FastAPI:
             
             # Publish TTSAudio event to trigger playback
             logger.info("Client: Publishing tts.audio event to bus (duration=%.2fs, path=%s)", duration_s, temp_path)
-            audio_event = TTSAudio(wav_path=temp_path, duration_s=duration_s)
+            audio_event = TTSAudio(wav_path=temp_path, duration_s=duration_s, seq=seq, final=final)
+            if corr_id:
+                audio_event.corr_id = corr_id
             logger.info("Client: Created TTSAudio event: topic=%s, wav_path=%s", audio_event.topic, audio_event.wav_path)
             await bus.publish(audio_event.topic, audio_event.dict())
             logger.info("Client: Published tts.audio event successfully (bus.publish completed)")
@@ -152,6 +164,7 @@ def create_client_app(bus: Bus, lifespan=None) -> FastAPI:
         except Exception as e:
             logger.exception("Error receiving audio: %s", e)
             # Clean up temp file on error
+            get_decode_cache().evict(temp_path)
             try:
                 os.remove(temp_path)
             except Exception:
@@ -38,18 +38,16 @@ specific).
 import asyncio
 import logging
 import os
-
-try:
-    import soundfile as sf
-except ImportError:
-    sf = None
+from collections import OrderedDict
 
 try:
     import numpy as np
 except ImportError:
     np = None
-from typing import Optional
-from ..contracts import PlaybackStart, PlaybackEnd, UXState
+from typing import List, Optional, Tuple
+from ..contracts import MouthEnvelope, PlaybackStart, PlaybackEnd, UXState
+from .buffers import get_buffer_registry, get_decode_cache
+from .envelope import compute_envelope
 
 # Try to import BeagleBone GPIO/PWM libraries
 try:
@@ -67,7 +65,8 @@ class BillyBass:
     Controls Billy Bass motors for mouth, tail, and head animations.
     
     Listens on:
-    - 'audio.playback.start' and 'audio.playback.end' - Controls mouth motor based on audio amplitude
+    - 'anim.mouth.envelope' - Precomputed amplitude envelope for the next clip
+    - 'audio.playback.start' and 'audio.playback.end' - Drives the mouth motor from the envelope
     - 'ux.state' - Triggers body animations based on conversation state
     
     Provides direct methods for manual control:
@@ -89,7 +88,9 @@ class BillyBass:
     STBY_PIN = "P1_06"
 
     # Audio processing parameters
-    CHUNK_SIZE_MS = 10  # Process audio in 10ms chunks (smaller = more responsive)
+    CHUNK_SIZE_MS = 10  # Envelope hop when computing from the file (smaller = more responsive)
+    SYNC_DELAY_S = 0.05  # Delay after playback start to line up with the audio
+    MAX_PENDING_ENVELOPES = 8  # Envelopes kept for clips that have not started yet
     NOISE_GATE_THRESHOLD = 500  # RMS threshold below which motor stops (higher = more precise)
     VOLUME_DIVISOR = 150  # Scale factor for volume to PWM conversion (lower = more movement)
     MIN_PWM = 5  # Minimum PWM when audio detected (for subtle movement)
@@ -111,6 +112,8 @@ class BillyBass:
         self._current_task: Optional[asyncio.Task] = None
         self._body_task: Optional[asyncio.Task] = None
         self._periodic_flap_task: Optional[asyncio.Task] = None
+        self._envelopes: "OrderedDict[str, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._prev_pwm = 0
 
         if not BBIO_AVAILABLE:
             self.log.warning(
@@ -133,6 +136,7 @@ class BillyBass:
             self.log.error("BillyBass: Hardware initialization failed, motors will not work")
             return
         
+        self.bus.subscribe("anim.mouth.envelope", self._on_envelope)
         self.bus.subscribe("audio.playback.start", self._on_playback_start)
         self.bus.subscribe("audio.playback.end", self._on_playback_end)
         self.bus.subscribe("ux.state", self._on_ux_state)
@@ -167,6 +171,20 @@ class BillyBass:
             self.log.exception("Failed to initialize Billy Bass hardware: %s", e)
             self.enabled = False
 
+    async def _on_envelope(self, payload: dict):
+        """Keep the envelope of an upcoming clip until its playback starts."""
+        try:
+            event = MouthEnvelope(**payload)
+        except Exception:
+            self.log.warning("malformed anim.mouth.envelope event, skipping")
+            return
+        key = event.buffer_id or event.wav_path
+        if not key:
+            return
+        self._envelopes[key] = (np.asarray(event.env, dtype=np.float32), event.hop_ms)
+        while len(self._envelopes) > self.MAX_PENDING_ENVELOPES:
+            self._envelopes.popitem(last=False)
+
     async def _on_playback_start(self, payload: dict):
         """Handle playback start event - begin processing audio chunks."""
         if not self.enabled:
@@ -179,19 +197,25 @@ class BillyBass:
         
         try:
             event = PlaybackStart(**payload)
-            self.log.info("BillyBass: Received playback.start for %s", event.wav_path)
+            self.log.info("BillyBass: Received playback.start for %s", event.wav_path or event.buffer_id)
         except Exception:
             self.log.warning("malformed audio.playback.start event, skipping")
             return
 
-        wav_path = event.wav_path
-        if not wav_path or not os.path.exists(wav_path):
-            self.log.warning("BillyBass: Audio file not found: %s", wav_path)
+        key = event.buffer_id or event.wav_path
+        if event.buffer_id:
+            if key not in self._envelopes and get_buffer_registry().get(key) is None:
+                self.log.warning("BillyBass: Audio buffer not found: %s", key)
+                return
+        elif not key or not os.path.exists(key):
+            self.log.warning("BillyBass: Audio file not found: %s", key)
             return
 
         # Publish UX state "speaking" so body animations trigger
         # This ensures animations work even if conversation loop isn't running (e.g., REPL mode)
-        await self.bus.publish("ux.state", UXState(state="speaking").dict())
+        # Streamed replies arrive as several chunks; only the first one starts speaking
+        if event.seq == 0:
+            await self.bus.publish("ux.state", UXState(state="speaking").dict())
 
         # Cancel any existing task
         if self._current_task and not self._current_task.done():
@@ -201,10 +225,17 @@ class BillyBass:
             except asyncio.CancelledError:
                 pass
 
-        # Start processing audio chunks
-        self.log.info("BillyBass: Starting audio chunk processing for mouth motor")
+        # Use the envelope published with the clip, or compute it from the audio
+        envelope = self._envelopes.pop(key, None)
+        if envelope is None:
+            loop = asyncio.get_event_loop()
+            envelope = await loop.run_in_executor(None, self._load_envelope, event)
+        env, hop_ms = envelope
+        schedule = self.mouth_schedule(env)
+
+        self.log.info("BillyBass: Driving mouth from %d-step schedule (%d ms hops)", len(schedule), hop_ms)
         self._current_task = asyncio.create_task(
-            self._process_audio_chunks(wav_path)
+            self._drive_mouth(schedule, hop_ms / 1000.0)
         )
 
     async def _on_playback_end(self, payload: dict):
@@ -218,8 +249,8 @@ class BillyBass:
             self.log.warning("malformed audio.playback.end event, skipping")
             return
 
-        # Publish UX state "idle" to stop body animations
-        if event.ok:
+        # Publish UX state "idle" to stop body animations (after the last chunk)
+        if event.ok and event.final:
             await self.bus.publish("ux.state", UXState(state="idle").dict())
 
         # Stop motor
@@ -233,121 +264,91 @@ class BillyBass:
             except asyncio.CancelledError:
                 pass
 
-    async def _process_audio_chunks(self, wav_path: str):
+    def _load_envelope(self, event: PlaybackStart) -> Tuple[np.ndarray, int]:
+        """Read a clip and compute its envelope (fallback when none was published)."""
+        buffer = get_buffer_registry().get(event.buffer_id)
+        if buffer is not None:
+            data, sample_rate = buffer.as_float32(), buffer.sample_rate
+        else:
+            cache = get_decode_cache()
+            buffer = cache.acquire(event.wav_path)
+            cache.release(event.wav_path)
+            data, sample_rate = buffer.pcm, buffer.sample_rate
+        return compute_envelope(data, sample_rate, self.CHUNK_SIZE_MS), self.CHUNK_SIZE_MS
+
+    @classmethod
+    def mouth_schedule(cls, env: np.ndarray) -> np.ndarray:
+        """
+        Map a normalized envelope to mouth PWM duty cycles, one per hop.
+        
+        Levels are compared in int16 units: below the noise gate the mouth
+        closes, above it the level is scaled and clamped to [MIN_PWM, MAX_PWM].
         """
-        Read audio file in chunks and control motor based on amplitude.
+        level = np.asarray(env, dtype=np.float32) * 32767.0
+        pwm = np.clip((level - cls.NOISE_GATE_THRESHOLD) / cls.VOLUME_DIVISOR, cls.MIN_PWM, cls.MAX_PWM)
+        pwm = pwm.astype(np.uint8)
+        pwm[level < cls.NOISE_GATE_THRESHOLD] = 0
+        return pwm
+
+    @staticmethod
+    def _schedule_steps(schedule: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Reduce a schedule to the hops where the motor needs a new command.
+        
+        A step is emitted whenever the duty cycle changes, plus one hop after
+        each close so the reverse pulse that snaps the mouth shut is stopped.
+        """
+        if len(schedule) == 0:
+            return []
+        changes = np.flatnonzero(np.diff(schedule.astype(np.int16))) + 1
+        steps = [(0, int(schedule[0]))]
+        for idx in changes.tolist():
+            value = int(schedule[idx])
+            steps.append((idx, value))
+            if value == 0 and idx + 1 < len(schedule) and schedule[idx + 1] == 0:
+                steps.append((idx + 1, 0))
+        return steps
+
+    async def _drive_mouth(self, schedule: np.ndarray, hop_s: float):
+        """
+        Drive the mouth motor from a precomputed PWM schedule.
         
-        This runs in parallel with the actual audio playback.
-        Uses precise timing to stay synchronized with audio playback.
+        Only wakes up when the duty cycle changes and derives every step's
+        time from the start of the clip, so it does not drift.
         """
         try:
-            # Small delay to let audio playback start (account for device initialization)
-            await asyncio.sleep(0.05)  # 50ms delay to sync with audio playback start
-            
-            # Open audio file
-            with sf.SoundFile(wav_path) as audio_file:
-                sample_rate = audio_file.samplerate
-                channels = audio_file.channels
-                chunk_size_samples = int(sample_rate * self.CHUNK_SIZE_MS / 1000)
-                chunk_duration_s = self.CHUNK_SIZE_MS / 1000.0
-
-                self.log.debug(
-                    "Processing audio chunks: %d Hz, %d ch, %d samples/chunk, %.1fms/chunk",
-                    sample_rate, channels, chunk_size_samples, self.CHUNK_SIZE_MS
-                )
-
-                # Track timing to maintain sync
-                import time
-                start_time = time.time()
-                chunk_index = 0
-
-                # Read and process chunks
-                while True:
-                    chunk = audio_file.read(chunk_size_samples, dtype="float32", always_2d=True)
-                    
-                    if len(chunk) == 0:
-                        break  # End of file
-
-                    # Convert to mono if stereo (take mean of channels)
-                    if channels > 1:
-                        chunk = np.mean(chunk, axis=1)
-                    else:
-                        chunk = chunk.flatten()
-
-                    # Convert float32 [-1, 1] to int16 for RMS calculation
-                    chunk_int16 = (chunk * 32767).astype(np.int16)
-
-                    # Control motor based on volume (Python 3.7 compatible)
-                    loop = asyncio.get_event_loop()
-                    await loop.run_in_executor(None, self._move_mouth, chunk_int16)
-
-                    # Calculate precise sleep time to maintain sync
-                    chunk_index += 1
-                    expected_time = start_time + (chunk_index * chunk_duration_s)
-                    current_time = time.time()
-                    sleep_time = max(0, expected_time - current_time)
-                    
-                    # If we're behind, don't sleep (catch up)
-                    # If we're ahead, sleep to maintain sync
-                    if sleep_time > 0:
-                        await asyncio.sleep(sleep_time)
-                    else:
-                        # We're behind, skip a tiny sleep to catch up
-                        await asyncio.sleep(0.001)  # Minimal sleep to yield to event loop
-
+            await asyncio.sleep(self.SYNC_DELAY_S)
+            loop = asyncio.get_event_loop()
+            start_time = loop.time()
+            self._prev_pwm = 0
+            for idx, pwm_val in self._schedule_steps(schedule):
+                delay = start_time + idx * hop_s - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._set_mouth(pwm_val)
+            # Hold the last value until the clip ends
+            remaining = start_time + len(schedule) * hop_s - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
         except asyncio.CancelledError:
-            self.log.debug("Audio chunk processing cancelled")
+            self.log.debug("Mouth schedule cancelled")
             raise
         except Exception as e:
-            self.log.exception("Error processing audio chunks: %s", e)
+            self.log.exception("Error driving mouth motor: %s", e)
         finally:
             self._stop_motor()
 
-    def _move_mouth(self, audio_chunk):
+    def _set_mouth(self, pwm_val: int):
         """
-        Calculate volume from audio chunk and set PWM duty cycle.
+        Apply one mouth duty cycle.
         
-        This runs in a thread to avoid blocking the event loop.
-        Uses peak detection for more precise mouth movement.
-        Actively closes mouth by reversing motor direction when no audio.
+        Actively closes mouth by reversing motor direction when it goes from
+        open to closed.
         """
         if not self._initialized:
             return
 
         try:
-            if len(audio_chunk) == 0:
-                volume = 0
-                peak = 0
-            else:
-                # Calculate RMS volume (average energy)
-                volume = np.sqrt(np.mean(audio_chunk.astype(np.float64) ** 2))
-                # Calculate peak amplitude (for detecting speech bursts)
-                peak = np.max(np.abs(audio_chunk.astype(np.float64)))
-
-            # Use peak detection for more precise movement
-            # Peak is better for detecting actual speech sounds vs background
-            effective_volume = max(volume, peak * 0.7)  # Blend RMS and peak
-
-            # Track previous state to detect transitions
-            if not hasattr(self, '_prev_pwm'):
-                self._prev_pwm = 0
-
-            # Noise gate: stop motor if volume too low
-            if effective_volume < self.NOISE_GATE_THRESHOLD:
-                pwm_val = 0
-            else:
-                # Scale volume to PWM duty cycle with min/max limits
-                # Use a more aggressive scaling for better responsiveness
-                pwm_val = int((effective_volume - self.NOISE_GATE_THRESHOLD) / self.VOLUME_DIVISOR)
-                pwm_val = max(self.MIN_PWM, min(self.MAX_PWM, pwm_val))
-
-            # Log periodically to debug
-            if not hasattr(self, '_mouth_log_counter'):
-                self._mouth_log_counter = 0
-            self._mouth_log_counter += 1
-            if self._mouth_log_counter % 50 == 0:  # Log every 50 chunks (~1 second)
-                self.log.info("BillyBass: volume=%.1f, peak=%.1f, pwm=%d", volume, peak, pwm_val)
-
             # Drive motor based on audio
             if pwm_val > 0:
                 # Open mouth: drive motor forward
@@ -362,7 +363,7 @@ class BillyBass:
                     GPIO.output(self.MOUTH_IN1, GPIO.LOW)
                     GPIO.output(self.MOUTH_IN2, GPIO.HIGH)
                     PWM.set_duty_cycle(self.MOUTH_PWM_PIN, 25)  # Brief reverse pulse to close
-                    # The next chunk (20ms later) will stop it, so this is just a quick pulse
+                    # The next step (one hop later) will stop it, so this is just a quick pulse
                 else:
                     # Already closed, ensure it stays stopped
                     PWM.set_duty_cycle(self.MOUTH_PWM_PIN, 0)
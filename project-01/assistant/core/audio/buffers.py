@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Audio Buffer Registry
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+In-process registry of decoded audio. Components hand audio to each other by
+putting PCM into the registry and publishing its buffer id on the bus, so a
+recording or a synthesized reply is decoded once and never round-trips
+through a temporary WAV file. Files are only written when audio leaves the
+process (remote STT, pushing audio to a client). Audio that does arrive as a
+file (e.g. pushed to the client) goes through a shared decode cache, so each
+file is decoded once however many components read it.
+
+--------------------------------------------------------------------------
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger("audio_buffers")
+
+# Same scratch root as recordings (recorder.TMP_DIR) without importing sounddevice
+BUFFER_DIR = Path(tempfile.gettempdir()) / "fish"
+MAX_BUFFERS = 32  # unreleased buffers kept before the oldest is dropped
+MAX_DECODED = 16  # unreferenced decoded files kept before the oldest is dropped
+
+
+@dataclass(frozen=True)
+class AudioBuffer:
+    """Read-only PCM (frames x channels, or frames) and its sample rate."""
+    pcm: np.ndarray
+    sample_rate: int
+
+    @property
+    def frames(self) -> int:
+        return len(self.pcm)
+
+    @property
+    def duration_s(self) -> float:
+        return self.frames / float(self.sample_rate) if self.sample_rate else 0.0
+
+    def as_float32(self) -> np.ndarray:
+        """Samples as float32 in [-1, 1], shape (frames, channels)."""
+        data = self.pcm if self.pcm.ndim == 2 else self.pcm[:, None]
+        if data.dtype == np.float32:
+            return data
+        if data.dtype == np.int16:
+            return data.astype(np.float32) / 32768.0
+        return data.astype(np.float32)
+
+
+class BufferRegistry:
+    """
+    Thread-safe map of buffer id -> AudioBuffer.
+
+    The component that consumes a buffer last releases it (Playback after a
+    clip has played, STT after transcribing). Buffers that are never released
+    are dropped oldest-first once more than `max_items` are held, so a missed
+    release can't grow memory without bound.
+
+    Usage:
+        registry = get_buffer_registry()
+        buffer_id = registry.put(pcm, 16000)
+        buffer = registry.get(buffer_id)
+        path = registry.materialize(buffer_id)   # only at a process boundary
+        registry.release(buffer_id)
+    """
+
+    def __init__(self, max_items: int = MAX_BUFFERS):
+        self.max_items = max(1, int(max_items))
+        self._buffers: "OrderedDict[str, AudioBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, pcm: np.ndarray, sample_rate: int) -> str:
+        """
+        Register audio and return its buffer id.
+
+        The array is not copied; consumers get a read-only view of it, and
+        callers must not modify it afterwards.
+        """
+        pcm = np.asarray(pcm).view()
+        pcm.flags.writeable = False
+        buffer_id = uuid.uuid4().hex
+        with self._lock:
+            self._buffers[buffer_id] = AudioBuffer(pcm, int(sample_rate))
+            while len(self._buffers) > self.max_items:
+                dropped, _ = self._buffers.popitem(last=False)
+                logger.warning("Dropping unreleased audio buffer %s", dropped)
+        return buffer_id
+
+    def get(self, buffer_id: Optional[str]) -> Optional[AudioBuffer]:
+        """Return the buffer or None if it is unknown or already released."""
+        if not buffer_id:
+            return None
+        with self._lock:
+            return self._buffers.get(buffer_id)
+
+    def release(self, buffer_id: Optional[str]) -> None:
+        """Forget a buffer; unknown ids are ignored."""
+        if not buffer_id:
+            return
+        with self._lock:
+            self._buffers.pop(buffer_id, None)
+
+    def materialize(self, buffer_id: str, directory: Optional[Path] = None) -> str:
+        """
+        Write a buffer to a new 16-bit WAV file and return its path.
+
+        The caller owns (and removes) the file.
+
+        Raises:
+            KeyError: If the buffer is unknown or already released
+        """
+        buffer = self.get(buffer_id)
+        if buffer is None:
+            raise KeyError(buffer_id)
+        directory = Path(directory) if directory else BUFFER_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="buf-", suffix=".wav", dir=str(directory))
+        os.close(fd)
+        sf.write(path, buffer.pcm, buffer.sample_rate, subtype="PCM_16")
+        return path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buffers)
+
+
+class DecodeCache:
+    """
+    Decoded WAV files keyed by (path, mtime, size), shared by all readers.
+
+    acquire() returns the file as a read-only float32 AudioBuffer (frames x
+    channels), decoding it only on first use; release() drops the caller's
+    reference. Unreferenced entries stay cached (LRU, up to `max_items`)
+    until the file is deleted: whoever removes the file calls evict(), as
+    Playback does in _safe_cleanup. A rewritten file has a new key, so stale
+    audio is never served.
+
+    Usage:
+        cache = get_decode_cache()
+        buffer = cache.acquire(path)    # decodes on first use
+        ...
+        cache.release(path)
+        cache.evict(path)               # before deleting the file
+    """
+
+    def __init__(self, max_items: int = MAX_DECODED):
+        self.max_items = max(0, int(max_items))
+        self._entries: "OrderedDict[tuple, list]" = OrderedDict()  # key -> [AudioBuffer, refs]
+        self._lock = threading.Lock()
+        self.decodes = 0
+        self.hits = 0
+
+    @staticmethod
+    def _key(path: str) -> tuple:
+        st = os.stat(path)
+        return (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+    def acquire(self, path: str) -> AudioBuffer:
+        """
+        Return the decoded file and take a reference to it.
+
+        Raises:
+            OSError / RuntimeError: If the file is missing or not audio
+        """
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] += 1
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        # Decode outside the lock; a concurrent first use may decode twice, keep one
+        data, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+        data.flags.writeable = False
+        buffer = AudioBuffer(data, int(sample_rate))
+        with self._lock:
+            self.decodes += 1
+            entry = self._entries.setdefault(key, [buffer, 0])
+            entry[1] += 1
+            self._entries.move_to_end(key)
+            self._trim()
+            return entry[0]
+
+    def release(self, path: str) -> None:
+        """Drop one reference; the decoded audio stays cached until evicted."""
+        real = os.path.realpath(path)
+        with self._lock:
+            for key, entry in self._entries.items():
+                if key[0] == real and entry[1] > 0:
+                    entry[1] -= 1
+            self._trim()
+
+    def evict(self, path: str) -> None:
+        """Forget every decoded version of a file (call before deleting it)."""
+        real = os.path.realpath(path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == real]:
+                del self._entries[key]
+
+    def _trim(self) -> None:
+        # Oldest unreferenced entries go first; referenced ones are in use
+        idle = [k for k, entry in self._entries.items() if entry[1] == 0]
+        for key in idle[:max(0, len(idle) - self.max_items)]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        """Return decode/hit counters and the number of cached files."""
+        with self._lock:
+            return {"decodes": self.decodes, "hits": self.hits, "entries": len(self._entries)}
+
+    def __contains__(self, path: str) -> bool:
+        real = os.path.realpath(path)
+        with self._lock:
+            return any(key[0] == real for key in self._entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_registry: Optional[BufferRegistry] = None
+_registry_lock = threading.Lock()
+_decode_cache: Optional[DecodeCache] = None
+_decode_cache_lock = threading.Lock()
+
+
+def get_buffer_registry() -> BufferRegistry:
+    """Return the process-wide buffer registry."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = BufferRegistry()
+    return _registry
+
+
+def get_decode_cache() -> DecodeCache:
+    """Return the process-wide decode cache."""
+    global _decode_cache
+    if _decode_cache is None:
+        with _decode_cache_lock:
+            if _decode_cache is None:
+                _decode_cache = DecodeCache()
+    return _decode_cache
@@ -29,11 +29,13 @@ SOFTWARE.
 Client audio push service for server mode. When CLIENT_SERVER_URL is
 configured, pushes TTS audio files to the client for playback instead of
 (or in addition to) playing locally. Handles HTTP file uploads gracefully
-with error handling.
+with error handling. In-process audio buffers are written to a WAV only
+here, where the audio leaves the process.
 
 --------------------------------------------------------------------------
 """
 
+import asyncio
 import logging
 import os
 import httpx
@@ -41,6 +43,8 @@ from typing import Optional
 from ..bus import Bus
 from ..contracts import TTSAudio
 from ..config import Config
+from ..http import get_http_clients
+from .buffers import get_buffer_registry
 
 logger = logging.getLogger("client_push")
 
@@ -85,11 +89,15 @@ class ClientAudioPush:
         
         try:
             audio_event = TTSAudio(**payload)
-            self.log.info("ClientPush: Parsed audio event: %s (%.2fs)", audio_event.wav_path, audio_event.duration_s)
+            self.log.info("ClientPush: Parsed audio event: %s (%.2fs)", audio_event.wav_path or audio_event.buffer_id, audio_event.duration_s)
         except Exception as e:
             self.log.warning("ClientPush: Malformed tts.audio event, skipping push: %s", e)
             return
         
+        if audio_event.buffer_id:
+            await self._push_buffer(audio_event)
+            return
+
         wav_path = audio_event.wav_path
         if not wav_path or not os.path.exists(wav_path):
             self.log.warning("ClientPush: Missing or invalid audio file, skipping push: %s", wav_path)
@@ -98,13 +106,37 @@ class ClientAudioPush:
         # Push to client asynchronously (don't block the pipeline)
         self.log.info("ClientPush: Starting push to client: %s", self.client_url)
         try:
-            await self._push_to_client(wav_path)
+            await self._push_to_client(wav_path, audio_event)
             self.log.info("ClientPush: Successfully pushed audio to client")
         except Exception as e:
             self.log.error("ClientPush: Failed to push audio to client: %s", e, exc_info=True)
             # Don't raise - graceful degradation
     
-    async def _push_to_client(self, wav_path: str):
+    async def _push_buffer(self, audio_event: TTSAudio):
+        """Write an in-process buffer to a WAV for the client, push it, and release both."""
+        registry = get_buffer_registry()
+        loop = asyncio.get_event_loop()
+        try:
+            wav_path = await loop.run_in_executor(None, registry.materialize, audio_event.buffer_id)
+        except KeyError:
+            self.log.warning("ClientPush: Unknown or released audio buffer, skipping push: %s", audio_event.buffer_id)
+            return
+        finally:
+            # Nothing plays this buffer locally; the file is all the client needs
+            registry.release(audio_event.buffer_id)
+        self.log.info("ClientPush: Starting push to client: %s", self.client_url)
+        try:
+            await self._push_to_client(wav_path, audio_event)
+            self.log.info("ClientPush: Successfully pushed audio to client")
+        except Exception as e:
+            self.log.error("ClientPush: Failed to push audio to client: %s", e, exc_info=True)
+        finally:
+            try:
+                os.remove(wav_path)
+            except OSError:
+                pass
+    
+    async def _push_to_client(self, wav_path: str, audio_event: Optional[TTSAudio] = None):
         """Push audio file to client's /api/audio/play endpoint."""
         api_url = f"{self.client_url.rstrip('/')}/api/audio/play"
         
@@ -113,19 +145,27 @@ class ClientAudioPush:
         self.log.info("ClientPush: File: %s (%d bytes)", wav_path, file_size)
         
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                with open(wav_path, "rb") as f:
-                    files = {"audio": (os.path.basename(wav_path), f, "audio/wav")}
-                    self.log.info("ClientPush: Sending HTTP POST request...")
-                    response = await client.post(api_url, files=files)
-                    self.log.info("ClientPush: Received HTTP response: %d", response.status_code)
-                    response.raise_for_status()
-                    
-                    result = response.json()
-                    self.log.info(
-                        "ClientPush: Client accepted audio (duration: %.2fs, status: %s)",
-                        result.get("duration_s", 0), result.get("status", "unknown")
-                    )
+            client = get_http_clients().get(api_url)
+            with open(wav_path, "rb") as f:
+                files = {"audio": (os.path.basename(wav_path), f, "audio/wav")}
+                # Keep trace and chunk order of streamed replies on the client
+                data = {}
+                if audio_event is not None:
+                    data = {
+                        "corr_id": audio_event.corr_id,
+                        "seq": str(audio_event.seq),
+                        "final": "true" if audio_event.final else "false",
+                    }
+                self.log.info("ClientPush: Sending HTTP POST request...")
+                response = await client.post(api_url, files=files, data=data, timeout=30.0)
+                self.log.info("ClientPush: Received HTTP response: %d", response.status_code)
+                response.raise_for_status()
+                
+                result = response.json()
+                self.log.info(
+                    "ClientPush: Client accepted audio (duration: %.2fs, status: %s)",
+                    result.get("duration_s", 0), result.get("status", "unknown")
+                )
         except httpx.TimeoutException:
             self.log.error("Timeout pushing audio to client after 30s")
             raise
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Playback Engine
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Low-latency playback engine. Keeps one sounddevice OutputStream open for the
+life of the process and feeds it from a queue of clips inside the audio
+callback, so replies start without opening a device, consecutive clips play
+back to back without gaps, playback can be cancelled mid-clip, and clip start
+and end times are reported on the stream's own clock.
+
+--------------------------------------------------------------------------
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Optional
+
+import numpy as np
+
+from .resample import resample
+
+logger = logging.getLogger("playback_engine")
+
+DEFAULT_SAMPLE_RATE = 48000  # TTS output rate
+DEFAULT_BLOCKSIZE = 1024     # frames per audio callback
+
+
+class Clip:
+    """
+    One queued clip. `started` and `done` are futures resolved from the
+    audio thread; `done` resolves to True when the clip played to the end
+    and False when it was cancelled.
+    """
+
+    def __init__(self, data: np.ndarray, tag: Any = None):
+        self.data = data
+        self.tag = tag
+        self.pos = 0
+        self.start_time: Optional[float] = None  # stream clock (DAC time)
+        self.end_time: Optional[float] = None
+        self.started: Future = Future()
+        self.done: Future = Future()
+
+    @property
+    def frames(self) -> int:
+        return len(self.data)
+
+    def _resolve(self, ok: bool) -> None:
+        if not self.started.done():
+            self.started.set_result(self.start_time)
+        if not self.done.done():
+            self.done.set_result(ok)
+
+
+class PlaybackEngine:
+    """
+    Long-lived output stream fed from a clip queue.
+
+    Usage:
+        engine = PlaybackEngine(device=3)
+        engine.start()
+        clip = engine.play(data, 22050)
+        await asyncio.wrap_future(clip.done)
+    """
+
+    def __init__(
+        self,
+        device: Optional[int] = None,
+        samplerate: int = DEFAULT_SAMPLE_RATE,
+        channels: int = 1,
+        blocksize: int = DEFAULT_BLOCKSIZE,
+        stream_factory: Optional[Callable[..., Any]] = None,
+    ):
+        """
+        Initialize playback engine.
+
+        Args:
+            device: Output device index (None = system default)
+            samplerate: Stream sample rate; clips are resampled to it
+            channels: Stream channel count; clips are up/down-mixed to it
+            blocksize: Frames per audio callback
+            stream_factory: Callable with sd.OutputStream's signature
+                            (defaults to sd.OutputStream)
+        """
+        self.device = device
+        self.samplerate = int(samplerate)
+        self.channels = int(channels)
+        self.blocksize = int(blocksize)
+        self._stream_factory = stream_factory
+        self._stream = None
+        self._queue: Deque[Clip] = deque()
+        self._lock = threading.Lock()
+        self.frames_played = 0
+        self.underruns = 0
+
+    def start(self) -> None:
+        """Open and start the output stream."""
+        if self._stream is not None:
+            return
+        factory = self._stream_factory
+        if factory is None:
+            import sounddevice as sd
+            factory = sd.OutputStream
+        self._stream = factory(
+            samplerate=self.samplerate,
+            channels=self.channels,
+            dtype="float32",
+            device=self.device,
+            blocksize=self.blocksize,
+            callback=self._callback,
+        )
+        self._stream.start()
+        logger.info("Playback engine: stream open (device=%s, %d Hz, %d ch, blocksize=%d)",
+                    self.device, self.samplerate, self.channels, self.blocksize)
+
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    def time(self) -> float:
+        """Current stream clock in seconds."""
+        if self._stream is not None:
+            try:
+                return float(self._stream.time)
+            except Exception:
+                pass
+        return self.frames_played / float(self.samplerate)
+
+    def play(self, data: np.ndarray, samplerate: int, tag: Any = None) -> Clip:
+        """
+        Queue audio behind anything already playing and return its Clip.
+
+        Args:
+            data: PCM as (frames,) or (frames, channels), float or int16
+            samplerate: Sample rate of data
+            tag: Opaque value kept on the clip (e.g. the tts.audio event)
+        """
+        return self.queue(self.prepare(data, samplerate), tag)
+
+    def queue(self, data: np.ndarray, tag: Any = None) -> Clip:
+        """Queue audio already converted by prepare() and return its Clip."""
+        clip = Clip(data, tag)
+        with self._lock:
+            self._queue.append(clip)
+        return clip
+
+    def cancel(self) -> int:
+        """Stop the current clip and drop everything queued. Returns clips cancelled."""
+        with self._lock:
+            clips = list(self._queue)
+            self._queue.clear()
+        for clip in clips:
+            clip._resolve(False)
+        return len(clips)
+
+    @property
+    def pending(self) -> int:
+        """Clips queued or playing."""
+        with self._lock:
+            return len(self._queue)
+
+    def close(self) -> None:
+        """Cancel queued clips and close the stream."""
+        self.cancel()
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return
+        try:
+            stream.stop()
+            stream.close()
+        except Exception as e:
+            logger.warning("Playback engine: error closing stream: %s", e)
+
+    def prepare(self, data: np.ndarray, samplerate: int) -> np.ndarray:
+        """
+        Convert to float32 (frames, channels) at the stream rate.
+
+        Thread-safe; callers on an event loop run it in an executor, since
+        resampling a long clip takes a while.
+        """
+        data = np.asarray(data)
+        if np.issubdtype(data.dtype, np.integer):
+            data = data.astype(np.float32) / float(np.iinfo(data.dtype).max)
+        if data.ndim == 1:
+            data = data[:, None]
+        if int(samplerate) != self.samplerate:
+            data = resample(data, int(samplerate), self.samplerate)
+        if data.shape[1] != self.channels:
+            mono = data.mean(axis=1, keepdims=True)
+            data = np.repeat(mono, self.channels, axis=1)
+        return np.ascontiguousarray(data, dtype=np.float32)
+
+    def _callback(self, outdata, frames: int, time_info, status) -> None:
+        """Audio-thread callback: copy queued clips into the device buffer back to back."""
+        if status:
+            self.underruns += 1
+        dac_time = getattr(time_info, "outputBufferDacTime", None)
+        if dac_time is None:
+            dac_time = self.frames_played / float(self.samplerate)
+
+        written = 0
+        finished = []
+        with self._lock:
+            while written < frames and self._queue:
+                clip = self._queue[0]
+                if clip.pos == 0 and clip.start_time is None:
+                    clip.start_time = dac_time + written / float(self.samplerate)
+                    if not clip.started.done():
+                        clip.started.set_result(clip.start_time)
+                n = min(frames - written, clip.frames - clip.pos)
+                outdata[written:written + n] = clip.data[clip.pos:clip.pos + n]
+                clip.pos += n
+                written += n
+                if clip.pos >= clip.frames:
+                    clip.end_time = dac_time + written / float(self.samplerate)
+                    self._queue.popleft()
+                    finished.append(clip)
+
+        if written < frames:
+            outdata[written:] = 0
+        self.frames_played += frames
+        for clip in finished:
+            clip._resolve(True)
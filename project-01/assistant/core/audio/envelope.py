@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Mouth Envelope
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Amplitude envelope of a clip for mouth animation. The whole clip is reduced
+to one value per hop in a single vectorized pass (RMS blended with peak),
+so animation can be driven from a small precomputed array instead of
+analyzing audio while it plays.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+
+DEFAULT_HOP_MS = 10
+PEAK_WEIGHT = 0.7  # effective level = max(rms, PEAK_WEIGHT * peak)
+
+
+def compute_envelope(data: np.ndarray, sample_rate: int, hop_ms: int = DEFAULT_HOP_MS) -> np.ndarray:
+    """
+    Compute a normalized [0..1] amplitude envelope, one value per hop.
+
+    Args:
+        data: PCM as (frames,) or (frames, channels), float in [-1, 1] or int16
+        sample_rate: Sample rate of data
+        hop_ms: Envelope resolution in milliseconds
+
+    Returns:
+        float32 array of length ceil(frames / hop)
+    """
+    data = np.asarray(data)
+    if np.issubdtype(data.dtype, np.integer):
+        data = data.astype(np.float32) / 32767.0
+    if data.ndim > 1:
+        data = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    data = data.astype(np.float32, copy=False)
+
+    hop = max(1, int(sample_rate * hop_ms / 1000))
+    n_frames = len(data)
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    n_hops = -(-n_frames // hop)
+
+    # Zero-pad the last partial hop; its RMS is taken over real samples only
+    padded = np.zeros(n_hops * hop, dtype=np.float32)
+    padded[:n_frames] = data
+    blocks = padded.reshape(n_hops, hop)
+    counts = np.full(n_hops, hop, dtype=np.float32)
+    counts[-1] = n_frames - (n_hops - 1) * hop
+
+    rms = np.sqrt(np.einsum("ij,ij->i", blocks, blocks) / counts)
+    peak = np.abs(blocks).max(axis=1)
+    return np.clip(np.maximum(rms, PEAK_WEIGHT * peak), 0.0, 1.0).astype(np.float32)
@@ -27,9 +27,10 @@ SOFTWARE.
 --------------------------------------------------------------------------
 
 Audio playback component for Fish Assistant. Listens for TTS audio events
-and plays WAV files through the system audio output. Emits playback start/end
-events for motor synchronization. Handles device selection and fallback
-gracefully.
+and plays in-process audio buffers (or WAV files) through the system audio
+output. Emits playback start/end events for motor synchronization. Handles device selection and fallback
+gracefully. By default clips are queued on a persistent PlaybackEngine
+stream; if that stream cannot be opened, each clip is played with sd.play.
 
 --------------------------------------------------------------------------
 """
@@ -42,8 +43,14 @@ try:
     import soundfile as sf
 except ImportError:
     sf = None
-from ..contracts import TTSAudio, PlaybackStart, PlaybackEnd, same_trace
+from ..config import Config
+from ..contracts import TTSAudio, PlaybackStart, PlaybackEnd, MouthEnvelope, same_trace
+from ..tracing import trace_span
+from .buffers import get_buffer_registry, get_decode_cache
 from .devices import get_default_output_index, list_output_devices
+from .engine import DEFAULT_SAMPLE_RATE, PlaybackEngine
+from .envelope import DEFAULT_HOP_MS, compute_envelope
+from .resample import resample
 from typing import Optional
 
 # Lazy import sounddevice to avoid initialization errors on systems without audio devices
@@ -64,27 +71,99 @@ except Exception as e:
     SD_AVAILABLE = False
     logging.getLogger("playback").warning("sounddevice not available: %s", e)
 
+def _clip_name(audio_event: TTSAudio) -> str:
+    """Human-readable clip reference for logs."""
+    return audio_event.wav_path or f"buffer {audio_event.buffer_id}"
+
+
 class Playback:
     """
     Listens on 'tts.audio' and emits 'audio.playback.start' and 'audio.playback.end'.
     Plays audio file and cleans it up after playback.
     """
 
-    def __init__(self, bus, output_device: Optional[int] = None):
+    def __init__(self, bus, output_device: Optional[int] = None, engine: Optional[PlaybackEngine] = None):
         self.bus = bus
         self.log = logging.getLogger("playback")
         self.output_device = output_device
         # Cache output device on first use
         self._cached_output_device = None
+        self.engine = engine
+        self._tasks: set = set()
 
     async def start(self):
         self.bus.subscribe("tts.audio", self._on_audio)
         self.log.info("Playback: Subscribed to tts.audio events")
+        if self.engine is None and Config.PLAYBACK_ENGINE and SD_AVAILABLE:
+            self.engine = self._open_engine()
+        elif self.engine is not None and not self.engine.running:
+            self.engine.start()
+
+    def _open_engine(self) -> Optional[PlaybackEngine]:
+        """Open the persistent output stream, or return None to fall back to sd.play."""
+        device = self._resolve_output_device()
+        rates = [DEFAULT_SAMPLE_RATE]
+        try:
+            device_sr = int(sd.query_devices(device, "output").get("default_samplerate", 0))
+            if device_sr and device_sr not in rates:
+                rates.append(device_sr)
+        except Exception:
+            pass
+        for rate in rates:
+            engine = PlaybackEngine(device=device, samplerate=rate)
+            try:
+                engine.start()
+                return engine
+            except Exception as e:
+                self.log.warning("Playback: Could not open output stream (device=%s, %d Hz): %s", device, rate, e)
+        self.log.warning("Playback: Falling back to per-clip sd.play()")
+        return None
+
+    def _resolve_output_device(self) -> Optional[int]:
+        """Pick the output device once: configured, system default, or first available."""
+        if self._cached_output_device is None:
+            if self.output_device is not None:
+                self._cached_output_device = self.output_device
+                self.log.info("Playback: Using configured output device: %d", self.output_device)
+            else:
+                # Try to find a valid output device
+                output_devices = list_output_devices()
+                if output_devices:
+                    self.log.info("Playback: Found %d output devices: %s", 
+                                len(output_devices), [(idx, name) for idx, name in output_devices])
+                    self._cached_output_device = get_default_output_index()
+                    if self._cached_output_device is None and output_devices:
+                        # Fallback to first available output device
+                        self._cached_output_device = output_devices[0][0]
+                        self.log.info("Playback: Using first available output device: %d (%s)", 
+                                    self._cached_output_device, output_devices[0][1])
+                    elif self._cached_output_device is not None:
+                        self.log.info("Playback: Using default output device: %d", self._cached_output_device)
+                else:
+                    self.log.warning("Playback: No output devices found, will try without specifying device")
+        return self._cached_output_device
+
+    def cancel(self) -> int:
+        """Stop the current reply immediately and drop queued clips."""
+        if self.engine is None:
+            if SD_AVAILABLE:
+                sd.stop()
+            return 0
+        return self.engine.cancel()
+
+    async def stop(self):
+        """Cancel playback and close the output stream."""
+        self.log.info("stopping Playback component")
+        self.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.engine is not None:
+            self.engine.close()
 
     async def _on_audio(self, payload: dict):
         self.log.info("Playback: Received tts.audio event (payload keys: %s)", list(payload.keys()) if isinstance(payload, dict) else "not a dict")
         
-        if not SD_AVAILABLE:
+        if not SD_AVAILABLE and self.engine is None:
             self.log.error("Playback: sounddevice not available, cannot play audio.")
             return
         
@@ -96,53 +175,39 @@ class Playback:
         
         try:
             audio_event = TTSAudio(**payload)
-            self.log.info("Playback: Parsed audio event: %s (%.2fs)", audio_event.wav_path, audio_event.duration_s)
+            self.log.info("Playback: Parsed audio event: %s (%.2fs)", _clip_name(audio_event), audio_event.duration_s)
         except Exception:
             self.log.warning("Playback: malformed tts.audio event, skipping")
             return
 
         path = audio_event.wav_path
-        if not path or not os.path.exists(path):
+        if audio_event.buffer_id:
+            if get_buffer_registry().get(audio_event.buffer_id) is None:
+                self.log.warning("Playback: unknown or released audio buffer: %s", audio_event.buffer_id)
+                return
+        elif not path or not os.path.exists(path):
             self.log.warning("Playback: missing or invalid path: %s", path)
             return
+
+        if self.engine is not None:
+            await self._enqueue(audio_event)
+            return
         
         try:
-            # Gather info
-            size_bytes = os.path.getsize(path)
-            info = sf.info(path)
-            duration = info.frames / float(info.samplerate) if info.samplerate else 0.0
-            self.log.info("Playback: Starting playback: %s (%.2fs, %d bytes, %d Hz, %d ch)", 
-                          path, duration, size_bytes, info.samplerate, info.channels)
-            
+            # Read audio data and announce its mouth envelope before it plays
+            data, sr = self._load(audio_event)
+            self.log.info("Playback: Starting playback: %s (%.2fs, %d Hz, %d ch)",
+                          _clip_name(audio_event), len(data) / float(sr) if sr else 0.0, sr, data.shape[1])
+            await self._publish_envelope(audio_event, data, sr)
+
             # Emit playback start
-            start_event = PlaybackStart(wav_path=path)
+            start_event = PlaybackStart(wav_path=path, seq=audio_event.seq, final=audio_event.final,
+                                        buffer_id=audio_event.buffer_id)
             same_trace(audio_event, start_event)
             await self.bus.publish(start_event.topic, start_event.dict())
-            
-            # Read audio data (non-blocking)
-            data, sr = sf.read(path, dtype="float32", always_2d=True)
 
             # Get output device (cache on first use)
-            if self._cached_output_device is None:
-                if self.output_device is not None:
-                    self._cached_output_device = self.output_device
-                    self.log.info("Playback: Using configured output device: %d", self.output_device)
-                else:
-                    # Try to find a valid output device
-                    output_devices = list_output_devices()
-                    if output_devices:
-                        self.log.info("Playback: Found %d output devices: %s", 
-                                    len(output_devices), [(idx, name) for idx, name in output_devices])
-                        self._cached_output_device = get_default_output_index()
-                        if self._cached_output_device is None and output_devices:
-                            # Fallback to first available output device
-                            self._cached_output_device = output_devices[0][0]
-                            self.log.info("Playback: Using first available output device: %d (%s)", 
-                                        self._cached_output_device, output_devices[0][1])
-                        elif self._cached_output_device is not None:
-                            self.log.info("Playback: Using default output device: %d", self._cached_output_device)
-                    else:
-                        self.log.warning("Playback: No output devices found, will try without specifying device")
+            self._resolve_output_device()
             
             # Non-blocking play start
             self.log.info("Playback: Starting audio device playback (data shape: %s, sample rate: %d Hz, device: %s)...", 
@@ -159,7 +224,7 @@ class Playback:
                 if idx not in devices_to_try:
                     devices_to_try.append(idx)
             
-            # Try playing with current sample rate
+            # Try playing with current sample rate, then at the device's own rate
             for device_idx in devices_to_try:
                 try:
                     self.log.info("Playback: Trying device %d at %d Hz...", device_idx, sr)
@@ -169,7 +234,9 @@ class Playback:
                     break
                 except Exception as e:
                     self.log.warning("Playback: Failed to play with device %d: %s", device_idx, e)
-                    continue
+                if self._play_resampled(data, sr, device_idx):
+                    play_success = True
+                    break
             
             if not play_success:
                 # Last resort: try without specifying device
@@ -192,25 +259,126 @@ class Playback:
             self.log.info("Playback: Audio playback finished")
 
             # Emit playback end
-            end_event = PlaybackEnd(wav_path=path, ok=True)
+            end_event = PlaybackEnd(wav_path=path, ok=True, seq=audio_event.seq, final=audio_event.final,
+                                    buffer_id=audio_event.buffer_id)
             same_trace(audio_event, end_event)
             await self.bus.publish(end_event.topic, end_event.dict())
             self.log.info("Playback: Published playback.end event")
 
         except Exception as e:
-            self.log.exception("failed to play %s", path)
+            self.log.exception("failed to play %s", _clip_name(audio_event))
             # Emit error end event
-            end_event = PlaybackEnd(wav_path=path, ok=False)
+            end_event = PlaybackEnd(wav_path=path, ok=False, seq=audio_event.seq, final=audio_event.final,
+                                    buffer_id=audio_event.buffer_id)
             same_trace(audio_event, end_event)
             await self.bus.publish(end_event.topic, end_event.dict())
+            self._release(audio_event)
             return
         
         # Cleanup in worker thread (Python 3.7 compatible)
         loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self._safe_cleanup, path) 
+        await loop.run_in_executor(None, self._release, audio_event)
+
+    def _load(self, audio_event: TTSAudio):
+        """Return (float32 frames x channels, sample_rate) for the event's buffer or file."""
+        if audio_event.buffer_id:
+            buffer = get_buffer_registry().get(audio_event.buffer_id)
+            if buffer is None:
+                raise KeyError(f"audio buffer not found: {audio_event.buffer_id}")
+            return buffer.as_float32(), buffer.sample_rate
+        buffer = get_decode_cache().acquire(audio_event.wav_path)
+        return buffer.pcm, buffer.sample_rate
+
+    def _release(self, audio_event: TTSAudio):
+        """Drop the clip's buffer, or delete its file, once it has been played."""
+        if audio_event.buffer_id:
+            get_buffer_registry().release(audio_event.buffer_id)
+        elif audio_event.wav_path:
+            get_decode_cache().release(audio_event.wav_path)
+            self._safe_cleanup(audio_event.wav_path)
+
+    def _prepare_clip(self, audio_event: TTSAudio):
+        """Load the event's audio and convert it for the engine: (data, sr, prepared)."""
+        data, sr = self._load(audio_event)
+        return data, sr, self.engine.prepare(data, sr)
+
+    async def _enqueue(self, audio_event: TTSAudio):
+        """Queue a clip on the engine and track it without blocking the bus."""
+        path = audio_event.wav_path
+        loop = asyncio.get_event_loop()
+        try:
+            # Decoding, resampling and format conversion stay off the loop
+            data, sr, prepared = await loop.run_in_executor(None, self._prepare_clip, audio_event)
+            await self._publish_envelope(audio_event, data, sr)
+            clip = self.engine.queue(prepared, tag=audio_event)
+        except Exception:
+            self.log.exception("failed to queue %s", _clip_name(audio_event))
+            end_event = PlaybackEnd(wav_path=path, ok=False, seq=audio_event.seq, final=audio_event.final,
+                                    buffer_id=audio_event.buffer_id)
+            same_trace(audio_event, end_event)
+            await self.bus.publish(end_event.topic, end_event.dict())
+            self._release(audio_event)
+            return
+
+        self.log.info("Playback: Queued %s (%d frames, %d pending)", _clip_name(audio_event), clip.frames, self.engine.pending)
+        task = asyncio.ensure_future(self._track(clip, audio_event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _publish_envelope(self, audio_event: TTSAudio, data, sr: int):
+        """Publish the clip's amplitude envelope so animation needs no audio analysis."""
+        env = compute_envelope(data, sr, DEFAULT_HOP_MS)
+        envelope_event = MouthEnvelope(env=env.round(4).tolist(), hop_ms=DEFAULT_HOP_MS,
+                                       wav_path=audio_event.wav_path or None, buffer_id=audio_event.buffer_id)
+        same_trace(audio_event, envelope_event)
+        await self.bus.publish(envelope_event.topic, envelope_event.dict())
+
+    async def _track(self, clip, audio_event: TTSAudio):
+        """Publish start/end events on the engine's clock and release the clip's audio."""
+        path = audio_event.wav_path
+        with trace_span("playback.start_latency", audio_event.corr_id):
+            # Clips queued ahead of this one, plus opening the device for the first
+            await asyncio.wrap_future(clip.started)
+        start_event = PlaybackStart(wav_path=path, seq=audio_event.seq, final=audio_event.final,
+                                    buffer_id=audio_event.buffer_id)
+        same_trace(audio_event, start_event)
+        await self.bus.publish(start_event.topic, start_event.dict())
+
+        ok = await asyncio.wrap_future(clip.done)
+        if ok and clip.end_time is not None:
+            # The last block was handed to the device; wait until it is actually heard
+            lag = clip.end_time - self.engine.time()
+            if 0 < lag < 1.0:
+                await asyncio.sleep(lag)
+        self.log.info("Playback: %s %s", "Finished" if ok else "Cancelled", _clip_name(audio_event))
+
+        end_event = PlaybackEnd(wav_path=path, ok=ok, seq=audio_event.seq, final=audio_event.final,
+                                buffer_id=audio_event.buffer_id)
+        same_trace(audio_event, end_event)
+        await self.bus.publish(end_event.topic, end_event.dict())
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self._release, audio_event)
+
+    def _play_resampled(self, data, sr: int, device_idx: int) -> bool:
+        """Retry a device that rejected the file's rate at its default rate."""
+        try:
+            device_sr = int(sd.query_devices(device_idx).get("default_samplerate", 0))
+        except Exception:
+            return False
+        if not device_sr or device_sr == sr:
+            return False
+        try:
+            self.log.info("Playback: Resampling %d Hz -> %d Hz for device %d", sr, device_sr, device_idx)
+            sd.play(resample(data, sr, device_sr), device_sr, device=device_idx)
+            return True
+        except Exception as e:
+            self.log.warning("Playback: Failed to play with device %d at %d Hz: %s", device_idx, device_sr, e)
+            return False
 
     # Cleanup logic
     def _safe_cleanup(self, path):
+        get_decode_cache().evict(path)
         try:
             os.remove(path)
             self.log.debug("cleaned up: %s", path)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Audio Resampler
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+In-process polyphase resampler built on NumPy. Converts audio between
+sample rates with a Kaiser-windowed sinc low-pass filter, without spawning
+sox/ffmpeg or writing intermediate files. Filter taps are computed once per
+(src_rate, dst_rate) pair and cached.
+
+--------------------------------------------------------------------------
+"""
+
+from functools import lru_cache
+from math import gcd
+from typing import Tuple
+
+import numpy as np
+
+# Filter design parameters
+ZERO_CROSSINGS = 16   # sinc half-width in zero crossings (quality vs. cost)
+ROLLOFF = 0.945       # cutoff as a fraction of the lower Nyquist frequency
+KAISER_BETA = 8.6     # stopband attenuation ~ 85 dB
+
+# Output samples computed per vectorized block (bounds temporary memory)
+BLOCK_SIZE = 8192
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(src_rate: int, dst_rate: int) -> Tuple[int, int, int, np.ndarray]:
+    """
+    Design the polyphase filter bank for a rate pair.
+
+    Returns:
+        (up, down, delay, taps) where taps has shape (up, taps_per_phase)
+    """
+    g = gcd(src_rate, dst_rate)
+    up, down = dst_rate // g, src_rate // g
+    ratio = max(up, down)
+
+    taps_per_phase = int(np.ceil(2 * ZERO_CROSSINGS * ratio / (ROLLOFF * up)))
+    length = taps_per_phase * up
+    center = length // 2
+
+    n = np.arange(length) - center
+    cutoff = ROLLOFF / ratio  # in cycles per upsampled sample (x2)
+    h = up * cutoff * np.sinc(cutoff * n)
+
+    # Kaiser window centred on the same sample as the sinc
+    half = length / 2.0
+    arg = np.clip(1.0 - (n / half) ** 2, 0.0, 1.0)
+    h *= np.i0(KAISER_BETA * np.sqrt(arg)) / np.i0(KAISER_BETA)
+
+    # Row p holds taps p, p + up, p + 2*up, ... for output phase p
+    bank = h.reshape(taps_per_phase, up).T.astype(np.float32)
+    bank.setflags(write=False)
+    return up, down, center, bank
+
+
+def resample(data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    Resample audio to a new sample rate.
+
+    Args:
+        data: Audio samples, shape (frames,) or (frames, channels)
+        src_rate: Input sample rate (Hz)
+        dst_rate: Output sample rate (Hz)
+
+    Returns:
+        float32 array with the same number of dimensions (values keep the
+        input's scale, e.g. int16 input yields floats in the int16 range)
+    """
+    src_rate, dst_rate = int(src_rate), int(dst_rate)
+    if src_rate <= 0 or dst_rate <= 0:
+        raise ValueError(f"sample rates must be positive, got {src_rate} -> {dst_rate}")
+
+    x = np.asarray(data, dtype=np.float32)
+    if src_rate == dst_rate or len(x) == 0:
+        return x.copy()
+
+    up, down, delay, bank = _polyphase_filter(src_rate, dst_rate)
+    taps_per_phase = bank.shape[1]
+
+    mono = x.ndim == 1
+    if mono:
+        x = x[:, None]
+
+    n_in = x.shape[0]
+    n_out = int(np.ceil(n_in * up / down))
+
+    # Zero-pad so every tap index stays in range
+    pad = taps_per_phase + 1
+    xpad = np.zeros((n_in + 2 * pad, x.shape[1]), dtype=np.float32)
+    xpad[pad:pad + n_in] = x
+
+    out = np.empty((n_out, x.shape[1]), dtype=np.float32)
+    j = np.arange(taps_per_phase)
+    for start in range(0, n_out, BLOCK_SIZE):
+        m = np.arange(start, min(start + BLOCK_SIZE, n_out))
+        pos = m * down + delay
+        phase = pos % up
+        base = pos // up
+        idx = base[:, None] - j[None, :] + pad
+        # (block, taps) x (block, taps, channels) -> (block, channels)
+        out[start:start + len(m)] = np.einsum("bt,btc->bc", bank[phase], xpad[idx])
+
+    return out[:, 0] if mono else out
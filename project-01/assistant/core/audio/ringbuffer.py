@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Audio Ring Buffer
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Fixed-capacity ring buffer for mono PCM. Every sample is stored twice, at
+i and i + capacity, so any window of up to `capacity` samples is one
+contiguous slice: VAD frames and whole utterances are read as zero-copy
+views, and memory stays constant however long the fish listens.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Single-writer ring buffer addressed by absolute sample positions.
+
+    The audio callback calls write(); readers take views by position. A view
+    stays valid until `capacity` more samples have been written.
+
+    Usage:
+        ring = AudioRingBuffer(capacity=16000 * 30)
+        ring.write(block)                   # audio thread
+        frame = ring.view(pos, pos + 480)   # event loop, zero-copy
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Number of samples retained
+            dtype: Sample dtype
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self._buf = np.zeros(2 * self.capacity, dtype=dtype)
+        self.written = 0  # total samples ever written (absolute write position)
+
+    @property
+    def oldest(self) -> int:
+        """Absolute position of the oldest sample still held."""
+        return max(0, self.written - self.capacity)
+
+    def write(self, data: np.ndarray) -> int:
+        """Append samples (1-D) in place and return the new write position."""
+        data = np.asarray(data).reshape(-1)
+        n = len(data)
+        if n == 0:
+            return self.written
+        skipped = 0
+        if n > self.capacity:
+            skipped = n - self.capacity
+            data = data[skipped:]
+            n = self.capacity
+
+        cap = self.capacity
+        i = (self.written + skipped) % cap
+        first = min(n, cap - i)
+        buf = self._buf
+        buf[i:i + first] = data[:first]
+        buf[i + cap:i + cap + first] = data[:first]
+        if first < n:
+            rest = n - first
+            buf[:rest] = data[first:]
+            buf[cap:cap + rest] = data[first:]
+
+        # Publish the new position only after the samples are in place
+        self.written += skipped + n
+        return self.written
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """Return a read-only view of samples [start, end) by absolute position."""
+        if start < self.oldest or end > self.written or start > end:
+            raise IndexError(f"window [{start}, {end}) outside buffer [{self.oldest}, {self.written})")
+        i = start % self.capacity
+        out = self._buf[i:i + (end - start)]
+        out.flags.writeable = False
+        return out
+
+    def latest(self, n: int) -> np.ndarray:
+        """Return a view of the most recent n samples (fewer if not yet written)."""
+        end = self.written
+        return self.view(max(self.oldest, end - int(n)), end)
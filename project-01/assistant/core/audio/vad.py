@@ -26,17 +26,30 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 --------------------------------------------------------------------------
 
-Voice Activity Detection (VAD) wrapper using webrtcvad. Detects speech in
-audio chunks to enable hands-free conversation. Requires 10ms, 20ms, or
-30ms frames at 8kHz or 16kHz sample rate with 16-bit PCM mono audio.
+Voice Activity Detection (VAD) backends. Detects speech in audio chunks to
+enable hands-free conversation. Two backends share one interface:
+WebRTCVAD wraps the webrtcvad C extension (10/20/30ms frames at 8kHz or
+16kHz, 16-bit PCM mono), and NumpyVAD is a pure-NumPy detector for boards
+where webrtcvad is not installed. Whole blocks are classified at once with
+process(): frames are cut with one reshape, and frames whose energy is
+below an adaptive noise floor are marked silent without further analysis.
 
 --------------------------------------------------------------------------
 """
 
 import logging
-import webrtcvad
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Optional
+
 import numpy as np
-from typing import Literal
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    webrtcvad = None
+    WEBRTCVAD_AVAILABLE = False
 
 # Audio constants from recorder.py
 SR = 16_000  # sample rate (Hz) - matches recorder
@@ -47,33 +60,72 @@ DTYPE = "int16"  # 16-bit PCM
 FRAME_MS = 30  # 30ms frames (good balance of latency and accuracy)
 FRAME_SIZE = int(SR * FRAME_MS / 1000)  # samples per frame (480 samples for 30ms at 16kHz)
 
+# Energy gate for process(): frames below max(MIN_GATE_ENERGY, floor * GATE_RATIO) skip classification
+MIN_GATE_ENERGY = 40.0 ** 2  # mean-square of int16 samples (~-58 dBFS)
+GATE_RATIO = 3.0             # ~5 dB above the tracked noise floor
+FLOOR_ADAPT = 0.05           # noise floor rise rate per block (falls immediately)
+
+# NumpyVAD features: speech band, and per-aggressiveness (flatness max, band ratio min, ZCR max)
+SPEECH_BAND_HZ = (250.0, 3500.0)
+NUMPY_THRESHOLDS = {
+    0: (0.55, 0.45, 0.45),
+    1: (0.45, 0.55, 0.40),
+    2: (0.35, 0.65, 0.35),
+    3: (0.25, 0.75, 0.30),
+}
+HANGOVER_FRAMES = 8  # frames kept as speech after the last detected one (~240ms)
+
+VAD_BACKENDS = ("auto", "webrtc", "numpy")
 
-class VAD:
+
+def frame_energy(audio: np.ndarray, frame_size: int = FRAME_SIZE):
     """
-    Voice Activity Detection wrapper around webrtcvad.
+    Split audio into whole frames and compute per-frame mean-square energy.
     
-    Aggressiveness levels:
+    Returns:
+        (frames, energy): a (n, frame_size) view of the audio (no copy for
+        contiguous input; trailing partial frame dropped) and float64 energies
+    """
+    audio = np.asarray(audio).reshape(-1)
+    n = len(audio) // frame_size
+    frames = audio[:n * frame_size].reshape(n, frame_size)
+    energy = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / float(frame_size)
+    return frames, energy
+
+
+class VADBackend:
+    """
+    Common interface for VAD backends.
+    
+    Subclasses implement _classify(), which labels the frames that passed
+    the energy gate. Aggressiveness levels:
     - 0: Least aggressive (fewer false positives, may miss some speech)
     - 1: Moderate
-    - 2: Most aggressive (more false positives, catches more speech)
+    - 2: More aggressive
+    - 3: Most aggressive (rejects the most non-speech)
     """
 
-    def __init__(self, aggressiveness: Literal[0, 1, 2] = 2, sample_rate: int = SR):
+    name = "base"
+
+    def __init__(self, aggressiveness: Literal[0, 1, 2, 3] = 2, sample_rate: int = SR):
         """
         Initialize VAD.
         
         Args:
-            aggressiveness: VAD aggressiveness mode (0-2)
+            aggressiveness: VAD aggressiveness mode (0-3)
             sample_rate: Audio sample rate (must be 8000 or 16000)
         """
         if sample_rate not in (8000, 16000):
-            raise ValueError(f"webrtcvad only supports 8kHz or 16kHz, got {sample_rate}")
-        
-        self.vad = webrtcvad.Vad(aggressiveness)
+            raise ValueError(f"VAD only supports 8kHz or 16kHz, got {sample_rate}")
+        self.aggressiveness = int(aggressiveness)
         self.sample_rate = sample_rate
         self.frame_size = int(sample_rate * FRAME_MS / 1000)
         self.log = logging.getLogger("vad")
-        
+        # Mean-square energy of background noise; starts where the gate equals MIN_GATE_ENERGY
+        self.noise_floor: float = MIN_GATE_ENERGY / GATE_RATIO
+        self.frames_gated = 0   # frames rejected by the energy gate
+        self.frames_checked = 0  # frames passed to the classifier
+
     def is_speech(self, audio_chunk: np.ndarray) -> bool:
         """
         Check if an audio chunk contains speech.
@@ -90,14 +142,213 @@ class VAD:
                 f"Audio chunk must be exactly {self.frame_size} samples "
                 f"({FRAME_MS}ms at {self.sample_rate}Hz), got {len(audio_chunk)}"
             )
-        
-        # Convert to bytes (int16 = 2 bytes per sample)
-        audio_bytes = audio_chunk.tobytes()
-        
+        frames = np.asarray(audio_chunk).reshape(1, -1)
         try:
-            return self.vad.is_speech(audio_bytes, self.sample_rate)
+            return bool(self._classify(frames)[0])
         except Exception as e:
             self.log.warning("VAD error: %s", e)
             return False
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Classify every whole frame in a block of audio.
+        
+        Frames quieter than the adaptive noise gate are marked silent without
+        being classified; the rest go to the backend. The noise floor
+        follows the energy of non-speech frames.
+        
+        Args:
+            audio: Audio data as numpy array (int16, mono), any length
+        
+        Returns:
+            Boolean array with one entry per whole frame (True = speech)
+        """
+        frames, energy = frame_energy(audio, self.frame_size)
+        result = np.zeros(len(frames), dtype=bool)
+        if len(frames) == 0:
+            return result
+
+        gate = max(MIN_GATE_ENERGY, self.noise_floor * GATE_RATIO)
+        loud = np.flatnonzero(energy >= gate)
+        self.frames_gated += len(frames) - len(loud)
+        self.frames_checked += len(loud)
+
+        if len(loud):
+            try:
+                result[loud] = self._classify(frames[loud])
+            except Exception as e:
+                self.log.warning("VAD error: %s", e)
+
+        # Track the floor: drop immediately to quieter background, rise slowly
+        quiet = energy[~result]
+        if len(quiet):
+            level = float(quiet.mean())
+            if level < self.noise_floor:
+                self.noise_floor = level
+            else:
+                self.noise_floor += FLOOR_ADAPT * (level - self.noise_floor)
+        return self._smooth(result)
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        """Label (n, frame_size) int16 frames; returns n booleans."""
+        raise NotImplementedError
+
+    def _smooth(self, flags: np.ndarray) -> np.ndarray:
+        """Post-process a block's decisions (backends may keep state across blocks)."""
+        return flags
+
+
+class WebRTCVAD(VADBackend):
+    """Voice Activity Detection wrapper around webrtcvad."""
+
+    name = "webrtc"
+
+    def __init__(self, aggressiveness: Literal[0, 1, 2, 3] = 2, sample_rate: int = SR):
+        if not WEBRTCVAD_AVAILABLE:
+            raise ImportError("webrtcvad is not installed (pip install webrtcvad, or use VAD_BACKEND=numpy)")
+        super().__init__(aggressiveness, sample_rate)
+        self.vad = webrtcvad.Vad(self.aggressiveness)
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        # webrtcvad takes one frame of 16-bit PCM bytes per call
+        frames = frames.astype(np.int16, copy=False)
+        return np.fromiter(
+            (self.vad.is_speech(frame.tobytes(), self.sample_rate) for frame in frames),
+            dtype=bool, count=len(frames),
+        )
+
+
+# Backwards-compatible name for the webrtcvad backend
+VAD = WebRTCVAD
+
+
+class NumpyVAD(VADBackend):
+    """
+    Pure-NumPy VAD using per-frame spectral features.
+    
+    A frame that passed the energy gate counts as speech when its spectrum
+    is peaky (low spectral flatness) or concentrated in the speech band,
+    and its zero-crossing rate is below the noise-like range. Decisions are
+    held for HANGOVER_FRAMES frames after the last speech frame so word
+    gaps do not split an utterance.
+    """
+
+    name = "numpy"
+
+    def __init__(self, aggressiveness: Literal[0, 1, 2, 3] = 2, sample_rate: int = SR, hangover: int = HANGOVER_FRAMES):
+        super().__init__(aggressiveness, sample_rate)
+        self.flatness_max, self.band_ratio_min, self.zcr_max = NUMPY_THRESHOLDS[min(3, max(0, self.aggressiveness))]
+        self.hangover = int(hangover)
+        self._hang = 0  # hangover frames left from the previous block
+        self._window = np.hanning(self.frame_size).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.frame_size, 1.0 / sample_rate)
+        self._band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+        self._dc = freqs < 80.0
+
+    def features(self, frames: np.ndarray):
+        """Return (spectral flatness, speech-band energy ratio, zero-crossing rate) per frame."""
+        x = frames.astype(np.float32)
+        power = np.abs(np.fft.rfft(x * self._window, axis=1)) ** 2 + 1e-10
+        band = power[:, self._band]
+        flatness = np.exp(np.log(band).mean(axis=1)) / band.mean(axis=1)
+        total = power[:, ~self._dc].sum(axis=1)
+        band_ratio = band.sum(axis=1) / total
+        signs = np.signbit(x)
+        zcr = (signs[:, 1:] != signs[:, :-1]).mean(axis=1)
+        return flatness, band_ratio, zcr
+
+    def _classify(self, frames: np.ndarray) -> np.ndarray:
+        flatness, band_ratio, zcr = self.features(frames)
+        return ((flatness < self.flatness_max) | (band_ratio > self.band_ratio_min)) & (zcr < self.zcr_max)
+
+    def _smooth(self, flags: np.ndarray) -> np.ndarray:
+        out = flags.copy()
+        hang = self._hang
+        for i, speech in enumerate(flags):
+            if speech:
+                hang = self.hangover
+            elif hang > 0:
+                out[i] = True
+                hang -= 1
+        self._hang = hang
+        return out
+
+
+def create_vad(backend: Optional[str] = None, aggressiveness: int = 2, sample_rate: int = SR) -> VADBackend:
+    """
+    Create a VAD backend.
     
+    Args:
+        backend: "webrtc", "numpy" or "auto" (webrtc if installed, else numpy).
+                 Defaults to Config.VAD_BACKEND.
+        aggressiveness: VAD aggressiveness mode (0-3)
+        sample_rate: Audio sample rate (8000 or 16000)
+    """
+    if backend is None:
+        from assistant.core.config import Config
+        backend = Config.VAD_BACKEND
+    backend = (backend or "auto").lower()
+    if backend not in VAD_BACKENDS:
+        raise ValueError(f"Unknown VAD backend {backend!r}; expected one of {VAD_BACKENDS}")
+    if backend == "auto":
+        backend = "webrtc" if WEBRTCVAD_AVAILABLE else "numpy"
+    if backend == "webrtc":
+        return WebRTCVAD(aggressiveness, sample_rate)
+    return NumpyVAD(aggressiveness, sample_rate)
+
+
+def bench_vad(paths: Iterable[Path], backends: Iterable[str] = ("webrtc", "numpy"), aggressiveness: int = 2) -> Dict[str, dict]:
+    """
+    Benchmark VAD backends on a corpus of 16 kHz mono WAV files.
+    
+    Each backend processes every file in BLOCK-sized pieces, as the
+    conversation loop does. Reports throughput in frames/sec, the share of
+    frames labelled speech, and agreement with the first backend.
+    
+    Args:
+        paths: WAV files (other sample rates are skipped)
+        backends: Backend names to compare (unavailable ones are skipped)
+        aggressiveness: VAD aggressiveness mode for every backend
+    
+    Returns:
+        Dict of backend name -> {"frames", "seconds", "frames_per_s", "speech_ratio", "agreement"}
+    """
+    import soundfile as sf
+
+    corpus: List[np.ndarray] = []
+    for path in paths:
+        data, sr = sf.read(str(path), dtype="int16", always_2d=True)
+        if sr != SR:
+            logging.getLogger("vad").warning("Skipping %s: %d Hz (need %d Hz)", path, sr, SR)
+            continue
+        corpus.append(np.ascontiguousarray(data[:, 0]))
+
+    block = FRAME_SIZE * 2
+    results: Dict[str, dict] = {}
+    labels: Dict[str, np.ndarray] = {}
+    for name in backends:
+        try:
+            vad = create_vad(name, aggressiveness)
+        except ImportError as e:
+            logging.getLogger("vad").warning("Skipping %s backend: %s", name, e)
+            continue
+        flags = []
+        start = time.perf_counter()
+        for audio in corpus:
+            for i in range(0, len(audio) - block + 1, block):
+                flags.append(vad.process(audio[i:i + block]))
+        elapsed = time.perf_counter() - start
+        flags = np.concatenate(flags) if flags else np.zeros(0, dtype=bool)
+        labels[name] = flags
+        results[name] = {
+            "frames": int(len(flags)),
+            "seconds": elapsed,
+            "frames_per_s": len(flags) / elapsed if elapsed > 0 else 0.0,
+            "speech_ratio": float(flags.mean()) if len(flags) else 0.0,
+        }
 
+    if labels:
+        reference = labels[next(iter(labels))]
+        for name, flags in labels.items():
+            results[name]["agreement"] = float((flags == reference).mean()) if len(flags) else 1.0
+    return results
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Bus Bridge
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Bridges selected bus topics between the server and client processes over one
+persistent WebSocket (/ws/bus), so both sides behave like a single bus.
+Events are sent as compact binary frames; audio events (tts.audio,
+audio.recorded) carry their PCM in the same frame and arrive as in-process
+buffers on the other side. Events of a turn (corr_id) that arrived from a
+peer are sent back to that peer only. Each side sends a heartbeat and drops
+a silent connection; the client reconnects with backoff and flushes recent
+non-audio events queued while it was disconnected. Audio is encoded and
+decoded in an executor, off the event loop.
+
+Frame layout (big-endian):
+    kind:u8 | header_len:u32 | header (event payload, UTF-8 JSON)
+    [ | sample_rate:u32 | channels:u16 | int16 PCM ]   audio events only
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import numpy as np
+
+from assistant.core.audio.buffers import get_buffer_registry
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    websockets = None
+    WEBSOCKETS_AVAILABLE = False
+
+logger = logging.getLogger("bridge")
+
+BRIDGE_PATH = "/ws/bus"
+
+# Default outbound topics per side
+SERVER_TOPICS = ("tts.audio", "stt.transcript", "ux.state", "anim.mouth.envelope")
+CLIENT_TOPICS = ("audio.recorded", "audio.playback.start", "audio.playback.end")
+AUDIO_TOPICS = ("tts.audio", "audio.recorded")  # events whose buffer travels with them
+
+FRAME_EVENT = 1
+FRAME_PING = 2
+_HEADER = struct.Struct("!BI")
+_PCM = struct.Struct("!IH")
+
+HEARTBEAT_S = 10.0  # ping interval; a peer silent for 3 intervals is dropped
+QUEUE_SIZE = 64     # frames queued per peer (and while disconnected) before dropping the oldest
+BACKLOG_TTL_S = 5.0  # events queued while disconnected are dropped after this
+RECONNECT_MAX_S = 10.0
+
+
+def encode_frame(payload: dict) -> bytes:
+    """
+    Encode an event as a frame, attaching the audio of audio events.
+    
+    The local buffer is released: audio is handed off to the peer.
+    """
+    body = b""
+    if payload.get("topic") in AUDIO_TOPICS:
+        payload = dict(payload)
+        body = _take_audio(payload)
+    header = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(FRAME_EVENT, len(header)) + header + body
+
+
+def _has_audio(frame: bytes) -> bool:
+    """True if the frame carries PCM after its header."""
+    kind, header_len = _HEADER.unpack_from(frame)
+    return kind == FRAME_EVENT and len(frame) > _HEADER.size + header_len
+
+
+def decode_frame(frame: bytes) -> Tuple[int, Optional[dict]]:
+    """
+    Decode a frame into (kind, payload).
+    
+    Attached audio is put in the local buffer registry and referenced by
+    the payload's buffer_id.
+    """
+    kind, header_len = _HEADER.unpack_from(frame)
+    if kind != FRAME_EVENT:
+        return kind, None
+    start = _HEADER.size
+    payload = json.loads(frame[start:start + header_len].decode("utf-8"))
+    body = memoryview(frame)[start + header_len:]
+    if len(body) >= _PCM.size:
+        sample_rate, channels = _PCM.unpack_from(body)
+        pcm = np.frombuffer(body[_PCM.size:], dtype=">i2").astype(np.int16)
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels)
+        payload["buffer_id"] = get_buffer_registry().put(pcm, sample_rate)
+        payload["wav_path"] = ""
+    return kind, payload
+
+
+def _take_audio(payload: dict) -> bytes:
+    """Move an audio event's PCM out of the local registry (or its WAV) into a frame body."""
+    registry = get_buffer_registry()
+    buffer = registry.get(payload.get("buffer_id"))
+    if buffer is not None:
+        registry.release(payload["buffer_id"])
+        sample_rate = buffer.sample_rate
+        pcm = buffer.pcm
+        if pcm.dtype != np.int16:
+            pcm = (np.clip(buffer.as_float32(), -1.0, 1.0) * 32767).astype(np.int16)
+    elif payload.get("wav_path"):
+        import soundfile as sf
+        pcm, sample_rate = sf.read(payload["wav_path"], dtype="int16", always_2d=True)
+    else:
+        return b""
+    channels = pcm.shape[1] if pcm.ndim == 2 else 1
+    payload["buffer_id"] = None
+    payload["wav_path"] = ""
+    return _PCM.pack(int(sample_rate), channels) + pcm.astype(">i2").tobytes()
+
+
+def bridge_url(server_url: str) -> str:
+    """Turn a server's HTTP base URL into its bridge WebSocket URL."""
+    parts = urlsplit(server_url)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    return urlunsplit((scheme, parts.netloc, BRIDGE_PATH, "", ""))
+
+
+class _Peer:
+    """One connection: its socket wrapper and outbound frame queue."""
+
+    def __init__(self, conn, queue_size: int):
+        self.conn = conn
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=queue_size)
+        self.last_rx = time.monotonic()
+
+
+class StarletteConnection:
+    """Adapts a Starlette/FastAPI WebSocket to the bridge's send/recv/close."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+
+    async def send(self, frame: bytes):
+        await self.websocket.send_bytes(frame)
+
+    async def recv(self) -> bytes:
+        return await self.websocket.receive_bytes()
+
+    async def close(self):
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+
+
+class WebsocketsConnection:
+    """Adapts a `websockets` client connection to the bridge's send/recv/close."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+
+    async def send(self, frame: bytes):
+        await self.websocket.send(frame)
+
+    async def recv(self) -> bytes:
+        return await self.websocket.recv()
+
+    async def close(self):
+        await self.websocket.close()
+
+
+class BusBridge:
+    """
+    Forwards local events on `topics` to connected peers and publishes
+    events received from peers on the local bus.
+    
+    The server accepts any number of peers (serve() per WebSocket); the
+    client keeps one connection open with connect(). Events received from a
+    peer are not sent back out, so both sides may share topics.
+    
+    Usage:
+        bridge = BusBridge(bus, SERVER_TOPICS)     # server: /ws/bus calls serve()
+        bridge = BusBridge(bus, CLIENT_TOPICS)     # client
+        bridge.connect("ws://server:8000/ws/bus")
+        ...
+        await bridge.close()
+    """
+
+    def __init__(
+        self,
+        bus,
+        topics: Iterable[str],
+        heartbeat_s: float = HEARTBEAT_S,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        """
+        Initialize bus bridge and subscribe to the outbound topics.
+        
+        Args:
+            bus: Event bus instance
+            topics: Local topics forwarded to peers
+            heartbeat_s: Ping interval in seconds
+            queue_size: Outbound frames buffered per peer (and while no peer is connected)
+        """
+        self.bus = bus
+        self.topics = tuple(topics)
+        self.heartbeat_s = heartbeat_s
+        self.queue_size = queue_size
+        self._peers: Set[_Peer] = set()
+        self._backlog: deque = deque(maxlen=queue_size)  # (queued at, frame) while no peer is connected
+        self._received: "OrderedDict[tuple, None]" = OrderedDict()  # recently received event ids
+        self._routes: "OrderedDict[str, _Peer]" = OrderedDict()  # corr_id -> peer that started the turn
+        self._client_task: Optional[asyncio.Future] = None
+        self.frames_sent = 0
+        self.frames_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.dropped = 0
+        self.connects = 0
+        for topic in self.topics:
+            bus.subscribe(topic, self._on_local)
+
+    @property
+    def connected(self) -> bool:
+        return bool(self._peers)
+
+    async def _on_local(self, payload: dict):
+        key = _event_key(payload)
+        if key in self._received:
+            return  # came from a peer; don't echo it back
+        audio = payload.get("topic") in AUDIO_TOPICS
+        route = self._routes.get(payload.get("corr_id"))
+        if route is not None:
+            peers = [route] if route in self._peers else []  # that peer's turn; others don't get it
+        else:
+            peers = list(self._peers)
+        if not peers and (route is not None or audio):
+            # The turn's peer is gone, or audio would be stale by the time one connects
+            self.dropped += 1
+            if audio:
+                get_buffer_registry().release(payload.get("buffer_id"))
+            return
+        try:
+            if audio:
+                loop = asyncio.get_event_loop()
+                frame = await loop.run_in_executor(None, encode_frame, payload)
+            else:
+                frame = encode_frame(payload)
+        except Exception as e:
+            logger.warning("Bridge: Could not encode %s: %s", payload.get("topic"), e)
+            return
+        if not peers:
+            if len(self._backlog) == self._backlog.maxlen:
+                self.dropped += 1
+            self._backlog.append((time.monotonic(), frame))
+            return
+        for peer in peers:
+            self._enqueue(peer, frame)
+
+    def _enqueue(self, peer: _Peer, frame: bytes):
+        if peer.queue.full():
+            peer.queue.get_nowait()
+            self.dropped += 1
+        peer.queue.put_nowait(frame)
+
+    async def serve(self, conn):
+        """Run one peer connection until it closes or goes silent."""
+        peer = _Peer(conn, self.queue_size)
+        stale = time.monotonic() - BACKLOG_TTL_S
+        while self._backlog:
+            queued, frame = self._backlog.popleft()
+            if queued < stale:
+                self.dropped += 1
+            else:
+                self._enqueue(peer, frame)
+        self._peers.add(peer)
+        self.connects += 1
+        logger.info("Bridge: Peer connected (%d open)", len(self._peers))
+        tasks = [
+            asyncio.ensure_future(self._send_loop(peer)),
+            asyncio.ensure_future(self._heartbeat(peer)),
+        ]
+        try:
+            await self._recv_loop(peer)
+        finally:
+            self._peers.discard(peer)
+            for task in tasks:
+                task.cancel()
+            await conn.close()
+            logger.info("Bridge: Peer disconnected (%d open)", len(self._peers))
+
+    async def _recv_loop(self, peer: _Peer):
+        while True:
+            try:
+                frame = await peer.conn.recv()
+            except Exception:
+                return  # closed (either library's close/disconnect exception)
+            peer.last_rx = time.monotonic()
+            self.frames_received += 1
+            self.bytes_received += len(frame)
+            try:
+                if _has_audio(frame):
+                    loop = asyncio.get_event_loop()
+                    kind, payload = await loop.run_in_executor(None, decode_frame, frame)
+                else:
+                    kind, payload = decode_frame(frame)
+            except Exception as e:
+                logger.warning("Bridge: Dropping malformed frame: %s", e)
+                continue
+            if payload is None:
+                continue  # heartbeat
+            self._remember(_event_key(payload))
+            self._route(payload.get("corr_id"), peer)
+            await self.bus.publish(payload["topic"], payload)
+
+    async def _send_loop(self, peer: _Peer):
+        try:
+            while True:
+                frame = await peer.queue.get()
+                await peer.conn.send(frame)
+                self.frames_sent += 1
+                self.bytes_sent += len(frame)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Bridge: Send failed: %s", e)
+            await peer.conn.close()
+
+    async def _heartbeat(self, peer: _Peer):
+        ping = _HEADER.pack(FRAME_PING, 0)
+        while True:
+            await asyncio.sleep(self.heartbeat_s)
+            if time.monotonic() - peer.last_rx > 3 * self.heartbeat_s:
+                logger.warning("Bridge: No heartbeat from peer for %.0fs, closing", 3 * self.heartbeat_s)
+                await peer.conn.close()
+                return
+            if peer.queue.empty():
+                self._enqueue(peer, ping)
+
+    def _remember(self, key: tuple):
+        self._received[key] = None
+        while len(self._received) > 4 * self.queue_size:
+            self._received.popitem(last=False)
+
+    def _route(self, corr_id: Optional[str], peer: _Peer):
+        """Send the rest of this turn's events to the peer it came from."""
+        if not corr_id:
+            return
+        self._routes[corr_id] = peer
+        self._routes.move_to_end(corr_id)
+        while len(self._routes) > 4 * self.queue_size:
+            self._routes.popitem(last=False)
+
+    def connect(self, url: str, connector: Optional[Callable] = None, reconnect_max_s: float = RECONNECT_MAX_S):
+        """
+        Keep a connection to the server's bridge open in the background.
+        
+        Args:
+            url: Bridge URL (see bridge_url())
+            connector: Async context manager factory yielding a connection with
+                send/recv/close; defaults to the `websockets` client
+            reconnect_max_s: Longest wait between reconnect attempts
+        """
+        if connector is None:
+            if not WEBSOCKETS_AVAILABLE:
+                raise RuntimeError("websockets not installed. Install with: pip install websockets")
+            connector = _websockets_connect
+        self._client_task = asyncio.ensure_future(self._run_client(url, connector, reconnect_max_s))
+
+    async def _run_client(self, url: str, connector: Callable, reconnect_max_s: float):
+        delay = 0.5
+        while True:
+            try:
+                async with connector(url) as conn:
+                    delay = 0.5
+                    await self.serve(conn)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Bridge: Cannot reach %s: %s", url, e)
+            logger.info("Bridge: Reconnecting in %.1fs", delay)
+            await asyncio.sleep(delay)
+            delay = min(2 * delay, reconnect_max_s)
+
+    async def close(self):
+        """Stop reconnecting and close open connections."""
+        if self._client_task is not None:
+            self._client_task.cancel()
+            try:
+                await self._client_task
+            except asyncio.CancelledError:
+                pass
+            self._client_task = None
+        for peer in list(self._peers):
+            await peer.conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Connection and traffic counters."""
+        return {
+            "peers": len(self._peers),
+            "connects": self.connects,
+            "frames_sent": self.frames_sent,
+            "frames_received": self.frames_received,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "dropped": self.dropped,
+            "backlog": len(self._backlog),
+        }
+
+
+def _event_key(payload: dict) -> tuple:
+    return (payload.get("topic"), payload.get("corr_id"), payload.get("ts_ms"), payload.get("seq"))
+
+
+@asynccontextmanager
+async def _websockets_connect(url: str):
+    """Open a `websockets` client connection wrapped for the bridge."""
+    # Heartbeats are the bridge's own frames; no size limit for audio frames
+    websocket = await websockets.connect(url, ping_interval=None, max_size=None)
+    try:
+        yield WebsocketsConnection(websocket)
+    finally:
+        await websocket.close()
+
+
+_bus_bridge: Optional[BusBridge] = None
+
+
+def set_bus_bridge(bridge: Optional[BusBridge]) -> None:
+    """Register the process's bridge (served at /ws/bus, closed at shutdown)."""
+    global _bus_bridge
+    _bus_bridge = bridge
+
+
+def get_bus_bridge() -> Optional[BusBridge]:
+    """Return the process's bridge, or None when bridging is off."""
+    return _bus_bridge
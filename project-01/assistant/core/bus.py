@@ -31,36 +31,176 @@ event publishing and subscription mechanism for decoupled component
 communication. Components subscribe to topics and receive events when
 published.
 
+By default publish() runs every subscriber and waits for all of them
+(direct dispatch). Topics configured with configure_topic() use queued
+dispatch instead: each subscriber gets a bounded queue drained by worker
+tasks, publish() returns as soon as the event is enqueued, and a per-topic
+overflow policy (block, drop_oldest, reject) decides what happens when a
+queue is full.
+
+With tracing on (assistant/core/tracing.py), every subscriber call and queue
+wait is recorded as a span under the event's corr_id.
+
 --------------------------------------------------------------------------
 """
 
 from collections import defaultdict
-from typing import Any, Awaitable, Callable, Dict, List
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import asyncio
 import logging
+import time
+
+from assistant.core.tracing import Span, get_tracer
 
 Subscriber = Callable[[Dict[str, Any]], Awaitable[None]]
 
+OVERFLOW_POLICIES = ("block", "drop_oldest", "reject")
+
+
+class BusQueueFull(Exception):
+    """Raised by publish() when a 'reject' topic queue is full."""
+
+
+@dataclass
+class TopicPolicy:
+    queue_size: int = 16        # max events waiting per subscriber
+    workers: int = 1            # worker tasks per subscriber (1 keeps order)
+    overflow: str = "block"     # "block", "drop_oldest" or "reject"
+
+
+class _SubscriberQueue:
+    """Bounded queue plus worker tasks feeding one subscriber of a queued topic."""
+
+    def __init__(self, bus: "Bus", topic: str, fn: Subscriber, policy: TopicPolicy):
+        self.bus = bus
+        self.topic = topic
+        self.fn = fn
+        self.policy = policy
+        self.name = getattr(fn, "__name__", str(fn))
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+        self.unfinished = 0     # enqueued events not yet fully handled
+        self.dropped = 0
+        self.rejected = 0
+
+    def _ensure_started(self) -> None:
+        # Created lazily so the queue and tasks bind to the running loop
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=self.policy.queue_size)
+        if not self.tasks:
+            for i in range(self.policy.workers):
+                self.tasks.append(asyncio.ensure_future(self._worker(i)))
+
+    async def put(self, payload) -> None:
+        self._ensure_started()
+        overflow = self.policy.overflow
+        if overflow == "block" or not self.queue.full():
+            await self.queue.put((payload, time.perf_counter()))
+            self.unfinished += 1
+        elif overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+            except asyncio.QueueEmpty:
+                self.unfinished += 1
+            self.dropped += 1
+            self.bus._log.warning("publish: %s queue for %s full, dropped oldest event", self.topic, self.name)
+            self.queue.put_nowait((payload, time.perf_counter()))
+        else:
+            self.rejected += 1
+            raise BusQueueFull(f"queue for {self.topic} -> {self.name} is full")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            payload, queued_at = await self.queue.get()
+            try:
+                await self.bus._call(self.topic, self.fn, payload, queued_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.bus._log.error("worker %s[%d] for %s raised exception: %s", self.name, index, self.topic, e, exc_info=e)
+            finally:
+                self.unfinished -= 1
+                self.queue.task_done()
+
+    async def join(self) -> None:
+        if self.queue is not None:
+            await self.queue.join()
+
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue is not None else 0
+
+    def cancel(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+
 class Bus:
     def __init__(self):
         self._subs: Dict[str, List[Subscriber]] = defaultdict(list)
+        self._policies: Dict[str, TopicPolicy] = {}
+        self._queues: Dict[str, List[_SubscriberQueue]] = defaultdict(list)
         self._log = logging.getLogger("bus")
+        self.tracer = get_tracer()
+    
+    def configure_topic(self, topic: str, queue_size: int = 16, workers: int = 1, overflow: str = "block"):
+        """
+        Switch a topic to queued dispatch.
+        
+        Args:
+            topic: Topic name
+            queue_size: Max events waiting per subscriber
+            workers: Worker tasks per subscriber (1 preserves event order)
+            overflow: What publish() does when a queue is full:
+                      "block" waits for space, "drop_oldest" discards the
+                      oldest waiting event, "reject" raises BusQueueFull
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        policy = TopicPolicy(queue_size=max(1, queue_size), workers=max(1, workers), overflow=overflow)
+        self._policies[topic] = policy
+        for q in self._queues.pop(topic, []):
+            q.cancel()
+        for fn in self._subs.get(topic, []):
+            self._queues[topic].append(_SubscriberQueue(self, topic, fn, policy))
+        self._log.info("configure: %s -> queued (size=%d, workers=%d, overflow=%s)", topic, policy.queue_size, policy.workers, overflow)
     
     def subscribe(self, topic: str, fn: callable):
         self._subs[topic].append(fn)
+        policy = self._policies.get(topic)
+        if policy is not None:
+            self._queues[topic].append(_SubscriberQueue(self, topic, fn, policy))
         subscriber_name = getattr(fn, "__name__", str(fn))
         self._log.info("subscribe: %s -> %s (total subscribers: %d)", topic, subscriber_name, len(self._subs[topic]))
 
     async def publish(self, topic, payload):
+        started = time.perf_counter()
+        try:
+            await self._dispatch(topic, payload)
+        finally:
+            if self.tracer is not None:
+                # Downstream handlers ran (or we waited for queue space) inside the caller's span
+                self.tracer.add_nested(time.perf_counter() - started)
+
+    async def _dispatch(self, topic, payload):
         subscribers = self._subs.get(topic, [])
         self._log.info("publish: %s -> %d subscribers %s", topic, len(subscribers), list(payload.keys()) if isinstance(payload, dict) else type(payload).__name__)
         if not subscribers:
             self._log.warning("publish: No subscribers for topic %s", topic)
+
+        if topic in self._policies:
+            # Queued dispatch: hand off to subscriber queues and return
+            for q in self._queues.get(topic, []):
+                await q.put(payload)
+            return
+
         tasks = []
         for fn in subscribers:
             try:
                 self._log.debug("publish: Scheduling subscriber %s for topic %s", getattr(fn, "__name__", str(fn)), topic)
-                tasks.append(asyncio.create_task(fn(payload)))
+                tasks.append(asyncio.create_task(self._call(topic, fn, payload)))
             except Exception as e:
                 self._log.exception("error scheduling subscriber for %s: %s", topic, e)
                 
@@ -70,5 +210,45 @@ class Bus:
             if isinstance(result, Exception):
                 self._log.error("publish: Subscriber %d raised exception: %s", i, result, exc_info=result) 
 
+    async def _call(self, topic: str, fn: Subscriber, payload, queued_at: Optional[float] = None):
+        """Run one subscriber, recording a span when the event has a corr_id."""
+        tracer = self.tracer
+        corr_id = payload.get("corr_id") if tracer is not None and isinstance(payload, dict) else None
+        if not corr_id:
+            await fn(payload)
+            return
+        name = getattr(fn, "__qualname__", getattr(fn, "__name__", str(fn)))
+        if queued_at is not None:
+            waited = time.perf_counter() - queued_at
+            tracer.record(corr_id, Span(f"queue:{name}", "queue", queued_at, waited, waited, topic))
+        with tracer.span(name, corr_id, cat="handler", topic=topic):
+            await fn(payload)
+
+    async def join(self):
+        """Wait until every queued topic has been fully processed."""
+        while True:
+            queues = [q for qs in self._queues.values() for q in qs]
+            for q in queues:
+                await q.join()
+            # Handlers may have enqueued more work downstream while we waited
+            if all(q.unfinished == 0 for q in queues):
+                return
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Queue depth and overflow counters for queued topics."""
+        out = {}
+        for topic, queues in self._queues.items():
+            out[topic] = {
+                "depth": sum(q.depth() for q in queues),
+                "dropped": sum(q.dropped for q in queues),
+                "rejected": sum(q.rejected for q in queues),
+            }
+        return out
+
     def clear(self):
+        for queues in self._queues.values():
+            for q in queues:
+                q.cancel()
+        self._queues.clear()
+        self._policies.clear()
         self._subs.clear()
\ No newline at end of file
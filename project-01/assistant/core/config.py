@@ -69,31 +69,87 @@ class Config:
     STT_SERVER_URL: str = os.getenv("STT_SERVER_URL", "http://localhost:8000")
     STT_MODEL_SIZE: str = os.getenv("STT_MODEL_SIZE", "tiny")  # "tiny", "base", "small", "medium"
     STT_TIMEOUT: float = float(os.getenv("STT_TIMEOUT", "30.0"))
+    STT_COMPUTE_TYPE: str = os.getenv("STT_COMPUTE_TYPE", "int8")  # CTranslate2 compute type (local only)
+    STT_CPU_THREADS: int = int(os.getenv("STT_CPU_THREADS", "0"))  # 0 = library default (local only)
+    STT_MODEL_POOL_SIZE: int = int(os.getenv("STT_MODEL_POOL_SIZE", "2"))  # warm models kept loaded
+    STT_PRELOAD: bool = os.getenv("STT_PRELOAD", "true").lower() in ("true", "1", "yes")
+    STT_STREAMING: bool = os.getenv("STT_STREAMING", "false").lower() in ("true", "1", "yes")  # transcribe while recording (local only)
+    STT_PARTIAL_INTERVAL_MS: int = int(os.getenv("STT_PARTIAL_INTERVAL_MS", "700"))  # new audio between partial transcripts
+    STT_BATCHING: bool = os.getenv("STT_BATCHING", "false").lower() in ("true", "1", "yes")  # server: batch concurrent transcriptions
+    STT_BATCH_MAX: int = int(os.getenv("STT_BATCH_MAX", "8"))  # most requests per batch
+    STT_BATCH_WAIT_MS: float = float(os.getenv("STT_BATCH_WAIT_MS", "50"))  # longest wait for a batch to fill
+    STT_PROCESSES: int = int(os.getenv("STT_PROCESSES", "0"))  # worker processes for local Whisper, 0 = in-process threads
+    STT_PROCESS_START_METHOD: str = os.getenv("STT_PROCESS_START_METHOD", "spawn")  # "spawn", "forkserver" or "fork"
     
     # TTS Configuration
     TTS_MODE: str = os.getenv("TTS_MODE", "local")  # "local" or "remote"
     TTS_SERVER_URL: str = os.getenv("TTS_SERVER_URL", "http://localhost:8000")
     TTS_VOICE: Optional[str] = os.getenv("TTS_VOICE", None)
     TTS_TIMEOUT: float = float(os.getenv("TTS_TIMEOUT", "30.0"))
+    TTS_STREAMING: bool = os.getenv("TTS_STREAMING", "false").lower() in ("true", "1", "yes")  # sentence-by-sentence synthesis
+    TTS_CACHE: bool = os.getenv("TTS_CACHE", "true").lower() in ("true", "1", "yes")  # reuse audio for repeated phrases
+    TTS_CACHE_ITEMS: int = int(os.getenv("TTS_CACHE_ITEMS", "64"))  # decoded clips kept in memory
+    TTS_CACHE_DISK_MB: int = int(os.getenv("TTS_CACHE_DISK_MB", "64"))  # on-disk tier cap (0 = memory only)
+    TTS_PREWARM_PHRASES: list = [
+        p.strip() for p in os.getenv(
+            "TTS_PREWARM_PHRASES",
+            "I'm not sure how to respond to that.|Sorry, I'm having trouble connecting right now.",
+        ).split("|") if p.strip()
+    ]  # "|"-separated phrases synthesized at startup
+    
+    # Conversation Loop Configuration
+    VAD_BACKEND: str = os.getenv("VAD_BACKEND", "auto")  # "auto", "webrtc" or "numpy"
+    CONV_MAX_UTTERANCE_S: float = float(os.getenv("CONV_MAX_UTTERANCE_S", "30.0"))  # recording is cut off after this
+    CONV_PREROLL_MS: int = int(os.getenv("CONV_PREROLL_MS", "320"))  # audio kept from before speech start
+    
+    # Playback Configuration
+    PLAYBACK_ENGINE: bool = os.getenv("PLAYBACK_ENGINE", "true").lower() in ("true", "1", "yes")  # persistent output stream
     
     # Billy Bass Configuration
     BILLY_BASS_ENABLED: bool = os.getenv("BILLY_BASS_ENABLED", "true").lower() in ("true", "1", "yes")
     
+    # Event Bus Configuration
+    BUS_DISPATCH: str = os.getenv("BUS_DISPATCH", "direct")  # "direct" or "queued"
+    BUS_QUEUE_SIZE: int = int(os.getenv("BUS_QUEUE_SIZE", "8"))  # per-subscriber queue (queued mode)
+    TRACING: bool = os.getenv("TRACING", "true").lower() in ("true", "1", "yes")  # per-turn spans (GET /api/traces)
+    TRACE_MAX_TURNS: int = int(os.getenv("TRACE_MAX_TURNS", "200"))  # turns kept in memory
+    
     # Deployment Mode Configuration
     DEPLOYMENT_MODE: str = os.getenv("DEPLOYMENT_MODE", "full")  # "full", "server", or "client"
     SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
     SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
     
+    # Server inference pool (STT/TTS endpoints)
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "1"))  # concurrent STT/TTS jobs
+    INFERENCE_QUEUE_SIZE: int = int(os.getenv("INFERENCE_QUEUE_SIZE", "4"))  # waiting jobs before 503
+    
+    # Outgoing HTTP (remote adapters, client push, chat)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "4"))  # pooled connections per host
+    HTTP_KEEPALIVE_S: float = float(os.getenv("HTTP_KEEPALIVE_S", "60.0"))  # idle connections kept open
+    HTTP2: bool = os.getenv("HTTP2", "false").lower() in ("true", "1", "yes")  # needs the h2 package
+    HTTP_PREWARM: bool = os.getenv("HTTP_PREWARM", "true").lower() in ("true", "1", "yes")  # connect at startup
+    
     # Client Configuration (for server mode to push audio to client)
     CLIENT_SERVER_URL: Optional[str] = os.getenv("CLIENT_SERVER_URL", None)
     
+    # Client mode pipeline: "split" (remote STT + local NLU/skills + remote TTS),
+    # "converse" (one POST /api/converse per turn to STT_SERVER_URL) or
+    # "bridge" (playback only; events arrive over the server's /ws/bus)
+    CLIENT_PIPELINE: str = os.getenv("CLIENT_PIPELINE", "split")
+    CONVERSE_TIMEOUT: float = float(os.getenv("CONVERSE_TIMEOUT", "60.0"))  # whole turn, incl. chat
+    
+    # Bus bridge (persistent WebSocket between server and client)
+    BRIDGE: bool = os.getenv("BRIDGE", "false").lower() in ("true", "1", "yes")  # server: send replies over /ws/bus
+    BRIDGE_URL: str = os.getenv("BRIDGE_URL", "")  # client: defaults to STT_SERVER_URL's /ws/bus
+    BRIDGE_HEARTBEAT_S: float = float(os.getenv("BRIDGE_HEARTBEAT_S", "10.0"))  # silent peers dropped after 3x
+    
     @classmethod
     def get_stt_adapter(cls):
         """
         Get the appropriate STT adapter based on configuration.
         
         Returns:
-            STT adapter instance (WhisperAdapter or RemoteSTTAdapter)
+            STT adapter instance (WhisperAdapter, STTProcessPool or RemoteSTTAdapter)
         """
         if cls.STT_MODE == "remote":
             from assistant.core.stt.remote_stt_adapter import RemoteSTTAdapter
@@ -106,6 +162,10 @@ class Config:
                 model_size=cls.STT_MODEL_SIZE,
                 timeout=cls.STT_TIMEOUT,
             )
+        elif cls.STT_PROCESSES > 0:
+            from assistant.core.stt.process_pool import get_stt_process_pool
+            logger.info("Using local STT in %d worker processes (model: %s)", cls.STT_PROCESSES, cls.STT_MODEL_SIZE)
+            return get_stt_process_pool()
         else:
             from assistant.core.stt.whisper_adapter import WhisperAdapter
             logger.info("Using local STT adapter (model: %s)", cls.STT_MODEL_SIZE)
@@ -156,10 +216,20 @@ class Config:
             print(f"    Voice: {cls.TTS_VOICE or 'default'}")
         
         print(f"  Billy Bass: {'enabled' if cls.BILLY_BASS_ENABLED else 'disabled'}")
+        print(f"  Bus Dispatch: {cls.BUS_DISPATCH}")
         print(f"  Deployment Mode: {cls.DEPLOYMENT_MODE}")
+        if cls.DEPLOYMENT_MODE == "client":
+            print(f"    Pipeline: {cls.CLIENT_PIPELINE}")
         if cls.DEPLOYMENT_MODE == "server":
             print(f"    Server: {cls.SERVER_HOST}:{cls.SERVER_PORT}")
-            if cls.CLIENT_SERVER_URL:
+            print(f"    Inference: {cls.INFERENCE_WORKERS} workers, queue {cls.INFERENCE_QUEUE_SIZE}")
+            if cls.STT_PROCESSES > 0:
+                print(f"    STT Processes: {cls.STT_PROCESSES} ({cls.STT_PROCESS_START_METHOD})")
+            if cls.STT_BATCHING:
+                print(f"    STT Batching: up to {cls.STT_BATCH_MAX}, {cls.STT_BATCH_WAIT_MS:.0f}ms window")
+            if cls.BRIDGE:
+                print("    Bridge: /ws/bus")
+            elif cls.CLIENT_SERVER_URL:
                 print(f"    Client: {cls.CLIENT_SERVER_URL}")
         print()
 
@@ -57,10 +57,11 @@ class AudioRecorded(Event):
     topic: str = "audio.recorded"
     wav_path: str = ""        # file path to recorded WAV
     duration_s: float = 0.0   # seconds
+    buffer_id: Optional[str] = None  # in-process audio (audio.buffers registry) instead of a file
 
     def __post_init__(self) -> None:
-        if not self.wav_path or self.duration_s <= 0.0:
-            raise ValueError("AudioRecorded requires non-empty wav_path and duration_s > 0")
+        if not (self.wav_path or self.buffer_id) or self.duration_s <= 0.0:
+            raise ValueError("AudioRecorded requires wav_path or buffer_id and duration_s > 0")
         # Optional existence check (best-effort; don't error hard)
         try:
             if self.wav_path.startswith("/") and not os.path.exists(self.wav_path):
@@ -75,6 +76,7 @@ class STTTranscript(Event):
     confidence: Optional[float] = None  # 0..1 optional
     # Optional per-word timing: [{"word":"hi","start":0.12,"end":0.28}]
     words: Optional[List[Dict[str, Any]]] = None
+    partial: bool = False  # True for interim text while the user is still speaking
 
 @dataclass
 class NLUIntent(Event):
@@ -102,27 +104,37 @@ class TTSRequest(Event):
     topic: str = "tts.request"
     text: str = ""
     voice: Optional[str] = None   # adapter-specific (optional)
+    stream: Optional[bool] = None # split into sentences (None = Config.TTS_STREAMING)
 
 @dataclass
 class TTSAudio(Event):
     topic: str = "tts.audio"
     wav_path: str = ""
     duration_s: float = 0.0
+    seq: int = 0              # chunk index within a streamed reply
+    final: bool = True        # last chunk of the reply
+    buffer_id: Optional[str] = None  # in-process audio (audio.buffers registry) instead of a file
 
     def __post_init__(self) -> None:
-        if not self.wav_path or self.duration_s <= 0.0:
-            raise ValueError("TTSAudio requires non-empty wav_path and duration_s > 0")
+        if not (self.wav_path or self.buffer_id) or self.duration_s <= 0.0:
+            raise ValueError("TTSAudio requires wav_path or buffer_id and duration_s > 0")
 
 @dataclass
 class PlaybackStart(Event):
     topic: str = "audio.playback.start"
     wav_path: str = ""
+    seq: int = 0
+    final: bool = True
+    buffer_id: Optional[str] = None
 
 @dataclass
 class PlaybackEnd(Event):
     topic: str = "audio.playback.end"
     wav_path: str = ""
     ok: bool = True
+    seq: int = 0
+    final: bool = True
+    buffer_id: Optional[str] = None
 
 # Fish mouth control
 @dataclass
@@ -130,6 +142,8 @@ class MouthEnvelope(Event):
     topic: str = "anim.mouth.envelope"
     env: List[float] = field(default_factory=list)  # normalized [0..1]
     hop_ms: int = 20
+    wav_path: Optional[str] = None  # clip the envelope belongs to
+    buffer_id: Optional[str] = None  # ... when the clip is an in-process buffer
 
 # Fish state for debugging
 @dataclass
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Single Round-Trip Conversation Turns
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+One network round trip per conversation turn. On the server, ConversePipeline
+runs STT, NLU, the router and skills, and TTS for one uploaded utterance and
+hands back the reply audio. In client mode, ConverseClient replaces the local
+STT/NLU/skills/TTS components: each recording is uploaded to POST
+/api/converse and the reply is published for local playback, so the device
+makes one request per turn instead of a transcribe and a synthesize request.
+
+Transcript, intent and reply text travel in percent-encoded X-Transcript,
+X-Intent and X-Reply headers; per-stage times in a Server-Timing header.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import soundfile as sf
+
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.contracts import AudioRecorded, NLUIntent, STTTranscript, TTSAudio, TTSRequest, same_trace
+from assistant.core.http import get_http_clients
+
+logger = logging.getLogger("converse")
+
+CONVERSE_PATH = "/api/converse"
+REPLY_TIMEOUT_S = 30.0  # NLU + skills (the chat skill calls out to an LLM)
+
+
+@dataclass
+class ConverseResult:
+    """Outcome of one conversation turn."""
+    transcript: str = ""
+    intent: Optional[str] = None
+    reply: Optional[str] = None
+    wav_path: Optional[str] = None  # reply audio (server side; caller removes it)
+    timings: Dict[str, float] = field(default_factory=dict)  # stage -> milliseconds
+
+    def headers(self) -> Dict[str, str]:
+        """Response headers carrying everything but the audio."""
+        headers = {
+            "X-Transcript": quote(self.transcript),
+            "Server-Timing": ", ".join(f"{name};dur={ms:.1f}" for name, ms in self.timings.items()),
+        }
+        if self.intent:
+            headers["X-Intent"] = quote(self.intent)
+        if self.reply:
+            headers["X-Reply"] = quote(self.reply)
+        return headers
+
+    @classmethod
+    def from_headers(cls, headers) -> "ConverseResult":
+        """Parse the headers written by headers()."""
+        timings = {}
+        for entry in headers.get("server-timing", "").split(","):
+            name, _, dur = entry.strip().partition(";dur=")
+            try:
+                timings[name] = float(dur)
+            except ValueError:
+                continue
+        intent = headers.get("x-intent")
+        reply = headers.get("x-reply")
+        return cls(
+            transcript=unquote(headers.get("x-transcript", "")),
+            intent=unquote(intent) if intent else None,
+            reply=unquote(reply) if reply else None,
+            timings=timings,
+        )
+
+
+class ConversePipeline:
+    """
+    Runs whole conversation turns on the server.
+    
+    STT and TTS run on the inference pool; NLU, the router and skills run on a
+    private bus with no playback, where the tts.request for the turn is taken
+    as the reply. `setup` starts those components on the bus (see
+    assistant.app.start_converse_components) and runs once, on first use.
+    
+    Usage:
+        pipeline = ConversePipeline(stt_adapter, tts_adapter, pool, setup=start_converse_components)
+        result = await pipeline.run("utterance.wav")
+    """
+
+    def __init__(
+        self,
+        stt_adapter,
+        tts_adapter,
+        pool,
+        setup: Callable[[Bus], Awaitable[None]],
+        reply_timeout: float = REPLY_TIMEOUT_S,
+    ):
+        """
+        Initialize conversation pipeline.
+        
+        Args:
+            stt_adapter: Blocking STT adapter (transcribe(path, model_size=...))
+            tts_adapter: Blocking TTS adapter (synth(text) -> WAV path)
+            pool: InferencePool running the adapters
+            setup: Coroutine function starting NLU, router and skills on a bus
+            reply_timeout: Seconds to wait for NLU and skills to produce a reply
+        """
+        self.stt_adapter = stt_adapter
+        self.tts_adapter = tts_adapter
+        self.pool = pool
+        self.reply_timeout = reply_timeout
+        self.bus = Bus()
+        self._setup = setup
+        self._started: Optional[asyncio.Future] = None
+        self._turns: Dict[str, ConverseResult] = {}  # corr_id -> turn in progress
+        self._replies: Dict[str, asyncio.Future] = {}  # corr_id -> resolved by the turn's reply
+        self.bus.subscribe("nlu.intent", self._on_intent)
+        self.bus.subscribe("tts.request", self._on_reply)
+
+    async def start(self):
+        """Start the NLU/skill components (idempotent, safe to call concurrently)."""
+        if self._started is None:
+            self._started = asyncio.ensure_future(self._setup(self.bus))
+        await asyncio.shield(self._started)
+
+    async def run(self, path: str, model_size: Optional[str] = None) -> ConverseResult:
+        """
+        Run one turn for a WAV file.
+        
+        Returns:
+            ConverseResult; wav_path is None when there is nothing to say
+        
+        Raises:
+            PoolFullError: If the inference pool cannot admit the STT or TTS job
+        """
+        await self.start()
+        result = ConverseResult()
+        started = time.monotonic()
+
+        text, timing = await self.pool.run_timed(self.stt_adapter.transcribe, path, model_size=model_size)
+        queued_s = timing["wait_s"]
+        result.timings["stt"] = 1000 * timing["run_s"]
+        result.transcript = (text or "").strip()
+
+        if result.transcript:
+            transcript = STTTranscript(text=result.transcript)
+            self._turns[transcript.corr_id] = result
+            reply = self._replies[transcript.corr_id] = asyncio.get_event_loop().create_future()
+            reply_started = time.monotonic()
+            try:
+                await asyncio.wait_for(self._publish(transcript, reply), self.reply_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Converse: No reply within %.0fs for '%s'", self.reply_timeout, result.transcript[:50])
+            finally:
+                self._turns.pop(transcript.corr_id, None)
+                self._replies.pop(transcript.corr_id, None)
+            result.timings["reply"] = 1000 * (time.monotonic() - reply_started)
+
+        if result.reply:
+            result.wav_path, timing = await self.pool.run_timed(self.tts_adapter.synth, result.reply)
+            queued_s += timing["wait_s"]
+            result.timings["tts"] = 1000 * timing["run_s"]
+
+        result.timings["queue"] = 1000 * queued_s
+        result.timings["total"] = 1000 * (time.monotonic() - started)
+        logger.info(
+            "Converse: '%s' -> %s -> '%s' (%.0fms)",
+            result.transcript[:50], result.intent, (result.reply or "")[:50], result.timings["total"],
+        )
+        return result
+
+    async def _publish(self, transcript: STTTranscript, reply: asyncio.Future):
+        """
+        Publish the transcript and wait for this turn's reply.
+        
+        With direct dispatch the turn is done when publish returns. Queued
+        topics may still be working on it: it ends at its reply, or when the
+        bus has gone idle without one (nothing to say). Other turns' work
+        only delays a turn that gets no reply.
+        """
+        await self.bus.publish(transcript.topic, transcript.dict())
+        if reply.done():
+            return
+        idle = asyncio.ensure_future(self.bus.join())
+        try:
+            await asyncio.wait([reply, idle], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            idle.cancel()
+
+    async def _on_intent(self, payload: dict):
+        turn = self._turns.get(payload.get("corr_id"))
+        if turn is not None:
+            turn.intent = NLUIntent(**payload).intent
+
+    async def _on_reply(self, payload: dict):
+        turn = self._turns.get(payload.get("corr_id"))
+        if turn is None:
+            return
+        text = TTSRequest(**payload).text.strip()
+        if text:
+            turn.reply = f"{turn.reply} {text}" if turn.reply else text
+            reply = self._replies.get(payload.get("corr_id"))
+            if reply is not None and not reply.done():
+                reply.set_result(None)
+
+
+class ConverseClient:
+    """
+    Client-mode stand-in for STT, NLU, skills and TTS.
+    
+    Listens on 'audio.recorded', uploads the utterance to the server's
+    /api/converse endpoint and publishes 'stt.transcript' (so the
+    conversation loop can track the turn) and the reply as 'tts.audio'.
+    """
+
+    def __init__(self, bus, server_url: str, model_size: Optional[str] = None, timeout: float = 60.0):
+        """
+        Initialize converse client.
+        
+        Args:
+            bus: Event bus instance
+            server_url: Base URL of the server (e.g., "http://localhost:8000")
+            model_size: STT model size hint (None = server default)
+            timeout: Request timeout in seconds, covering the whole turn
+        """
+        self.bus = bus
+        self.server_url = server_url.rstrip('/')
+        self.model_size = model_size
+        self.timeout = timeout
+        self.log = logging.getLogger("converse")
+
+    async def start(self):
+        self.bus.subscribe("audio.recorded", self._on_recorded)
+
+    async def _on_recorded(self, payload: dict):
+        try:
+            audio_event = AudioRecorded(**payload)
+        except Exception:
+            self.log.warning("malformed audio.recorded event, skipping")
+            return
+
+        loop = asyncio.get_event_loop()
+        try:
+            # WAV encode and file reads stay off the loop (playback, mouth drive)
+            if audio_event.buffer_id:
+                data = await loop.run_in_executor(None, _read_buffer, audio_event.buffer_id)
+            else:
+                data = await loop.run_in_executor(None, _read_file, audio_event.wav_path)
+            result, wav = await self.converse(data)
+        except Exception as e:
+            self.log.exception("Converse: Request failed: %s", e)
+            return
+
+        self.log.info(
+            "Converse: '%s' -> %s (%s)", result.transcript[:50], result.intent,
+            ", ".join(f"{name} {ms:.0f}ms" for name, ms in result.timings.items()),
+        )
+        transcript_event = STTTranscript(text=result.transcript)
+        same_trace(audio_event, transcript_event)
+        await self.bus.publish(transcript_event.topic, transcript_event.dict())
+
+        if wav:
+            buffer_id, duration_s = await loop.run_in_executor(None, _decode_reply, wav)
+            audio_out = TTSAudio(buffer_id=buffer_id, duration_s=duration_s)
+            same_trace(audio_event, audio_out)
+            await self.bus.publish(audio_out.topic, audio_out.dict())
+
+    async def converse(self, wav: bytes):
+        """
+        Upload one utterance and return (ConverseResult, reply WAV bytes or None).
+        
+        Raises:
+            httpx.HTTPError: On network errors or an error response
+        """
+        api_url = f"{self.server_url}{CONVERSE_PATH}"
+        data = {"model_size": self.model_size} if self.model_size else None
+        response = await get_http_clients().get(api_url).post(
+            api_url,
+            files={"audio": ("utterance.wav", wav, "audio/wav")},
+            data=data,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        result = ConverseResult.from_headers(response.headers)
+        return result, (response.content if response.status_code == 200 and response.content else None)
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _decode_reply(wav: bytes) -> Tuple[str, float]:
+    """Decode reply WAV bytes into the buffer registry; return (buffer_id, duration_s)."""
+    pcm, sr = sf.read(io.BytesIO(wav), dtype="int16", always_2d=True)
+    return get_buffer_registry().put(pcm, sr), max(len(pcm) / float(sr), 0.01)
+
+
+def _read_buffer(buffer_id: str) -> bytes:
+    """Encode an in-process audio buffer as WAV bytes and release it."""
+    registry = get_buffer_registry()
+    buffer = registry.get(buffer_id)
+    if buffer is None:
+        raise KeyError(f"audio buffer not found: {buffer_id}")
+    try:
+        out = io.BytesIO()
+        sf.write(out, buffer.pcm, buffer.sample_rate, format="WAV", subtype="PCM_16")
+        return out.getvalue()
+    finally:
+        registry.release(buffer_id)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Shared HTTP Clients
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Application-scoped HTTP clients for the remote STT/TTS adapters, the client
+audio push and the chat skill. One pooled keep-alive client is kept per
+origin (scheme, host, port) and event loop, so repeated requests reuse open
+TCP/TLS connections instead of connecting per request. HTTP/2 is used when
+enabled and the h2 package is installed. Synchronous callers run their
+requests on a background event loop owned by the registry, so they share
+pooled connections too.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger("http")
+
+try:
+    import h2  # noqa: F401
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+
+def origin(url: str) -> str:
+    """Return scheme://host[:port] of a URL (the pooling key)."""
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"not an absolute URL: {url!r}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class HTTPClients:
+    """
+    Registry of pooled httpx.AsyncClient instances.
+
+    httpx clients are bound to the event loop they are used on, so clients
+    are keyed by (origin, loop). Requests pass their own timeout; the
+    client only fixes pooling.
+
+    Usage:
+        clients = get_http_clients()
+        client = clients.get("http://server:8000")          # inside a coroutine
+        response = await client.post(url, json=payload, timeout=30.0)
+        text = clients.run_sync(transcribe_file_async(...))  # from a worker thread
+        await clients.aclose()                               # at shutdown
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 4,
+        keepalive_s: float = 60.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize client registry.
+
+        Args:
+            max_connections: Connection pool size per origin
+            keepalive_s: How long idle connections are kept open
+            http2: Negotiate HTTP/2 (falls back to HTTP/1.1 without h2)
+            transport: Optional transport for every client (tests)
+        """
+        if http2 and not H2_AVAILABLE:
+            logger.warning("HTTP/2 requested but h2 is not installed, using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(1, int(max_connections)),
+            keepalive_expiry=keepalive_s,
+        )
+        self.transport = transport
+        self._clients: Dict[Tuple[str, int], Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._lock = threading.Lock()
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_thread: Optional[threading.Thread] = None
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the URL's origin on the running event loop."""
+        loop = asyncio.get_event_loop()
+        key = (origin(url), id(loop))
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and entry[0] is loop and not entry[1].is_closed:
+                return entry[1]
+            # Forget clients of loops that have gone away (their sockets went with them)
+            for stale in [k for k, (l, _) in self._clients.items() if l.is_closed()]:
+                del self._clients[stale]
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                http2=self.http2,
+                transport=self.transport,
+            )
+            self._clients[key] = (loop, client)
+            logger.debug("Opened HTTP client for %s", key[0])
+            return client
+
+    def run_sync(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the registry's background loop and wait for it.
+
+        For blocking adapter methods called from worker threads; the
+        coroutine's get() calls return clients pooled on that loop.
+        """
+        loop = self._background_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._sync_loop is None or self._sync_loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="http-sync", daemon=True)
+                thread.start()
+                self._sync_loop, self._sync_thread = loop, thread
+            return self._sync_loop
+
+    async def prewarm(self, urls: Iterable[str], timeout: float = 5.0) -> int:
+        """
+        Open connections ahead of the first real request.
+
+        Sends a GET to each URL (e.g. a /health endpoint); any HTTP response
+        counts, since the point is the TCP/TLS handshake. Returns the number
+        of origins reached.
+        """
+        async def warm(url: str) -> bool:
+            try:
+                await self.get(url).get(url, timeout=timeout)
+                return True
+            except Exception as e:
+                logger.warning("Could not pre-warm connection to %s: %s", url, e)
+                return False
+
+        urls = list(dict.fromkeys(u for u in urls if u))
+        results = await asyncio.gather(*(warm(u) for u in urls))
+        warmed = sum(results)
+        if warmed:
+            logger.info("Pre-warmed %d HTTP connection(s)", warmed)
+        return warmed
+
+    async def aclose(self) -> None:
+        """Close every client (those on other loops via their loop) and stop the background loop."""
+        loop = asyncio.get_event_loop()
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+            sync_loop, self._sync_loop = self._sync_loop, None
+            sync_thread, self._sync_thread = self._sync_thread, None
+        for client_loop, client in entries:
+            if client_loop is loop:
+                await client.aclose()
+            elif client_loop is sync_loop and not sync_loop.is_closed():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), sync_loop))
+        if sync_loop is not None and not sync_loop.is_closed():
+            sync_loop.call_soon_threadsafe(sync_loop.stop)
+            sync_thread.join(timeout=1.0)
+            if not sync_loop.is_running():
+                sync_loop.close()
+
+    def stats(self) -> dict:
+        """Return the origins that currently have a client."""
+        with self._lock:
+            return {"clients": len(self._clients), "origins": sorted({key[0] for key in self._clients}), "http2": self.http2}
+
+
+_clients: Optional[HTTPClients] = None
+_clients_lock = threading.Lock()
+
+
+def get_http_clients() -> HTTPClients:
+    """Get or create the process-wide HTTP client registry."""
+    global _clients
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:
+                from assistant.core.config import Config
+                _clients = HTTPClients(
+                    max_connections=Config.HTTP_MAX_CONNECTIONS,
+                    keepalive_s=Config.HTTP_KEEPALIVE_S,
+                    http2=Config.HTTP2,
+                )
+    return _clients
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Inference Worker Pool
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Bounded worker pool for blocking inference (Whisper, pyttsx3). Runs jobs on
+a dedicated thread pool so the asyncio event loop stays responsive, admits
+at most workers + queue_size jobs at once, and sheds load with
+PoolFullError when the queue is full. Tracks queue depth and wait times.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger("inference")
+
+
+class PoolFullError(Exception):
+    """Raised when the inference pool cannot admit another job."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(f"inference queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class InferencePool:
+    """
+    Dedicated thread pool with a bounded request queue.
+
+    Usage:
+        pool = InferencePool(workers=2, queue_size=4)
+        try:
+            text = await pool.run(adapter.transcribe, "audio.wav")
+        except PoolFullError as e:
+            ...  # respond 503 with Retry-After: e.retry_after
+    """
+
+    def __init__(self, workers: int = 1, queue_size: int = 4, name: str = "inference"):
+        """
+        Initialize inference pool.
+
+        Args:
+            workers: Number of worker threads running jobs concurrently
+            queue_size: Number of jobs allowed to wait for a free worker
+            name: Thread name prefix (shows up in logs and traces)
+        """
+        self.workers = max(1, int(workers))
+        self.queue_size = max(0, int(queue_size))
+        self.capacity = self.workers + self.queue_size
+        self.name = name
+        self.log = logging.getLogger("inference")
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0   # admitted jobs (queued + running)
+        self._active = 0    # jobs currently running on a worker
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._waits = deque(maxlen=100)  # recent queue wait times (s)
+        self._runs = deque(maxlen=100)   # recent run times (s)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._pending - self._active)
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a slot frees up (at least 1)."""
+        with self._lock:
+            avg_run = sum(self._runs) / len(self._runs) if self._runs else 1.0
+            backlog = self._pending - self.workers + 1
+        return max(1, int(math.ceil(avg_run * max(1, backlog) / self.workers)))
+
+    async def run_timed(self, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Dict[str, float]]:
+        """
+        Run a blocking callable on the pool.
+
+        Returns:
+            (result, {"wait_s": queue wait, "run_s": execution time})
+
+        Raises:
+            PoolFullError: If workers + queue_size jobs are already admitted
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                full = True
+            else:
+                self._pending += 1
+                full = False
+        if full:
+            retry_after = self.retry_after()
+            self.log.warning("%s: queue full (%d pending), rejecting job", self.name, self.capacity)
+            raise PoolFullError(retry_after)
+
+        submitted = time.monotonic()
+        timing: Dict[str, float] = {}
+
+        state = {"started": False, "abandoned": False}
+
+        def _call():
+            started = time.monotonic()
+            with self._lock:
+                if state["abandoned"]:  # caller gave up while queued; slot already returned
+                    return None
+                state["started"] = True
+                self._active += 1
+                self._waits.append(started - submitted)
+            timing["wait_s"] = started - submitted
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                finished = time.monotonic()
+                timing["run_s"] = finished - started
+                with self._lock:
+                    self._active -= 1
+                    self._pending -= 1
+                    self._runs.append(finished - started)
+
+        loop = asyncio.get_event_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, _call)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            # Cancelled while still queued: _call will never run (or will skip
+            # the job), so give the admission slot back here.
+            with self._lock:
+                if not state["started"]:
+                    state["abandoned"] = True
+                    self._pending -= 1
+        with self._lock:
+            self.completed += 1
+        return result, timing
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the pool and return its result."""
+        result, _timing = await self.run_timed(fn, *args, **kwargs)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, counters and recent wait/run times."""
+        with self._lock:
+            waits = list(self._waits)
+            runs = list(self._runs)
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "active": self._active,
+                "queued": max(0, self._pending - self._active),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_ms_avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                "wait_ms_max": round(1000 * max(waits), 1) if waits else 0.0,
+                "run_ms_avg": round(1000 * sum(runs) / len(runs), 1) if runs else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work and release worker threads."""
+        self._executor.shutdown(wait=wait)
@@ -62,6 +62,9 @@ class NLU:
             self.log.warning("NLU: Malformed stt.transcript event, skipping")
             return
 
+        if stt_event.partial:
+            return  # interim text; act on the final transcript only
+
         text = stt_event.text.strip()
         if not text:
             self.log.warning("NLU: Empty transcript, skipping")
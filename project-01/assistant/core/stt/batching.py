@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+STT Batch Scheduler
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Micro-batching of server transcriptions. When several fish speak at once,
+requests that arrive while the inference workers are busy are collected for
+up to a short window and run as one batched Whisper pass on the warm model
+(WhisperAdapter.transcribe_batch); the transcripts are then fanned back to
+each request. A request that finds a worker free starts immediately as a
+batch of one, so a single user sees no added latency.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+log = logging.getLogger("stt.batching")
+
+MAX_BATCH = 8
+MAX_WAIT_MS = 50.0
+
+
+class _Request:
+    __slots__ = ("audio", "sample_rate", "future", "queued")
+
+    def __init__(self, audio: np.ndarray, sample_rate: int, future: "asyncio.Future"):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.future = future
+        self.queued = time.monotonic()
+
+
+class STTBatchScheduler:
+    """
+    Groups concurrent transcription requests into batches on an InferencePool.
+    
+    Policy: a batch is dispatched as soon as it reaches max_batch requests,
+    when a pool worker is free, or max_wait_ms after its first request,
+    whichever comes first. Requests for different model sizes are batched
+    separately. A full pool (PoolFullError) fails every request in the batch.
+    
+    Usage:
+        scheduler = STTBatchScheduler(adapter.transcribe_batch, pool)
+        text, timing = await scheduler.transcribe(pcm, 16000, model_size="tiny")
+    """
+
+    def __init__(
+        self,
+        transcribe_batch: Callable[..., List[str]],
+        pool,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            transcribe_batch: Blocking fn(audios, sample_rates, model_size=...) -> texts
+            pool: InferencePool the batches run on (one pool job per batch)
+            max_batch: Most requests per batch
+            max_wait_ms: Longest a request waits for others to join its batch
+        """
+        self.transcribe_batch = transcribe_batch
+        self.pool = pool
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000
+        self._pending: Dict[Optional[str], List[_Request]] = {}
+        self._timers: Dict[Optional[str], asyncio.TimerHandle] = {}
+        self._inflight = 0  # dispatched batches not finished yet
+        self.batches = 0
+        self.requests = 0
+        self.sizes: Counter = Counter()
+        self._waits = deque(maxlen=100)  # recent time spent waiting for a batch (s)
+
+    async def transcribe(self, audio: np.ndarray, sample_rate: int = 16000,
+                         model_size: Optional[str] = None) -> Tuple[str, Dict[str, float]]:
+        """
+        Transcribe one utterance as part of a batch.
+        
+        Returns:
+            (text, {"wait_s": batching + pool queue wait, "run_s": batch run time,
+            "batch_size": requests in the batch})
+        
+        Raises:
+            PoolFullError: If the pool rejected the batch
+        """
+        loop = asyncio.get_event_loop()
+        request = _Request(audio, sample_rate, loop.create_future())
+        batch = self._pending.setdefault(model_size, [])
+        batch.append(request)
+        if len(batch) >= self.max_batch or self._inflight < self.pool.workers:
+            self._flush(model_size)
+        elif model_size not in self._timers:
+            self._timers[model_size] = loop.call_later(self.max_wait_s, self._flush, model_size)
+        return await request.future
+
+    def _flush(self, model_size: Optional[str]) -> None:
+        timer = self._timers.pop(model_size, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model_size, None)
+        if not batch:
+            return
+        self._inflight += 1
+        asyncio.ensure_future(self._run(model_size, batch))
+
+    async def _run(self, model_size: Optional[str], batch: List[_Request]) -> None:
+        dispatched = time.monotonic()
+        try:
+            texts, timing = await self.pool.run_timed(
+                self.transcribe_batch,
+                [r.audio for r in batch],
+                [r.sample_rate for r in batch],
+                model_size=model_size,
+            )
+        except Exception as e:
+            for r in batch:
+                if not r.future.done():
+                    r.future.set_exception(e)
+        else:
+            self.batches += 1
+            self.requests += len(batch)
+            self.sizes[len(batch)] += 1
+            log.debug("STT batch of %d (model %s): run %.0fms", len(batch), model_size, 1000 * timing["run_s"])
+            for r, text in zip(batch, texts):
+                waited = dispatched - r.queued
+                self._waits.append(waited)
+                if not r.future.done():  # the caller may have gone away
+                    r.future.set_result((text, {
+                        "wait_s": waited + timing["wait_s"],
+                        "run_s": timing["run_s"],
+                        "batch_size": len(batch),
+                    }))
+        finally:
+            self._inflight -= 1
+            # A worker is free again: start whatever gathered in the meantime
+            for size in list(self._pending):
+                if self._inflight < self.pool.workers:
+                    self._flush(size)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch size distribution and time requests spent waiting to be batched."""
+        waits = list(self._waits)
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": round(1000 * self.max_wait_s, 1),
+            "batches": self.batches,
+            "requests": self.requests,
+            "pending": sum(len(b) for b in self._pending.values()),
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": max(self.sizes) if self.sizes else 0,
+            "batch_sizes": {str(k): v for k, v in sorted(self.sizes.items())},
+            "batch_wait_ms_avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+        }
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Whisper Model Pool
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Process-wide pool of warm faster-whisper models. Models are keyed by
+(model_size, compute_type, cpu_threads), loaded once, shared across executor
+threads, and evicted least-recently-used when more sizes are requested than
+the pool can hold.
+
+--------------------------------------------------------------------------
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("model_pool")
+
+ModelKey = Tuple[str, str, int]
+
+
+def _load_whisper_model(model_size: str, compute_type: str, cpu_threads: int):
+    """Default loader: build a CPU faster-whisper model."""
+    from faster_whisper import WhisperModel
+    return WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+
+
+class WhisperModelPool:
+    """
+    LRU pool of loaded Whisper models.
+
+    Loading happens at most once per key even when several threads ask for
+    the same model at the same time. CTranslate2 models are safe to call
+    from multiple threads, so callers share the returned instance.
+
+    Usage:
+        pool = get_model_pool()
+        model = pool.get("tiny")
+        segments, info = model.transcribe("audio.wav")
+    """
+
+    def __init__(
+        self,
+        max_models: int = 2,
+        loader: Optional[Callable[[str, str, int], Any]] = None,
+    ):
+        """
+        Initialize model pool.
+
+        Args:
+            max_models: Maximum number of models kept loaded at once
+            loader: Callable (model_size, compute_type, cpu_threads) -> model.
+                    Defaults to building a faster-whisper WhisperModel.
+        """
+        self.max_models = max(1, int(max_models))
+        self._loader = loader or _load_whisper_model
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, model_size: str = "tiny", compute_type: str = "int8", cpu_threads: int = 0):
+        """
+        Return a loaded model for the key, loading it if necessary.
+
+        Args:
+            model_size: Whisper model size ("tiny", "base", "small", "medium")
+            compute_type: CTranslate2 compute type (e.g. "int8", "float32")
+            cpu_threads: Number of CPU threads (0 = library default)
+
+        Returns:
+            Loaded model instance
+        """
+        key: ModelKey = (model_size, compute_type, int(cpu_threads))
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Load outside the pool lock so other sizes stay available meanwhile
+        with key_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    return model
+
+            logger.info("Loading Whisper model: %s (compute_type=%s, cpu_threads=%d)", *key)
+            model = self._loader(*key)
+
+            with self._lock:
+                self._models[key] = model
+                self._models.move_to_end(key)
+                self.loads += 1
+                while len(self._models) > self.max_models:
+                    # The key's lock stays: a thread may hold or wait on it, and a
+                    # fresh lock would let a second load of the same model start
+                    old_key, _old = self._models.popitem(last=False)
+                    self.evictions += 1
+                    logger.info("Evicted Whisper model: %s (compute_type=%s, cpu_threads=%d)", *old_key)
+            return model
+
+    def preload(self, model_size: str = "tiny", compute_type: str = "int8", cpu_threads: int = 0) -> None:
+        """Load a model eagerly so the first request does not pay for it."""
+        self.get(model_size, compute_type, cpu_threads)
+
+    def loaded(self) -> list:
+        """Return loaded keys, least recently used first."""
+        with self._lock:
+            return list(self._models.keys())
+
+    def clear(self) -> None:
+        """Drop all loaded models."""
+        with self._lock:
+            self._models.clear()  # key locks stay (see get()); there are only a few keys
+
+
+_pool: Optional[WhisperModelPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Get or create the process-wide model pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from assistant.core.config import Config
+                _pool = WhisperModelPool(max_models=Config.STT_MODEL_POOL_SIZE)
+    return _pool
@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+STT Worker Processes
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Whisper transcription in separate worker processes, so CPU-heavy decoding
+doesn't contend for the GIL with the uvicorn event loop, VAD and TTS. Each
+worker loads its model once at startup and then serves requests over a pipe;
+PCM is handed over through a per-worker shared memory segment rather than
+pickled. Workers are health-checked in the background and restarted when
+they die or stop answering. STTProcessPool has the same methods as
+WhisperAdapter, including batched and segment transcription, so STT, the
+incremental transcriber and the server's batch scheduler use it as their
+adapter unchanged.
+
+--------------------------------------------------------------------------
+"""
+
+import atexit
+import functools
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7: PCM is pickled instead
+    shared_memory = None
+
+log = logging.getLogger("stt.process_pool")
+
+STARTUP_TIMEOUT_S = 120.0  # model load, including a first download
+JOB_TIMEOUT_S = 60.0       # a worker silent for longer is restarted
+HEALTH_INTERVAL_S = 5.0
+PING_TIMEOUT_S = 5.0
+
+
+class WorkerError(RuntimeError):
+    """A worker crashed, timed out or failed to load its model."""
+
+
+def _align(offset: int) -> int:
+    return (offset + 63) & ~63
+
+
+def _worker_main(conn, adapter_factory: Callable[[], Any]) -> None:
+    """Worker process: load the model, then answer requests until told to stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles Ctrl+C
+    try:
+        adapter = adapter_factory()
+        preload = getattr(adapter, "preload", None)
+        if callable(preload):
+            preload()
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", os.getpid()))
+
+    segment = None
+
+    def clips(ref) -> List[np.ndarray]:
+        """Arrays for an ("shm", name, layouts) or ("pcm", clips) audio reference."""
+        nonlocal segment
+        if ref[0] == "pcm":
+            return [np.frombuffer(data, dtype=dtype).reshape(shape) for data, shape, dtype in ref[1]]
+        _, name, layouts = ref
+        if segment is None or segment.name != name:
+            if segment is not None:
+                segment.close()
+            segment = shared_memory.SharedMemory(name=name)
+        return [np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=offset)
+                for offset, shape, dtype in layouts]
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        kind = msg[0]
+        if kind == "stop":
+            break
+        if kind == "ping":
+            conn.send(("pong",))
+            continue
+        try:
+            if kind == "path":
+                _, path, model_size = msg
+                text = adapter.transcribe(path, model_size=model_size)
+            elif kind == "shm":
+                _, name, shape, dtype, sample_rate, model_size = msg
+                if segment is None or segment.name != name:
+                    if segment is not None:
+                        segment.close()
+                    segment = shared_memory.SharedMemory(name=name)
+                audio = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+                try:
+                    text = adapter.transcribe_array(audio, sample_rate, model_size=model_size)
+                finally:
+                    del audio  # release the buffer export before the segment can be closed
+            elif kind == "pcm":  # pickled fallback
+                _, data, shape, dtype, sample_rate, model_size = msg
+                audio = np.frombuffer(data, dtype=dtype).reshape(shape)
+                text = adapter.transcribe_array(audio, sample_rate, model_size=model_size)
+            elif kind == "batch":
+                _, ref, sample_rates, model_size = msg
+                audios = clips(ref)
+                try:
+                    text = adapter.transcribe_batch(audios, sample_rates, model_size=model_size)
+                finally:
+                    del audios
+            elif kind == "segments":
+                _, ref, prompt, model_size = msg
+                audios = clips(ref)
+                try:
+                    text = adapter.transcribe_segments(audios[0], prompt=prompt, model_size=model_size)
+                finally:
+                    del audios
+            else:
+                raise ValueError(f"unknown request {kind!r}")
+            conn.send(("ok", text))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+    if segment is not None:
+        segment.close()
+
+
+class _Worker:
+    """Parent-side handle: process, pipe and shared memory segment of one worker."""
+
+    def __init__(self, ctx, index: int, adapter_factory: Callable[[], Any]):
+        self.index = index
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, adapter_factory),
+            name=f"stt-worker-{index}", daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.jobs = 0
+        self.segment = None
+
+    def write_pcm(self, audio: np.ndarray):
+        """Copy PCM into this worker's segment (grown as needed); return the message fields."""
+        if self.segment is None or self.segment.size < audio.nbytes:
+            self.release_segment()
+            self.segment = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+        np.ndarray(audio.shape, dtype=audio.dtype, buffer=self.segment.buf)[...] = audio
+        return self.segment.name, audio.shape, audio.dtype.str
+
+    def write_clips(self, audios: List[np.ndarray]):
+        """Copy several clips back to back into the segment; return its name and (offset, shape, dtype) per clip."""
+        layouts, size = [], 0
+        for audio in audios:
+            offset = _align(size)
+            layouts.append((offset, audio.shape, audio.dtype.str))
+            size = offset + audio.nbytes
+        if self.segment is None or self.segment.size < size:
+            self.release_segment()
+            self.segment = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for audio, (offset, shape, dtype) in zip(audios, layouts):
+            np.ndarray(shape, dtype=dtype, buffer=self.segment.buf, offset=offset)[...] = audio
+        return self.segment.name, layouts
+
+    def release_segment(self) -> None:
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+    def stop(self, timeout: float = 2.0) -> None:
+        try:
+            self.conn.send(("stop",))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout)
+        self.conn.close()
+        self.release_segment()
+
+
+class STTProcessPool:
+    """
+    Pool of Whisper worker processes, usable as an STT adapter.
+    
+    Calls are blocking and meant for executor threads (STT and the server's
+    inference pool already run adapters there); each call occupies one
+    worker, so size INFERENCE_WORKERS to match. Workers start on first use or
+    preload().
+    
+    Usage:
+        pool = STTProcessPool(workers=2, model_size="base")
+        pool.preload()
+        text = pool.transcribe_array(pcm, 16000)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        model_size: str = "tiny",
+        compute_type: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
+        adapter_factory: Optional[Callable[[], Any]] = None,
+        start_method: str = "spawn",
+        job_timeout: float = JOB_TIMEOUT_S,
+        health_interval: float = HEALTH_INTERVAL_S,
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            workers: Number of worker processes
+            model_size, compute_type, cpu_threads: WhisperAdapter settings for each worker
+            adapter_factory: Picklable callable building a worker's adapter
+                (default: WhisperAdapter with the settings above)
+            start_method: multiprocessing start method. "spawn" (default) loads
+                the model in each fresh worker; "fork" is faster to start but
+                unsafe once CTranslate2 threads exist in the parent
+            job_timeout: Seconds a worker may take per request before it is restarted
+            health_interval: Seconds between background health checks (0 = off)
+        """
+        if adapter_factory is None:
+            from assistant.core.stt.whisper_adapter import WhisperAdapter
+            adapter_factory = functools.partial(WhisperAdapter, model_size, compute_type, cpu_threads)
+        self.workers = max(1, int(workers))
+        self.model_size = model_size
+        self.adapter_factory = adapter_factory
+        self.job_timeout = job_timeout
+        self.health_interval = health_interval
+        self._ctx = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: List[_Worker] = []
+        self._started = False
+        self._closed = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self.completed = 0
+        self.failed = 0
+        self.restarts = 0
+
+    # -- lifecycle ----------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker processes and the health monitor (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            if self._closed.is_set():
+                raise WorkerError("STT process pool is closed")
+            for index in range(self.workers):
+                worker = _Worker(self._ctx, index, self.adapter_factory)
+                self._all.append(worker)
+                self._idle.put(worker)
+            self._started = True
+        log.info("Started %d STT worker processes (model %s)", self.workers, self.model_size)
+        if self.health_interval > 0:
+            self._monitor = threading.Thread(target=self._monitor_loop, name="stt-pool-monitor", daemon=True)
+            self._monitor.start()
+
+    def preload(self) -> None:
+        """Start the workers and wait until every one has loaded its model."""
+        self.start()
+        workers = [self._idle.get() for _ in range(self.workers)]
+        try:
+            for i, worker in enumerate(workers):
+                try:
+                    self._ensure_ready(worker)
+                except WorkerError:
+                    workers[i] = self._restart(worker)
+                    raise
+        finally:
+            for worker in workers:
+                self._idle.put(worker)
+
+    def close(self) -> None:
+        """Stop all workers and release their shared memory."""
+        self._closed.set()
+        with self._lock:
+            workers, self._all = self._all, []
+            self._started = False
+        for worker in workers:
+            worker.stop()
+        if self._monitor is not None:
+            self._monitor.join(timeout=1.0)
+
+    # -- adapter interface --------------------------------------------------
+
+    def transcribe(self, path: Union[str, Path], model_size: Optional[str] = None) -> str:
+        """Transcribe a WAV file (the worker reads it from disk)."""
+        return self._call(lambda worker: ("path", str(path), model_size))
+
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = 16000,
+                         model_size: Optional[str] = None) -> str:
+        """Transcribe in-memory audio, handed to the worker through shared memory."""
+        audio = np.ascontiguousarray(audio)
+
+        def message(worker: _Worker):
+            if shared_memory is None:
+                return ("pcm", audio.tobytes(), audio.shape, audio.dtype.str, sample_rate, model_size)
+            name, shape, dtype = worker.write_pcm(audio)
+            return ("shm", name, shape, dtype, sample_rate, model_size)
+
+        return self._call(message)
+
+    def transcribe_batch(self, audios: List[np.ndarray], sample_rates: Optional[List[int]] = None,
+                         model_size: Optional[str] = None) -> List[str]:
+        """Transcribe several clips in one batched pass on a single worker (see batching.py)."""
+        audios = [np.ascontiguousarray(audio) for audio in audios]
+        return self._call(lambda worker: ("batch", self._clips_ref(worker, audios), sample_rates, model_size))
+
+    def transcribe_segments(self, audio: np.ndarray, prompt: Optional[str] = None,
+                            model_size: Optional[str] = None) -> List[Tuple[float, float, str]]:
+        """Transcribe 16kHz mono audio into timed segments (incremental transcription)."""
+        audio = np.ascontiguousarray(audio)
+        return self._call(lambda worker: ("segments", self._clips_ref(worker, [audio]), prompt, model_size))
+
+    # -- internals ----------------------------------------------------------
+
+    @staticmethod
+    def _clips_ref(worker: _Worker, audios: List[np.ndarray]) -> tuple:
+        """Audio reference for a batch/segments message: shared memory, or pickled PCM."""
+        if shared_memory is None:
+            return ("pcm", [(audio.tobytes(), audio.shape, audio.dtype.str) for audio in audios])
+        name, layouts = worker.write_clips(audios)
+        return ("shm", name, layouts)
+
+    def _call(self, build_message: Callable[[_Worker], tuple]) -> Any:
+        self.start()
+        worker = self._idle.get()
+        try:
+            self._ensure_ready(worker)
+            worker.conn.send(build_message(worker))
+            reply = self._receive(worker, self.job_timeout)
+        except WorkerError:
+            self._count("failed")
+            worker = self._restart(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+        if reply[0] != "ok":
+            self._count("failed", worker)
+            raise WorkerError(f"STT worker {worker.index} failed: {reply[1]}")
+        self._count("completed", worker)
+        return reply[1]
+
+    def _count(self, counter: str, worker: Optional[_Worker] = None) -> None:
+        """Bump a job counter (and the worker's job count) under the pool lock."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            if worker is not None:
+                worker.jobs += 1
+
+    def _receive(self, worker: _Worker, timeout: float) -> tuple:
+        try:
+            if not worker.conn.poll(timeout):
+                raise WorkerError(f"STT worker {worker.index} did not answer within {timeout:.0f}s")
+            return worker.conn.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerError(f"STT worker {worker.index} exited (code {worker.process.exitcode})") from e
+
+    def _ensure_ready(self, worker: _Worker) -> None:
+        """Wait for the worker's startup message (model loaded)."""
+        if worker.ready:
+            return
+        reply = self._receive(worker, STARTUP_TIMEOUT_S)
+        if reply[0] != "ready":
+            raise WorkerError(f"STT worker {worker.index} failed to start: {reply[1]}")
+        worker.ready = True
+        log.info("STT worker %d ready (pid %d)", worker.index, reply[1])
+
+    def _restart(self, worker: _Worker) -> _Worker:
+        """Replace a dead or hung worker with a fresh process."""
+        log.warning("Restarting STT worker %d (pid %s)", worker.index, worker.process.pid)
+        worker.stop(timeout=0.5)
+        replacement = _Worker(self._ctx, worker.index, self.adapter_factory)
+        with self._lock:
+            self._all = [replacement if w is worker else w for w in self._all]
+            self.restarts += 1
+        return replacement
+
+    def _monitor_loop(self) -> None:
+        """Ping idle workers; restart those that died or don't answer."""
+        while not self._closed.wait(self.health_interval):
+            for _ in range(self._idle.qsize()):
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    if worker.ready:
+                        worker.conn.send(("ping",))
+                        self._receive(worker, PING_TIMEOUT_S)
+                    elif not worker.process.is_alive():
+                        raise WorkerError(f"STT worker {worker.index} exited during startup")
+                except (WorkerError, OSError):
+                    if not self._closed.is_set():
+                        worker = self._restart(worker)
+                finally:
+                    self._idle.put(worker)
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker processes, their state and job counters."""
+        with self._lock:
+            workers = [(w, w.jobs) for w in self._all]
+            counters = {"completed": self.completed, "failed": self.failed, "restarts": self.restarts}
+        return {
+            "workers": self.workers,
+            "idle": self._idle.qsize(),
+            **counters,
+            "shared_memory": shared_memory is not None,
+            "processes": [
+                {"index": w.index, "pid": w.process.pid, "alive": w.process.is_alive(),
+                 "ready": w.ready, "jobs": jobs}
+                for w, jobs in workers
+            ],
+        }
+
+
+_process_pool: Optional[STTProcessPool] = None
+_process_pool_lock = threading.Lock()
+
+
+def get_stt_process_pool() -> STTProcessPool:
+    """Get or create the process-wide STT worker pool (Config.STT_PROCESSES workers)."""
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                from assistant.core.config import Config
+                _process_pool = STTProcessPool(
+                    workers=Config.STT_PROCESSES,
+                    model_size=Config.STT_MODEL_SIZE,
+                    compute_type=Config.STT_COMPUTE_TYPE,
+                    cpu_threads=Config.STT_CPU_THREADS,
+                    start_method=Config.STT_PROCESS_START_METHOD,
+                )
+                atexit.register(close_stt_process_pool)
+    return _process_pool
+
+
+def close_stt_process_pool() -> None:
+    """Stop the process-wide pool if it was created."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.close()
@@ -27,9 +27,10 @@ SOFTWARE.
 --------------------------------------------------------------------------
 
 Remote STT adapter that proxies transcription requests to a remote server.
-Uploads WAV files via HTTP and receives transcripts. Maintains the same
-interface as the local whisper_adapter for drop-in replacement. Expects
-server API at POST /api/stt/transcribe with multipart/form-data.
+Uploads WAV files via HTTP over a shared keep-alive connection and receives
+transcripts. Maintains the same interface as the local whisper_adapter for
+drop-in replacement. Expects server API at POST /api/stt/transcribe with
+multipart/form-data.
 
 --------------------------------------------------------------------------
 """
@@ -38,7 +39,8 @@ import logging
 from pathlib import Path
 from typing import Union
 import httpx
-import asyncio
+
+from assistant.core.http import get_http_clients
 
 logger = logging.getLogger("remote_stt")
 
@@ -74,31 +76,31 @@ async def transcribe_file_async(
     
     logger.info("Uploading audio to %s (model: %s)", api_url, model_size)
     
-    # Read file and upload
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        with open(wav_path, "rb") as f:
-            files = {"audio": (wav_path.name, f, "audio/wav")}
-            data = {"model_size": model_size}
+    # Read file and upload over the shared keep-alive connection
+    client = get_http_clients().get(api_url)
+    with open(wav_path, "rb") as f:
+        files = {"audio": (wav_path.name, f, "audio/wav")}
+        data = {"model_size": model_size}
+        
+        try:
+            response = await client.post(api_url, files=files, data=data, timeout=timeout)
+            response.raise_for_status()
+            
+            result = response.json()
+            text = result.get("text", "").strip()
             
-            try:
-                response = await client.post(api_url, files=files, data=data)
-                response.raise_for_status()
-                
-                result = response.json()
-                text = result.get("text", "").strip()
-                
-                logger.debug("Transcription received: %s", text[:50] if text else "(empty)")
-                return text
-                
-            except httpx.TimeoutException as e:
-                logger.error("STT request timed out after %.1fs", timeout)
-                raise
-            except httpx.HTTPStatusError as e:
-                logger.error("STT server error: %s %s", e.response.status_code, e.response.text)
-                raise
-            except httpx.RequestError as e:
-                logger.error("STT network error: %s", e)
-                raise
+            logger.debug("Transcription received: %s", text[:50] if text else "(empty)")
+            return text
+            
+        except httpx.TimeoutException as e:
+            logger.error("STT request timed out after %.1fs", timeout)
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error("STT server error: %s %s", e.response.status_code, e.response.text)
+            raise
+        except httpx.RequestError as e:
+            logger.error("STT network error: %s", e)
+            raise
 
 
 def transcribe_file(
@@ -111,7 +113,7 @@ def transcribe_file(
     Synchronous wrapper for transcribe_file_async.
     
     This maintains compatibility with the local whisper_adapter interface
-    while using async HTTP under the hood.
+    while using async HTTP under the hood. Safe to call from worker threads.
     
     Args:
         path: Path to WAV file
@@ -122,30 +124,10 @@ def transcribe_file(
     Returns:
         Transcribed text string
     """
-    try:
-        # Try to get running event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, we need to use a different approach
-            # This shouldn't happen if called from asyncio.to_thread()
-            logger.warning("Event loop is running, creating new thread for HTTP request")
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(
-                    lambda: asyncio.run(
-                        transcribe_file_async(path, server_url, model_size, timeout)
-                    )
-                )
-                return future.result()
-        else:
-            return loop.run_until_complete(
-                transcribe_file_async(path, server_url, model_size, timeout)
-            )
-    except RuntimeError:
-        # No event loop, create one
-        return asyncio.run(
-            transcribe_file_async(path, server_url, model_size, timeout)
-        )
+    # Runs on the shared clients' background loop, reusing pooled connections
+    return get_http_clients().run_sync(
+        transcribe_file_async(path, server_url, model_size, timeout)
+    )
 
 
 class RemoteSTTAdapter:
@@ -157,6 +139,7 @@ class RemoteSTTAdapter:
     Usage:
         adapter = RemoteSTTAdapter(server_url="http://localhost:8000")
         text = adapter.transcribe("audio.wav")
+        text = await adapter.transcribe_async("audio.wav")  # from async code
     """
     
     def __init__(
@@ -194,4 +177,20 @@ class RemoteSTTAdapter:
             self.model_size,
             self.timeout,
         )
-
+    
+    async def transcribe_async(self, path: Union[str, Path]) -> str:
+        """
+        Transcribe audio file using remote server, on the caller's event loop.
+        
+        Args:
+            path: Path to WAV file
+        
+        Returns:
+            Transcribed text string
+        """
+        return await transcribe_file_async(
+            path,
+            self.server_url,
+            self.model_size,
+            self.timeout,
+        )
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Incremental Transcription
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Incremental speech-to-text while the user is still speaking. Growing windows
+of the recording are transcribed with the warm model; segments that end well
+before the window edge and agree with the previous pass are committed, and
+the next window starts after them. On endpointing only the uncommitted tail
+is transcribed, so the wait after the user stops talking depends on the
+length of the tail rather than the whole utterance.
+
+--------------------------------------------------------------------------
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+SR = 16000
+STABLE_MARGIN_S = 1.0  # segments ending closer than this to the window edge may still change
+MIN_WINDOW_S = 1.0  # don't run the model on less uncommitted audio than this
+MIN_TAIL_S = 0.1  # shorter tails at finalize are treated as silence
+
+Segment = Tuple[float, float, str]
+
+log = logging.getLogger("stt.streaming")
+
+
+class IncrementalTranscriber:
+    """
+    Transcribes one utterance in passes while it is being recorded.
+    
+    The adapter must provide `transcribe_segments(audio, prompt=None)`
+    returning (start_s, end_s, text) tuples for in-memory audio. `update`
+    and `finalize` are blocking and meant to run in an executor, one call at
+    a time per utterance.
+    
+    Usage:
+        transcriber = IncrementalTranscriber(WhisperAdapter())
+        transcriber.reset()
+        partial = transcriber.update(audio_so_far)   # repeatedly while recording
+        text = transcriber.finalize(full_audio)      # after endpointing
+    """
+
+    def __init__(
+        self,
+        adapter,
+        sample_rate: int = SR,
+        stable_margin_s: float = STABLE_MARGIN_S,
+        min_window_s: float = MIN_WINDOW_S,
+    ):
+        self.adapter = adapter
+        self.sample_rate = sample_rate
+        self.stable_margin_s = stable_margin_s
+        self.min_window = int(min_window_s * sample_rate)
+        self.passes = 0  # model runs for the current utterance, including finalize
+        self.last_tail_s = 0.0  # audio transcribed by the last finalize
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the current utterance."""
+        self._committed = 0  # samples covered by committed text
+        self._committed_text: List[str] = []
+        self._pending: List[Segment] = []  # last pass's uncommitted segments
+        self.passes = 0
+
+    @property
+    def committed_s(self) -> float:
+        """Seconds of audio whose text is final."""
+        return self._committed / self.sample_rate
+
+    @property
+    def text(self) -> str:
+        """Committed text followed by the latest uncommitted hypothesis."""
+        return " ".join(self._committed_text + [seg[2] for seg in self._pending]).strip()
+
+    def _transcribe(self, audio: np.ndarray) -> List[Segment]:
+        self.passes += 1
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32) / 32768.0  # also copies out of the ring buffer
+        prompt = " ".join(self._committed_text) or None
+        return self.adapter.transcribe_segments(audio, prompt=prompt)
+
+    def update(self, audio: np.ndarray) -> str:
+        """
+        Transcribe the uncommitted part of the utterance recorded so far.
+        
+        Args:
+            audio: The whole utterance so far (int16 or float32), starting at
+                the same sample on every call
+        
+        Returns:
+            Current partial text
+        """
+        window = audio[self._committed:]
+        if len(window) < self.min_window:
+            return self.text
+
+        segments = self._transcribe(window)
+        cutoff = len(window) / self.sample_rate - self.stable_margin_s
+        previous = [seg[2] for seg in self._pending]
+
+        # Commit the leading segments that are away from the edge and unchanged since the last pass
+        stable = 0
+        while (stable < len(segments) and stable < len(previous)
+               and segments[stable][1] <= cutoff and segments[stable][2] == previous[stable]):
+            stable += 1
+
+        if stable:
+            self._committed_text.extend(seg[2] for seg in segments[:stable])
+            self._committed += int(segments[stable - 1][1] * self.sample_rate)
+            # Re-base the rest so the next pass can compare against it
+            shift = segments[stable - 1][1]
+            segments = [(s - shift, e - shift, t) for s, e, t in segments[stable:]]
+        self._pending = segments
+        return self.text
+
+    def finalize(self, audio: np.ndarray) -> str:
+        """
+        Transcribe the trailing audio after the committed point and return the
+        full text. Resets for the next utterance.
+        """
+        tail = audio[self._committed:]
+        self.last_tail_s = len(tail) / self.sample_rate
+        segments = self._transcribe(tail) if len(tail) >= MIN_TAIL_S * self.sample_rate else []
+        text = " ".join(self._committed_text + [seg[2] for seg in segments]).strip()
+        log.debug("Finalized after %d passes (committed %.2fs, tail %.2fs)",
+                  self.passes, self.committed_s, self.last_tail_s)
+        self.reset()
+        return text
+
+
+def create_incremental_transcriber(adapter=None) -> Optional[IncrementalTranscriber]:
+    """
+    Build a transcriber for the configured STT adapter, or None when the
+    adapter can't transcribe in-memory audio (e.g. the remote adapter).
+    """
+    if adapter is None:
+        from assistant.core.config import Config
+        adapter = Config.get_stt_adapter()
+    if not hasattr(adapter, "transcribe_segments"):
+        log.warning("STT adapter %s has no incremental mode, transcribing after endpointing",
+                    type(adapter).__name__)
+        return None
+    return IncrementalTranscriber(adapter)
@@ -29,20 +29,30 @@ SOFTWARE.
 Speech-to-text component for Fish Assistant. Listens for audio recording
 events and transcribes them to text using either local (WhisperAdapter) or
 remote (RemoteSTTAdapter) adapters. Publishes transcript events for NLU
-processing.
+processing. Recordings arrive either as a WAV path or as an in-process audio
+buffer id, which local adapters transcribe without touching the filesystem.
 
 --------------------------------------------------------------------------
 """
 
 import asyncio
 import logging
+import os
 from pathlib import Path
 from typing import Union, Optional
+from assistant.core.audio.buffers import get_buffer_registry
 from assistant.core.contracts import AudioRecorded, STTTranscript, same_trace
 
 
 class STTAdapter:
-    """Protocol for STT adapters - must implement transcribe method."""
+    """
+    Protocol for STT adapters - must implement transcribe method.
+    
+    Adapters may also implement transcribe_array(audio, sample_rate) to take
+    in-memory audio; STT writes a temporary WAV for those that don't.
+    Network-bound adapters may implement transcribe_async(path), which STT
+    awaits on the event loop instead of running transcribe() in an executor.
+    """
     def transcribe(self, path: Union[str, Path]) -> str:
         """Transcribe audio file and return text."""
         raise NotImplementedError
@@ -80,6 +90,22 @@ class STT:
 
     async def start(self):
         self.bus.subscribe("audio.recorded", self._on_recorded)
+        await self.preload()
+
+    async def preload(self):
+        """Warm up the adapter's model (if it has one) so the first utterance is fast."""
+        from assistant.core.config import Config
+        preload = getattr(self.adapter, "preload", None)
+        if not Config.STT_PRELOAD or not callable(preload):
+            return
+        self.log.info("STT: Preloading model...")
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, preload)
+            self.log.info("STT: Model ready")
+        except Exception as e:
+            # Not fatal: the model will be loaded on first use instead
+            self.log.warning("STT: Model preload failed, will load on first use: %s", e)
 
     async def _on_recorded(self, payload: dict):
         try:
@@ -88,22 +114,22 @@ class STT:
             self.log.warning("malformed audio.recorded event, skipping")
             return
 
-        wav_path = audio_event.wav_path.strip()
-        if not wav_path:
-            self.log.debug("empty wav_path, skipping")
-            return
-
-        # Verify file exists
-        if not Path(wav_path).exists():
-            self.log.warning("audio file does not exist: %s", wav_path)
-            return
-
-        # run blocking transcription in thread (Python 3.7 compatible)
-        self.log.info("STT: Transcribing audio file: %s (duration=%.2fs)", wav_path, audio_event.duration_s)
         try:
-            # Use adapter's transcribe method
-            loop = asyncio.get_event_loop()
-            text = await loop.run_in_executor(None, self.adapter.transcribe, wav_path)
+            if audio_event.buffer_id:
+                self.log.info("STT: Transcribing audio buffer %s (duration=%.2fs)", audio_event.buffer_id, audio_event.duration_s)
+                text = await self._transcribe_buffer(audio_event.buffer_id)
+            else:
+                wav_path = audio_event.wav_path.strip()
+                if not wav_path:
+                    self.log.debug("empty wav_path, skipping")
+                    return
+
+                # Verify file exists
+                if not Path(wav_path).exists():
+                    self.log.warning("audio file does not exist: %s", wav_path)
+                    return
+                self.log.info("STT: Transcribing audio file: %s (duration=%.2fs)", wav_path, audio_event.duration_s)
+                text = await self._transcribe_file(wav_path)
             self.log.info("STT: Transcription complete: '%s'", text[:100] if text else "(empty)")
         except Exception as e:
             self.log.exception("STT: Transcription failed: %s", e)
@@ -123,6 +149,42 @@ class STT:
         await self.bus.publish(transcript_event.topic, transcript_event.dict())
         self.log.info("STT: Published stt.transcript event successfully")
 
+    async def _transcribe_file(self, path: str) -> str:
+        """Transcribe a WAV file, awaiting async adapters directly."""
+        transcribe_async = getattr(self.adapter, "transcribe_async", None)
+        if callable(transcribe_async):
+            return await transcribe_async(path)
+        # run blocking transcription in thread (Python 3.7 compatible)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.adapter.transcribe, path)
+
+    async def _transcribe_buffer(self, buffer_id: str) -> str:
+        """
+        Transcribe an in-process audio buffer and release it.
+        
+        Adapters with transcribe_array() get the PCM directly; others (e.g. the
+        remote adapter) get a temporary WAV, since the audio leaves the process.
+        """
+        registry = get_buffer_registry()
+        buffer = registry.get(buffer_id)
+        if buffer is None:
+            raise KeyError(f"audio buffer not found: {buffer_id}")
+        try:
+            transcribe_array = getattr(self.adapter, "transcribe_array", None)
+            if callable(transcribe_array):
+                loop = asyncio.get_event_loop()
+                return await loop.run_in_executor(None, transcribe_array, buffer.pcm, buffer.sample_rate)
+            path = registry.materialize(buffer_id)
+            try:
+                return await self._transcribe_file(path)
+            finally:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        finally:
+            registry.release(buffer_id)
+
     async def stop(self):
         """Cleans up resources before shutdown"""
         self.log.info("stopping STT component")
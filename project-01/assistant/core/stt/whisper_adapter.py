@@ -28,19 +28,41 @@ SOFTWARE.
 
 Local speech-to-text adapter using faster-whisper. Transcribes WAV files
 to text using OpenAI Whisper models. Supports multiple model sizes (tiny,
-base, small, medium) with configurable VAD filtering.
+base, small, medium) with configurable VAD filtering. Loaded models are
+shared through the process-wide model pool (see model_pool.py).
 
 --------------------------------------------------------------------------
 """
 
-from faster_whisper import WhisperModel
 from pathlib import Path
-from typing import Union
+from typing import List, Optional, Tuple, Union
 
-def transcribe_file(path: Union[str, Path], model_size: str = "tiny") -> str:  # "tiny", "base", "small", "medium"
+import numpy as np
+
+from assistant.core.stt.model_pool import get_model_pool
+
+# Fail at import time (like before) when faster-whisper is not installed, so
+# callers can fall back to remote adapters.
+import faster_whisper  # noqa: F401
+
+WHISPER_SAMPLE_RATE = 16000
+BATCH_WINDOW_S = 30           # encoder input length; longer clips aren't batched
+NO_SPEECH_THRESHOLD = 0.6     # faster-whisper defaults for dropping silent clips
+LOG_PROB_THRESHOLD = -1.0
+
+
+def transcribe_file(
+    path: Union[str, Path],
+    model_size: str = "tiny",  # "tiny", "base", "small", "medium"
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+) -> str:
     """
     Transcribe a WAV file using faster-whisper. Returns text string.
     
+    The model comes from the shared model pool, so only the first call for a
+    given (model_size, compute_type, cpu_threads) pays the load cost.
+    
     Note: This function is kept for backward compatibility.
     Consider using WhisperAdapter class for better integration.
     """
@@ -50,8 +72,118 @@ def transcribe_file(path: Union[str, Path], model_size: str = "tiny") -> str:  #
     duration = info.frames / float(info.samplerate) if info.samplerate else 0
     use_vad = duration > 1.0  # Only use VAD for recordings longer than 1 second
     
-    model = WhisperModel(model_size, device="cpu", compute_type="int8")  # simple default
+    model = get_model_pool().get(model_size, compute_type, cpu_threads)
     segments, _info = model.transcribe(str(path), vad_filter=use_vad)
+    return _join_segments(segments)
+
+
+def transcribe_array(
+    audio: np.ndarray,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    model_size: str = "tiny",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+) -> str:
+    """
+    Transcribe in-memory audio (int16 or float32, mono or frames x channels).
+    
+    Same behaviour as transcribe_file without decoding a WAV: multi-channel
+    audio is averaged to mono and other rates are resampled to 16kHz.
+    """
+    audio = _to_whisper_audio(audio, sample_rate)
+    use_vad = len(audio) > WHISPER_SAMPLE_RATE  # Only use VAD for recordings longer than 1 second
+
+    model = get_model_pool().get(model_size, compute_type, cpu_threads)
+    segments, _info = model.transcribe(audio, vad_filter=use_vad)
+    return _join_segments(segments)
+
+
+def transcribe_batch(
+    audios: List[np.ndarray],
+    sample_rates: Optional[List[int]] = None,
+    model_size: str = "tiny",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+) -> List[str]:
+    """
+    Transcribe several utterances with one batched encoder and decoder pass.
+    
+    Each utterance is padded to Whisper's 30 s window, as the model does for a
+    single short clip, so the batch costs about as much per step as one clip.
+    Beam search without temperature fallback, no VAD filter and no timestamps; utterances
+    longer than the window fall back to transcribe_array one at a time.
+    
+    Args:
+        audios: PCM arrays (int16 or float32, mono or frames x channels)
+        sample_rates: Rate of each array (default 16 kHz for all)
+        model_size, compute_type, cpu_threads: Model pool key
+    
+    Returns:
+        One transcript per input, in order
+    """
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+
+    rates = sample_rates or [WHISPER_SAMPLE_RATE] * len(audios)
+    clips = [_to_whisper_audio(a, sr) for a, sr in zip(audios, rates)]
+    texts = [""] * len(clips)
+    window = BATCH_WINDOW_S * WHISPER_SAMPLE_RATE
+    batched = [i for i, clip in enumerate(clips) if 0 < len(clip) <= window]
+    for i, clip in enumerate(clips):
+        if len(clip) > window:
+            texts[i] = transcribe_array(clip, WHISPER_SAMPLE_RATE, model_size, compute_type, cpu_threads)
+    if not batched:
+        return texts
+
+    model = get_model_pool().get(model_size, compute_type, cpu_threads)
+    features = np.stack([pad_or_trim(model.feature_extractor(clips[i])) for i in batched])
+    encoder_output = model.encode(features)
+
+    multilingual = model.model.is_multilingual
+    tokenizer = Tokenizer(model.hf_tokenizer, multilingual, task="transcribe", language="en" if multilingual else None)
+    prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+    prompts = [list(prompt) for _ in batched]
+    if multilingual:
+        # Per-utterance language, as transcribe() detects it for a single clip
+        index = prompt.index(tokenizer.language)
+        for p, langs in zip(prompts, model.model.detect_language(encoder_output)):
+            p[index] = tokenizer.tokenizer.token_to_id(langs[0][0])
+
+    results = model.model.generate(
+        encoder_output,
+        prompts,
+        beam_size=5,
+        max_length=model.max_length,
+        suppress_blank=True,
+        suppress_tokens=[-1],
+        return_scores=True,
+        return_no_speech_prob=True,
+    )
+    for i, result in zip(batched, results):
+        tokens = result.sequences_ids[0]
+        avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+        # Same silence rule as transcribe(): likely no speech and low confidence
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD:
+            continue
+        texts[i] = tokenizer.decode(tokens).strip()
+    return texts
+
+
+def _to_whisper_audio(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Convert PCM to the float32 16 kHz mono Whisper expects."""
+    audio = np.asarray(audio)
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    audio = audio.astype(np.float32, copy=False)
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1)
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        from assistant.core.audio.resample import resample
+        audio = resample(audio, sample_rate, WHISPER_SAMPLE_RATE).astype(np.float32, copy=False)
+    return audio
+
+
+def _join_segments(segments) -> str:
     chunks = []
     for seg in segments:
         if seg.text:
@@ -65,26 +197,109 @@ class WhisperAdapter:
     
     Usage:
         adapter = WhisperAdapter(model_size="tiny")
+        adapter.preload()  # optional, load model before first request
         text = adapter.transcribe("audio.wav")
     """
     
-    def __init__(self, model_size: str = "tiny"):  # "tiny", "base", "small", "medium"
+    def __init__(
+        self,
+        model_size: str = "tiny",  # "tiny", "base", "small", "medium"
+        compute_type: Optional[str] = None,
+        cpu_threads: Optional[int] = None,
+    ):
         """
         Initialize Whisper adapter.
         
         Args:
             model_size: Whisper model size to use
+            compute_type: CTranslate2 compute type (defaults to Config.STT_COMPUTE_TYPE)
+            cpu_threads: CPU threads per model (defaults to Config.STT_CPU_THREADS)
         """
+        from assistant.core.config import Config
         self.model_size = model_size
+        self.compute_type = compute_type or Config.STT_COMPUTE_TYPE
+        self.cpu_threads = Config.STT_CPU_THREADS if cpu_threads is None else cpu_threads
     
-    def transcribe(self, path: Union[str, Path]) -> str:
+    def preload(self) -> None:
+        """Load the model into the shared pool (blocking)."""
+        get_model_pool().preload(self.model_size, self.compute_type, self.cpu_threads)
+    
+    def transcribe(self, path: Union[str, Path], model_size: Optional[str] = None) -> str:
         """
         Transcribe audio file using local Whisper model.
         
         Args:
             path: Path to WAV file
+            model_size: Optional per-call model size override
+        
+        Returns:
+            Transcribed text string
+        """
+        return transcribe_file(
+            path,
+            model_size or self.model_size,
+            self.compute_type,
+            self.cpu_threads,
+        )
+    
+    def transcribe_array(self, audio: np.ndarray, sample_rate: int = WHISPER_SAMPLE_RATE,
+                         model_size: Optional[str] = None) -> str:
+        """
+        Transcribe in-memory audio without writing a WAV file.
+        
+        Args:
+            audio: PCM samples (int16 or float32)
+            sample_rate: Sample rate of `audio`
+            model_size: Optional per-call model size override
         
         Returns:
             Transcribed text string
         """
-        return transcribe_file(path, self.model_size)
\ No newline at end of file
+        return transcribe_array(
+            audio,
+            sample_rate,
+            model_size or self.model_size,
+            self.compute_type,
+            self.cpu_threads,
+        )
+    
+    def transcribe_batch(self, audios: List[np.ndarray], sample_rates: Optional[List[int]] = None,
+                         model_size: Optional[str] = None) -> List[str]:
+        """
+        Transcribe several in-memory utterances in one batched model pass.
+        
+        Used by the server's STT batch scheduler (see batching.py).
+        """
+        return transcribe_batch(
+            audios,
+            sample_rates,
+            model_size or self.model_size,
+            self.compute_type,
+            self.cpu_threads,
+        )
+    
+    def transcribe_segments(
+        self,
+        audio: np.ndarray,
+        prompt: Optional[str] = None,
+        model_size: Optional[str] = None,
+    ) -> List[Tuple[float, float, str]]:
+        """
+        Transcribe in-memory 16kHz mono audio into timed segments.
+        
+        Used by incremental transcription, which feeds growing windows of the
+        recording buffer without writing a WAV file.
+        
+        Args:
+            audio: float32 samples in [-1, 1] (int16 is converted)
+            prompt: Optional text preceding this audio, to keep context
+            model_size: Optional per-call model size override
+        
+        Returns:
+            List of (start_s, end_s, text) relative to the start of `audio`
+        """
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32) / 32768.0
+        model = get_model_pool().get(model_size or self.model_size, self.compute_type, self.cpu_threads)
+        segments, _info = model.transcribe(audio, vad_filter=False, initial_prompt=prompt or None)
+        return [(seg.start, seg.end, seg.text.strip()) for seg in segments if seg.text and seg.text.strip()]
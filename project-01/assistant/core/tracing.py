@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Turn Tracing
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Per-turn tracing keyed by corr_id. The bus records a span for every
+subscriber call (and the queue wait for queued topics), so a turn's trace
+shows how long STT, NLU, each skill, TTS and playback took. Spans also carry
+self time: in direct dispatch a handler awaits everything downstream of the
+events it publishes, and that nested time is subtracted. Recent traces are
+kept in a bounded in-memory store and exported as Chrome trace-event JSON
+(chrome://tracing, Perfetto) and as per-stage p50/p95/p99 summaries.
+
+--------------------------------------------------------------------------
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+MAX_TRACES = 200          # turns kept in memory (oldest dropped first)
+MAX_SPANS_PER_TRACE = 512
+MAX_SAMPLES = 1000        # recent self times per stage used for percentiles
+
+# Nested time (s) accumulated by the span running in the current task
+_nested: "contextvars.ContextVar[Optional[List[float]]]" = contextvars.ContextVar("trace_nested", default=None)
+
+
+@dataclass
+class Span:
+    name: str          # stage, e.g. "STT._on_recorded"
+    cat: str           # "handler", "queue" or "stage"
+    start: float       # perf_counter seconds
+    dur: float         # seconds
+    self_dur: float    # seconds, excluding nested publishes
+    topic: Optional[str] = None
+
+
+class Tracer:
+    """
+    Bounded store of spans grouped by corr_id.
+    
+    Thread-safe: spans may also be recorded from executor threads.
+    
+    Usage:
+        tracer = get_tracer()
+        with tracer.span("stt.model", corr_id):
+            ...
+        tracer.chrome(corr_id)      # Chrome trace-event JSON
+        tracer.summary()            # per-stage p50/p95/p99 (ms)
+    """
+
+    def __init__(self, max_traces: int = MAX_TRACES, max_samples: int = MAX_SAMPLES):
+        self.max_traces = max(1, int(max_traces))
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=max_samples))
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._wall0 = time.time()
+        self.dropped_traces = 0
+
+    def record(self, corr_id: Optional[str], span: Span) -> None:
+        """Add a finished span to its trace and to the stage statistics."""
+        if not corr_id:
+            return
+        with self._lock:
+            spans = self._traces.get(corr_id)
+            if spans is None:
+                spans = self._traces[corr_id] = []
+                while len(self._traces) > self.max_traces:
+                    self._traces.popitem(last=False)
+                    self.dropped_traces += 1
+            if len(spans) < MAX_SPANS_PER_TRACE:
+                spans.append(span)
+            self._samples[span.name].append(span.self_dur)
+
+    @contextmanager
+    def span(self, name: str, corr_id: Optional[str], cat: str = "stage", topic: Optional[str] = None):
+        """
+        Time a block as a span; publishes awaited inside it count as nested time.
+        
+        The bus wraps each subscriber call in a "handler" span; components may
+        add "stage" spans for work inside a handler (e.g. the model call).
+        """
+        nested = [0.0]
+        token = _nested.set(nested)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter() - start
+            _nested.reset(token)
+            if cat == "stage":
+                # A block inside a handler: its downstream time is the handler's too
+                self.add_nested(nested[0])
+            self.record(corr_id, Span(name, cat, start, dur, max(0.0, dur - nested[0]), topic))
+
+    def add_nested(self, seconds: float) -> None:
+        """Count time spent waiting on downstream work against the current span."""
+        parent = _nested.get()
+        if parent is not None:
+            parent[0] += seconds
+
+    def get(self, corr_id: str) -> List[Span]:
+        with self._lock:
+            return list(self._traces.get(corr_id, ()))
+
+    def traces(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent traces first, with per-stage self times (ms)."""
+        with self._lock:
+            items = list(self._traces.items())[-limit:]
+        out = []
+        for corr_id, spans in reversed(items):
+            if not spans:
+                continue
+            start = min(s.start for s in spans)
+            end = max(s.start + s.dur for s in spans)
+            stages: Dict[str, float] = defaultdict(float)
+            for s in spans:
+                stages[s.name] += 1000 * s.self_dur
+            out.append({
+                "corr_id": corr_id,
+                "start_ts_ms": int(1000 * (self._wall0 + start - self._t0)),
+                "duration_ms": round(1000 * (end - start), 1),
+                "stages": {name: round(ms, 1) for name, ms in stages.items()},
+            })
+        return out
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage count and p50/p95/p99 of self time in milliseconds."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items() if values}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(1000 * percentile(values, 50), 1),
+                "p95_ms": round(1000 * percentile(values, 95), 1),
+                "p99_ms": round(1000 * percentile(values, 99), 1),
+            }
+            for name, values in sorted(samples.items())
+        }
+
+    def chrome(self, corr_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Export spans as Chrome trace-event JSON.
+        
+        Each stage gets its own track (tid); all traces, or only corr_id's.
+        """
+        with self._lock:
+            if corr_id is not None:
+                selected = [(corr_id, list(self._traces.get(corr_id, ())))]
+            else:
+                selected = [(cid, list(spans)) for cid, spans in self._traces.items()]
+        tids: Dict[str, int] = {}
+        events = []
+        for cid, spans in selected:
+            for s in spans:
+                tid = tids.setdefault(s.name, len(tids) + 1)
+                events.append({
+                    "name": s.name,
+                    "cat": s.cat,
+                    "ph": "X",
+                    "ts": round(1e6 * (s.start - self._t0), 1),
+                    "dur": round(1e6 * s.dur, 1),
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"corr_id": cid, "topic": s.topic, "self_ms": round(1000 * s.self_dur, 3)},
+                })
+        for name, tid in tids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
+            self._samples.clear()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, int(-(-pct * len(sorted_values) // 100)))  # ceil
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def latency_distribution(seconds: List[float]) -> Dict[str, float]:
+    """Count, mean, p50/p95/p99 and max (ms) of a list of durations in seconds."""
+    if not seconds:
+        return {"count": 0}
+    values = sorted(seconds)
+    return {
+        "count": len(values),
+        "mean_ms": round(1000 * sum(values) / len(values), 1),
+        "p50_ms": round(1000 * percentile(values, 50), 1),
+        "p95_ms": round(1000 * percentile(values, 95), 1),
+        "p99_ms": round(1000 * percentile(values, 99), 1),
+        "max_ms": round(1000 * values[-1], 1),
+    }
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the process-wide tracer, or None when TRACING is off."""
+    global _tracer
+    from assistant.core.config import Config
+    if not Config.TRACING:
+        return None
+    if _tracer is None:
+        _tracer = Tracer(max_traces=Config.TRACE_MAX_TURNS)
+    return _tracer
+
+
+def trace_span(name: str, corr_id: Optional[str]):
+    """Span on the process tracer, or a no-op when tracing is off."""
+    tracer = get_tracer()
+    return tracer.span(name, corr_id) if tracer is not None else nullcontext()
+
+
+def create_trace_router():
+    """
+    FastAPI routes exposing the tracer (shared by the server and client apps):
+    GET /api/traces, /api/traces/summary and /api/traces/chrome?corr_id=...
+    """
+    from fastapi import APIRouter, HTTPException
+
+    router = APIRouter()
+
+    def _tracer() -> Tracer:
+        tracer = get_tracer()
+        if tracer is None:
+            raise HTTPException(status_code=404, detail="Tracing disabled (TRACING=false)")
+        return tracer
+
+    @router.get("/api/traces")
+    async def recent_traces(limit: int = 20):
+        """Most recent turns with per-stage self times."""
+        return {"traces": _tracer().traces(limit)}
+
+    @router.get("/api/traces/summary")
+    async def trace_summary():
+        """Per-stage p50/p95/p99 over recent turns."""
+        return _tracer().summary()
+
+    @router.get("/api/traces/chrome")
+    async def chrome_trace(corr_id: Optional[str] = None):
+        """Chrome trace-event JSON (load in chrome://tracing or Perfetto)."""
+        return _tracer().chrome(corr_id)
+
+    return router
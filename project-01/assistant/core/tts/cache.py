@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+TTS Phrase Cache
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Content-addressed cache of synthesized phrases. Entries are keyed by a hash
+of (normalized text, voice, rate, sample rate) and kept in two tiers: an LRU
+of decoded PCM in memory and a size-capped directory of WAV files on disk.
+Identical requests that arrive while a phrase is being synthesized wait for
+the first one instead of synthesizing it again.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger("tts_cache")
+
+# Same scratch root as recordings (recorder.TMP_DIR) without importing sounddevice
+CACHE_DIR = Path(tempfile.gettempdir()) / "fish" / "tts-cache"
+
+# (int16 PCM frames x channels, sample rate)
+Clip = Tuple[np.ndarray, int]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookup (unicode form and whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text: str, voice: Optional[str] = None, rate: Optional[int] = None, sample_rate: Optional[int] = None) -> str:
+    """Return the content address for a phrase rendered with the given settings."""
+    parts = [normalize_text(text), voice or "", str(rate or 0), str(sample_rate or 0)]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Two-tier cache of synthesized phrases.
+
+    Thread-safe: lookups and synthesis happen on executor threads, or on the
+    event loop for adapters with synth_async().
+
+    Usage:
+        cache = get_tts_cache()
+        key = cache_key("Hello", voice, rate, sample_rate)
+        pcm, sr = cache.get_or_create(key, lambda: synth_pcm("Hello"))
+        buffer_id = get_buffer_registry().put(pcm, sr)
+    """
+
+    def __init__(
+        self,
+        max_items: int = 64,
+        disk_dir: Optional[Path] = None,
+        disk_max_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Initialize phrase cache.
+
+        Args:
+            max_items: Maximum number of clips kept decoded in memory
+            disk_dir: Directory for the on-disk tier (None disables it)
+            disk_max_bytes: Size cap of the on-disk tier in bytes
+        """
+        self.max_items = max(1, int(max_items))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = int(disk_max_bytes)
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+        self._memory: "OrderedDict[str, Clip]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.bytes_served = 0
+        self.bytes_synthesized = 0
+
+    def get(self, key: str) -> Optional[Clip]:
+        """Return a cached clip (memory first, then disk) or None."""
+        with self._lock:
+            clip = self._memory.get(key)
+            if clip is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.bytes_served += clip[0].nbytes
+                return clip
+
+        clip = self._read_disk(key)
+        if clip is None:
+            return None
+        with self._lock:
+            self._remember(key, clip)
+            self.hits += 1
+            self.disk_hits += 1
+            self.bytes_served += clip[0].nbytes
+        return clip
+
+    def put(self, key: str, pcm: np.ndarray, sample_rate: int) -> Clip:
+        """Store a clip in both tiers and return it."""
+        clip = (_as_pcm16(pcm), int(sample_rate))
+        with self._lock:
+            self._remember(key, clip)
+        self._write_disk(key, clip)
+        return clip
+
+    def get_or_create(self, key: str, create: Callable[[], Clip]) -> Clip:
+        """
+        Return the cached clip for key, calling create() on a miss.
+
+        Concurrent callers with the same key share a single create() call.
+        Errors from create() propagate to every waiting caller and nothing
+        is cached.
+        """
+        clip = self.get(key)
+        if clip is not None:
+            return clip
+
+        future, owner = self._claim(key)
+        if not owner:
+            return future.result()
+
+        try:
+            clip = self._fill(key, *create())
+            future.set_result(clip)
+            return clip
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def get_or_create_async(self, key: str, create: Callable[[], Awaitable[Clip]]) -> Clip:
+        """
+        Like get_or_create(), for adapters that synthesize with a coroutine.
+
+        Shares in-flight synthesis with get_or_create() callers on executor
+        threads, so a phrase is still synthesized once per key.
+        """
+        clip = self.get(key)
+        if clip is not None:
+            return clip
+
+        future, owner = self._claim(key)
+        if not owner:
+            return await asyncio.wrap_future(future)
+
+        try:
+            clip = self._fill(key, *(await create()))
+            future.set_result(clip)
+            return clip
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        """Return (in-flight future, True if the caller must synthesize)."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        return future, owner
+
+    def _fill(self, key: str, pcm: np.ndarray, sample_rate: int) -> Clip:
+        """Store a freshly synthesized clip and return it."""
+        if np.asarray(pcm).size == 0:
+            # Don't pin a failed (silent) synthesis in the cache
+            return (_as_pcm16(pcm), int(sample_rate))
+        clip = self.put(key, pcm, sample_rate)
+        with self._lock:
+            self.bytes_synthesized += clip[0].nbytes
+        return clip
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            memory_bytes = sum(pcm.nbytes for pcm, _ in self._memory.values())
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "memory_items": len(self._memory),
+                "memory_bytes": memory_bytes,
+                "disk_bytes": self._disk_usage(),
+                "bytes_served": self.bytes_served,
+                "bytes_synthesized": self.bytes_synthesized,
+            }
+
+    def clear(self) -> None:
+        """Drop the memory tier and delete the disk tier's files."""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir is None:
+            return
+        with self._disk_lock:
+            for path in self.disk_dir.glob("*.wav"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    # Internals
+
+    def _remember(self, key: str, clip: Clip) -> None:
+        """Insert into the memory LRU (caller holds the lock)."""
+        self._memory[key] = clip
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.disk_dir / f"{key}.wav" if self.disk_dir is not None else None
+
+    def _read_disk(self, key: str) -> Optional[Clip]:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            pcm, sr = sf.read(str(path), dtype="int16", always_2d=True)
+            os.utime(str(path), None)  # mark as recently used for eviction
+            pcm.flags.writeable = False
+            return pcm, int(sr)
+        except Exception as e:
+            logger.warning("TTS cache: unreadable entry %s: %s", path.name, e)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+    def _write_disk(self, key: str, clip: Clip) -> None:
+        path = self._disk_path(key)
+        if path is None or self.disk_max_bytes <= 0:
+            return
+        pcm, sr = clip
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with self._disk_lock:
+                sf.write(str(tmp_path), pcm, sr, subtype="PCM_16", format="WAV")
+                os.replace(str(tmp_path), str(path))
+                self._evict_disk()
+        except Exception as e:
+            logger.warning("TTS cache: could not write %s: %s", path.name, e)
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used files until the tier fits its cap (caller holds the disk lock)."""
+        entries = []
+        for path in self.disk_dir.glob("*.wav"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _mtime, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def _disk_usage(self) -> int:
+        if self.disk_dir is None:
+            return 0
+        total = 0
+        for path in self.disk_dir.glob("*.wav"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+
+def _as_pcm16(pcm: np.ndarray) -> np.ndarray:
+    """Return a read-only 2-D int16 copy of float or integer PCM (shared by cache readers)."""
+    pcm = np.asarray(pcm)
+    if pcm.ndim == 1:
+        pcm = pcm[:, None]
+    if np.issubdtype(pcm.dtype, np.floating):
+        pcm = np.round(np.clip(pcm, -1.0, 1.0) * 32767.0)
+    pcm = np.array(pcm, dtype=np.int16, order="C")  # always a copy, even of int16 input
+    pcm.flags.writeable = False
+    return pcm
+
+
+_cache: Optional[TTSCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    """Get or create the process-wide phrase cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from assistant.core.config import Config
+                _cache = TTSCache(
+                    max_items=Config.TTS_CACHE_ITEMS,
+                    disk_dir=CACHE_DIR,
+                    disk_max_bytes=Config.TTS_CACHE_DISK_MB * 1024 * 1024,
+                )
+    return _cache
@@ -28,123 +28,272 @@ SOFTWARE.
 
 Local text-to-speech adapter using pyttsx3. Synthesizes text to WAV files
 using system TTS engines. Supports voice selection and resamples output to
-48000 Hz for USB audio device compatibility.
+48000 Hz in-process for USB audio device compatibility. A single long-lived worker
+thread owns the pre-configured engine and takes synthesis jobs from a queue,
+so engine startup and voice lookup happen once per process.
 
 --------------------------------------------------------------------------
 """
 
 import os
+import queue
 import tempfile
+import threading
 import logging
-import subprocess
+import numpy as np
 import soundfile as sf
-from typing import Optional
+from typing import Callable, Dict, Optional
 import pyttsx3
-import time
 
-class Pyttsx3Adapter:
+from assistant.core.audio.resample import resample
+
+# Speaking rate and volume applied once when the engine is created
+DEFAULT_RATE = 150
+DEFAULT_VOLUME = 1.0
+
+# Output rate expected by USB audio devices on the fish
+TARGET_SAMPLE_RATE = 48000
+
+# Max time to wait for the finished-utterance callback after runAndWait()
+FINISH_TIMEOUT_S = 5.0
+
+# Voices known to produce reliable output when the requested one is missing
+STABLE_VOICES = ['com.apple.voice.compact.en-GB.Daniel', 'com.apple.speech.synthesis.voice.Albert']
+
+
+class _SynthJob:
+    """One save-to-file request handed to the synthesis worker."""
+
+    def __init__(self, text: str, out_path: str, voice: Optional[str]):
+        self.text = text
+        self.out_path = out_path
+        self.voice = voice
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.lock = threading.Lock()
+        self.started = False
+        self.cancelled = False  # caller timed out; nobody will read out_path
+
+    def cancel(self) -> None:
+        with self.lock:
+            self.cancelled = True
+
+    def start(self) -> bool:
+        """Claim the job for the worker; False if it was cancelled while queued."""
+        with self.lock:
+            if self.cancelled:
+                return False
+            self.started = True
+            return True
+
+
+class SynthWorker:
     """
-    Simple TTS adapter using pyttsx3.
-    Synchronously synthesizes text into a temporary WAV file.
+    Long-lived pyttsx3 worker thread.
+
+    pyttsx3 engines are not thread-safe and pyttsx3.init() returns one shared
+    engine per driver, so a single thread owns the engine for the life of the
+    process. The engine is configured once (rate, volume); resolved voice ids
+    are cached per requested voice and only switched when a job asks for a
+    different voice. Completion is taken from the engine's finished-utterance
+    callback instead of polling the output file.
     """
 
-    def __init__(self, voice: Optional[str] = None):
-        self.voice = voice
+    def __init__(
+        self,
+        rate: int = DEFAULT_RATE,
+        volume: float = DEFAULT_VOLUME,
+        engine_factory: Optional[Callable[[], object]] = None,
+        job_timeout: float = 30.0,
+    ):
+        self.rate = rate
+        self.volume = volume
+        self.job_timeout = job_timeout
+        self._engine_factory = engine_factory or pyttsx3.init
+        self._jobs: "queue.Queue[Optional[_SynthJob]]" = queue.Queue()
+        self._voices: list = []
+        self._voice_ids: Dict[Optional[str], Optional[str]] = {}
+        self._current_voice_id: Optional[str] = None
+        self._finished = threading.Event()
+        self._ready = threading.Event()
+        self._init_error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="pyttsx3-worker", daemon=True)
         self.log = logging.getLogger("pyttsx3")
+        self._thread.start()
 
-    def synth(self, text: str) -> str:
-        # Create temp file path
-        fd, out_path = tempfile.mkstemp(suffix=".wav")
-        os.close(fd)
+    def wait_ready(self, timeout: Optional[float] = None) -> None:
+        """Block until the engine is created (raises if engine init failed)."""
+        self._ready.wait(timeout)
+        if self._init_error is not None:
+            raise RuntimeError(f"pyttsx3 engine failed to initialize: {self._init_error}")
+
+    def synth(self, text: str, out_path: str, voice: Optional[str] = None) -> None:
+        """Queue a job and block until the WAV file is written."""
+        self.wait_ready(self.job_timeout)
+        job = _SynthJob(text, out_path, voice)
+        self._jobs.put(job)
+        if not job.done.wait(self.job_timeout):
+            job.cancel()  # the worker skips it, or removes the file if already rendering
+            raise RuntimeError(f"TTS synthesis timed out after {self.job_timeout}s: {out_path}")
+        if job.error is not None:
+            raise job.error
+
+    def close(self) -> None:
+        """Stop the worker thread after pending jobs finish."""
+        self._jobs.put(None)
+        self._thread.join(timeout=self.job_timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
 
-        # Initialize engine
-        engine = pyttsx3.init()
+    # -- worker thread -----------------------------------------------------
 
-        # Add explicit rate and volume
+    def _run(self) -> None:
         try:
-            engine.setProperty('rate', 150) # speaking rate
-            engine.setProperty('volume', 1.0)
-        except Exception as e:
-            self.log.warning("Could not set engine properties: %s", e)
+            engine = self._engine_factory()
+            try:
+                engine.setProperty('rate', self.rate)  # speaking rate
+                engine.setProperty('volume', self.volume)
+            except Exception as e:
+                self.log.warning("Could not set engine properties: %s", e)
+            engine.connect('finished-utterance', self._on_finished)
+            self._voices = list(engine.getProperty("voices") or [])
+        except BaseException as e:
+            self._init_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if not job.start():
+                self.log.debug("Skipping abandoned TTS job: %s", job.out_path)
+                job.done.set()
+                continue
+            try:
+                self._process(engine, job)
+            except BaseException as e:
+                job.error = e
+            finally:
+                job.done.set()
+                with job.lock:
+                    abandoned = job.cancelled
+                if abandoned:
+                    self._discard(job.out_path)
 
-        # Set voice using stable fallback logic.
-        voice_set = False
-        STABLE_VOICES = ['com.apple.voice.compact.en-GB.Daniel', 'com.apple.speech.synthesis.voice.Albert']
+        try:
+            engine.stop()
+        except Exception:
+            pass
+
+    def _discard(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _on_finished(self, name=None, completed=True):
+        self._finished.set()
+
+    def _resolve_voice(self, voice: Optional[str]) -> Optional[str]:
+        """Map a requested voice (id or name) to an engine voice id, cached."""
+        if voice in self._voice_ids:
+            return self._voice_ids[voice]
 
+        voice_id = None
         # Try user's voice first.
-        if self.voice:
-            for v in engine.getProperty("voices"):
-                if self.voice in (v.id, v.name):
-                    engine.setProperty("voice", v.id)
-                    voice_set = True
+        if voice:
+            for v in self._voices:
+                if voice in (v.id, v.name):
+                    voice_id = v.id
                     break
-        
+
         # If user voice failed or wasn't provided, try stable defaults.
-        if not voice_set:
-            available_ids = [v.id for v in engine.getProperty("voices")]
+        if voice_id is None:
+            available_ids = [v.id for v in self._voices]
             for stable_id in STABLE_VOICES:
                 if stable_id in available_ids:
-                    engine.setProperty("voice", stable_id)
+                    voice_id = stable_id
                     self.log.warning("Requested voice not set; falling back to stable voice: %s", stable_id)
-                    voice_set = True
                     break
-        
+
         # Final fallback warning
-        if not voice_set:
-             self.log.warning("Could not set any stable voice; using default engine voice.")
-        
-        # Queue save command
-        engine.save_to_file(text, out_path)
-        self.log.debug("pyttsx3 saving to %s", out_path)
+        if voice_id is None:
+            self.log.warning("Could not set any stable voice; using default engine voice.")
+
+        self._voice_ids[voice] = voice_id
+        return voice_id
+
+    def _process(self, engine, job: _SynthJob) -> None:
+        voice_id = self._resolve_voice(job.voice)
+        if voice_id is not None and voice_id != self._current_voice_id:
+            engine.setProperty("voice", voice_id)
+            self._current_voice_id = voice_id
 
-        # Run and wait for completion
+        self._finished.clear()
+        engine.save_to_file(job.text, job.out_path)
+        self.log.debug("pyttsx3 saving to %s", job.out_path)
         engine.runAndWait()
 
-        # Poll for file completion instead of fixed sleep
-        # pyttsx3 has a race condition where runAndWait() returns before file is fully written
-        # We poll for file existence, size, and validity to minimize latency
-        max_wait = 5.0  # Maximum wait time (safety timeout)
-        poll_interval = 0.05  # Check every 50ms
-        stability_checks = 2  # Number of consecutive valid checks required
-        waited = 0.0
-        valid_checks = 0
-        
-        while waited < max_wait:
-            if os.path.exists(out_path):
-                file_size = os.path.getsize(out_path)
-                if file_size > 0:
-                    # File exists and has content, verify it's a valid audio file
-                    try:
-                        # Quick validation: try to read file info
-                        info = sf.info(out_path)
-                        if info.frames > 0 and info.samplerate > 0:
-                            valid_checks += 1
-                            if valid_checks >= stability_checks:
-                                # File is valid and stable, ready to proceed
-                                self.log.debug("File ready after %.2fs (size: %d bytes, frames: %d)", 
-                                             waited, file_size, info.frames)
-                                break
-                        else:
-                            valid_checks = 0  # Reset if file becomes invalid
-                    except Exception:
-                        # File might still be writing, continue polling
-                        valid_checks = 0
-                else:
-                    valid_checks = 0  # Reset if file is empty
-            else:
-                valid_checks = 0  # Reset if file doesn't exist yet
-            
-            time.sleep(poll_interval)
-            waited += poll_interval
-        
-        if waited >= max_wait:
-            self.log.warning("File polling timeout after %.2fs, proceeding anyway", max_wait)
-            # Verify file exists and has content before proceeding
-            if not os.path.exists(out_path) or os.path.getsize(out_path) == 0:
-                raise RuntimeError(f"TTS output file not ready after {max_wait}s: {out_path}")
+        # Some drivers return from runAndWait() before the file is flushed;
+        # the finished-utterance callback marks the real end of synthesis.
+        if not self._finished.wait(FINISH_TIMEOUT_S):
+            self.log.warning("No finished-utterance callback after %.1fs, proceeding anyway", FINISH_TIMEOUT_S)
+
+        if not os.path.exists(job.out_path) or os.path.getsize(job.out_path) == 0:
+            raise RuntimeError(f"TTS output file not written: {job.out_path}")
+
+
+_worker: Optional[SynthWorker] = None
+_worker_lock = threading.Lock()
 
-        # Explicit stop to finalize file write and release resources
-        engine.stop()
+
+def get_synth_worker() -> SynthWorker:
+    """Get (or restart) the process-wide synthesis worker."""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = SynthWorker()
+        return _worker
+
+
+class Pyttsx3Adapter:
+    """
+    Simple TTS adapter using pyttsx3.
+    Synchronously synthesizes text into a temporary WAV file using the
+    shared synthesis worker.
+    """
+
+    def __init__(self, voice: Optional[str] = None, worker: Optional[SynthWorker] = None):
+        self.voice = voice
+        self.rate = DEFAULT_RATE
+        self.sample_rate = TARGET_SAMPLE_RATE
+        self._worker = worker
+        self.log = logging.getLogger("pyttsx3")
+
+    @property
+    def worker(self) -> SynthWorker:
+        return self._worker or get_synth_worker()
+
+    def preload(self) -> None:
+        """Start the worker and create the engine before the first request."""
+        self.worker.wait_ready()
+
+    def synth(self, text: str) -> str:
+        # Create temp file path
+        fd, out_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+
+        try:
+            self.worker.synth(text, out_path, self.voice)
+        except Exception:
+            try:
+                os.remove(out_path)
+            except Exception:
+                pass
+            raise
 
         self.log.info("pyttsx3 wrote %s", out_path)
         
@@ -156,66 +305,19 @@ class Pyttsx3Adapter:
     
     def _resample_to_48000(self, input_path: str) -> str:
         """
-        Resample audio file to 48000 Hz using sox or ffmpeg.
+        Resample audio file to 48000 Hz in-process and overwrite it.
         Returns path to resampled file (or original if resampling fails/unnecessary).
         """
         try:
-            # Check current sample rate
-            info = sf.info(input_path)
-            current_sr = info.samplerate
+            data, current_sr = sf.read(input_path, dtype="float32", always_2d=True)
             
-            if current_sr == 48000:
+            if current_sr == TARGET_SAMPLE_RATE:
                 # Already at target rate
                 return input_path
             
-            self.log.info("Resampling TTS audio from %d Hz to 48000 Hz", current_sr)
-            
-            # Create output path
-            output_path = input_path.replace('.wav', '_48000.wav')
-            
-            # Try sox first (lightweight, commonly available on macOS/Linux)
-            try:
-                result = subprocess.run(
-                    ['sox', input_path, '-r', '48000', output_path],
-                    capture_output=True,
-                    timeout=10,
-                    check=True
-                )
-                if os.path.exists(output_path):
-                    self.log.info("Resampled using sox: %s -> %s", input_path, output_path)
-                    # Clean up original file
-                    try:
-                        os.remove(input_path)
-                    except Exception:
-                        pass
-                    return output_path
-            except (FileNotFoundError, subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
-                self.log.warning("sox not available or failed: %s", e)
-                if isinstance(e, subprocess.CalledProcessError):
-                    self.log.warning("sox stderr: %s", e.stderr.decode() if e.stderr else "none")
-            
-            # Fallback to ffmpeg
-            try:
-                result = subprocess.run(
-                    ['ffmpeg', '-i', input_path, '-ar', '48000', '-y', output_path],
-                    capture_output=True,
-                    timeout=10,
-                    check=True
-                )
-                if os.path.exists(output_path):
-                    self.log.info("Resampled using ffmpeg: %s -> %s", input_path, output_path)
-                    # Clean up original file
-                    try:
-                        os.remove(input_path)
-                    except Exception:
-                        pass
-                    return output_path
-            except (FileNotFoundError, subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
-                self.log.warning("ffmpeg not available or failed: %s", e)
-            
-            # If both fail, return original (will likely fail on client but at least we tried)
-            self.log.error("Neither sox nor ffmpeg available for resampling! Audio will be at %d Hz (may fail on client)", current_sr)
-            self.log.error("Install sox or ffmpeg to enable resampling: brew install sox  (macOS) or apt-get install sox  (Linux)")
+            self.log.info("Resampling TTS audio from %d Hz to %d Hz", current_sr, TARGET_SAMPLE_RATE)
+            resampled = np.clip(resample(data, current_sr, TARGET_SAMPLE_RATE), -1.0, 1.0)
+            sf.write(input_path, resampled, TARGET_SAMPLE_RATE, subtype="PCM_16")
             return input_path
             
         except Exception as e:
@@ -27,9 +27,10 @@ SOFTWARE.
 --------------------------------------------------------------------------
 
 Remote TTS adapter that proxies synthesis requests to a remote server.
-Sends text via HTTP and receives WAV files. Maintains the same interface
-as the local pyttsx3_adapter for drop-in replacement. Expects server API
-at POST /api/tts/synthesize with JSON payload.
+Sends text via HTTP over a shared keep-alive connection and receives WAV
+files. Maintains the same interface as the local pyttsx3_adapter for
+drop-in replacement. Expects server API at POST /api/tts/synthesize with
+JSON payload.
 
 --------------------------------------------------------------------------
 """
@@ -37,10 +38,11 @@ at POST /api/tts/synthesize with JSON payload.
 import logging
 import os
 import tempfile
-import asyncio
 from typing import Optional
 import httpx
 
+from assistant.core.http import get_http_clients
+
 logger = logging.getLogger("remote_tts")
 
 
@@ -84,63 +86,50 @@ async def synthesize_async(
     os.close(fd)
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
-                response = await client.post(
-                    api_url,
-                    json=payload,
-                    headers={"Accept": "audio/wav, application/json"}
-                )
-                response.raise_for_status()
-                
-                # Check content type
-                content_type = response.headers.get("content-type", "").lower()
-                
-                if "application/json" in content_type:
-                    # Server returned JSON with URL
-                    result = response.json()
-                    wav_url = result.get("wav_url") or result.get("url")
-                    if wav_url:
-                        logger.debug("Server returned WAV URL: %s", wav_url)
-                        # Download the file
-                        download_response = await client.get(wav_url)
-                        download_response.raise_for_status()
-                        with open(out_path, "wb") as f:
-                            f.write(download_response.content)
-                    else:
-                        raise ValueError("Server returned JSON but no wav_url field")
-                else:
-                    # Server returned binary WAV file directly
+        # Shared keep-alive connection to the server
+        client = get_http_clients().get(api_url)
+        try:
+            response = await client.post(
+                api_url,
+                json=payload,
+                headers={"Accept": "audio/wav, application/json"},
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            
+            # Check content type
+            content_type = response.headers.get("content-type", "").lower()
+            
+            if "application/json" in content_type:
+                # Server returned JSON with URL
+                result = response.json()
+                wav_url = result.get("wav_url") or result.get("url")
+                if wav_url:
+                    logger.debug("Server returned WAV URL: %s", wav_url)
+                    # Download the file
+                    download_response = await get_http_clients().get(wav_url).get(wav_url, timeout=timeout)
+                    download_response.raise_for_status()
                     with open(out_path, "wb") as f:
-                        f.write(response.content)
-                
-                logger.debug("TTS synthesis complete: %s", out_path)
-                return out_path
-                
-            except httpx.TimeoutException as e:
-                logger.error("TTS request timed out after %.1fs", timeout)
-                # Clean up temp file
-                try:
-                    os.remove(out_path)
-                except Exception:
-                    pass
-                raise
-            except httpx.HTTPStatusError as e:
-                logger.error("TTS server error: %s %s", e.response.status_code, e.response.text)
-                # Clean up temp file
-                try:
-                    os.remove(out_path)
-                except Exception:
-                    pass
-                raise
-            except httpx.RequestError as e:
-                logger.error("TTS network error: %s", e)
-                # Clean up temp file
-                try:
-                    os.remove(out_path)
-                except Exception:
-                    pass
-                raise
+                        f.write(download_response.content)
+                else:
+                    raise ValueError("Server returned JSON but no wav_url field")
+            else:
+                # Server returned binary WAV file directly
+                with open(out_path, "wb") as f:
+                    f.write(response.content)
+            
+            logger.debug("TTS synthesis complete: %s", out_path)
+            return out_path
+            
+        except httpx.TimeoutException as e:
+            logger.error("TTS request timed out after %.1fs", timeout)
+            raise
+        except httpx.HTTPStatusError as e:
+            logger.error("TTS server error: %s %s", e.response.status_code, e.response.text)
+            raise
+        except httpx.RequestError as e:
+            logger.error("TTS network error: %s", e)
+            raise
     except Exception:
         # Clean up temp file on any error
         try:
@@ -171,30 +160,10 @@ def synthesize(
     Returns:
         Path to temporary WAV file
     """
-    try:
-        # Try to get running event loop
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is running, we need to use a different approach
-            # This shouldn't happen if called from asyncio.to_thread()
-            logger.warning("Event loop is running, creating new thread for HTTP request")
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(
-                    lambda: asyncio.run(
-                        synthesize_async(text, server_url, voice, timeout)
-                    )
-                )
-                return future.result()
-        else:
-            return loop.run_until_complete(
-                synthesize_async(text, server_url, voice, timeout)
-            )
-    except RuntimeError:
-        # No event loop, create one
-        return asyncio.run(
-            synthesize_async(text, server_url, voice, timeout)
-        )
+    # Runs on the shared clients' background loop, reusing pooled connections
+    return get_http_clients().run_sync(
+        synthesize_async(text, server_url, voice, timeout)
+    )
 
 
 class RemoteTTSAdapter:
@@ -206,6 +175,7 @@ class RemoteTTSAdapter:
     Usage:
         adapter = RemoteTTSAdapter(server_url="http://localhost:8000")
         wav_path = adapter.synth("Hello world")
+        wav_path = await adapter.synth_async("Hello world")  # from async code
     """
     
     def __init__(
@@ -243,4 +213,20 @@ class RemoteTTSAdapter:
             self.voice,
             self.timeout,
         )
-
+    
+    async def synth_async(self, text: str) -> str:
+        """
+        Synthesize text to speech using remote server, on the caller's event loop.
+        
+        Args:
+            text: Text to synthesize
+        
+        Returns:
+            Path to temporary WAV file
+        """
+        return await synthesize_async(
+            text,
+            self.server_url,
+            self.voice,
+            self.timeout,
+        )
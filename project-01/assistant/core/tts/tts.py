@@ -28,20 +28,85 @@ SOFTWARE.
 
 Text-to-speech component for Fish Assistant. Listens for TTS requests and
 synthesizes text to speech using either local (Pyttsx3Adapter) or remote
-(RemoteTTSAdapter) adapters. Publishes audio events for playback.
+(RemoteTTSAdapter) adapters. Publishes audio events for playback. In
+streaming mode, replies are split into sentences that are synthesized in a
+pipeline and published as an ordered sequence of audio chunks, so playback
+starts before the whole reply is synthesized. With a phrase cache attached,
+repeated phrases are served from cached PCM instead of being synthesized
+again. Synthesized audio is published as an in-process buffer, so playback
+doesn't decode the adapter's WAV a second time.
 
 --------------------------------------------------------------------------
 """
 
 import asyncio
 import logging
+import os
+import re
+import numpy as np
 import soundfile as sf
-from typing import Optional
+from typing import List, Optional, Tuple
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.config import Config
 from assistant.core.contracts import TTSRequest, TTSAudio, same_trace
+from assistant.core.tts.cache import TTSCache, cache_key
+
+# Sentence ends (and clause breaks for long sentences) used for streaming
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+|(?<=[.!?]["\')\]])\s+')
+_CLAUSE_BREAK = re.compile(r'(?<=[,;:])\s+')
+MIN_SEGMENT_CHARS = 12   # merge shorter pieces into the next one
+MAX_SEGMENT_CHARS = 160  # split longer sentences at clause breaks
+END_OF_STREAM_S = 0.05   # silent final chunk closing a stream whose next segment failed
+END_OF_STREAM_RATE = 16000
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into speakable segments for streaming synthesis.
+    
+    Splits on sentence punctuation, breaks overly long sentences at commas,
+    semicolons and colons, and merges very short pieces into the next one so
+    playback is not choppy.
+    """
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= MAX_SEGMENT_CHARS:
+            pieces.append(sentence)
+            continue
+        clause = ""
+        for part in _CLAUSE_BREAK.split(sentence):
+            clause = f"{clause} {part}".strip()
+            if len(clause) >= MAX_SEGMENT_CHARS // 2:
+                pieces.append(clause)
+                clause = ""
+        if clause:
+            pieces.append(clause)
+
+    segments: List[str] = []
+    carry = ""
+    for piece in pieces:
+        carry = f"{carry} {piece}".strip()
+        if len(carry) >= MIN_SEGMENT_CHARS:
+            segments.append(carry)
+            carry = ""
+    if carry:
+        if segments:
+            segments[-1] = f"{segments[-1]} {carry}"
+        else:
+            segments.append(carry)
+    return segments
 
 
 class TTSAdapter:
-    """Protocol for TTS adapters - must implement synth method."""
+    """
+    Protocol for TTS adapters - must implement synth method.
+    
+    Network-bound adapters may also implement synth_async(text), which TTS
+    awaits on the event loop instead of running synth() in an executor.
+    """
     def synth(self, text: str) -> str:
         """Synthesize text to speech and return path to WAV file."""
         raise NotImplementedError
@@ -54,7 +119,7 @@ class TTS:
     Can use either local (Pyttsx3Adapter) or remote (RemoteTTSAdapter) adapters.
     """
 
-    def __init__(self, bus, adapter: Optional[TTSAdapter] = None):
+    def __init__(self, bus, adapter: Optional[TTSAdapter] = None, cache: Optional[TTSCache] = None):
         """
         Initialize TTS component.
         
@@ -62,6 +127,7 @@ class TTS:
             bus: Event bus instance
             adapter: TTS adapter (Pyttsx3Adapter or RemoteTTSAdapter).
                     If None, creates a local Pyttsx3Adapter.
+            cache: Optional phrase cache shared by identical requests
         """
         self.bus = bus
         if adapter is None:
@@ -69,10 +135,43 @@ class TTS:
             from assistant.core.tts.pyttsx3_adapter import Pyttsx3Adapter
             adapter = Pyttsx3Adapter()
         self.adapter = adapter
+        self.cache = cache
         self.log = logging.getLogger("tts")
+        self._prewarm_task: Optional["asyncio.Future"] = None
 
     async def start(self):
         self.bus.subscribe("tts.request", self._on_request)
+        await self.preload()
+        if self.cache is not None and Config.TTS_PREWARM_PHRASES:
+            # In the background: a slow or unreachable TTS server must not hold up startup
+            self._prewarm_task = asyncio.ensure_future(self.prewarm(Config.TTS_PREWARM_PHRASES))
+
+    async def preload(self):
+        """Warm up the adapter's engine (if it has one) so the first reply is fast."""
+        preload = getattr(self.adapter, "preload", None)
+        if not callable(preload):
+            return
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, preload)
+            self.log.info("TTS: Engine ready")
+        except Exception as e:
+            # Not fatal: synthesis will report the error per request
+            self.log.warning("TTS: Engine preload failed: %s", e)
+
+    async def prewarm(self, phrases: List[str]):
+        """Synthesize common phrases into the cache ahead of the first request."""
+        if self.cache is None:
+            return
+        warmed = 0
+        for phrase in phrases:
+            try:
+                await self._clip(phrase)
+                warmed += 1
+            except Exception as e:
+                self.log.warning("TTS: Could not pre-warm '%s': %s", phrase[:50], e)
+        if warmed:
+            self.log.info("TTS: Pre-warmed %d cached phrase(s)", warmed)
 
     async def _on_request(self, payload: dict):
         self.log.info("TTS: Received tts.request event")
@@ -88,33 +187,130 @@ class TTS:
             self.log.warning("TTS: Empty text, skipping")
             return
 
-        # run blocking synth in thread (Python 3.7 compatible)
-        self.log.info("TTS: Synthesizing text (%d chars): '%s'", len(text), text[:50])
-        loop = asyncio.get_event_loop()
-        path = await loop.run_in_executor(None, self.adapter.synth, text)
-        self.log.info("TTS: Synthesis complete: %s", path)
+        stream = Config.TTS_STREAMING if req.stream is None else req.stream
+        segments = split_sentences(text) if stream else [text]
+        if len(segments) > 1:
+            self.log.info("TTS: Streaming %d segments", len(segments))
+            await self._stream(req, segments)
+            return
+
+        buffer_id, duration_s = await self._synth(text)
+        audio_event = TTSAudio(buffer_id=buffer_id, duration_s=duration_s)
+        same_trace(req, audio_event)
+        self.log.info("TTS: Publishing tts.audio event (buffer=%s, duration=%.2fs)", buffer_id, duration_s)
+        await self.bus.publish(audio_event.topic, audio_event.dict())
+        self.log.info("TTS: Published tts.audio event successfully")
 
-        # Get duration from audio file
+    async def _stream(self, req: TTSRequest, segments: List[str]):
+        """Synthesize segment i+1 while segment i is being published/played."""
+        loop = asyncio.get_event_loop()
+        pending = loop.create_task(self._synth(segments[0]))
+        last = len(segments) - 1
         try:
-            info = sf.info(path)
-            duration_s = info.frames / float(info.samplerate) if info.samplerate else 0.01
-        except Exception:
-            self.log.warning("could not read audio duration, using 0.01")
-            duration_s = 0.01  # minimal default to satisfy contract
+            for seq in range(len(segments)):
+                try:
+                    buffer_id, duration_s = await pending
+                except Exception as e:
+                    self.log.exception("TTS: Synthesis failed for segment %d/%d: %s", seq + 1, last + 1, e)
+                    if seq > 0:
+                        # Chunks went out with final=False: end the reply so playback doesn't wait for more
+                        await self._end_stream(req, seq)
+                    return
+                finally:
+                    pending = None
+                if seq < last:
+                    pending = loop.create_task(self._synth(segments[seq + 1]))
+
+                audio_event = TTSAudio(buffer_id=buffer_id, duration_s=duration_s, seq=seq, final=(seq == last))
+                same_trace(req, audio_event)
+                self.log.info("TTS: Publishing tts.audio chunk %d/%d (buffer=%s, duration=%.2fs)", seq + 1, last + 1, buffer_id, duration_s)
+                await self.bus.publish(audio_event.topic, audio_event.dict())
+        finally:
+            if pending is not None:
+                _discard(pending)
 
-        audio_event = TTSAudio(wav_path=path, duration_s=duration_s)
+    async def _end_stream(self, req: TTSRequest, seq: int):
+        """Publish a short silent final chunk to close a reply cut short by a failed segment."""
+        frames = int(END_OF_STREAM_S * END_OF_STREAM_RATE)
+        buffer_id = get_buffer_registry().put(np.zeros((frames, 1), dtype=np.int16), END_OF_STREAM_RATE)
+        audio_event = TTSAudio(buffer_id=buffer_id, duration_s=END_OF_STREAM_S, seq=seq, final=True)
         same_trace(req, audio_event)
-        self.log.info("TTS: Publishing tts.audio event (path=%s, duration=%.2fs)", path, duration_s)
         await self.bus.publish(audio_event.topic, audio_event.dict())
-        self.log.info("TTS: Published tts.audio event successfully")
+
+    async def _synth(self, text: str) -> Tuple[str, float]:
+        """Run the adapter (or the cache) and return (buffer_id, duration_s)."""
+        self.log.info("TTS: Synthesizing text (%d chars): '%s'", len(text), text[:50])
+        pcm, sr = await self._clip(text)
+        buffer_id = get_buffer_registry().put(pcm, sr)
+        duration_s = len(pcm) / float(sr) if sr else 0.0
+        self.log.info("TTS: Synthesis complete: buffer %s (%.2fs)", buffer_id, duration_s)
+        return buffer_id, max(duration_s, 0.01)  # minimal duration to satisfy contract
+
+    async def _clip(self, text: str):
+        """Return (pcm, sample_rate) for text, awaiting async adapters directly."""
+        if callable(getattr(self.adapter, "synth_async", None)):
+            if self.cache is not None:
+                return await self.cache.get_or_create_async(
+                    self._cache_key(text), lambda: self._synth_pcm_async(text))
+            return await self._synth_pcm_async(text)
+
+        # run blocking synth in thread (Python 3.7 compatible)
+        loop = asyncio.get_event_loop()
+        synth = self._cached_clip if self.cache is not None else self._synth_pcm
+        return await loop.run_in_executor(None, synth, text)
+
+    def _cache_key(self, text: str) -> str:
+        return cache_key(
+            text,
+            getattr(self.adapter, "voice", None),
+            getattr(self.adapter, "rate", None),
+            getattr(self.adapter, "sample_rate", None),
+        )
+
+    def _cached_clip(self, text: str):
+        """Return (pcm, sample_rate) for text from the cache, synthesizing on a miss."""
+        return self.cache.get_or_create(self._cache_key(text), lambda: self._synth_pcm(text))
+
+    def _synth_pcm(self, text: str):
+        """Run the adapter and decode its WAV into int16 PCM (the file is removed)."""
+        return _decode_wav(self.adapter.synth(text))
+
+    async def _synth_pcm_async(self, text: str):
+        """Await the adapter's synth_async and decode its WAV like _synth_pcm."""
+        path = await self.adapter.synth_async(text)
+        # Decoding is blocking file I/O: keep it off the event loop
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, _decode_wav, path)
 
     async def stop(self):
         """Cleans up resources before shutdown"""
         self.log.info("stopping TTS component")
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
         # self.bus.unsubscribe("assistant.reply", self._on_reply) 
     
         # close adapter if possible
         if hasattr(self.adapter, 'close') and callable(self.adapter.close):
             # prevent blocking event loop (Python 3.7 compatible)
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.adapter.close)
\ No newline at end of file
+            await loop.run_in_executor(None, self.adapter.close)
+
+
+def _discard(task: "asyncio.Task") -> None:
+    """Cancel a segment synthesis nobody will publish, releasing its buffer if it finished."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None:
+        get_buffer_registry().release(task.result()[0])
+
+
+def _decode_wav(path: str):
+    """Decode a synthesized WAV into (int16 PCM, sample_rate) and remove the file."""
+    try:
+        pcm, sr = sf.read(path, dtype="int16", always_2d=True)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return pcm, sr
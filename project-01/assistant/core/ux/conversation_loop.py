@@ -30,31 +30,50 @@ Conversation loop with VAD for continuous hands-free listening. Continuously
 listens for audio, uses voice activity detection to detect speech start/stop,
 records when speech is detected, and triggers the full pipeline. Manages
 conversation state transitions: idle → listening → recording → thinking →
-speaking → idle.
+speaking → idle. The audio callback hands blocks to the event loop, so the
+loop only wakes when audio arrives, and the thinking/speaking timeouts are
+event-loop timers rather than polled deadlines. Audio is written in place
+into a fixed-size ring buffer, and VAD frames and the final utterance are
+read from it as views; the finished utterance goes to STT as an in-memory
+buffer rather than a WAV file. With incremental STT enabled the utterance is
+transcribed while it is being recorded, partial transcripts are published,
+and only the trailing audio is transcribed after endpointing.
 
 --------------------------------------------------------------------------
 """
 
 import asyncio
 import logging
-import queue
-import time
-from datetime import datetime
+import uuid
 
 import numpy as np
 import sounddevice as sd
-import soundfile as sf
-from typing import Optional, List
+from typing import Optional
 
 from ..bus import Bus
+from ..config import Config
 from ..contracts import AudioRecorded, PlaybackStart, PlaybackEnd, UXState, STTTranscript
-from ..audio.vad import VAD, FRAME_SIZE, SR, CHANNELS, DTYPE
-from ..audio.recorder import TMP_DIR
+from ..audio.vad import VADBackend, create_vad, FRAME_SIZE, SR, CHANNELS, DTYPE
+from ..audio.buffers import get_buffer_registry
+from ..audio.ringbuffer import AudioRingBuffer
+from ..stt.streaming import IncrementalTranscriber, create_incremental_transcriber
 
 # Audio constants
 BLOCKSIZE = 1024  # samples per callback (64ms at 16kHz)
 SILENCE_FRAMES_THRESHOLD = 15  # ~450ms of silence to stop recording (increased to avoid false stops)
 SPEECH_FRAMES_TO_START = 3  # ~90ms of speech to start recording (increased to reduce false positives)
+VAD_STEP = BLOCKSIZE // FRAME_SIZE * FRAME_SIZE  # samples checked per step while idle (2 frames)
+RING_SLACK_S = 2.0  # ring capacity beyond max utterance + pre-roll, so views survive until written out
+THINKING_TIMEOUT_S = 30.0  # waiting for a reply - something went wrong
+SPEAKING_TIMEOUT_S = 60.0  # waiting for playback.end - playback probably finished
+
+
+def _longest_run(flags: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    if not flags.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
 
 
 class ConversationLoop:
@@ -64,19 +83,43 @@ class ConversationLoop:
     States: idle → listening → recording → thinking → speaking → idle
     """
 
-    def __init__(self, bus: Bus, vad: Optional[VAD] = None, device_index: Optional[int] = None):
+    def __init__(
+        self,
+        bus: Bus,
+        vad: Optional[VADBackend] = None,
+        device_index: Optional[int] = None,
+        transcriber: Optional[IncrementalTranscriber] = None,
+    ):
         self.bus = bus
-        self.vad = vad or VAD(aggressiveness=2)
+        self.vad = vad or create_vad(aggressiveness=2)
+        if transcriber is None and Config.STT_STREAMING:
+            transcriber = create_incremental_transcriber()
+        self.transcriber = transcriber
         self.device_index = device_index
         self.log = logging.getLogger("conversation_loop")
         
         # State
         self.state = "idle"
         self.running = False
-        self.audio_queue = queue.Queue()
-        self.recording_buffer: List[np.ndarray] = []
         self.silence_frame_count = 0
         self.speech_frame_count = 0
+
+        # Audio: the callback writes into the ring; the loop reads views by position
+        self.preroll_frames = int(SR * Config.CONV_PREROLL_MS / 1000)
+        self.max_utterance_frames = int(SR * Config.CONV_MAX_UTTERANCE_S)
+        self.ring = AudioRingBuffer(self.max_utterance_frames + self.preroll_frames + int(SR * RING_SLACK_S))
+        self._read_pos = 0  # next sample the state machine has not looked at
+        self._vad_pos = 0   # next sample the VAD has not classified while recording
+        self._utterance_start: Optional[int] = None
+        self._audio_ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._state_timer: Optional[asyncio.TimerHandle] = None
+
+        # Incremental STT: partial passes run in an executor, one at a time
+        self.partial_interval_frames = int(SR * Config.STT_PARTIAL_INTERVAL_MS / 1000)
+        self._partial_pos = 0  # recording position of the last partial pass
+        self._partial_task: Optional[asyncio.Future] = None
+        self._utterance_id: Optional[str] = None  # corr_id shared by partial and final transcripts
         
     async def start(self):
         """Start the conversation loop."""
@@ -91,7 +134,7 @@ class ConversationLoop:
         self.bus.subscribe("stt.transcript", self._on_transcript)
         
         self.running = True
-        self.state = "idle"
+        self._set_state("idle")
         await self.bus.publish("ux.state", UXState(state="idle").dict())
         
         # Start the main loop
@@ -100,30 +143,62 @@ class ConversationLoop:
     async def stop(self):
         """Stop the conversation loop."""
         self.running = False
+        self._cancel_state_timer()
+        if self._audio_ready is not None:
+            self._audio_ready.set()  # wake the consumer so it can exit
         self.log.info("Stopping conversation loop")
         await self.bus.publish("ux.state", UXState(state="idle", note="stopped").dict())
-    
+
+    def _set_state(self, state: str):
+        """Change state and (re)arm the timeout timer for waiting states."""
+        self._cancel_state_timer()
+        self.state = state
+        timeout = {"thinking": THINKING_TIMEOUT_S, "speaking": SPEAKING_TIMEOUT_S}.get(state)
+        if timeout is not None:
+            loop = self._loop or asyncio.get_event_loop()
+            self._state_timer = loop.call_later(timeout, self._on_state_timeout, state)
+
+    def _cancel_state_timer(self):
+        if self._state_timer is not None:
+            self._state_timer.cancel()
+            self._state_timer = None
+
+    def _on_state_timeout(self, state: str):
+        """Timer callback: give up waiting and go back to listening."""
+        self._state_timer = None
+        if self.state != state:
+            return
+        self.log.warning("%s state timeout, resetting to idle", state.capitalize())
+        self._set_state("idle")
+        asyncio.ensure_future(self.bus.publish("ux.state", UXState(state="idle").dict()))
+
     async def _run_loop(self):
         """Main conversation loop."""
         self.log.info("Starting conversation loop (device: %s)", self.device_index)
         
         if self.device_index is not None:
             sd.default.device = (self.device_index, None)
+
+        self._loop = asyncio.get_event_loop()
+        self._audio_ready = asyncio.Event()
         
         def audio_callback(indata, frames_count, time_info, status):
-            """Called every ~64ms with 1024 samples."""
+            """Called every ~64ms with 1024 samples (PortAudio thread)."""
             if status:
                 self.log.warning("Audio callback status: %s", status)
             if self.running:
                 # Calculate audio level for debugging
-                audio_level = np.abs(indata).mean()
                 if not hasattr(self, '_audio_log_counter'):
                     self._audio_log_counter = 0
                 self._audio_log_counter += 1
                 # Log audio level every 50 callbacks (~3 seconds) to avoid spam
                 if self._audio_log_counter % 50 == 0:
-                    self.log.info("Audio input: level=%.4f (device=%s)", audio_level, self.device_index)
-                self.audio_queue.put(indata.copy())
+                    self.log.info("Audio input: level=%.4f (device=%s)", np.abs(indata).mean(), self.device_index)
+                self.ring.write(indata[:, 0])
+                try:
+                    self._loop.call_soon_threadsafe(self._audio_ready.set)
+                except RuntimeError:
+                    pass  # event loop closed during shutdown
         
         try:
             with sd.InputStream(
@@ -133,85 +208,68 @@ class ConversationLoop:
                 blocksize=BLOCKSIZE,
                 callback=audio_callback
             ):
-                while self.running:
-                    try:
-                        if self.state == "idle":
-                            await self._detect_speech_start()
-                        elif self.state == "recording":
-                            await self._detect_speech_end()
-                        elif self.state == "thinking":
-                            # Waiting for pipeline to process (with timeout)
-                            if not hasattr(self, '_thinking_start_time'):
-                                self._thinking_start_time = time.time()
-                            # Timeout after 30 seconds - something went wrong
-                            if time.time() - self._thinking_start_time > 30:
-                                self.log.warning("Thinking state timeout, resetting to idle")
-                                self.state = "idle"
-                                delattr(self, '_thinking_start_time')
-                            await asyncio.sleep(0.1)
-                        elif self.state == "speaking":
-                            # Waiting for TTS playback to finish (with timeout)
-                            if not hasattr(self, '_speaking_start_time'):
-                                self._speaking_start_time = time.time()
-                            # Timeout after 60 seconds - playback probably finished
-                            if time.time() - self._speaking_start_time > 60:
-                                self.log.warning("Speaking state timeout, resetting to idle")
-                                self.state = "idle"
-                                await self.bus.publish("ux.state", UXState(state="idle").dict())
-                                delattr(self, '_speaking_start_time')
-                            await asyncio.sleep(0.1)
-                        else:
-                            self.log.warning("Unknown state: %s, resetting to idle", self.state)
-                            self.state = "idle"
-                        
-                        await asyncio.sleep(0.01)  # Small delay to prevent busy-waiting
-                    except Exception as e:
-                        self.log.exception("Error in conversation loop state machine: %s", e)
-                        # Reset to idle on error
-                        self.state = "idle"
-                        await asyncio.sleep(0.1)
+                await self._consume()
                     
         except Exception as e:
             self.log.exception("Error in conversation loop: %s", e)
             await self.bus.publish("ux.state", UXState(state="error", note=str(e)).dict())
-    
-    async def _detect_speech_start(self):
-        """Use VAD to detect when speech starts."""
-        # Collect recent audio chunks (keep last 5 chunks = ~320ms for better detection)
-        chunks = []
-        while not self.audio_queue.empty() and len(chunks) < 5:
-            chunks.append(self.audio_queue.get())
-        
-        if not chunks:
-            return
+
+    async def _consume(self):
+        """Wait for new audio and advance the state machine; idle when nothing arrives."""
+        while self.running:
+            await self._audio_ready.wait()
+            self._audio_ready.clear()
+            if not self.running:
+                break
+            try:
+                await self._on_audio(self.ring.written)
+            except Exception as e:
+                self.log.exception("Error in conversation loop state machine: %s", e)
+                # Reset to idle on error
+                self._set_state("idle")
+
+    async def _on_audio(self, end: int):
+        """
+        Feed audio written up to position `end` to the state machine.
         
-        # Convert to single array
-        recent_audio = np.concatenate(chunks)  # ~320ms = ~10-11 VAD frames
+        Audio is stepped through one callback block at a time, so detection
+        behaves the same when several blocks arrived since the last wake-up.
+        """
+        if self._read_pos < self.ring.oldest:
+            self.log.warning("Conversation loop fell behind, skipped %d samples", self.ring.oldest - self._read_pos)
+            self._read_pos = self.ring.oldest
+
+        while self._read_pos < end:
+            start = self._read_pos
+            if self.state == "idle":
+                # Whole VAD frames only; a partial frame waits for the next block
+                usable = min(VAD_STEP, (end - start) // FRAME_SIZE * FRAME_SIZE)
+                if usable == 0:
+                    return
+                self._read_pos = start + usable
+                await self._detect_speech_start(self.ring.view(start, start + usable), start + usable)
+            elif self.state == "recording":
+                self._read_pos = min(start + BLOCKSIZE, end)
+                await self._detect_speech_end(self._read_pos)
+            elif self.state in ("thinking", "speaking"):
+                # Not listening while the reply is produced; the fish would hear itself
+                self._read_pos = end
+            else:
+                self.log.warning("Unknown state: %s, resetting to idle", self.state)
+                self._read_pos = end
+                self._set_state("idle")
+    
+    async def _detect_speech_start(self, recent_audio: np.ndarray, end: int):
+        """Use VAD on newly arrived audio (a view ending at position `end`) to detect speech start."""
         
         # Calculate audio level for debugging
         audio_level = np.abs(recent_audio).mean() * 100 if len(recent_audio) > 0 else 0
         
-        # Check each VAD frame (480 samples = 30ms)
-        speech_frames_in_window = 0
-        total_frames = 0
-        consecutive_speech = 0
-        max_consecutive = 0
-        
-        for i in range(0, len(recent_audio), FRAME_SIZE):
-            frame = recent_audio[i:i + FRAME_SIZE]
-            if len(frame) == FRAME_SIZE:
-                total_frames += 1
-                try:
-                    is_speech = self.vad.is_speech(frame)
-                    if is_speech:
-                        speech_frames_in_window += 1
-                        consecutive_speech += 1
-                        max_consecutive = max(max_consecutive, consecutive_speech)
-                    else:
-                        consecutive_speech = 0
-                except Exception as e:
-                    self.log.warning("VAD error on frame: %s", e)
-                    consecutive_speech = 0
+        # Classify every VAD frame (480 samples = 30ms) in one pass
+        speech = self.vad.process(recent_audio)
+        total_frames = len(speech)
+        speech_frames_in_window = int(speech.sum())
+        max_consecutive = _longest_run(speech)
         
         # Update speech_frame_count based on consecutive speech
         if max_consecutive > 0:
@@ -245,51 +303,89 @@ class ConversationLoop:
         if speech_frames_in_window >= 2 and self.speech_frame_count >= threshold:
             self.log.info("Speech detected! Starting recording (speech_frames=%d/%d, consecutive=%d, audio_level=%.1f)", 
                          speech_frames_in_window, total_frames, max_consecutive, audio_level)
-            self.state = "recording"
-            self.recording_buffer = chunks.copy()  # Include the chunks that triggered detection
+            self._set_state("recording")
+            # Include the pre-roll that led up to detection
+            self._utterance_start = max(self.ring.oldest, end - len(recent_audio) - self.preroll_frames)
+            self._vad_pos = end  # the VAD has seen everything up to here
             self.silence_frame_count = 0
             self.speech_frame_count = 0  # Reset after detection
+            if self.transcriber is not None:
+                self.transcriber.reset()
+                self._partial_pos = end
+                self._utterance_id = uuid.uuid4().hex
             await self.bus.publish("ux.state", UXState(state="listening").dict())
     
-    async def _detect_speech_end(self):
-        """Use VAD to detect when speech ends (silence)."""
-        # Collect audio chunks while recording
-        while not self.audio_queue.empty():
-            chunk = self.audio_queue.get()
-            self.recording_buffer.append(chunk)
-        
-        # Check recent frames for silence (last 2 chunks = ~128ms)
-        if len(self.recording_buffer) >= 2:
-            recent = np.concatenate(self.recording_buffer[-2:])
-            
-            # Count speech frames in recent audio
-            speech_frames = 0
-            for i in range(0, len(recent), FRAME_SIZE):
-                frame = recent[i:i + FRAME_SIZE]
-                if len(frame) == FRAME_SIZE:
-                    if self.vad.is_speech(frame):
-                        speech_frames += 1
+    async def _detect_speech_end(self, end: int):
+        """Use VAD to detect when speech ends (silence) or the utterance gets too long."""
+        if end - self._utterance_start >= self.max_utterance_frames:
+            self.log.info("Maximum utterance length reached (%.1fs), stopping recording", Config.CONV_MAX_UTTERANCE_S)
+            await self._stop_and_process(end)
+            return
+
+        # Classify only whole frames the VAD hasn't seen yet: its noise floor and
+        # hangover are stateful, so each sample must go through it exactly once
+        self._vad_pos = max(self._vad_pos, self.ring.oldest)
+        usable = (end - self._vad_pos) // FRAME_SIZE * FRAME_SIZE
+        if usable:
+            speech_frames = int(self.vad.process(self.ring.view(self._vad_pos, self._vad_pos + usable)).sum())
+            self._vad_pos += usable
             
             # If no speech detected, increment silence counter
             if speech_frames == 0:
                 self.silence_frame_count += 1
                 if self.silence_frame_count >= SILENCE_FRAMES_THRESHOLD:
                     # Silence detected for threshold duration, stop recording
-                    await self._stop_and_process()
+                    await self._stop_and_process(end)
             else:
                 # Speech still detected, reset silence counter
                 self.silence_frame_count = 0
+
+        if self.state == "recording":
+            self._maybe_transcribe_partial(end)
+
+    def _maybe_transcribe_partial(self, end: int):
+        """Start a partial STT pass when enough new audio arrived and none is running."""
+        if self.transcriber is None or end - self._partial_pos < self.partial_interval_frames:
+            return
+        if self._partial_task is not None and not self._partial_task.done():
+            return  # the model is slower than real time; skip rather than queue
+        self._partial_pos = end
+        self._partial_task = asyncio.ensure_future(self._transcribe_partial(self._utterance_start, end))
+
+    async def _transcribe_partial(self, start: int, end: int):
+        """Run one incremental pass over the utterance so far and publish the partial text."""
+        utterance_id = self._utterance_id
+        try:
+            loop = asyncio.get_event_loop()
+            text = await loop.run_in_executor(None, self.transcriber.update, self.ring.view(start, end))
+        except Exception as e:
+            self.log.warning("Partial transcription failed: %s", e)
+            return
+        if text and utterance_id == self._utterance_id:
+            partial = STTTranscript(text=text, partial=True, corr_id=utterance_id)
+            await self.bus.publish(partial.topic, partial.dict())
+
+    async def _finish_partial(self):
+        """Wait for a running partial pass so the transcriber state is settled."""
+        task, self._partial_task = self._partial_task, None
+        if task is not None:
+            try:
+                await task
+            except Exception:
+                pass
     
-    async def _stop_and_process(self):
+    async def _stop_and_process(self, end: Optional[int] = None):
         """Stop recording and trigger pipeline."""
-        if not self.recording_buffer:
+        end = self.ring.written if end is None else end
+        if self._utterance_start is None or end <= self._utterance_start:
+            self._utterance_start = None
             self.log.warning("No audio recorded, returning to idle")
-            self.state = "idle"
+            self._set_state("idle")
             await self.bus.publish("ux.state", UXState(state="idle").dict())
             return
         
-        # Concatenate all recorded chunks
-        full_audio = np.concatenate(self.recording_buffer)
+        # The whole utterance is one view into the ring (no copy)
+        full_audio = self.ring.view(max(self._utterance_start, self.ring.oldest), end)
         duration_s = len(full_audio) / SR
         
         # Minimum duration check - if too short, likely false positive or noise
@@ -297,41 +393,67 @@ class ConversationLoop:
         if duration_s < MIN_RECORDING_DURATION:
             self.log.warning("Recording too short (%.2fs < %.2fs), likely false positive, returning to idle", 
                            duration_s, MIN_RECORDING_DURATION)
-            self.state = "idle"
-            self.recording_buffer = []
+            self._set_state("idle")
+            self._utterance_start = None
             self.silence_frame_count = 0
+            if self.transcriber is not None:
+                self._utterance_id = None
+                await self._finish_partial()
+                self.transcriber.reset()
             await self.bus.publish("ux.state", UXState(state="idle").dict())
             return
+
+        if self.transcriber is not None:
+            await self._finalize_transcript(full_audio, duration_s)
+            return
         
-        # Save to WAV file
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        wav_path = TMP_DIR / f"conv-{timestamp}.wav"
-        sf.write(str(wav_path), full_audio, SR, subtype="PCM_16")
+        # Hand the utterance to STT in memory; the ring will be overwritten, so copy it once
+        buffer_id = get_buffer_registry().put(full_audio.copy(), SR)
         
-        self.log.info("Recording complete: %s (%.2fs)", wav_path, duration_s)
+        self.log.info("Recording complete: buffer %s (%.2fs)", buffer_id, duration_s)
         
         # Publish audio.recorded event → triggers STT pipeline
         audio_event = AudioRecorded(
-            wav_path=str(wav_path),
+            buffer_id=buffer_id,
             duration_s=duration_s
         )
         await self.bus.publish(audio_event.topic, audio_event.dict())
         
         # Transition to thinking state
-        self.state = "thinking"
-        self.recording_buffer = []
+        self._set_state("thinking")
+        self._utterance_start = None
         self.silence_frame_count = 0
-        self._thinking_start_time = time.time()
         await self.bus.publish("ux.state", UXState(state="thinking").dict())
     
+    async def _finalize_transcript(self, full_audio: np.ndarray, duration_s: float):
+        """Transcribe the uncommitted tail and publish the final transcript instead of audio.recorded."""
+        self._set_state("thinking")
+        self._utterance_start = None
+        self.silence_frame_count = 0
+        await self.bus.publish("ux.state", UXState(state="thinking").dict())
+
+        await self._finish_partial()
+        utterance_id, self._utterance_id = self._utterance_id, None
+        loop = asyncio.get_event_loop()
+        try:
+            text = await loop.run_in_executor(None, self.transcriber.finalize, full_audio)
+        except Exception as e:
+            self.log.exception("Final transcription failed: %s", e)
+            self.transcriber.reset()
+            text = ""
+        self.log.info("Recording complete (%.2fs), transcribed %.2fs after endpointing",
+                      duration_s, self.transcriber.last_tail_s)
+
+        transcript = STTTranscript(text=text, corr_id=utterance_id or uuid.uuid4().hex)
+        await self.bus.publish(transcript.topic, transcript.dict())
+    
     async def _on_playback_start(self, payload: dict):
         """When TTS playback starts, update state to speaking."""
         try:
             playback_event = PlaybackStart(**payload)
             if self.state in ("thinking", "idle"):  # Allow transition from idle too (in case we missed thinking)
                 self.log.info("Playback started, fish is speaking")
-                self.state = "speaking"
-                self._speaking_start_time = time.time()
+                self._set_state("speaking")
                 await self.bus.publish("ux.state", UXState(state="speaking").dict())
         except Exception as e:
             self.log.warning("Error handling playback.start: %s", e)
@@ -340,9 +462,11 @@ class ConversationLoop:
         """When TTS playback finishes, resume listening."""
         try:
             playback_event = PlaybackEnd(**payload)
+            if not playback_event.final:
+                return  # more chunks of a streamed reply are coming
             if playback_event.ok and self.state in ("thinking", "speaking"):
                 self.log.info("Playback complete, resuming listening")
-                self.state = "idle"
+                self._set_state("idle")
                 await self.bus.publish("ux.state", UXState(state="idle").dict())
         except Exception as e:
             self.log.warning("Error handling playback.end: %s", e)
@@ -351,11 +475,14 @@ class ConversationLoop:
         """When STT detects text, log it and reset state if empty."""
         try:
             transcript_event = STTTranscript(**payload)
+            if transcript_event.partial:
+                self.log.debug("Partial transcript: '%s'", transcript_event.text)
+                return
             if not transcript_event.text or not transcript_event.text.strip():
                 # Empty transcription - reset to idle immediately
                 self.log.info("Empty transcription received, resetting to idle")
                 if self.state == "thinking":
-                    self.state = "idle"
+                    self._set_state("idle")
                     await self.bus.publish("ux.state", UXState(state="idle").dict())
                 return
             
@@ -367,6 +494,6 @@ class ConversationLoop:
             # On error, also reset to idle to prevent getting stuck
             if self.state == "thinking":
                 self.log.info("Error handling transcript, resetting to idle")
-                self.state = "idle"
+                self._set_state("idle")
                 await self.bus.publish("ux.state", UXState(state="idle").dict())
 
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Server Load Generator
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Drives the STT/TTS server with a fleet of simulated fish. Each simulated
+client waits a random think time, uploads an utterance of realistic length
+to /api/stt/transcribe and, like a real turn, asks /api/tts/synthesize for a
+reply of realistic length. The server runs in-process (httpx ASGI transport)
+or is reached over the network. Reports per-endpoint latency percentiles
+and histograms, error and 503 (load shed) rates, and the inference queue
+depth over time from /api/stats, as JSON.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import io
+import logging
+import random
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from assistant.core.tracing import latency_distribution
+
+log = logging.getLogger("loadgen")
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    log.warning("httpx not available. Install with: pip install httpx")
+
+SR = 16000
+HISTOGRAM_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+REQUEST_TIMEOUT_S = 60.0
+IN_PROCESS_URL = "http://fish-server"
+_WORDS = ("the", "fish", "swims", "in", "a", "bowl", "of", "water", "and", "sings",
+          "about", "bubbles", "tides", "shiny", "pebbles", "all", "day", "long")
+
+
+@dataclass
+class LoadProfile:
+    """What each simulated client does; ranges are sampled uniformly per turn."""
+    clients: int = 4
+    duration_s: float = 60.0
+    turns: Optional[int] = None             # per client; stops early when reached
+    utterance_s: Tuple[float, float] = (1.0, 4.0)
+    think_s: Tuple[float, float] = (2.0, 8.0)
+    reply_chars: Tuple[int, int] = (30, 150)
+    tts: bool = True                        # also request the spoken reply
+    model_size: Optional[str] = None
+    sample_interval_s: float = 0.5          # /api/stats polling period
+    seed: Optional[int] = None
+
+
+class EndpointStats:
+    """Latencies and status codes of one endpoint."""
+
+    def __init__(self):
+        self.latencies: List[float] = []     # successful requests, seconds
+        self.server_waits: List[float] = []  # X-Queue-Wait-Ms of successful requests
+        self.status: Counter = Counter()     # HTTP status, or "error" for transport failures
+
+    def record(self, seconds: float, status, headers=None) -> None:
+        self.status[status] += 1
+        if status == 200:
+            self.latencies.append(seconds)
+            wait_ms = (headers or {}).get("X-Queue-Wait-Ms")
+            if wait_ms is not None:
+                self.server_waits.append(int(wait_ms) / 1000)
+
+    def summary(self, wall_s: float) -> Dict[str, Any]:
+        requests = sum(self.status.values())
+        ok = self.status.get(200, 0)
+        rejected = self.status.get(503, 0)
+        errors = requests - ok - rejected
+        return {
+            "requests": requests,
+            "ok": ok,
+            "rejected_503": rejected,
+            "errors": errors,
+            "rate_503": round(rejected / requests, 4) if requests else 0.0,
+            "error_rate": round(errors / requests, 4) if requests else 0.0,
+            "throughput_rps": round(ok / wall_s, 3) if wall_s > 0 else 0.0,
+            "status": {str(k): v for k, v in sorted(self.status.items(), key=str)},
+            "latency": latency_distribution(self.latencies),
+            "histogram": histogram(self.latencies),
+            "server_queue_wait": latency_distribution(self.server_waits),
+        }
+
+
+def histogram(seconds: List[float], buckets_ms=HISTOGRAM_BUCKETS_MS) -> Dict[str, int]:
+    """Counts per latency bucket, keyed by upper bound ("<=250") plus an overflow bucket."""
+    counts = [0] * (len(buckets_ms) + 1)
+    for s in seconds:
+        counts[bisect_left(buckets_ms, 1000 * s)] += 1
+    keys = [f"<={b}" for b in buckets_ms] + [f">{buckets_ms[-1]}"]
+    return dict(zip(keys, counts))
+
+
+def synth_utterance(duration_s: float, rng: random.Random) -> bytes:
+    """
+    WAV bytes of speech-like audio: a voiced harmonic tone with syllable-rate
+    amplitude modulation and some noise, so VAD and the model do real work.
+    """
+    n = max(1, int(duration_s * SR))
+    t = np.arange(n) / SR
+    f0 = rng.uniform(100, 220)
+    voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(3, 5) * t))
+    noise = np.random.default_rng(rng.randrange(2 ** 32)).normal(0, 0.05, n)
+    pcm = (0.3 * voice * envelope + noise) * 8000
+    buf = io.BytesIO()
+    sf.write(buf, np.clip(pcm, -32768, 32767).astype(np.int16), SR, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def _reply_text(chars: int, rng: random.Random) -> str:
+    words: List[str] = []
+    while sum(len(w) + 1 for w in words) < chars:
+        words.append(rng.choice(_WORDS))
+    return " ".join(words).capitalize() + "."
+
+
+def _load_corpus(paths: List[Path]) -> List[bytes]:
+    files: List[Path] = []
+    for path in paths:
+        files.extend(sorted(Path(path).glob("*.wav")) if Path(path).is_dir() else [Path(path)])
+    return [f.read_bytes() for f in files]
+
+
+class LoadGenerator:
+    """
+    Runs a LoadProfile against the server.
+    
+    Usage:
+        results = await LoadGenerator(LoadProfile(clients=8), base_url="http://laptop:8000").run()
+        results = await LoadGenerator(LoadProfile(clients=8), app=create_app()).run()  # in-process
+    """
+
+    def __init__(self, profile: LoadProfile, base_url: Optional[str] = None, app=None,
+                 corpus: Optional[List[Path]] = None):
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is required for load generation")
+        if (base_url is None) == (app is None):
+            raise ValueError("Pass either base_url or app")
+        self.profile = profile
+        self.base_url = (base_url or IN_PROCESS_URL).rstrip("/")
+        self.app = app
+        self.corpus = _load_corpus(corpus) if corpus else []
+        self.rng = random.Random(profile.seed)
+        self.stats = {"stt": EndpointStats(), "tts": EndpointStats()}
+        self.queue_samples: List[Dict[str, Any]] = []
+        self.turns = 0
+
+    def _client(self) -> "httpx.AsyncClient":
+        """One connection per simulated fish, as each device has its own."""
+        transport = httpx.ASGITransport(app=self.app) if self.app is not None else None
+        return httpx.AsyncClient(base_url=self.base_url, transport=transport, timeout=REQUEST_TIMEOUT_S)
+
+    async def _request(self, stats: EndpointStats, client, path: str, **kwargs) -> Optional["httpx.Response"]:
+        start = time.perf_counter()
+        try:
+            response = await client.post(path, **kwargs)
+        except httpx.HTTPError as e:
+            log.warning("%s failed: %s", path, e)
+            stats.record(time.perf_counter() - start, "error")
+            return None
+        stats.record(time.perf_counter() - start, response.status_code, response.headers)
+        return response
+
+    async def _fish(self, index: int, deadline: float) -> None:
+        profile = self.profile
+        rng = random.Random(self.rng.randrange(2 ** 32))
+        async with self._client() as client:
+            # Staggered start: fish don't all speak at the same moment
+            await asyncio.sleep(rng.uniform(0, profile.think_s[1]))
+            turns = 0
+            while time.perf_counter() < deadline and (profile.turns is None or turns < profile.turns):
+                wav = rng.choice(self.corpus) if self.corpus else synth_utterance(rng.uniform(*profile.utterance_s), rng)
+                data = {"model_size": profile.model_size} if profile.model_size else None
+                response = await self._request(
+                    self.stats["stt"], client, "/api/stt/transcribe",
+                    files={"audio": (f"fish{index}.wav", wav, "audio/wav")}, data=data,
+                )
+                if profile.tts and response is not None and response.status_code == 200:
+                    text = _reply_text(rng.randint(*profile.reply_chars), rng)
+                    await self._request(self.stats["tts"], client, "/api/tts/synthesize", json={"text": text})
+                turns += 1
+                self.turns += 1
+                if time.perf_counter() + profile.think_s[0] >= deadline:
+                    break
+                await asyncio.sleep(rng.uniform(*profile.think_s))
+
+    async def _sample_queue(self, started: float, stop: asyncio.Event) -> None:
+        async with self._client() as client:
+            while not stop.is_set():
+                try:
+                    response = await client.get("/api/stats")
+                    inference = response.json().get("inference", {})
+                    self.queue_samples.append({
+                        "t_s": round(time.perf_counter() - started, 2),
+                        "queued": inference.get("queued", 0),
+                        "active": inference.get("active", 0),
+                        "rejected": inference.get("rejected", 0),
+                    })
+                except (httpx.HTTPError, ValueError) as e:
+                    log.debug("stats poll failed: %s", e)
+                try:
+                    await asyncio.wait_for(stop.wait(), self.profile.sample_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every simulated client until the duration (or turn count) is reached."""
+        profile = self.profile
+        started = time.perf_counter()
+        stop = asyncio.Event()
+        sampler = asyncio.ensure_future(self._sample_queue(started, stop))
+        try:
+            await asyncio.gather(*(self._fish(i, started + profile.duration_s) for i in range(profile.clients)))
+        finally:
+            stop.set()
+            await sampler
+        wall_s = time.perf_counter() - started
+        queued = [s["queued"] for s in self.queue_samples]
+        config = asdict(profile)
+        config.update({"target": self.base_url if self.app is None else "in-process", "corpus_files": len(self.corpus)})
+        return {
+            "config": config,
+            "wall_s": round(wall_s, 3),
+            "turns": self.turns,
+            "endpoints": {name: stats.summary(wall_s) for name, stats in self.stats.items()},
+            "queue": {
+                "max_queued": max(queued) if queued else 0,
+                "mean_queued": round(sum(queued) / len(queued), 2) if queued else 0.0,
+                "samples": self.queue_samples,
+            },
+        }
@@ -29,21 +29,30 @@ SOFTWARE.
 FastAPI HTTP server for Fish Assistant. Exposes STT and TTS endpoints for
 remote clients. Can run standalone or alongside the full assistant pipeline.
 Provides REST API for speech-to-text transcription and text-to-speech
-synthesis.
+synthesis, a converse endpoint that runs a whole turn (STT, NLU, skills,
+TTS) in one request, and a WebSocket that bridges bus events to a client.
 
 --------------------------------------------------------------------------
 """
 
+import io
 import logging
 import tempfile
 import os
 import asyncio
+import soundfile as sf
 from typing import Optional, Callable, AsyncContextManager
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, BackgroundTasks, WebSocket
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from assistant.core.bridge import BRIDGE_PATH, StarletteConnection, get_bus_bridge
 from assistant.core.config import Config
+from assistant.core.converse import ConversePipeline
+from assistant.core.inference import InferencePool, PoolFullError
+from assistant.core.stt.batching import STTBatchScheduler
+from assistant.core.stt.process_pool import STTProcessPool, get_stt_process_pool
+from assistant.core.tracing import create_trace_router
 
 # Optional imports for server dependencies
 try:
@@ -62,10 +71,16 @@ except ImportError:
 
 logger = logging.getLogger("server")
 
+# Model sizes clients may request via the model_size form field
+ALLOWED_MODEL_SIZES = ("tiny", "tiny.en", "base", "base.en", "small", "small.en", "medium", "medium.en")
+
 
 # Initialize adapters (lazy-loaded on first request)
 _stt_adapter = None
 _tts_adapter = None
+_inference_pool = None
+_stt_scheduler = None
+_converse_pipeline = None
 
 
 def get_stt_adapter():
@@ -77,7 +92,11 @@ def get_stt_adapter():
         )
     global _stt_adapter
     if _stt_adapter is None:
-        _stt_adapter = WhisperAdapter(model_size=Config.STT_MODEL_SIZE)
+        if Config.STT_PROCESSES > 0:
+            # Same worker processes as the bus STT component (Config.get_stt_adapter)
+            _stt_adapter = get_stt_process_pool()
+        else:
+            _stt_adapter = WhisperAdapter(model_size=Config.STT_MODEL_SIZE)
     return _stt_adapter
 
 
@@ -94,6 +113,85 @@ def get_tts_adapter():
     return _tts_adapter
 
 
+def get_inference_pool() -> InferencePool:
+    """Get or create the inference worker pool shared by STT and TTS endpoints."""
+    global _inference_pool
+    if _inference_pool is None:
+        _inference_pool = InferencePool(
+            workers=Config.INFERENCE_WORKERS,
+            queue_size=Config.INFERENCE_QUEUE_SIZE,
+        )
+        logger.info(
+            "Inference pool ready: %d workers, queue size %d",
+            _inference_pool.workers, _inference_pool.queue_size
+        )
+    return _inference_pool
+
+
+def get_stt_scheduler() -> Optional[STTBatchScheduler]:
+    """
+    Get or create the STT batch scheduler, or None when STT_BATCHING is off
+    or the adapter can't transcribe batches.
+    """
+    global _stt_scheduler
+    if not Config.STT_BATCHING:
+        return None
+    adapter = get_stt_adapter()
+    if not hasattr(adapter, "transcribe_batch"):
+        return None
+    if _stt_scheduler is None:
+        _stt_scheduler = STTBatchScheduler(
+            adapter.transcribe_batch,
+            get_inference_pool(),
+            max_batch=Config.STT_BATCH_MAX,
+            max_wait_ms=Config.STT_BATCH_WAIT_MS,
+        )
+        logger.info(
+            "STT batching on: up to %d requests, %.0fms window",
+            _stt_scheduler.max_batch, Config.STT_BATCH_WAIT_MS
+        )
+    return _stt_scheduler
+
+
+def get_converse_pipeline() -> ConversePipeline:
+    """Get or create the pipeline behind /api/converse (shares adapters and pool)."""
+    global _converse_pipeline
+    if _converse_pipeline is None:
+        from assistant.app import start_converse_components
+        _converse_pipeline = ConversePipeline(
+            get_stt_adapter(),
+            get_tts_adapter(),
+            get_inference_pool(),
+            setup=start_converse_components,
+        )
+    return _converse_pipeline
+
+
+def _overloaded(e: PoolFullError) -> HTTPException:
+    """Build the 503 response used when the inference queue is full."""
+    return HTTPException(
+        status_code=503,
+        detail="Server busy: inference queue full",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+def _decode_upload(content: bytes):
+    """Decode an uploaded WAV into (float32 frames x channels, sample_rate)."""
+    return sf.read(io.BytesIO(content), dtype="float32", always_2d=True)
+
+
+def _timing_headers(timing: dict) -> dict:
+    """Expose queue wait and run time so clients can see server load."""
+    headers = {
+        "X-Queue-Wait-Ms": str(int(1000 * timing.get("wait_s", 0.0))),
+        "X-Inference-Ms": str(int(1000 * timing.get("run_s", 0.0))),
+    }
+    if "batch_size" in timing:
+        headers["X-STT-Batch-Size"] = str(timing["batch_size"])
+    return headers
+
+
 def create_app(lifespan: Optional[Callable[[FastAPI], AsyncContextManager]] = None) -> FastAPI:
     """
     Create FastAPI app with optional lifespan.
@@ -129,17 +227,44 @@ def create_app(lifespan: Optional[Callable[[FastAPI], AsyncContextManager]] = No
         """Health check endpoint."""
         return {"status": "ok", "service": "fish-assistant"}
     
+    app.include_router(create_trace_router())
+    
+    @app.get("/api/stats")
+    async def stats():
+        """Inference queue depth, wait times and counters."""
+        stats = {"inference": get_inference_pool().stats()}
+        if _stt_scheduler is not None:
+            stats["stt_batching"] = _stt_scheduler.stats()
+        if isinstance(_stt_adapter, STTProcessPool):
+            stats["stt_processes"] = _stt_adapter.stats()
+        bridge = get_bus_bridge()
+        if bridge is not None:
+            stats["bridge"] = bridge.stats()
+        return stats
+    
+    @app.websocket(BRIDGE_PATH)
+    async def bus_bridge(websocket: WebSocket):
+        """Persistent event channel to a client (see assistant/core/bridge.py)."""
+        bridge = get_bus_bridge()
+        if bridge is None:
+            await websocket.close(code=1013)  # bridging is off (BRIDGE=false)
+            return
+        await websocket.accept()
+        await bridge.serve(StarletteConnection(websocket))
+    
     @app.post("/api/stt/transcribe")
     async def transcribe_audio(
         audio: UploadFile = File(..., description="WAV audio file"),
-        model_size: str = Form(default="tiny", description="Model size hint")
+        model_size: Optional[str] = Form(default=None, description="Model size hint")
     ):
         """
         Transcribe audio file to text.
         
         Accepts multipart/form-data with:
         - audio: WAV file
-        - model_size: Optional model size hint (tiny, base, small, medium)
+        - model_size: Optional model size (tiny, base, small, medium).
+          Defaults to STT_MODEL_SIZE. Each size is loaded once and kept
+          warm in the model pool (least recently used sizes are evicted).
         
         Returns JSON with transcribed text.
         """
@@ -150,38 +275,60 @@ def create_app(lifespan: Optional[Callable[[FastAPI], AsyncContextManager]] = No
                 detail="Only WAV files are supported"
             )
         
-        # Save uploaded file to temporary location
-        fd, temp_path = tempfile.mkstemp(suffix=".wav")
-        os.close(fd)
+        if model_size and model_size not in ALLOWED_MODEL_SIZES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported model_size: {model_size}"
+            )
         
+        temp_path = None
         try:
-            # Write uploaded content to temp file
-            with open(temp_path, "wb") as f:
-                content = await audio.read()
-                f.write(content)
-            
+            content = await audio.read()
             logger.info(
                 "Transcribing audio: %s (%d bytes, model_size: %s)",
                 audio.filename, len(content), model_size
             )
             
-            # Transcribe using adapter
+            # Transcribe on the inference pool (model comes from the shared warm pool),
+            # batched with concurrent requests when STT_BATCHING is on
             adapter = get_stt_adapter()
-            text = adapter.transcribe(temp_path)
+            scheduler = get_stt_scheduler()
+            try:
+                if scheduler is not None:
+                    # Decode off the event loop: many uploads arrive at once when batching pays off
+                    loop = asyncio.get_event_loop()
+                    pcm, sample_rate = await loop.run_in_executor(None, _decode_upload, content)
+                    text, timing = await scheduler.transcribe(pcm, sample_rate, model_size=model_size or None)
+                else:
+                    # Save uploaded file to temporary location (the batched path decodes from memory)
+                    fd, temp_path = tempfile.mkstemp(suffix=".wav")
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(content)
+                    text, timing = await get_inference_pool().run_timed(
+                        adapter.transcribe, temp_path, model_size=model_size or None
+                    )
+            except PoolFullError as e:
+                raise _overloaded(e)
             
-            logger.info("Transcription complete: %s", text[:50] if text else "(empty)")
+            logger.info(
+                "Transcription complete: %s (wait %.0fms, run %.0fms)",
+                text[:50] if text else "(empty)", 1000 * timing["wait_s"], 1000 * timing["run_s"]
+            )
             
-            return JSONResponse(content={"text": text})
+            return JSONResponse(content={"text": text}, headers=_timing_headers(timing))
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.exception("Error transcribing audio: %s", e)
             raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
         finally:
             # Clean up temp file
-            try:
-                os.remove(temp_path)
-            except Exception:
-                pass
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except Exception:
+                    pass
     
     @app.post("/api/tts/synthesize")
     async def synthesize_speech(
@@ -219,8 +366,11 @@ def create_app(lifespan: Optional[Callable[[FastAPI], AsyncContextManager]] = No
             else:
                 adapter = get_tts_adapter()
             
-            # Synthesize to temp file
-            wav_path = adapter.synth(text.strip())
+            # Synthesize to temp file on the inference pool
+            try:
+                wav_path, timing = await get_inference_pool().run_timed(adapter.synth, text.strip())
+            except PoolFullError as e:
+                raise _overloaded(e)
             
             if not os.path.exists(wav_path):
                 raise HTTPException(status_code=500, detail="TTS synthesis failed: no output file")
@@ -241,13 +391,85 @@ def create_app(lifespan: Optional[Callable[[FastAPI], AsyncContextManager]] = No
             return FileResponse(
                 wav_path,
                 media_type="audio/wav",
-                filename="synthesized.wav"
+                filename="synthesized.wav",
+                headers=_timing_headers(timing),
             )
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.exception("Error synthesizing speech: %s", e)
             raise HTTPException(status_code=500, detail=f"Synthesis failed: {str(e)}")
     
+    @app.post("/api/converse")
+    async def converse(
+        background_tasks: BackgroundTasks,
+        audio: UploadFile = File(..., description="WAV audio file"),
+        model_size: Optional[str] = Form(default=None, description="Model size hint"),
+    ):
+        """
+        Run one conversation turn: STT -> NLU -> skills -> TTS.
+        
+        Accepts multipart/form-data like /api/stt/transcribe.
+        
+        Returns the reply as a WAV file (204 when there is nothing to say).
+        Both carry X-Transcript, X-Intent and X-Reply (percent-encoded) and
+        a Server-Timing header with queue, stt, reply, tts and total times.
+        """
+        if not audio.filename.endswith(('.wav', '.WAV')):
+            raise HTTPException(
+                status_code=400,
+                detail="Only WAV files are supported"
+            )
+        
+        if model_size and model_size not in ALLOWED_MODEL_SIZES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported model_size: {model_size}"
+            )
+        
+        fd, temp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        
+        try:
+            with open(temp_path, "wb") as f:
+                content = await audio.read()
+                f.write(content)
+            
+            logger.info("Conversing: %s (%d bytes, model_size: %s)", audio.filename, len(content), model_size)
+            
+            try:
+                result = await get_converse_pipeline().run(temp_path, model_size=model_size or None)
+            except PoolFullError as e:
+                raise _overloaded(e)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception("Error running conversation turn: %s", e)
+            raise HTTPException(status_code=500, detail=f"Conversation failed: {str(e)}")
+        finally:
+            try:
+                os.remove(temp_path)
+            except Exception:
+                pass
+        
+        if not result.wav_path:
+            return Response(status_code=204, headers=result.headers())
+        
+        def cleanup_file():
+            try:
+                os.remove(result.wav_path)
+            except Exception:
+                pass
+        
+        background_tasks.add_task(cleanup_file)
+        return FileResponse(
+            result.wav_path,
+            media_type="audio/wav",
+            filename="reply.wav",
+            headers=result.headers(),
+        )
+    
     return app
 
 
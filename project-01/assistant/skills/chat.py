@@ -43,11 +43,14 @@ logger = logging.getLogger("chat_skill")
 
 try:
     import httpx
+    from assistant.core.http import get_http_clients
     HTTPX_AVAILABLE = True
 except ImportError:
     HTTPX_AVAILABLE = False
     logger.warning("httpx not available. Install with: pip install httpx")
 
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+
 
 class ChatSkill:
     """Simple chat skill using Groq API for AI responses."""
@@ -104,8 +107,6 @@ class ChatSkill:
 
     async def _groq_chat(self, user_input: str) -> Optional[str]:
         """Generate response using Groq API."""
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
@@ -127,13 +128,14 @@ class ChatSkill:
             "temperature": 0.7
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            result = response.json()
-            
-            if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"].strip()
-            
-            return None
+        # Shared keep-alive client: the TLS handshake is paid once, not per turn
+        client = get_http_clients().get(GROQ_CHAT_URL)
+        response = await client.post(GROQ_CHAT_URL, json=payload, headers=headers, timeout=30.0)
+        response.raise_for_status()
+        result = response.json()
+        
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"].strip()
+        
+        return None
 
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Audio Buffer Registry Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the in-process audio buffer registry, the STT hand-off that uses
+it instead of a recorded WAV file, and the shared decode cache.
+
+--------------------------------------------------------------------------
+"""
+
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from assistant.core.audio.buffers import BufferRegistry, DecodeCache, get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.contracts import AudioRecorded, TTSAudio
+from assistant.core.stt.stt import STT
+
+
+def test_put_get_release():
+    registry = BufferRegistry()
+    pcm = np.arange(1600, dtype=np.int16)
+    buffer_id = registry.put(pcm, 16000)
+
+    buffer = registry.get(buffer_id)
+    assert buffer.pcm is not pcm and np.shares_memory(buffer.pcm, pcm)  # no copy
+    assert not buffer.pcm.flags.writeable
+    assert pcm.flags.writeable  # the caller's array is untouched
+    assert buffer.duration_s == pytest.approx(0.1)
+    assert buffer.as_float32().shape == (1600, 1)
+
+    registry.release(buffer_id)
+    registry.release(buffer_id)  # releasing twice is harmless
+    assert registry.get(buffer_id) is None
+    assert len(registry) == 0
+
+
+def test_unreleased_buffers_are_bounded():
+    registry = BufferRegistry(max_items=2)
+    ids = [registry.put(np.zeros(10, dtype=np.int16), 16000) for _ in range(3)]
+    assert registry.get(ids[0]) is None
+    assert registry.get(ids[2]) is not None
+    assert len(registry) == 2
+
+
+def test_materialize_writes_a_wav(tmp_path):
+    registry = BufferRegistry()
+    buffer_id = registry.put(np.full(800, 1000, dtype=np.int16), 8000)
+    path = registry.materialize(buffer_id, tmp_path)
+    data, sr = sf.read(path, dtype="int16")
+    assert sr == 8000 and len(data) == 800 and data[0] == 1000
+    os.remove(path)
+
+    registry.release(buffer_id)
+    with pytest.raises(KeyError):
+        registry.materialize(buffer_id)
+
+
+def test_events_accept_buffer_instead_of_path():
+    assert AudioRecorded(buffer_id="abc", duration_s=1.0).wav_path == ""
+    assert TTSAudio(buffer_id="abc", duration_s=1.0).buffer_id == "abc"
+    with pytest.raises(ValueError):
+        TTSAudio(duration_s=1.0)
+
+
+class ArrayAdapter:
+    def __init__(self):
+        self.arrays = []
+
+    def transcribe(self, path):
+        raise AssertionError("should not need a file")
+
+    def transcribe_array(self, audio, sample_rate):
+        self.arrays.append((len(audio), sample_rate))
+        return "hello fish"
+
+
+class FileAdapter:
+    def __init__(self):
+        self.frames = []
+
+    def transcribe(self, path):
+        self.frames.append(sf.info(path).frames)
+        return "hello file"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("adapter_cls, text", [(ArrayAdapter, "hello fish"), (FileAdapter, "hello file")])
+async def test_stt_transcribes_buffer_and_releases_it(adapter_cls, text):
+    bus = Bus()
+    adapter = adapter_cls()
+    stt = STT(bus, adapter=adapter)
+    transcripts = []
+
+    async def capture(payload):
+        transcripts.append(payload)
+
+    bus.subscribe("stt.transcript", capture)
+    bus.subscribe("audio.recorded", stt._on_recorded)
+
+    registry = get_buffer_registry()
+    buffer_id = registry.put(np.zeros(16000, dtype=np.int16), 16000)
+    event = AudioRecorded(buffer_id=buffer_id, duration_s=1.0)
+    await bus.publish(event.topic, event.dict())
+
+    assert [t["text"] for t in transcripts] == [text]
+    assert transcripts[0]["corr_id"] == event.corr_id
+    assert registry.get(buffer_id) is None
+    if adapter_cls is ArrayAdapter:
+        assert adapter.arrays == [(16000, 16000)]
+    else:
+        assert adapter.frames == [16000]
+
+
+def _wav(tmp_path, name, value, frames=100, sr=1000):
+    path = str(tmp_path / name)
+    sf.write(path, np.full(frames, value, dtype=np.float32), sr)
+    return path
+
+
+def test_decode_cache_decodes_each_file_once(tmp_path):
+    cache = DecodeCache()
+    path = _wav(tmp_path, "a.wav", 0.5)
+
+    first = cache.acquire(path)
+    second = cache.acquire(path)
+    assert first is second
+    assert first.pcm.shape == (100, 1) and first.pcm.dtype == np.float32
+    assert not first.pcm.flags.writeable
+    assert first.duration_s == pytest.approx(0.1)
+    assert cache.stats() == {"decodes": 1, "hits": 1, "entries": 1}
+
+    cache.release(path)
+    cache.release(path)
+    assert path in cache  # unreferenced, but kept until the file goes away
+    cache.evict(path)
+    assert path not in cache and len(cache) == 0
+
+
+def test_decode_cache_sees_rewritten_files(tmp_path):
+    cache = DecodeCache()
+    path = _wav(tmp_path, "a.wav", 0.5)
+    assert cache.acquire(path).pcm[0, 0] == 0.5
+    _wav(tmp_path, "a.wav", 0.25, frames=200)
+    assert cache.acquire(path).pcm[0, 0] == 0.25
+    assert cache.stats()["decodes"] == 2
+
+
+def test_decode_cache_keeps_referenced_entries(tmp_path):
+    cache = DecodeCache(max_items=1)
+    a, b, c = (_wav(tmp_path, n, 0.1) for n in ("a.wav", "b.wav", "c.wav"))
+    cache.acquire(a)  # still referenced
+    for path in (b, c):
+        cache.acquire(path)
+        cache.release(path)
+    assert len(cache) == 2  # a (in use) and c (most recent idle entry)
+    cache.acquire(a)
+    assert cache.stats()["decodes"] == 3
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Benchmark Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the pipeline benchmark: replaying a corpus through the pipeline
+with stub adapters, and comparing results against a baseline.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from assistant.bench import compare, run_bench
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for i, text in enumerate(["tell me a joke", "hello there"]):
+        sf.write(str(tmp_path / f"utt{i}.wav"), np.zeros(1600 * (i + 2), dtype=np.int16), 16000, subtype="PCM_16")
+        (tmp_path / f"utt{i}.txt").write_text(text)
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_bench_replays_corpus_with_stubs(corpus):
+    results = await run_bench(
+        [corpus], iterations=2, concurrency=2, stt="stub", tts="stub", chat="stub",
+        stub_delays={"chat": 0.01}, turn_timeout=5.0,
+    )
+
+    assert results["turns"] == 4
+    assert results["completed"] == 4
+    assert results["timeouts"] == 0
+    assert results["end_to_end"]["count"] == 4
+    assert results["end_to_end"]["p50_ms"] >= 10  # includes the stub chat delay
+    assert results["throughput_turns_per_s"] > 0
+    assert "STT._on_recorded" in results["stages"]
+    assert results["stages"]["TTS._on_request"]["count"] == 4
+    assert results["config"]["adapters"]["stt"] == "stub"
+
+
+@pytest.mark.asyncio
+async def test_bench_rejects_empty_corpus(tmp_path):
+    with pytest.raises(ValueError):
+        await run_bench([tmp_path], stt="stub", tts="stub")
+
+
+def test_compare_flags_regressions_only_beyond_tolerance():
+    baseline = {
+        "end_to_end": {"p50_ms": 100.0, "p95_ms": 200.0},
+        "stages": {"STT._on_recorded": {"p50_ms": 50.0, "p95_ms": 0.5}},
+        "throughput_turns_per_s": 10.0,
+        "peak_rss_mb": 100.0,
+    }
+    current = {
+        "end_to_end": {"p50_ms": 105.0, "p95_ms": 260.0},
+        "stages": {"STT._on_recorded": {"p50_ms": 40.0, "p95_ms": 1.0}},
+        "throughput_turns_per_s": 8.0,
+        "peak_rss_mb": 100.0,
+    }
+
+    rows = {r["metric"]: r for r in compare(current, baseline, tolerance=0.1)}
+
+    assert not rows["end_to_end.p50_ms"]["regression"]
+    assert rows["end_to_end.p95_ms"]["regression"]
+    assert rows["end_to_end.p95_ms"]["change"] == 0.3
+    assert not rows["stages.STT._on_recorded.p50_ms"]["regression"]  # faster
+    assert not rows["stages.STT._on_recorded.p95_ms"]["regression"]  # under MIN_DELTA_MS
+    assert rows["throughput_turns_per_s"]["regression"]  # lower is worse
+    assert not rows["peak_rss_mb"]["regression"]
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Bus Bridge Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the WebSocket bus bridge: frame encoding, forwarding between two
+buses, echo suppression, per-turn routing, heartbeats, reconnects, the
+backlog and the /ws/bus endpoint.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import assistant.server as server
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core import bridge as bridge_module
+from assistant.core.bridge import (
+    CLIENT_TOPICS, SERVER_TOPICS, BusBridge, bridge_url, decode_frame, encode_frame, set_bus_bridge,
+)
+from assistant.core.bus import Bus
+from assistant.core.contracts import AudioRecorded, PlaybackEnd, TTSAudio, UXState
+
+
+class PipeEnd:
+    """In-memory stand-in for one side of a WebSocket."""
+
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.other = None
+        self.closed = False
+        self.sent = 0
+
+    async def send(self, frame):
+        if self.closed:
+            raise ConnectionError("closed")
+        self.sent += 1
+        await self.other.inbox.put(frame)
+
+    async def recv(self):
+        frame = await self.inbox.get()
+        if frame is None:
+            raise ConnectionError("closed")
+        return frame
+
+    async def close(self):
+        if not self.closed:
+            self.closed = True
+            await self.inbox.put(None)
+            await self.other.inbox.put(None)
+
+
+def pipe():
+    a, b = PipeEnd(), PipeEnd()
+    a.other, b.other = b, a
+    return a, b
+
+
+async def _until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def _capture(bus, topic):
+    events = []
+
+    async def handler(payload):
+        events.append(payload)
+
+    bus.subscribe(topic, handler)
+    return events
+
+
+def test_audio_frame_hands_buffer_to_peer():
+    registry = get_buffer_registry()
+    pcm = (np.arange(960, dtype=np.int16) - 480).reshape(-1, 2)
+    buffer_id = registry.put(pcm, 48000)
+    event = TTSAudio(buffer_id=buffer_id, duration_s=0.01, seq=1, final=False)
+
+    frame = encode_frame(event.dict())
+    assert registry.get(buffer_id) is None  # handed off
+
+    kind, payload = decode_frame(frame)
+    received = registry.get(payload["buffer_id"])
+    assert payload["buffer_id"] != buffer_id
+    assert payload["seq"] == 1 and payload["corr_id"] == event.corr_id
+    assert received.sample_rate == 48000
+    np.testing.assert_array_equal(received.pcm, pcm)
+    TTSAudio(**payload)  # still a valid event
+    registry.release(payload["buffer_id"])
+
+
+def test_bridge_url_from_server_url():
+    assert bridge_url("http://laptop:8000") == "ws://laptop:8000/ws/bus"
+    assert bridge_url("https://fish.example/") == "wss://fish.example/ws/bus"
+
+
+@pytest.mark.asyncio
+async def test_bridges_forward_events_both_ways():
+    server_bus, client_bus = Bus(), Bus()
+    server_bridge = BusBridge(server_bus, SERVER_TOPICS)
+    client_bridge = BusBridge(client_bus, CLIENT_TOPICS)
+    audio_out = _capture(client_bus, "tts.audio")
+    playback_end = _capture(server_bus, "audio.playback.end")
+
+    a, b = pipe()
+    tasks = [asyncio.ensure_future(server_bridge.serve(a)), asyncio.ensure_future(client_bridge.serve(b))]
+    await _until(lambda: server_bridge.connected and client_bridge.connected)
+
+    buffer_id = get_buffer_registry().put(np.zeros(1600, dtype=np.int16), 16000)
+    reply = TTSAudio(buffer_id=buffer_id, duration_s=0.1)
+    await server_bus.publish(reply.topic, reply.dict())
+    await _until(lambda: audio_out)
+    assert get_buffer_registry().get(audio_out[0]["buffer_id"]).frames == 1600
+
+    done = PlaybackEnd(buffer_id=audio_out[0]["buffer_id"])
+    await client_bus.publish(done.topic, done.dict())
+    await _until(lambda: playback_end)
+    assert playback_end[0]["corr_id"] == done.corr_id
+
+    await a.close()
+    await asyncio.gather(*tasks)
+    assert not server_bridge.connected
+    get_buffer_registry().release(audio_out[0]["buffer_id"])
+
+
+@pytest.mark.asyncio
+async def test_received_events_are_not_echoed():
+    bus_a, bus_b = Bus(), Bus()
+    bridge_a = BusBridge(bus_a, ["ux.state"])
+    bridge_b = BusBridge(bus_b, ["ux.state"])
+    states = _capture(bus_b, "ux.state")
+    a, b = pipe()
+    tasks = [asyncio.ensure_future(bridge_a.serve(a)), asyncio.ensure_future(bridge_b.serve(b))]
+    await _until(lambda: bridge_a.connected and bridge_b.connected)
+
+    state = UXState(state="thinking")
+    await bus_a.publish(state.topic, state.dict())
+    await _until(lambda: states)
+    await asyncio.sleep(0.05)
+
+    assert a.sent == 1 and b.sent == 0
+    await a.close()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_silent_peer_is_dropped():
+    bridge = BusBridge(Bus(), SERVER_TOPICS, heartbeat_s=0.02)
+    a, _b = pipe()  # nobody answers on the other end
+    await asyncio.wait_for(bridge.serve(a), timeout=1.0)
+    assert a.closed
+
+
+@pytest.mark.asyncio
+async def test_client_reconnects_and_flushes_backlog():
+    bus = Bus()
+    bridge = BusBridge(bus, ["ux.state"], heartbeat_s=5.0)
+    attempts = []
+    ends = []
+
+    @asynccontextmanager
+    async def connector(url):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise ConnectionRefusedError("server not up yet")
+        a, b = pipe()
+        ends.append(b)
+        yield a
+
+    state = UXState(state="listening")
+    await bus.publish(state.topic, state.dict())  # queued while disconnected
+    bridge.connect("ws://server/ws/bus", connector=connector, reconnect_max_s=0.01)
+
+    await _until(lambda: ends and not ends[0].inbox.empty())
+    _kind, payload = decode_frame(await ends[0].recv())
+    assert payload["state"] == "listening"
+    assert len(attempts) == 2
+
+    await bridge.close()
+
+
+@pytest.mark.asyncio
+async def test_turn_events_go_back_to_their_peer_only():
+    server_bus = Bus()
+    server_bridge = BusBridge(server_bus, SERVER_TOPICS)
+    clients, tasks, inboxes = [], [], []
+    for _ in range(2):
+        client_bus = Bus()
+        client_bridge = BusBridge(client_bus, CLIENT_TOPICS)
+        inboxes.append(_capture(client_bus, "ux.state"))
+        a, b = pipe()
+        tasks += [asyncio.ensure_future(server_bridge.serve(a)), asyncio.ensure_future(client_bridge.serve(b))]
+        clients.append((client_bus, a))
+    recorded = _capture(server_bus, "audio.recorded")
+    await _until(lambda: server_bridge.stats()["peers"] == 2)
+
+    pcm_id = get_buffer_registry().put(np.zeros(160, dtype=np.int16), 16000)
+    utterance = AudioRecorded(buffer_id=pcm_id, duration_s=0.01)
+    await clients[1][0].publish(utterance.topic, utterance.dict())
+    await _until(lambda: recorded)
+    get_buffer_registry().release(recorded[0]["buffer_id"])
+    reply = UXState(state="speaking", corr_id=utterance.corr_id)
+    await server_bus.publish(reply.topic, reply.dict())
+    broadcast = UXState(state="idle")  # not tied to a client's turn
+    await server_bus.publish(broadcast.topic, broadcast.dict())
+    await _until(lambda: len(inboxes[1]) == 2 and inboxes[0])
+    await asyncio.sleep(0.05)
+
+    assert [e["state"] for e in inboxes[0]] == ["idle"]
+    assert [e["state"] for e in inboxes[1]] == ["speaking", "idle"]
+    for _bus, a in clients:
+        await a.close()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_backlog_skips_audio_and_stale_events(monkeypatch):
+    bus = Bus()
+    bridge = BusBridge(bus, SERVER_TOPICS)
+    registry = get_buffer_registry()
+    before = len(registry)
+
+    audio = TTSAudio(buffer_id=registry.put(np.zeros(160, dtype=np.int16), 16000), duration_s=0.01)
+    await bus.publish(audio.topic, audio.dict())
+    old = UXState(state="thinking")
+    await bus.publish(old.topic, old.dict())
+    monkeypatch.setattr(bridge_module, "BACKLOG_TTL_S", 0.0)  # everything queued so far is stale
+    await asyncio.sleep(0.01)
+    assert bridge.stats()["backlog"] == 1
+    assert len(registry) == before  # dropped audio released its buffer
+
+    a, b = pipe()
+    task = asyncio.ensure_future(bridge.serve(a))
+    await _until(lambda: bridge.connected)
+    await asyncio.sleep(0.05)
+
+    assert b.inbox.empty()
+    assert bridge.stats()["dropped"] == 2
+    await a.close()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_audio_is_coded_off_the_event_loop(monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+    encode, decode = bridge_module.encode_frame, bridge_module.decode_frame
+
+    def recording_encode(payload):
+        threads.append(threading.get_ident())
+        return encode(payload)
+
+    def recording_decode(frame):
+        if bridge_module._has_audio(frame):
+            threads.append(threading.get_ident())
+        return decode(frame)
+
+    monkeypatch.setattr(bridge_module, "encode_frame", recording_encode)
+    monkeypatch.setattr(bridge_module, "decode_frame", recording_decode)
+    server_bus, client_bus = Bus(), Bus()
+    server_bridge = BusBridge(server_bus, SERVER_TOPICS)
+    client_bridge = BusBridge(client_bus, CLIENT_TOPICS)
+    audio_out = _capture(client_bus, "tts.audio")
+    a, b = pipe()
+    tasks = [asyncio.ensure_future(server_bridge.serve(a)), asyncio.ensure_future(client_bridge.serve(b))]
+    await _until(lambda: server_bridge.connected and client_bridge.connected)
+
+    reply = TTSAudio(buffer_id=get_buffer_registry().put(np.zeros(1600, dtype=np.int16), 16000), duration_s=0.1)
+    await server_bus.publish(reply.topic, reply.dict())
+    await _until(lambda: audio_out)
+
+    assert len(threads) == 2 and loop_thread not in threads
+    get_buffer_registry().release(audio_out[0]["buffer_id"])
+    await a.close()
+    await asyncio.gather(*tasks)
+
+
+def test_ws_endpoint_publishes_client_events(monkeypatch):
+    bus = Bus()
+    bridge = BusBridge(bus, SERVER_TOPICS)
+    received = _capture(bus, "audio.playback.end")
+    monkeypatch.setattr("assistant.core.bridge._bus_bridge", bridge)
+    client = TestClient(server.create_app())
+
+    done = PlaybackEnd(ok=True)
+    with client.websocket_connect("/ws/bus") as ws:
+        ws.send_bytes(encode_frame(done.dict()))
+        deadline = time.monotonic() + 2.0
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    assert received and received[0]["corr_id"] == done.corr_id
+    assert client.get("/api/stats").json()["bridge"]["frames_received"] == 1
+
+
+def test_ws_endpoint_refuses_when_bridge_off():
+    set_bus_bridge(None)
+    client = TestClient(server.create_app())
+    with pytest.raises(Exception):
+        with client.websocket_connect("/ws/bus") as ws:
+            ws.receive_bytes()
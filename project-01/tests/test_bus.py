@@ -34,7 +34,7 @@ and event delivery.
 
 import asyncio
 import pytest
-from assistant.core.bus import Bus
+from assistant.core.bus import Bus, BusQueueFull
 
 @pytest.mark.asyncio
 async def test_publish_subscribe():
@@ -47,4 +47,110 @@ async def test_publish_subscribe():
     bus.subscribe("demo", handler)
     await bus.publish("demo", {"x": 1})
     await asyncio.sleep(0.01)
-    assert got == [1]
\ No newline at end of file
+    assert got == [1]
+
+@pytest.mark.asyncio
+async def test_queued_publish_returns_before_handler_finishes():
+    bus = Bus()
+    bus.configure_topic("slow", queue_size=4)
+    started = asyncio.Event()
+    release = asyncio.Event()
+    done = []
+
+    async def handler(evt):
+        started.set()
+        await release.wait()
+        done.append(evt["x"])
+
+    bus.subscribe("slow", handler)
+    await asyncio.wait_for(bus.publish("slow", {"x": 1}), timeout=0.5)
+    await asyncio.wait_for(started.wait(), timeout=0.5)
+    assert done == []
+
+    release.set()
+    await asyncio.wait_for(bus.join(), timeout=0.5)
+    assert done == [1]
+    bus.clear()
+
+
+@pytest.mark.asyncio
+async def test_queued_single_worker_preserves_order():
+    bus = Bus()
+    bus.configure_topic("ordered", queue_size=16, workers=1)
+    got = []
+
+    async def handler(evt):
+        await asyncio.sleep(0)
+        got.append(evt["x"])
+
+    bus.subscribe("ordered", handler)
+    for i in range(10):
+        await bus.publish("ordered", {"x": i})
+    await bus.join()
+    assert got == list(range(10))
+    bus.clear()
+
+
+@pytest.mark.asyncio
+async def test_queued_drop_oldest_overflow():
+    bus = Bus()
+    bus.configure_topic("lossy", queue_size=2, overflow="drop_oldest")
+    release = asyncio.Event()
+    got = []
+
+    async def handler(evt):
+        await release.wait()
+        got.append(evt["x"])
+
+    bus.subscribe("lossy", handler)
+    await bus.publish("lossy", {"x": 0})
+    await asyncio.sleep(0.01)  # worker picks up 0 and blocks
+    for i in range(1, 5):
+        await bus.publish("lossy", {"x": i})
+
+    release.set()
+    await bus.join()
+    assert got == [0, 3, 4]
+    assert bus.stats()["lossy"]["dropped"] == 2
+    bus.clear()
+
+
+@pytest.mark.asyncio
+async def test_queued_reject_overflow():
+    bus = Bus()
+    bus.configure_topic("strict", queue_size=1, overflow="reject")
+    release = asyncio.Event()
+
+    async def handler(evt):
+        await release.wait()
+
+    bus.subscribe("strict", handler)
+    await bus.publish("strict", {"x": 0})
+    await asyncio.sleep(0.01)
+    await bus.publish("strict", {"x": 1})  # fills the queue
+    with pytest.raises(BusQueueFull):
+        await bus.publish("strict", {"x": 2})
+
+    release.set()
+    await bus.join()
+    assert bus.stats()["strict"]["rejected"] == 1
+    bus.clear()
+
+
+@pytest.mark.asyncio
+async def test_queued_handler_exception_does_not_stop_worker():
+    bus = Bus()
+    bus.configure_topic("flaky")
+    got = []
+
+    async def handler(evt):
+        if evt["x"] == 0:
+            raise RuntimeError("boom")
+        got.append(evt["x"])
+
+    bus.subscribe("flaky", handler)
+    await bus.publish("flaky", {"x": 0})
+    await bus.publish("flaky", {"x": 1})
+    await bus.join()
+    assert got == [1]
+    bus.clear()
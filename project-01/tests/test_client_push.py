@@ -35,11 +35,15 @@ push functionality.
 import pytest
 import tempfile
 import os
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import patch
+
+import httpx
+
 from assistant.core.audio.client_push import ClientAudioPush
 from assistant.core.bus import Bus
 from assistant.core.contracts import TTSAudio
 from assistant.core.config import Config
+from assistant.core.http import HTTPClients
 
 
 @pytest.fixture
@@ -105,18 +109,15 @@ async def test_client_push_success(bus, temp_wav_file):
         client_push = ClientAudioPush(bus)
         await client_push.start()
         
-        # Mock httpx client
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"status": "ok", "duration_s": 1.0}
-        mock_response.raise_for_status = MagicMock()
-        
-        with patch("assistant.core.audio.client_push.httpx.AsyncClient") as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client.return_value = mock_client_instance
-            
+        # Stand-in client endpoint behind the shared HTTP client registry
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"status": "ok", "duration_s": 1.0})
+
+        clients = HTTPClients(transport=httpx.MockTransport(handler))
+        with patch("assistant.core.audio.client_push.get_http_clients", return_value=clients):
             # Publish a TTS audio event
             audio_event = TTSAudio(wav_path=temp_wav_file, duration_s=1.0)
             await bus.publish(audio_event.topic, audio_event.dict())
@@ -125,11 +126,12 @@ async def test_client_push_success(bus, temp_wav_file):
             import asyncio
             await asyncio.sleep(0.1)
             
-            # Verify POST was called
-            assert mock_client_instance.post.called
-            call_args = mock_client_instance.post.call_args
-            assert call_args[0][0] == "http://localhost:8001/api/audio/play"
-            assert "files" in call_args[1]
+            # Verify POST was sent
+            assert len(requests) == 1
+            assert requests[0].method == "POST"
+            assert str(requests[0].url) == "http://localhost:8001/api/audio/play"
+            assert b'name="audio"' in requests[0].content
+        await clients.aclose()
     finally:
         Config.CLIENT_SERVER_URL = original_url
 
@@ -167,15 +169,12 @@ async def test_client_push_handles_network_error(bus, temp_wav_file):
         client_push = ClientAudioPush(bus)
         await client_push.start()
         
-        # Mock httpx client to raise an error
-        import httpx
-        with patch("assistant.core.audio.client_push.httpx.AsyncClient") as mock_client:
-            mock_client_instance = AsyncMock()
-            mock_client_instance.__aenter__.return_value = mock_client_instance
-            mock_client_instance.__aexit__.return_value = None
-            mock_client_instance.post = AsyncMock(side_effect=httpx.TimeoutException("Timeout"))
-            mock_client.return_value = mock_client_instance
-            
+        # Stand-in client endpoint that times out
+        def handler(request):
+            raise httpx.TimeoutException("Timeout", request=request)
+
+        clients = HTTPClients(transport=httpx.MockTransport(handler))
+        with patch("assistant.core.audio.client_push.get_http_clients", return_value=clients):
             # Publish a TTS audio event
             audio_event = TTSAudio(wav_path=temp_wav_file, duration_s=1.0)
             await bus.publish(audio_event.topic, audio_event.dict())
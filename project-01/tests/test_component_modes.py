@@ -50,6 +50,7 @@ def reset_config():
     original_mode = Config.DEPLOYMENT_MODE
     original_stt_mode = Config.STT_MODE
     original_tts_mode = Config.TTS_MODE
+    original_pipeline = Config.CLIENT_PIPELINE
     
     yield
     
@@ -57,6 +58,7 @@ def reset_config():
     Config.DEPLOYMENT_MODE = original_mode
     Config.STT_MODE = original_stt_mode
     Config.TTS_MODE = original_tts_mode
+    Config.CLIENT_PIPELINE = original_pipeline
 
 
 async def test_start_full_components():
@@ -93,6 +95,28 @@ async def test_start_server_components():
     assert len(bus._subs) > 0
 
 
+async def test_server_components_share_stt_process_pool(monkeypatch):
+    """With STT_PROCESSES the bus STT and /api/stt/transcribe use the same worker pool."""
+    import assistant.server as server
+    from assistant.core.stt import process_pool
+
+    monkeypatch.setattr(Config, "STT_PROCESSES", 1)
+    monkeypatch.setattr(Config, "STT_PRELOAD", False)  # don't start worker processes
+    monkeypatch.setattr(process_pool, "_process_pool", None)
+    monkeypatch.setattr(server, "_stt_adapter", None)
+    monkeypatch.setattr(server, "WHISPER_AVAILABLE", True)
+    Config.DEPLOYMENT_MODE = "server"
+    bus = Bus()
+
+    try:
+        await start_server_components(bus)
+        stt = bus._subs["audio.recorded"][0].__self__
+        assert isinstance(stt.adapter, process_pool.STTProcessPool)
+        assert server.get_stt_adapter() is stt.adapter
+    finally:
+        process_pool.close_stt_process_pool()
+
+
 async def test_start_client_components():
     """Test that client mode components start correctly."""
     bus = Bus()
@@ -111,4 +135,16 @@ async def test_start_client_components():
     assert len(bus._subs) > 0
 
 
-
+async def test_start_client_components_converse_pipeline():
+    """Test that the converse client replaces local STT/NLU/skills/TTS."""
+    bus = Bus()
+    
+    Config.DEPLOYMENT_MODE = "client"
+    Config.CLIENT_PIPELINE = "converse"
+    
+    await start_client_components(bus)
+    
+    assert "audio.recorded" in bus._subs
+    assert "tts.audio" in bus._subs  # local playback
+    assert "stt.transcript" not in bus._subs
+    assert "tts.request" not in bus._subs
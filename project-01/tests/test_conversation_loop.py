@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Conversation Loop Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the event-driven conversation loop. Audio blocks are pushed from a
+thread the way the PortAudio callback does, with a fake VAD, so no input
+device is needed.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.config import Config
+from assistant.core.contracts import PlaybackEnd
+
+try:
+    import assistant.core.ux.conversation_loop as conversation_loop
+    from assistant.core.ux.conversation_loop import BLOCKSIZE, ConversationLoop
+except OSError:  # sounddevice raises OSError when PortAudio is missing
+    pytest.skip("PortAudio not available", allow_module_level=True)
+
+
+class FakeVAD:
+    """Treats any frame with non-zero samples as speech."""
+
+    def is_speech(self, frame):
+        return bool(np.any(frame))
+
+    def process(self, audio):
+        n = len(audio) // 480
+        return np.any(audio[:n * 480].reshape(n, 480), axis=1)
+
+
+def _block(speech: bool):
+    return np.full((BLOCKSIZE, 1), 1000 if speech else 0, dtype=np.int16)
+
+
+def _prime(loop: ConversationLoop):
+    loop.running = True
+    loop._loop = asyncio.get_event_loop()
+    loop._audio_ready = asyncio.Event()
+
+
+def _callback(loop: ConversationLoop, block):
+    """What the PortAudio callback does with each block."""
+    loop.ring.write(block[:, 0])
+    loop._loop.call_soon_threadsafe(loop._audio_ready.set)
+
+
+@pytest.mark.asyncio
+async def test_blocks_from_audio_thread_drive_recording():
+    bus = Bus()
+    recorded, states = [], []
+
+    async def on_recorded(payload):
+        recorded.append(payload)
+
+    async def on_state(payload):
+        states.append(payload["state"])
+
+    bus.subscribe("audio.recorded", on_recorded)
+    bus.subscribe("ux.state", on_state)
+
+    loop = ConversationLoop(bus, vad=FakeVAD())
+    _prime(loop)
+    consumer = asyncio.ensure_future(loop._consume())
+
+    def audio_thread():
+        pattern = [False] * 2 + [True] * 10 + [False] * (conversation_loop.SILENCE_FRAMES_THRESHOLD + 1)
+        for speech in pattern:
+            _callback(loop, _block(speech))
+
+    thread = threading.Thread(target=audio_thread)
+    thread.start()
+    thread.join()
+
+    for _ in range(100):
+        if recorded:
+            break
+        await asyncio.sleep(0.01)
+
+    assert loop.state == "thinking"
+    assert states == ["listening", "thinking"]
+    assert len(recorded) == 1
+    assert recorded[0]["duration_s"] > 0.5
+    # The recording is handed over in memory and starts with the pre-roll before detection
+    assert recorded[0]["wav_path"] == ""
+    buffer = get_buffer_registry().get(recorded[0]["buffer_id"])
+    assert buffer.sample_rate == 16000
+    assert buffer.pcm[0] == 0 and buffer.pcm.max() == 1000
+    get_buffer_registry().release(recorded[0]["buffer_id"])
+
+    await loop.stop()
+    await asyncio.wait_for(consumer, timeout=1.0)
+
+
+class CountingVAD(FakeVAD):
+    """Records every sample passed to process()."""
+
+    def __init__(self):
+        self.samples = 0
+
+    def process(self, audio):
+        self.samples += len(audio)
+        return super().process(audio)
+
+
+@pytest.mark.asyncio
+async def test_vad_sees_each_sample_once_while_recording():
+    vad = CountingVAD()
+    loop = ConversationLoop(Bus(), vad=vad)
+    _prime(loop)
+
+    pattern = [False] * 2 + [True] * 10 + [False] * (conversation_loop.SILENCE_FRAMES_THRESHOLD + 1)
+    for speech in pattern:
+        loop.ring.write(_block(speech)[:, 0])
+        await loop._on_audio(loop.ring.written)
+
+    assert loop.state == "thinking"
+    assert vad.samples <= loop.ring.written  # no block classified twice
+    loop._cancel_state_timer()
+
+
+@pytest.mark.asyncio
+async def test_blocks_ignored_while_speaking():
+    loop = ConversationLoop(Bus(), vad=FakeVAD())
+    _prime(loop)
+    loop._set_state("speaking")
+    for _ in range(5):
+        loop.ring.write(_block(True)[:, 0])
+        await loop._on_audio(loop.ring.written)
+    assert loop.state == "speaking"
+    assert loop._utterance_start is None
+    assert loop._read_pos == loop.ring.written
+    loop._cancel_state_timer()
+
+
+@pytest.mark.asyncio
+async def test_long_utterance_is_cut_at_max_length(monkeypatch):
+    monkeypatch.setattr(Config, "CONV_MAX_UTTERANCE_S", 1.0)
+    bus = Bus()
+    recorded = []
+
+    async def on_recorded(payload):
+        recorded.append(payload)
+
+    bus.subscribe("audio.recorded", on_recorded)
+    loop = ConversationLoop(bus, vad=FakeVAD())
+    _prime(loop)
+
+    for _ in range(40):  # ~2.5s of continuous speech
+        loop.ring.write(_block(True)[:, 0])
+        await loop._on_audio(loop.ring.written)
+
+    assert len(recorded) == 1
+    assert recorded[0]["duration_s"] <= 1.0 + BLOCKSIZE / 16000.0
+    get_buffer_registry().release(recorded[0]["buffer_id"])
+    loop._cancel_state_timer()
+
+
+@pytest.mark.asyncio
+async def test_thinking_timeout_is_a_timer(monkeypatch):
+    monkeypatch.setattr(conversation_loop, "THINKING_TIMEOUT_S", 0.02)
+    bus = Bus()
+    states = []
+
+    async def on_state(payload):
+        states.append(payload["state"])
+
+    bus.subscribe("ux.state", on_state)
+    loop = ConversationLoop(bus, vad=FakeVAD())
+    loop._set_state("thinking")
+
+    await asyncio.sleep(0.1)
+    assert loop.state == "idle"
+    assert states == ["idle"]
+
+
+@pytest.mark.asyncio
+async def test_playback_end_cancels_speaking_timer(monkeypatch):
+    monkeypatch.setattr(conversation_loop, "SPEAKING_TIMEOUT_S", 0.05)
+    loop = ConversationLoop(Bus(), vad=FakeVAD())
+    loop._set_state("speaking")
+    timer = loop._state_timer
+
+    await loop._on_playback_end(PlaybackEnd(wav_path="x.wav", ok=True).dict())
+    assert loop.state == "idle"
+    assert loop._state_timer is None
+    assert timer.cancelled()
+
+
+class FakeTranscriber:
+    """Records what the loop asks for; text is the number of samples seen."""
+
+    last_tail_s = 0.0
+
+    def __init__(self):
+        self.updates = []
+        self.finalized = []
+
+    def reset(self):
+        pass
+
+    def update(self, audio):
+        self.updates.append(len(audio))
+        return "partial %d" % len(audio)
+
+    def finalize(self, audio):
+        self.finalized.append(len(audio))
+        return "final"
+
+
+@pytest.mark.asyncio
+async def test_streaming_stt_publishes_partials_then_final(monkeypatch):
+    monkeypatch.setattr(Config, "STT_PARTIAL_INTERVAL_MS", 200)
+    bus = Bus()
+    transcripts, recorded = [], []
+
+    async def on_transcript(payload):
+        transcripts.append(payload)
+
+    async def on_recorded(payload):
+        recorded.append(payload)
+
+    bus.subscribe("stt.transcript", on_transcript)
+    bus.subscribe("audio.recorded", on_recorded)
+    transcriber = FakeTranscriber()
+    loop = ConversationLoop(bus, vad=FakeVAD(), transcriber=transcriber)
+    _prime(loop)
+
+    pattern = [False] * 2 + [True] * 20 + [False] * (conversation_loop.SILENCE_FRAMES_THRESHOLD + 1)
+    for speech in pattern:
+        loop.ring.write(_block(speech)[:, 0])
+        await loop._on_audio(loop.ring.written)
+        await asyncio.sleep(0.01)  # let partial passes finish in the executor
+
+    assert loop.state == "thinking"
+    assert recorded == []  # no WAV round trip through the STT component
+    assert transcriber.updates and transcriber.finalized
+    partials = [t for t in transcripts if t["partial"]]
+    assert partials and all(t["text"].startswith("partial") for t in partials)
+    assert transcripts[-1]["text"] == "final" and not transcripts[-1]["partial"]
+    assert {t["corr_id"] for t in transcripts} == {transcripts[-1]["corr_id"]}
+    loop._cancel_state_timer()
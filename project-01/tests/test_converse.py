@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Converse Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for single round-trip conversation turns: the server pipeline, the
+/api/converse endpoint and the client-mode ConverseClient.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+
+import httpx
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi.testclient import TestClient
+
+import assistant.core.converse as converse
+import assistant.server as server
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.contracts import AudioRecorded, SkillRequest, SkillResponse, same_trace
+from assistant.core.converse import ConverseClient, ConversePipeline, ConverseResult
+from assistant.core.http import HTTPClients
+from assistant.core.inference import InferencePool
+from assistant.core.nlu.nlu import NLU
+from assistant.core.router import Router
+
+
+class FakeSTT:
+    def __init__(self, text):
+        self.text = text
+
+    def transcribe(self, path, model_size=None):
+        assert os.path.exists(path)
+        return self.text
+
+
+class FakeTTS:
+    def __init__(self):
+        self.calls = []
+
+    def synth(self, text):
+        self.calls.append(text)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        sf.write(path, np.zeros(1600, dtype=np.int16), 16000)
+        return path
+
+
+async def _setup(bus: Bus):
+    """NLU + router + a skill answering every request (no chat API needed)."""
+    Router(bus)
+    await NLU(bus).start()
+
+    async def answer(payload):
+        req = SkillRequest(**payload)
+        resp = SkillResponse(skill=req.skill, say=f"{req.skill}: {req.payload['original_text']}")
+        same_trace(req, resp)
+        await bus.publish(resp.topic, resp.dict())
+
+    bus.subscribe("skill.request", answer)
+
+
+def _wav_bytes(seconds=0.5):
+    out = io.BytesIO()
+    sf.write(out, np.zeros(int(16000 * seconds), dtype=np.int16), 16000, format="WAV", subtype="PCM_16")
+    return out.getvalue()
+
+
+@pytest.fixture
+def wav_file():
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    with open(path, "wb") as f:
+        f.write(_wav_bytes())
+    yield path
+    os.remove(path)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_whole_turn(wav_file):
+    tts = FakeTTS()
+    pipeline = ConversePipeline(FakeSTT("what time is it"), tts, InferencePool(), setup=_setup)
+
+    result = await pipeline.run(wav_file)
+
+    assert result.transcript == "what time is it"
+    assert result.intent == "time"
+    assert result.reply == "time: what time is it"
+    assert tts.calls == [result.reply]
+    assert set(result.timings) == {"stt", "reply", "tts", "queue", "total"}
+    os.remove(result.wav_path)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_do_not_wait_for_each_other(wav_file):
+    release = asyncio.Event()
+
+    async def setup(bus: Bus):
+        bus.configure_topic("skill.request", workers=2)
+        Router(bus)
+        await NLU(bus).start()
+
+        async def answer(payload):
+            req = SkillRequest(**payload)
+            if "joke" in req.payload["original_text"]:
+                await release.wait()  # e.g. a slow chat API call for one fish
+            resp = SkillResponse(skill=req.skill, say=f"{req.skill}: {req.payload['original_text']}")
+            same_trace(req, resp)
+            await bus.publish(resp.topic, resp.dict())
+
+        bus.subscribe("skill.request", answer)
+
+    class PerFileSTT:
+        def transcribe(self, path, model_size=None):
+            return "tell me a joke" if path.endswith("slow.wav") else "what time is it"
+
+    pipeline = ConversePipeline(PerFileSTT(), FakeTTS(), InferencePool(workers=2), setup=setup)
+    slow_path = wav_file[:-4] + "slow.wav"
+    with open(wav_file, "rb") as src, open(slow_path, "wb") as dst:
+        dst.write(src.read())
+    try:
+        slow = asyncio.ensure_future(pipeline.run(slow_path))
+        await asyncio.sleep(0.05)
+        fast = await asyncio.wait_for(pipeline.run(wav_file), 2.0)
+        assert fast.reply == "time: what time is it"
+        assert not slow.done()
+
+        release.set()
+        slow_result = await asyncio.wait_for(slow, 2.0)
+        assert slow_result.reply == "joke: tell me a joke"
+        for result in (fast, slow_result):
+            os.remove(result.wav_path)
+    finally:
+        os.remove(slow_path)
+
+
+@pytest.mark.asyncio
+async def test_queued_turn_without_reply_ends_when_bus_is_idle(wav_file):
+    async def setup(bus: Bus):
+        bus.configure_topic("nlu.intent")
+        await NLU(bus).start()  # no router or skills: nobody answers
+
+    tts = FakeTTS()
+    pipeline = ConversePipeline(FakeSTT("what time is it"), tts, InferencePool(), setup=setup, reply_timeout=5.0)
+
+    result = await asyncio.wait_for(pipeline.run(wav_file), 1.0)
+
+    assert result.intent == "time"
+    assert result.reply is None
+    assert tts.calls == []
+
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_tts_for_empty_transcript(wav_file):
+    tts = FakeTTS()
+    pipeline = ConversePipeline(FakeSTT("  "), tts, InferencePool(), setup=_setup)
+
+    result = await pipeline.run(wav_file)
+
+    assert result.transcript == ""
+    assert result.wav_path is None
+    assert tts.calls == []
+
+
+def test_result_headers_round_trip():
+    result = ConverseResult(transcript="héllo, fish", intent="smalltalk", reply="Hi!\nBye", timings={"stt": 12.5})
+    parsed = ConverseResult.from_headers(httpx.Headers(result.headers()))
+    assert parsed.transcript == result.transcript
+    assert parsed.intent == "smalltalk"
+    assert parsed.reply == result.reply
+    assert parsed.timings == {"stt": 12.5}
+
+
+def test_converse_endpoint_returns_reply_audio(wav_file, monkeypatch):
+    pipeline = ConversePipeline(FakeSTT("tell me a joke"), FakeTTS(), InferencePool(), setup=_setup)
+    monkeypatch.setattr(server, "_converse_pipeline", pipeline)
+    client = TestClient(server.create_app())
+
+    with open(wav_file, "rb") as audio_file:
+        response = client.post("/api/converse", files={"audio": ("test.wav", audio_file, "audio/wav")})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    result = ConverseResult.from_headers(response.headers)
+    assert result.transcript == "tell me a joke"
+    assert result.intent == "joke"
+    assert "total" in result.timings
+    pcm, sr = sf.read(io.BytesIO(response.content), dtype="int16")
+    assert sr == 16000 and len(pcm) == 1600
+
+
+def test_converse_endpoint_no_content_without_reply(wav_file, monkeypatch):
+    pipeline = ConversePipeline(FakeSTT(""), FakeTTS(), InferencePool(), setup=_setup)
+    monkeypatch.setattr(server, "_converse_pipeline", pipeline)
+    client = TestClient(server.create_app())
+
+    with open(wav_file, "rb") as audio_file:
+        response = client.post("/api/converse", files={"audio": ("test.wav", audio_file, "audio/wav")})
+
+    assert response.status_code == 204
+    assert response.headers["x-transcript"] == ""
+
+
+@pytest.mark.asyncio
+async def test_client_publishes_transcript_and_reply_audio(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        headers = ConverseResult(transcript="hello", intent="smalltalk", reply="Hi there").headers()
+        headers["content-type"] = "audio/wav"
+        return httpx.Response(200, content=_wav_bytes(0.25), headers=headers)
+
+    clients = HTTPClients(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("assistant.core.converse.get_http_clients", lambda: clients)
+    coded_on_loop = []
+
+    def off_loop(fn):
+        def wrapper(*args):
+            try:
+                asyncio.get_running_loop()
+                coded_on_loop.append(True)
+            except RuntimeError:  # no loop in this thread: an executor worker
+                coded_on_loop.append(False)
+            return fn(*args)
+        return wrapper
+
+    for name in ("_read_buffer", "_decode_reply"):
+        monkeypatch.setattr(converse, name, off_loop(getattr(converse, name)))
+
+    bus = Bus()
+    events = []
+
+    async def capture(payload):
+        events.append(payload)
+
+    bus.subscribe("stt.transcript", capture)
+    bus.subscribe("tts.audio", capture)
+    converse_client = ConverseClient(bus, server_url="http://server:8000")
+    await converse_client.start()
+
+    registry = get_buffer_registry()
+    buffer_id = registry.put(np.zeros(8000, dtype=np.int16), 16000)
+    recorded = AudioRecorded(buffer_id=buffer_id, duration_s=0.5)
+    await bus.publish(recorded.topic, recorded.dict())
+
+    assert len(requests) == 1
+    assert requests[0].url.path == "/api/converse"
+    assert registry.get(buffer_id) is None
+    assert events[0]["topic"] == "stt.transcript" and events[0]["text"] == "hello"
+    assert events[1]["topic"] == "tts.audio"
+    assert events[1]["duration_s"] == pytest.approx(0.25)
+    assert all(e["corr_id"] == recorded.corr_id for e in events)
+    assert coded_on_loop == [False, False]  # WAV encode and decode ran in an executor
+    registry.release(events[1]["buffer_id"])
+    await clients.aclose()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Shared HTTP Client Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the shared HTTP client registry against a local stand-in server
+that speaks HTTP/1.1 keep-alive and records which TCP connection served
+each request.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import assistant.core.http as http
+from assistant.core.http import HTTPClients, origin
+from assistant.core.stt.remote_stt_adapter import RemoteSTTAdapter
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections open between requests
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.connections.append(self.client_address)
+        body = json.dumps({"text": "hello fish", "status": "ok"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    srv.connections = []
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    registry = HTTPClients()
+    monkeypatch.setattr(http, "_clients", registry)
+    return registry
+
+
+@pytest.fixture
+def wav(tmp_path):
+    path = tmp_path / "a.wav"
+    path.write_bytes(b"RIFF0000WAVE")
+    return str(path)
+
+
+def test_origin():
+    assert origin("http://Host:8000/api/stt?x=1") == "http://host:8000"
+    with pytest.raises(ValueError):
+        origin("/health")
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_origin(clients):
+    a = clients.get("http://a:8000/x")
+    assert clients.get("http://a:8000/y") is a
+    assert clients.get("http://b:8000/x") is not a
+    assert clients.stats()["origins"] == ["http://a:8000", "http://b:8000"]
+    await clients.aclose()
+    assert a.is_closed
+    assert clients.stats()["clients"] == 0
+
+
+def test_sync_adapter_reuses_one_connection(server, clients, wav):
+    srv, url = server
+    adapter = RemoteSTTAdapter(server_url=url, timeout=5.0)
+    for _ in range(3):
+        assert adapter.transcribe(wav) == "hello fish"
+    assert len(srv.connections) == 3
+    assert len(set(srv.connections)) == 1  # same client port: one TCP connection
+    asyncio.run(clients.aclose())
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_the_connection_requests_reuse(server, clients):
+    srv, url = server
+    assert await clients.prewarm([f"{url}/health", f"{url}/health", "http://127.0.0.1:1/health"]) == 1
+    response = await clients.get(url).post(f"{url}/api/audio/play", timeout=5.0)
+    assert response.json()["status"] == "ok"
+    assert len(set(srv.connections)) == 1
+    await clients.aclose()
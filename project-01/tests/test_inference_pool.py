@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Inference Pool Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the bounded inference worker pool. Verifies jobs run off the
+event loop, admission control rejects work when the queue is full, and
+queue statistics are reported.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from assistant.core.inference import InferencePool, PoolFullError
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_run_returns_result_off_loop_thread():
+    pool = InferencePool(workers=1, queue_size=1)
+    loop_thread = threading.get_ident()
+
+    result = await pool.run(lambda: threading.get_ident())
+
+    assert result != loop_thread
+    assert pool.stats()["completed"] == 1
+    pool.shutdown()
+
+
+async def test_event_loop_stays_responsive_during_job():
+    pool = InferencePool(workers=1, queue_size=0)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(pool.run(time.sleep, 0.1), ticker())
+
+    assert len(ticks) == 5
+    pool.shutdown()
+
+
+async def test_rejects_when_queue_full():
+    pool = InferencePool(workers=1, queue_size=1)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(pool.run(release.wait))
+    queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+    await asyncio.sleep(0.05)
+
+    assert pool.stats()["active"] == 1
+    assert pool.stats()["queued"] == 1
+
+    with pytest.raises(PoolFullError) as exc_info:
+        await pool.run(lambda: "rejected")
+    assert exc_info.value.retry_after >= 1
+
+    release.set()
+    assert await queued == "queued"
+    await running
+
+    stats = pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["queued"] == 0
+    assert stats["wait_ms_max"] > 0
+    pool.shutdown()
+
+
+async def test_run_timed_reports_wait_and_run():
+    pool = InferencePool(workers=1, queue_size=0)
+
+    result, timing = await pool.run_timed(lambda x: x * 2, 21)
+
+    assert result == 42
+    assert timing["wait_s"] >= 0.0
+    assert timing["run_s"] >= 0.0
+    pool.shutdown()
+
+
+async def test_cancelled_queued_job_returns_its_slot():
+    pool = InferencePool(workers=1, queue_size=2)
+    release = threading.Event()
+    ran = []
+
+    running = asyncio.ensure_future(pool.run(release.wait))
+    queued = asyncio.ensure_future(pool.run(ran.append, "queued"))
+    await asyncio.sleep(0.05)
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    release.set()
+    await running
+    await asyncio.sleep(0.05)
+
+    assert ran == []
+    assert pool.pending == 0
+    assert pool.stats()["queued"] == 0
+    assert await pool.run(lambda: "next") == "next"
+    pool.shutdown()
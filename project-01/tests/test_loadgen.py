@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Load Generator Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the server load generator: simulated clients against the
+in-process app, 503 accounting, queue sampling and histograms.
+
+--------------------------------------------------------------------------
+"""
+
+import io
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+import assistant.server as server
+from assistant.core.inference import InferencePool
+from assistant.loadgen import LoadGenerator, LoadProfile, histogram, synth_utterance
+from assistant.server import create_app
+
+
+class FakeSTT:
+    def transcribe(self, path, model_size=None):
+        time.sleep(0.02)
+        return "hello fish"
+
+
+class FakeTTS:
+    def synth(self, text):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        sf.write(path, np.zeros(1600, dtype=np.int16), 16000, subtype="PCM_16")
+        return path
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    monkeypatch.setattr(server, "WHISPER_AVAILABLE", True)
+    monkeypatch.setattr(server, "PYTTSX3_AVAILABLE", True)
+    monkeypatch.setattr(server, "_stt_adapter", FakeSTT())
+    monkeypatch.setattr(server, "_tts_adapter", FakeTTS())
+    pool = InferencePool(workers=1, queue_size=1)
+    monkeypatch.setattr(server, "get_inference_pool", lambda: pool)
+    yield create_app()
+    pool.shutdown()
+
+
+def _profile(**kwargs):
+    defaults = dict(clients=4, duration_s=10.0, turns=3, utterance_s=(0.2, 0.5),
+                    think_s=(0.0, 0.01), sample_interval_s=0.01, seed=1)
+    defaults.update(kwargs)
+    return LoadProfile(**defaults)
+
+
+@pytest.mark.asyncio
+async def test_simulated_clients_report_latency_503s_and_queue(fake_server):
+    results = await LoadGenerator(_profile(), app=fake_server).run()
+
+    stt = results["endpoints"]["stt"]
+    tts = results["endpoints"]["tts"]
+    assert results["turns"] == 12
+    assert stt["requests"] == 12
+    # One worker and one queue slot for four clients: some uploads are shed
+    assert stt["ok"] + stt["rejected_503"] == 12
+    assert stt["rejected_503"] > 0
+    assert stt["rate_503"] == round(stt["rejected_503"] / 12, 4)
+    assert stt["errors"] == 0
+    assert tts["requests"] == stt["ok"]  # replies only follow a transcript
+    assert stt["latency"]["count"] == stt["ok"]
+    assert sum(stt["histogram"].values()) == stt["ok"]
+    assert stt["server_queue_wait"]["count"] == stt["ok"]
+    assert results["queue"]["samples"]
+    assert results["config"]["target"] == "in-process"
+
+
+@pytest.mark.asyncio
+async def test_stt_only_profile_skips_tts(fake_server):
+    results = await LoadGenerator(_profile(clients=1, tts=False), app=fake_server).run()
+    assert results["endpoints"]["stt"]["ok"] == 3
+    assert results["endpoints"]["tts"]["requests"] == 0
+
+
+def test_load_generator_needs_exactly_one_target():
+    with pytest.raises(ValueError):
+        LoadGenerator(LoadProfile())
+
+
+def test_histogram_buckets():
+    counts = histogram([0.01, 0.2, 0.2, 45.0], buckets_ms=(100, 250, 1000))
+    assert counts == {"<=100": 1, "<=250": 2, "<=1000": 0, ">1000": 1}
+
+
+def test_synth_utterance_length():
+    data, sr = sf.read(io.BytesIO(synth_utterance(1.5, random.Random(0))), dtype="int16")
+    assert sr == 16000
+    assert len(data) == 24000
+    assert np.abs(data).max() > 1000
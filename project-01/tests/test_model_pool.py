@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Whisper Model Pool Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the shared Whisper model pool. Verifies models are loaded once,
+shared across threads, and evicted least-recently-used.
+
+--------------------------------------------------------------------------
+"""
+
+import threading
+import time
+
+from assistant.core.stt.model_pool import WhisperModelPool
+
+
+class FakeLoader:
+    """Counts loads and returns a unique object per key."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, model_size, compute_type, cpu_threads):
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append((model_size, compute_type, cpu_threads))
+        return object()
+
+
+def test_model_loaded_once_and_reused():
+    loader = FakeLoader()
+    pool = WhisperModelPool(max_models=2, loader=loader)
+
+    first = pool.get("tiny")
+    second = pool.get("tiny")
+
+    assert first is second
+    assert loader.calls == [("tiny", "int8", 0)]
+
+
+def test_concurrent_requests_share_single_load():
+    loader = FakeLoader(delay=0.05)
+    pool = WhisperModelPool(max_models=2, loader=loader)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(pool.get("base"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(loader.calls) == 1
+    assert all(m is results[0] for m in results)
+
+
+def test_lru_eviction():
+    loader = FakeLoader()
+    pool = WhisperModelPool(max_models=2, loader=loader)
+
+    pool.get("tiny")
+    pool.get("base")
+    pool.get("tiny")   # tiny is now most recently used
+    pool.get("small")  # evicts base
+
+    assert pool.loaded() == [("tiny", "int8", 0), ("small", "int8", 0)]
+    assert pool.evictions == 1
+
+    pool.get("base")   # reloaded after eviction
+    assert loader.calls.count(("base", "int8", 0)) == 2
+
+
+def test_key_includes_compute_type_and_threads():
+    loader = FakeLoader()
+    pool = WhisperModelPool(max_models=4, loader=loader)
+
+    assert pool.get("tiny", "int8", 0) is not pool.get("tiny", "float32", 0)
+    assert pool.get("tiny", "int8", 0) is not pool.get("tiny", "int8", 2)
+    assert len(loader.calls) == 3
+
+
+def test_eviction_keeps_key_lock():
+    pool = WhisperModelPool(max_models=1, loader=FakeLoader())
+    pool.get("tiny")
+    lock = pool._key_locks[("tiny", "int8", 0)]
+
+    pool.get("base")  # evicts tiny
+    pool.clear()
+
+    # Threads still holding or waiting on the old lock serialize with new callers
+    assert pool._key_locks[("tiny", "int8", 0)] is lock
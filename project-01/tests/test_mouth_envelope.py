@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Mouth Envelope Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the precomputed mouth envelope and the BillyBass PWM schedule.
+Motor output is checked against fake GPIO/PWM modules.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pytest
+
+import assistant.core.audio.billy_bass as billy_bass
+from assistant.core.audio.billy_bass import BillyBass
+from assistant.core.audio.envelope import compute_envelope
+from assistant.core.bus import Bus
+
+
+class FakeGPIO:
+    OUT, HIGH, LOW = "out", 1, 0
+
+    def __init__(self):
+        self.calls = []
+
+    def output(self, pin, value):
+        self.calls.append((pin, value))
+
+
+class FakePWM:
+    def __init__(self):
+        self.duty = []
+
+    def set_duty_cycle(self, pin, value):
+        self.duty.append(value)
+
+
+def _reference_envelope(data, sr, hop_ms):
+    """Per-chunk loop equivalent to the old chunked processing."""
+    hop = int(sr * hop_ms / 1000)
+    out = []
+    for i in range(0, len(data), hop):
+        chunk = data[i:i + hop].astype(np.float64)
+        rms = np.sqrt(np.mean(chunk ** 2))
+        peak = np.max(np.abs(chunk))
+        out.append(max(rms, 0.7 * peak))
+    return np.array(out)
+
+
+def test_envelope_matches_per_chunk_reference():
+    rng = np.random.default_rng(0)
+    data = (rng.standard_normal(16000 + 37) * 0.2).astype(np.float32)
+    env = compute_envelope(data, 16000, 10)
+
+    assert env.dtype == np.float32
+    assert len(env) == 101  # trailing partial hop is kept
+    assert np.allclose(env, _reference_envelope(data, 16000, 10), atol=1e-5)
+
+
+def test_envelope_mixes_channels_and_accepts_int16():
+    stereo = np.zeros((480, 2), dtype=np.float32)
+    stereo[:, 0] = 0.5
+    assert np.allclose(compute_envelope(stereo, 48000, 10), 0.25)
+    assert np.allclose(compute_envelope(np.full(480, 16384, dtype=np.int16), 48000, 10), 0.5, atol=1e-3)
+    assert len(compute_envelope(np.zeros(0, dtype=np.float32), 48000)) == 0
+
+
+def test_mouth_schedule_applies_gate_and_limits():
+    gate = BillyBass.NOISE_GATE_THRESHOLD / 32767.0
+    env = np.array([0.0, gate * 0.9, gate * 1.01, 0.3, 1.0], dtype=np.float32)
+    schedule = BillyBass.mouth_schedule(env)
+
+    assert schedule.dtype == np.uint8
+    assert schedule[0] == 0 and schedule[1] == 0
+    assert schedule[2] == BillyBass.MIN_PWM
+    assert schedule[3] == int((0.3 * 32767 - BillyBass.NOISE_GATE_THRESHOLD) / BillyBass.VOLUME_DIVISOR)
+    assert schedule[4] == BillyBass.MAX_PWM
+
+
+def test_schedule_steps_only_on_changes_and_after_close():
+    schedule = np.array([0, 0, 20, 20, 20, 0, 0, 0, 30], dtype=np.uint8)
+    assert BillyBass._schedule_steps(schedule) == [(0, 0), (2, 20), (5, 0), (6, 0), (8, 30)]
+
+
+@pytest.mark.asyncio
+async def test_drive_mouth_from_schedule(monkeypatch):
+    gpio, pwm = FakeGPIO(), FakePWM()
+    monkeypatch.setattr(billy_bass, "GPIO", gpio)
+    monkeypatch.setattr(billy_bass, "PWM", pwm)
+    monkeypatch.setattr(BillyBass, "SYNC_DELAY_S", 0.0)
+    monkeypatch.setattr(billy_bass.BillyBass, "_stop_motor", lambda self: None)
+
+    fish = BillyBass(Bus(), enabled=False)
+    fish._initialized = True
+    schedule = np.array([0, 40, 40, 40, 0, 0], dtype=np.uint8)
+    await fish._drive_mouth(schedule, 0.001)
+
+    # closed, open at 40, reverse pulse to close, then stop
+    assert pwm.duty == [0, 40, 25, 0]
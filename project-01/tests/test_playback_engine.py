@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Playback Engine Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the persistent playback engine. The audio callback is driven by
+hand against a fake stream, so no audio device is needed.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from assistant.core.audio.buffers import get_buffer_registry, get_decode_cache
+from assistant.core.audio.engine import PlaybackEngine
+from assistant.core.audio.playback import Playback
+from assistant.core.bus import Bus
+from assistant.core.contracts import TTSAudio
+
+
+class FakeStream:
+    """Stands in for sd.OutputStream; the test calls the callback itself."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.started = False
+        self.closed = False
+        self.time = 0.0
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def close(self):
+        self.closed = True
+
+
+def _engine(**kwargs):
+    streams = []
+
+    def factory(**kw):
+        streams.append(FakeStream(**kw))
+        return streams[-1]
+
+    engine = PlaybackEngine(samplerate=1000, blocksize=8, stream_factory=factory, **kwargs)
+    engine.start()
+    return engine, streams[0]
+
+
+def _pull(engine, frames=8, dac_time=0.0):
+    out = np.full((frames, engine.channels), 9.0, dtype=np.float32)
+    engine._callback(out, frames, SimpleNamespace(outputBufferDacTime=dac_time), None)
+    return out
+
+
+def test_stream_opened_once_with_callback():
+    engine, stream = _engine()
+    engine.start()
+    assert stream.started
+    assert stream.kwargs["callback"] == engine._callback
+    assert stream.kwargs["samplerate"] == 1000
+    engine.close()
+    assert stream.closed
+
+
+def test_clips_play_back_to_back_without_gaps():
+    engine, _ = _engine()
+    a = engine.play(np.full(5, 0.1, dtype=np.float32), 1000)
+    b = engine.play(np.full(6, 0.2, dtype=np.float32), 1000)
+
+    first = _pull(engine, dac_time=1.0)
+    assert np.allclose(first[:5, 0], 0.1)
+    assert np.allclose(first[5:8, 0], 0.2)  # b starts in the same block
+    assert a.done.result(timeout=0) is True
+    assert a.start_time == pytest.approx(1.0)
+    assert a.end_time == pytest.approx(1.005)
+    assert b.start_time == pytest.approx(1.005)
+
+    second = _pull(engine, dac_time=1.008)
+    assert np.allclose(second[:3, 0], 0.2)
+    assert np.all(second[3:] == 0.0)  # silence once the queue is empty
+    assert b.done.result(timeout=0) is True
+    assert engine.pending == 0
+
+
+def test_cancel_stops_current_and_queued_clips():
+    engine, _ = _engine()
+    a = engine.play(np.full(20, 0.5, dtype=np.float32), 1000)
+    b = engine.play(np.full(20, 0.5, dtype=np.float32), 1000)
+    _pull(engine)
+
+    assert engine.cancel() == 2
+    assert a.done.result(timeout=0) is False
+    assert b.done.result(timeout=0) is False
+    assert np.all(_pull(engine) == 0.0)
+
+
+def test_clips_converted_to_stream_format():
+    engine, _ = _engine(channels=2)
+    clip = engine.play(np.full(100, 16384, dtype=np.int16), 500)
+    assert clip.data.shape == (200, 2)
+    assert clip.data.dtype == np.float32
+    assert np.allclose(clip.data[20:180], 0.5, atol=0.02)
+
+
+@pytest.mark.asyncio
+async def test_playback_queues_on_engine_and_publishes_events():
+    engine, _ = _engine()
+    bus = Bus()
+    playback = Playback(bus, engine=engine)
+    await playback.start()
+
+    events = []
+
+    async def capture(payload):
+        events.append(payload)
+
+    envelopes = []
+
+    async def capture_envelope(payload):
+        envelopes.append(payload)
+
+    bus.subscribe("anim.mouth.envelope", capture_envelope)
+    bus.subscribe("audio.playback.start", capture)
+    bus.subscribe("audio.playback.end", capture)
+
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    sf.write(path, np.full(12, 0.25, dtype=np.float32), 1000)
+    audio = TTSAudio(wav_path=path, duration_s=0.012)
+    decodes = get_decode_cache().stats()["decodes"]
+
+    # The handler returns once the clip is queued, before it has played
+    await bus.publish(audio.topic, audio.dict())
+    assert events == []
+    assert envelopes[0]["wav_path"] == path
+    assert envelopes[0]["env"] == [0.25, 0.25]
+
+    for _ in range(3):
+        _pull(engine)
+        await asyncio.sleep(0.01)
+
+    assert [e["ok"] for e in events if "ok" in e] == [True]
+    assert len(events) == 2
+    assert all(e["corr_id"] == audio.corr_id for e in events)
+    await asyncio.sleep(0.05)
+    assert not os.path.exists(path)
+    # Decoded once, and dropped from the decode cache with the file
+    assert get_decode_cache().stats()["decodes"] == decodes + 1
+    assert path not in get_decode_cache()
+    await playback.stop()
+
+
+@pytest.mark.asyncio
+async def test_playback_plays_buffer_and_releases_it():
+    engine, _ = _engine()
+    bus = Bus()
+    playback = Playback(bus, engine=engine)
+    await playback.start()
+
+    events = []
+
+    async def capture(payload):
+        events.append(payload)
+
+    bus.subscribe("anim.mouth.envelope", capture)
+    bus.subscribe("audio.playback.end", capture)
+
+    registry = get_buffer_registry()
+    buffer_id = registry.put(np.full((12, 1), 8192, dtype=np.int16), 1000)
+    audio = TTSAudio(buffer_id=buffer_id, duration_s=0.012)
+    await bus.publish(audio.topic, audio.dict())
+    assert events[0]["buffer_id"] == buffer_id
+    assert events[0]["env"] == [0.25, 0.25]
+
+    for _ in range(3):
+        _pull(engine)
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+
+    assert events[-1]["ok"] is True and events[-1]["buffer_id"] == buffer_id
+    assert registry.get(buffer_id) is None
+    await playback.stop()
+
+
+@pytest.mark.asyncio
+async def test_playback_prepares_clips_off_the_event_loop():
+    engine, _ = _engine()
+    prepared_on_loop = []
+    prepare = engine.prepare
+
+    def recording_prepare(data, samplerate):
+        try:
+            asyncio.get_running_loop()
+            prepared_on_loop.append(True)
+        except RuntimeError:  # no loop in this thread: an executor worker
+            prepared_on_loop.append(False)
+        return prepare(data, samplerate)
+
+    engine.prepare = recording_prepare
+    playback = Playback(Bus(), engine=engine)
+    await playback.start()
+
+    buffer_id = get_buffer_registry().put(np.zeros((4000, 1), dtype=np.int16), 16000)  # resampled to 1000 Hz
+    audio = TTSAudio(buffer_id=buffer_id, duration_s=0.25)
+    await playback._on_audio(audio.dict())
+
+    assert prepared_on_loop == [False]
+    assert engine.pending == 1
+    await playback.stop()
+    get_buffer_registry().release(buffer_id)
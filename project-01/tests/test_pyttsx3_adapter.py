@@ -65,4 +65,113 @@ def test_synth_creates_non_zero_duration_wav_file(tts_adapter):
          f"This indicates a 0.0s duration file (empty content).")
     
     # Clean up the temporary file
-    os.remove(path)
\ No newline at end of file
+    os.remove(path)
+
+class FakeVoice:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class FakeEngine:
+    """Minimal stand-in for a pyttsx3 engine that writes a short WAV."""
+
+    def __init__(self):
+        self.props = {}
+        self.callbacks = {}
+        self.queued = []
+        self.voice_lookups = 0
+
+    def setProperty(self, name, value):
+        self.props.setdefault(name, []).append(value)
+
+    def getProperty(self, name):
+        if name == "voices":
+            self.voice_lookups += 1
+            return [FakeVoice("v.daniel", "Daniel"), FakeVoice("v.fred", "Fred")]
+        return None
+
+    def connect(self, topic, cb):
+        self.callbacks.setdefault(topic, []).append(cb)
+
+    def save_to_file(self, text, path):
+        self.queued.append((text, path))
+
+    def runAndWait(self):
+        import numpy as np
+        import soundfile as sf
+        for text, path in self.queued:
+            sf.write(path, np.zeros(22050 // 10, dtype="int16"), 22050)
+            for cb in self.callbacks.get("finished-utterance", []):
+                cb(name=None, completed=True)
+        self.queued = []
+
+    def stop(self):
+        pass
+
+
+def test_worker_reuses_engine_and_caches_voice(tmp_path):
+    from assistant.core.tts.pyttsx3_adapter import SynthWorker
+
+    engines = []
+
+    def factory():
+        engines.append(FakeEngine())
+        return engines[-1]
+
+    worker = SynthWorker(engine_factory=factory)
+    try:
+        for i in range(3):
+            out = tmp_path / f"out{i}.wav"
+            worker.synth("hello", str(out), voice="Fred")
+            assert out.stat().st_size > 0
+        worker.synth("hi", str(tmp_path / "daniel.wav"), voice="Daniel")
+    finally:
+        worker.close()
+
+    assert len(engines) == 1
+    engine = engines[0]
+    assert engine.voice_lookups == 1
+    assert engine.props["rate"] == [150]
+    assert engine.props["voice"] == ["v.fred", "v.daniel"]
+
+
+def test_adapter_uses_worker(tmp_path):
+    from assistant.core.tts.pyttsx3_adapter import SynthWorker
+
+    worker = SynthWorker(engine_factory=FakeEngine)
+    try:
+        adapter = Pyttsx3Adapter(voice="Fred", worker=worker)
+        path = adapter.synth("hello")
+        assert os.path.exists(path)
+        os.remove(path)
+    finally:
+        worker.close()
+
+
+def test_timed_out_jobs_are_skipped_or_cleaned_up(tmp_path):
+    import threading
+    from assistant.core.tts.pyttsx3_adapter import SynthWorker
+
+    release = threading.Event()
+
+    class SlowEngine(FakeEngine):
+        def runAndWait(self):
+            release.wait(5)
+            super().runAndWait()
+
+    worker = SynthWorker(engine_factory=SlowEngine, job_timeout=0.1)
+    worker.wait_ready(5)
+    rendering, queued = tmp_path / "rendering.wav", tmp_path / "queued.wav"
+    try:
+        for out in (rendering, queued):
+            with pytest.raises(RuntimeError, match="timed out"):
+                worker.synth("hello", str(out))
+        release.set()
+        worker.synth("next", str(tmp_path / "next.wav"))  # not stuck behind the abandoned jobs
+    finally:
+        worker.close()
+
+    assert not rendering.exists()  # finished after its caller gave up: removed
+    assert not queued.exists()     # never rendered
+    assert (tmp_path / "next.wav").exists()
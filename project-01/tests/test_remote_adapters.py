@@ -84,6 +84,26 @@ async def test_remote_stt_adapter_success(test_wav_file):
         assert mock_post.called
 
 
+async def test_remote_stt_adapter_transcribe_async(test_wav_file):
+    """Test RemoteSTTAdapter.transcribe_async runs on the caller's loop."""
+    server_url = "http://localhost:8000"
+    
+    mock_response = httpx.Response(
+        200,
+        json={"text": "async transcription"},
+        request=httpx.Request("POST", server_url)
+    )
+    
+    with patch("httpx.AsyncClient.post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = mock_response
+        
+        adapter = RemoteSTTAdapter(server_url=server_url, timeout=5.0)
+        text = await adapter.transcribe_async(test_wav_file)
+        
+        assert text == "async transcription"
+        assert mock_post.called
+
+
 async def test_remote_stt_adapter_network_error(test_wav_file):
     """Test RemoteSTTAdapter handles network errors gracefully."""
     server_url = "http://localhost:8000"
@@ -128,6 +148,30 @@ async def test_remote_tts_adapter_success():
         assert mock_post.called
 
 
+async def test_remote_tts_adapter_synth_async():
+    """Test RemoteTTSAdapter.synth_async runs on the caller's loop."""
+    server_url = "http://localhost:8000"
+    
+    mock_response = httpx.Response(
+        200,
+        content=b"fake wav file content",
+        headers={"content-type": "audio/wav"},
+        request=httpx.Request("POST", server_url)
+    )
+    
+    with patch("httpx.AsyncClient.post", new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = mock_response
+        
+        adapter = RemoteTTSAdapter(server_url=server_url, timeout=5.0)
+        wav_path = await adapter.synth_async("Hello world")
+        
+        try:
+            with open(wav_path, "rb") as f:
+                assert f.read() == b"fake wav file content"
+        finally:
+            os.remove(wav_path)
+
+
 async def test_remote_tts_adapter_empty_text():
     """Test RemoteTTSAdapter rejects empty text."""
     server_url = "http://localhost:8000"
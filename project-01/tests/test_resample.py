@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Resampler Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the in-process polyphase resampler. Verifies output length,
+frequency preservation, anti-aliasing, and multi-channel handling.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pytest
+
+from assistant.core.audio.resample import resample, _polyphase_filter
+
+
+def _tone(freq, sr, seconds=1.0):
+    t = np.arange(int(sr * seconds)) / sr
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+def _peak_hz(x, sr):
+    spectrum = np.abs(np.fft.rfft(x * np.hanning(len(x))))
+    return np.argmax(spectrum) * sr / len(x)
+
+
+@pytest.mark.parametrize("src,dst", [(22050, 48000), (48000, 16000), (16000, 44100)])
+def test_length_and_frequency_preserved(src, dst):
+    y = resample(_tone(440, src), src, dst)
+
+    assert len(y) == int(np.ceil(src * dst / src))
+    assert y.dtype == np.float32
+    assert abs(_peak_hz(y, dst) - 440) < 2
+
+
+def test_upsampled_tone_matches_reference():
+    y = resample(_tone(440, 22050), 22050, 48000)
+    ref = _tone(440, 48000)[: len(y)]
+    # Ignore filter edges
+    assert np.max(np.abs(y[1000:-1000] - ref[1000:-1000])) < 1e-3
+
+
+def test_downsampling_rejects_aliases():
+    # 10 kHz is above the 8 kHz Nyquist of the target rate
+    y = resample(_tone(10000, 48000), 48000, 16000)
+    assert np.max(np.abs(y[1000:-1000])) < 1e-2
+
+
+def test_stereo_and_same_rate():
+    stereo = np.stack([_tone(440, 22050), _tone(880, 22050)], axis=1)
+    y = resample(stereo, 22050, 48000)
+    assert y.shape == (48000, 2)
+
+    same = resample(stereo, 22050, 22050)
+    assert np.array_equal(same, stereo)
+    assert same is not stereo
+
+
+def test_filter_taps_cached_per_rate_pair():
+    _polyphase_filter.cache_clear()
+    resample(_tone(440, 22050, 0.1), 22050, 48000)
+    resample(_tone(440, 22050, 0.1), 22050, 48000)
+    info = _polyphase_filter.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Audio Ring Buffer Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the audio ring buffer. Verifies wrap-around, contiguous zero-copy
+views and bounds checking.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pytest
+
+from assistant.core.audio.ringbuffer import AudioRingBuffer
+
+
+def test_views_are_contiguous_across_wrap():
+    ring = AudioRingBuffer(10)
+    ring.write(np.arange(7, dtype=np.int16))
+    ring.write(np.arange(7, 15, dtype=np.int16))
+
+    assert ring.written == 15
+    assert ring.oldest == 5
+    window = ring.view(6, 14)  # crosses the physical end of the buffer
+    assert np.array_equal(window, np.arange(6, 14))
+    assert window.base is not None  # a view, not a copy
+    assert np.array_equal(ring.latest(3), [12, 13, 14])
+
+
+def test_views_are_read_only_and_bounds_checked():
+    ring = AudioRingBuffer(8)
+    ring.write(np.arange(12, dtype=np.int16))
+
+    with pytest.raises(ValueError):
+        ring.view(4, 8)[0] = 1
+    with pytest.raises(IndexError):
+        ring.view(2, 6)  # already overwritten
+    with pytest.raises(IndexError):
+        ring.view(10, 13)  # not written yet
+
+
+def test_oversized_write_keeps_newest_samples():
+    ring = AudioRingBuffer(4)
+    ring.write(np.arange(10, dtype=np.int16))
+    assert ring.written == 10
+    assert np.array_equal(ring.latest(4), [6, 7, 8, 9])
+    assert len(ring.latest(100)) == 4
+
+
+def test_memory_is_fixed():
+    ring = AudioRingBuffer(16000)
+    nbytes = ring._buf.nbytes
+    block = np.ones(1024, dtype=np.int16)
+    for _ in range(1000):
+        ring.write(block)
+    assert ring._buf.nbytes == nbytes
+    assert ring.written == 1024 * 1000
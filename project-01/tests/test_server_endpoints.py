@@ -38,8 +38,10 @@ import numpy as np
 import soundfile as sf
 from fastapi.testclient import TestClient
 
+import assistant.server as server
 from assistant.server import create_app
 from assistant.core.config import Config
+from assistant.core.inference import PoolFullError
 
 
 
@@ -168,3 +170,67 @@ def test_tts_synthesize_missing_text(client):
     assert response.status_code == 400
     assert "empty" in response.json()["detail"].lower()
 
+
+
+def test_stats_endpoint(client):
+    """Test stats endpoint reports inference queue state."""
+    response = client.get("/api/stats")
+    assert response.status_code == 200
+    stats = response.json()["inference"]
+    assert stats["workers"] == Config.INFERENCE_WORKERS
+    assert "queued" in stats
+    assert "wait_ms_avg" in stats
+
+
+def test_stt_transcribe_sheds_load_when_queue_full(client, monkeypatch):
+    """Test STT endpoint returns 503 with Retry-After when the pool is full."""
+    class FullPool:
+        async def run_timed(self, fn, *args, **kwargs):
+            raise PoolFullError(retry_after=3)
+
+    class FakeAdapter:
+        def transcribe(self, path, model_size=None):
+            return "unused"
+
+    monkeypatch.setattr(server, "_stt_adapter", FakeAdapter())
+    monkeypatch.setattr(server, "get_inference_pool", lambda: FullPool())
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        wav_path = f.name
+    try:
+        sf.write(wav_path, np.zeros(1600, dtype=np.float32), 16000)
+        with open(wav_path, "rb") as audio_file:
+            response = client.post(
+                "/api/stt/transcribe",
+                files={"audio": ("test.wav", audio_file, "audio/wav")},
+            )
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "3"
+    finally:
+        os.remove(wav_path)
+
+
+def test_stt_transcribe_uses_inference_pool(client, monkeypatch):
+    """Test STT endpoint runs the adapter on the pool and reports queue wait."""
+    class FakeAdapter:
+        def transcribe(self, path, model_size=None):
+            return f"hello from {model_size}"
+
+    monkeypatch.setattr(server, "_stt_adapter", FakeAdapter())
+    monkeypatch.setattr(server, "WHISPER_AVAILABLE", True)
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        wav_path = f.name
+    try:
+        sf.write(wav_path, np.zeros(1600, dtype=np.float32), 16000)
+        with open(wav_path, "rb") as audio_file:
+            response = client.post(
+                "/api/stt/transcribe",
+                files={"audio": ("test.wav", audio_file, "audio/wav")},
+                data={"model_size": "base"},
+            )
+        assert response.status_code == 200
+        assert response.json()["text"] == "hello from base"
+        assert "x-queue-wait-ms" in response.headers
+    finally:
+        os.remove(wav_path)
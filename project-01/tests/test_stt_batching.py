@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+STT Batching Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the STT batch scheduler: immediate dispatch when a worker is
+free, batching while busy, the max-batch and max-wait policy, fan-out of
+results and load shedding, and the server endpoint with batching on.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+from fastapi.testclient import TestClient
+
+import assistant.server as server
+from assistant.core.config import Config
+from assistant.core.inference import InferencePool, PoolFullError
+from assistant.core.stt.batching import STTBatchScheduler
+
+
+class FakeBatchModel:
+    """Records batches; each transcript names the input's length."""
+
+    def __init__(self, delay_s=0.0):
+        self.delay_s = delay_s
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, audios, sample_rates, model_size=None):
+        with self.lock:
+            self.batches.append((len(audios), model_size))
+        time.sleep(self.delay_s)
+        return [f"{model_size}:{len(a)}" for a in audios]
+
+
+def _audio(n):
+    return np.zeros(n, dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_lone_request_runs_without_waiting():
+    model = FakeBatchModel()
+    scheduler = STTBatchScheduler(model, InferencePool(workers=1), max_wait_ms=1000)
+
+    start = time.monotonic()
+    text, timing = await scheduler.transcribe(_audio(100), 16000, model_size="tiny")
+
+    assert text == "tiny:100"
+    assert timing["batch_size"] == 1
+    assert time.monotonic() - start < 0.5  # didn't sit out the 1 s window
+
+
+@pytest.mark.asyncio
+async def test_requests_arriving_while_busy_share_a_batch():
+    model = FakeBatchModel(delay_s=0.1)
+    scheduler = STTBatchScheduler(model, InferencePool(workers=1, queue_size=4), max_wait_ms=500)
+
+    first = asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000))
+    await asyncio.sleep(0.02)  # the first batch is running
+    rest = [asyncio.ensure_future(scheduler.transcribe(_audio(n), 16000)) for n in range(2, 6)]
+    results = await asyncio.gather(first, *rest)
+
+    # Each caller gets its own transcript back
+    assert [text for text, _ in results] == [f"None:{n}" for n in range(1, 6)]
+    # The four latecomers ran together once the worker freed up (before the 500ms window)
+    assert [size for size, _ in model.batches] == [1, 4]
+    assert results[1][1]["batch_size"] == 4
+    assert scheduler.stats()["batch_sizes"] == {"1": 1, "4": 1}
+    assert scheduler.stats()["mean_batch_size"] == 2.5
+
+
+@pytest.mark.asyncio
+async def test_max_batch_and_model_sizes_split_batches():
+    model = FakeBatchModel(delay_s=0.05)
+    scheduler = STTBatchScheduler(model, InferencePool(workers=1, queue_size=8), max_batch=3, max_wait_ms=500)
+
+    first = asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000, model_size="tiny"))
+    await asyncio.sleep(0.01)
+    tiny = [asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000, model_size="tiny")) for _ in range(5)]
+    base = [asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000, model_size="base")) for _ in range(2)]
+    await asyncio.gather(first, *tiny, *base)
+
+    assert all(size <= 3 for size, _ in model.batches)
+    assert sorted(model.batches) == sorted([(1, "tiny"), (3, "tiny"), (2, "tiny"), (2, "base")])
+
+
+@pytest.mark.asyncio
+async def test_max_wait_dispatches_before_worker_is_free():
+    model = FakeBatchModel(delay_s=0.3)
+    scheduler = STTBatchScheduler(model, InferencePool(workers=1, queue_size=4), max_wait_ms=20)
+
+    first = asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000))
+    await asyncio.sleep(0.01)
+    second = asyncio.ensure_future(scheduler.transcribe(_audio(2), 16000))
+    await asyncio.sleep(0.1)
+
+    # Handed to the pool after the window although the first batch is still running
+    assert scheduler.stats()["pending"] == 0
+    text, timing = await second
+    await first
+    assert text == "None:2"
+    assert timing["wait_s"] > 0.1  # queued behind the first batch
+
+
+@pytest.mark.asyncio
+async def test_full_pool_fails_the_whole_batch():
+    model = FakeBatchModel(delay_s=0.2)
+    scheduler = STTBatchScheduler(model, InferencePool(workers=1, queue_size=0), max_wait_ms=10)
+
+    first = asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000))
+    await asyncio.sleep(0.01)
+    late = [asyncio.ensure_future(scheduler.transcribe(_audio(1), 16000)) for _ in range(2)]
+    results = await asyncio.gather(*late, return_exceptions=True)
+
+    assert all(isinstance(r, PoolFullError) for r in results)
+    assert (await first)[0] == "None:1"
+
+
+def test_server_transcribe_uses_batch_scheduler(monkeypatch):
+    class FakeAdapter:
+        def transcribe(self, path, model_size=None):
+            raise AssertionError("batched path expected")
+
+        def transcribe_batch(self, audios, sample_rates, model_size=None):
+            return [f"{len(a)} samples at {sr}" for a, sr in zip(audios, sample_rates)]
+
+    monkeypatch.setattr(server, "_stt_adapter", FakeAdapter())
+    monkeypatch.setattr(server, "_stt_scheduler", None)
+    monkeypatch.setattr(server, "WHISPER_AVAILABLE", True)
+    monkeypatch.setattr(Config, "STT_BATCHING", True)
+    decoded_on_loop = []
+    decode = server._decode_upload
+
+    def recording_decode(content):
+        try:
+            asyncio.get_running_loop()
+            decoded_on_loop.append(True)
+        except RuntimeError:  # no loop in this thread: an executor worker
+            decoded_on_loop.append(False)
+        return decode(content)
+
+    monkeypatch.setattr(server, "_decode_upload", recording_decode)
+    temp_files = []
+    mkstemp = server.tempfile.mkstemp
+
+    def recording_mkstemp(*args, **kwargs):
+        temp_files.append(kwargs.get("suffix"))
+        return mkstemp(*args, **kwargs)
+
+    monkeypatch.setattr(server.tempfile, "mkstemp", recording_mkstemp)
+
+    wav = io.BytesIO()
+    sf.write(wav, np.zeros(1600, dtype=np.int16), 16000, format="WAV", subtype="PCM_16")
+    client = TestClient(server.create_app())
+    response = client.post("/api/stt/transcribe", files={"audio": ("a.wav", wav.getvalue(), "audio/wav")})
+
+    assert response.status_code == 200
+    assert response.json()["text"] == "1600 samples at 16000"
+    assert response.headers["x-stt-batch-size"] == "1"
+    assert client.get("/api/stats").json()["stt_batching"]["requests"] == 1
+    assert decoded_on_loop == [False]  # decoded in an executor, not on the event loop
+    assert ".wav" not in temp_files  # batching decodes from memory; no temp WAV
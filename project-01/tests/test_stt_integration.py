@@ -35,10 +35,12 @@ to transcript conversion and event bus integration.
 import asyncio
 import pytest
 import tempfile
+import threading
 from pathlib import Path
 import numpy as np
 import soundfile as sf
 
+from assistant.core.audio.buffers import get_buffer_registry
 from assistant.core.bus import Bus
 from assistant.core.stt.stt import STT
 from assistant.core.contracts import AudioRecorded, STTTranscript
@@ -94,3 +96,43 @@ async def test_stt_component_integration():
         if test_wav.exists():
             test_wav.unlink()
 
+
+class FakeAsyncAdapter:
+    """Async-capable adapter that records where it ran."""
+
+    def __init__(self):
+        self.threads = []
+        self.sizes = []
+
+    def transcribe(self, path):
+        raise AssertionError("blocking transcribe() should not be used")
+
+    async def transcribe_async(self, path):
+        self.threads.append(threading.get_ident())
+        self.sizes.append(Path(path).stat().st_size)
+        return "hello fish"
+
+
+async def test_stt_awaits_async_adapter_for_buffers():
+    """Buffers for an async adapter are sent as a temporary WAV without an executor."""
+    bus = Bus()
+    adapter = FakeAsyncAdapter()
+    stt = STT(bus, adapter=adapter)
+    await stt.start()
+
+    captures = []
+
+    async def capture_transcript(payload: dict):
+        captures.append(payload)
+
+    bus.subscribe("stt.transcript", capture_transcript)
+
+    registry = get_buffer_registry()
+    buffer_id = registry.put(np.zeros(16000, dtype=np.int16), 16000)
+    audio_event = AudioRecorded(buffer_id=buffer_id, duration_s=1.0)
+    await bus.publish(audio_event.topic, audio_event.dict())
+
+    assert adapter.threads == [threading.get_ident()]
+    assert adapter.sizes[0] > 0
+    assert captures and captures[0]["text"] == "hello fish"
+    assert registry.get(buffer_id) is None
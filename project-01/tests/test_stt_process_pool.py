@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+STT Process Pool Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the STT worker process pool: transcription in other processes,
+PCM through shared memory, error reporting, restart of crashed and hung
+workers, health checks, batched and segment transcription, and use through
+Config.get_stt_adapter and the server's batch scheduler.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import assistant.server as server
+from assistant.core.config import Config
+from assistant.core.inference import InferencePool
+from assistant.core.stt import process_pool
+from assistant.core.stt.streaming import create_incremental_transcriber
+from assistant.core.stt.process_pool import STTProcessPool, WorkerError
+
+
+class FakeAdapter:
+    """Worker-side stand-in for WhisperAdapter; behaviour is picked by model_size."""
+
+    def preload(self):
+        pass
+
+    def transcribe(self, path, model_size=None):
+        return f"file {os.path.basename(path)}"
+
+    def transcribe_array(self, audio, sample_rate=16000, model_size=None):
+        if model_size == "crash":
+            os._exit(3)
+        if model_size == "hang":
+            time.sleep(30)
+        if model_size == "fail":
+            raise ValueError("bad audio")
+        if model_size == "slow":
+            time.sleep(0.2)
+        return f"{audio.dtype} {audio.shape} {sample_rate} {int(audio.sum())} {os.getpid()}"
+
+    def transcribe_batch(self, audios, sample_rates=None, model_size=None):
+        rates = sample_rates or [16000] * len(audios)
+        return [self.transcribe_array(a, sr, model_size) for a, sr in zip(audios, rates)]
+
+    def transcribe_segments(self, audio, prompt=None, model_size=None):
+        return [(0.0, len(audio) / 16000, f"{prompt} {int(audio.sum())}")]
+
+
+class BrokenAdapter:
+    def __init__(self):
+        raise RuntimeError("no model")
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs.setdefault("adapter_factory", FakeAdapter)
+        kwargs.setdefault("health_interval", 0)
+        pool = STTProcessPool(**kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def test_transcribes_in_worker_process_via_shared_memory(make_pool):
+    pool = make_pool(workers=1)
+    pool.preload()
+    pcm = np.arange(1000, dtype=np.int16)
+
+    text = pool.transcribe_array(pcm, 22050)
+
+    dtype, shape, rate, total, pid = text.rsplit(" ", 4)
+    assert (dtype, rate, int(total)) == ("int16", "22050", int(pcm.sum()))
+    assert int(pid) != os.getpid()
+    assert pool.transcribe("/tmp/x.wav") == "file x.wav"
+    # A larger clip grows the segment
+    assert pool.transcribe_array(np.ones((40000, 2), dtype=np.float32), 16000).startswith("float32 (40000, 2) 16000 80000")
+    assert pool.stats()["completed"] == 3
+
+
+def test_requests_spread_across_workers(make_pool):
+    pool = make_pool(workers=2)
+    pool.preload()
+    audio = np.zeros(10, dtype=np.int16)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(4) as executor:
+        texts = list(executor.map(lambda _: pool.transcribe_array(audio, model_size="slow"), range(4)))
+
+    assert len({t.split()[-1] for t in texts}) == 2  # two worker pids
+    assert time.monotonic() - start < 0.75  # 4 x 0.2 s on two processes
+
+
+def test_counters_consistent_under_concurrent_calls(make_pool):
+    pool = make_pool(workers=2)
+    pool.preload()
+    audio = np.zeros(10, dtype=np.int16)
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: pool.transcribe_array(audio), range(40)))
+
+    stats = pool.stats()
+    assert stats["completed"] == 40
+    assert sum(p["jobs"] for p in stats["processes"]) == 40
+
+
+def test_adapter_error_is_reported_and_worker_kept(make_pool):
+    pool = make_pool(workers=1)
+    with pytest.raises(WorkerError, match="ValueError: bad audio"):
+        pool.transcribe_array(np.zeros(4, dtype=np.int16), model_size="fail")
+    pid = pool.stats()["processes"][0]["pid"]
+
+    assert pool.transcribe_array(np.zeros(4, dtype=np.int16)).endswith(str(pid))
+    assert pool.stats()["restarts"] == 0
+
+
+def test_crashed_worker_is_restarted(make_pool):
+    pool = make_pool(workers=1)
+    pool.preload()
+    old_pid = pool.stats()["processes"][0]["pid"]
+
+    with pytest.raises(WorkerError, match="exited"):
+        pool.transcribe_array(np.zeros(4, dtype=np.int16), model_size="crash")
+
+    text = pool.transcribe_array(np.zeros(4, dtype=np.int16))
+    assert int(text.split()[-1]) != old_pid
+    assert pool.stats()["restarts"] == 1
+
+
+def test_hung_worker_is_restarted_after_timeout(make_pool):
+    pool = make_pool(workers=1, job_timeout=0.5)
+    pool.preload()
+
+    with pytest.raises(WorkerError, match="did not answer"):
+        pool.transcribe_array(np.zeros(4, dtype=np.int16), model_size="hang")
+
+    assert pool.transcribe_array(np.zeros(4, dtype=np.int16))
+    assert pool.stats()["restarts"] == 1
+
+
+def test_health_check_replaces_dead_idle_worker(make_pool):
+    pool = make_pool(workers=1, health_interval=0.1)
+    pool.preload()
+    victim = pool.stats()["processes"][0]["pid"]
+    os.kill(victim, 9)
+
+    deadline = time.monotonic() + 5
+    while pool.stats()["restarts"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert pool.stats()["restarts"] == 1
+    assert int(pool.transcribe_array(np.zeros(4, dtype=np.int16)).split()[-1]) != victim
+
+
+def test_model_load_failure_is_reported(make_pool):
+    pool = make_pool(workers=1, adapter_factory=BrokenAdapter)
+    with pytest.raises(WorkerError, match="no model"):
+        pool.preload()
+
+
+def test_config_returns_shared_process_pool(monkeypatch):
+    monkeypatch.setattr(Config, "STT_MODE", "local")
+    monkeypatch.setattr(Config, "STT_PROCESSES", 2)
+    monkeypatch.setattr(process_pool, "_process_pool", None)
+
+    adapter = Config.get_stt_adapter()
+    try:
+        assert isinstance(adapter, STTProcessPool)
+        assert adapter.workers == 2
+        assert Config.get_stt_adapter() is adapter  # STT and the server share the workers
+    finally:
+        process_pool.close_stt_process_pool()
+
+
+@pytest.mark.parametrize("shm", [True, False])
+def test_batch_transcribed_in_one_worker_call(make_pool, monkeypatch, shm):
+    if not shm:  # Python 3.7 path: clips are pickled
+        monkeypatch.setattr(process_pool, "shared_memory", None)
+    pool = make_pool(workers=1)
+    audios = [np.arange(5, dtype=np.int16), np.ones((3, 2), dtype=np.float32), np.full(7, 2, dtype=np.int16)]
+
+    texts = pool.transcribe_batch(audios, [16000, 22050, 8000])
+
+    assert [t.rsplit(" ", 1)[0] for t in texts] == [
+        "int16 (5,) 16000 10", "float32 (3, 2) 22050 6", "int16 (7,) 8000 14",
+    ]
+    assert pool.stats()["completed"] == 1
+
+
+def test_segments_transcribed_in_worker(make_pool):
+    pool = make_pool(workers=1)
+
+    segments = pool.transcribe_segments(np.ones(8000, dtype=np.float32), prompt="hello")
+
+    assert segments == [(0.0, 0.5, "hello 8000")]
+    assert create_incremental_transcriber(pool) is not None
+
+
+@pytest.mark.asyncio
+async def test_server_batching_stays_on_with_process_pool(make_pool, monkeypatch):
+    pool = make_pool(workers=1)
+    monkeypatch.setattr(server, "_stt_adapter", pool)
+    monkeypatch.setattr(server, "_stt_scheduler", None)
+    monkeypatch.setattr(server, "_inference_pool", InferencePool(workers=1, queue_size=8))
+    monkeypatch.setattr(Config, "STT_BATCHING", True)
+
+    scheduler = server.get_stt_scheduler()
+    assert scheduler is not None
+    results = await asyncio.gather(*(
+        scheduler.transcribe(np.full(n, 1, dtype=np.int16), 16000) for n in (4, 6)
+    ))
+
+    assert [text.split()[3] for text, _ in results] == ["4", "6"]
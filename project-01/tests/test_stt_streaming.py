@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Incremental STT Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for incremental transcription. A fake adapter turns every second of
+audio into one word, so committed text and the audio left for finalize can
+be checked exactly.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+
+from assistant.core.contracts import STTTranscript
+from assistant.core.stt.streaming import IncrementalTranscriber, create_incremental_transcriber
+
+SR = 16000
+
+
+class WordPerSecondAdapter:
+    """One segment per second of audio; the word encodes the sample value."""
+
+    def __init__(self):
+        self.windows = []
+        self.prompts = []
+
+    def transcribe_segments(self, audio, prompt=None):
+        self.windows.append(len(audio))
+        self.prompts.append(prompt)
+        segments = []
+        for start in range(0, len(audio), SR):
+            chunk = audio[start:start + SR]
+            segments.append((start / SR, (start + len(chunk)) / SR, "w%d" % round(chunk[0] * 32768 / 100)))
+        return segments
+
+
+def _utterance(seconds: int) -> np.ndarray:
+    return np.repeat(np.arange(1, seconds + 1, dtype=np.int16) * 100, SR)
+
+
+def test_update_commits_stable_segments_and_finalize_uses_tail():
+    adapter = WordPerSecondAdapter()
+    transcriber = IncrementalTranscriber(adapter)
+    audio = _utterance(6)
+
+    assert transcriber.update(audio[:SR // 2]) == ""  # below the minimum window
+    assert adapter.windows == []
+
+    assert transcriber.update(audio[:3 * SR]) == "w1 w2 w3"
+    assert transcriber.committed_s == 0.0  # nothing agreed with a previous pass yet
+
+    assert transcriber.update(audio[:4 * SR]) == "w1 w2 w3 w4"
+    assert transcriber.committed_s == 3.0  # w1..w3 repeated and end before the margin
+    assert adapter.prompts[-1] is None
+
+    text = transcriber.finalize(audio)
+    assert text == "w1 w2 w3 w4 w5 w6"
+    assert adapter.windows[-1] == 3 * SR  # only the trailing audio
+    assert adapter.prompts[-1] == "w1 w2 w3"
+    assert transcriber.last_tail_s == 3.0
+    assert transcriber.committed_s == 0.0  # reset for the next utterance
+
+
+def test_finalize_without_updates_transcribes_everything():
+    adapter = WordPerSecondAdapter()
+    transcriber = IncrementalTranscriber(adapter)
+    assert transcriber.finalize(_utterance(2)) == "w1 w2"
+    assert adapter.windows == [2 * SR]
+
+
+def test_short_tail_is_not_transcribed():
+    adapter = WordPerSecondAdapter()
+    transcriber = IncrementalTranscriber(adapter, stable_margin_s=0.0)
+    audio = _utterance(2)
+    transcriber.update(audio)
+    transcriber.update(audio)  # both words agree and end at the window edge
+    assert transcriber.committed_s == 2.0
+    assert transcriber.finalize(audio) == "w1 w2"
+    assert len(adapter.windows) == 2
+
+
+def test_adapter_without_segments_has_no_incremental_mode():
+    class FileOnlyAdapter:
+        def transcribe(self, path):
+            return ""
+
+    assert create_incremental_transcriber(FileOnlyAdapter()) is None
+    assert isinstance(create_incremental_transcriber(WordPerSecondAdapter()), IncrementalTranscriber)
+
+
+def test_partial_flag_defaults_to_final():
+    assert STTTranscript(text="hi").partial is False
+    assert STTTranscript(text="hi", partial=True).dict()["partial"] is True
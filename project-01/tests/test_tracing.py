@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Tracing Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for per-turn tracing: bus handler spans and self time, queue waits,
+the bounded store, percentile summaries, Chrome export and the endpoints.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from assistant.core.bus import Bus
+from assistant.core.config import Config
+from assistant.core.tracing import Span, Tracer
+from assistant.server import create_app
+
+
+def _traced_bus():
+    bus = Bus()
+    bus.tracer = Tracer()
+    return bus
+
+
+@pytest.mark.asyncio
+async def test_handler_spans_exclude_downstream_time():
+    bus = _traced_bus()
+
+    async def upstream(payload):
+        await asyncio.sleep(0.02)
+        await bus.publish("b", {"topic": "b", "corr_id": payload["corr_id"]})
+
+    async def downstream(payload):
+        await asyncio.sleep(0.05)
+
+    bus.subscribe("a", upstream)
+    bus.subscribe("b", downstream)
+    await bus.publish("a", {"topic": "a", "corr_id": "turn-1"})
+
+    spans = {s.name.split(".")[-1]: s for s in bus.tracer.get("turn-1")}
+    assert set(spans) == {"upstream", "downstream"}
+    assert spans["upstream"].dur >= 0.07
+    assert 0.015 <= spans["upstream"].self_dur < 0.045
+    assert spans["downstream"].self_dur >= 0.045
+    assert spans["downstream"].topic == "b"
+
+
+@pytest.mark.asyncio
+async def test_queued_topic_records_queue_wait():
+    bus = _traced_bus()
+    bus.configure_topic("q", queue_size=4)
+    done = asyncio.Event()
+
+    async def handler(payload):
+        done.set()
+
+    bus.subscribe("q", handler)
+    await bus.publish("q", {"topic": "q", "corr_id": "turn-2"})
+    await asyncio.wait_for(done.wait(), 1.0)
+    await bus.join()
+
+    cats = sorted(s.cat for s in bus.tracer.get("turn-2"))
+    assert cats == ["handler", "queue"]
+    bus.clear()
+
+
+@pytest.mark.asyncio
+async def test_events_without_corr_id_are_not_traced():
+    bus = _traced_bus()
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload)
+
+    bus.subscribe("x", handler)
+    await bus.publish("x", {"topic": "x"})
+    assert calls and bus.tracer.traces() == []
+
+
+def test_store_is_bounded_and_summary_has_percentiles():
+    tracer = Tracer(max_traces=2)
+    for i in range(1, 101):
+        tracer.record(f"turn-{i % 3}", Span("stage", "handler", float(i), i / 1000, i / 1000))
+
+    assert len(tracer.traces(limit=10)) == 2
+    assert tracer.dropped_traces > 0
+    summary = tracer.summary()["stage"]
+    assert summary["count"] == 100
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"]) == (50.0, 95.0, 99.0)
+
+
+def test_chrome_export():
+    tracer = Tracer()
+    tracer.record("turn-1", Span("STT._on_recorded", "handler", tracer._t0 + 0.5, 0.25, 0.2, "audio.recorded"))
+    tracer.record("turn-1", Span("TTS._on_request", "handler", tracer._t0 + 1.0, 0.1, 0.1, "tts.request"))
+    tracer.record("turn-2", Span("STT._on_recorded", "handler", tracer._t0 + 2.0, 0.1, 0.1, "audio.recorded"))
+
+    trace = json.loads(json.dumps(tracer.chrome("turn-1")))
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in spans] == ["STT._on_recorded", "TTS._on_request"]
+    assert spans[0]["ts"] == pytest.approx(500000) and spans[0]["dur"] == pytest.approx(250000)
+    assert spans[0]["args"]["corr_id"] == "turn-1"
+    names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert names == {"STT._on_recorded", "TTS._on_request"}
+    assert len([e for e in tracer.chrome()["traceEvents"] if e["ph"] == "X"]) == 3
+
+
+def test_trace_endpoints(monkeypatch):
+    client = TestClient(create_app())
+    monkeypatch.setattr(Config, "TRACING", True)
+    assert client.get("/api/traces").status_code == 200
+    assert isinstance(client.get("/api/traces/summary").json(), dict)
+    assert "traceEvents" in client.get("/api/traces/chrome").json()
+
+    monkeypatch.setattr(Config, "TRACING", False)
+    assert client.get("/api/traces").status_code == 404
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+TTS Phrase Cache Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the TTS phrase cache. Verifies key normalization, memory and disk
+tiers, single-flight synthesis, and that TTS serves repeats from the cache.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.config import Config
+from assistant.core.contracts import TTSRequest
+from assistant.core.tts.cache import TTSCache, cache_key
+from assistant.core.tts.tts import TTS
+
+
+class FakeAdapter:
+    """Writes a short WAV per call and counts calls."""
+
+    voice = "fish"
+    rate = 150
+    sample_rate = 48000
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def synth(self, text: str) -> str:
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(text)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        sf.write(path, np.full(4800, 0.25, dtype=np.float32), 48000)
+        return path
+
+
+class FakeAsyncAdapter(FakeAdapter):
+    """Adds synth_async and records the thread it ran on."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    async def synth_async(self, text: str) -> str:
+        self.threads.append(threading.get_ident())
+        await asyncio.sleep(0.01)
+        return self.synth(text)
+
+
+def _clip(n=100):
+    return np.arange(n, dtype=np.int16), 16000
+
+
+def test_cache_key_normalizes_whitespace_and_separates_settings():
+    assert cache_key("Hello  there ", "v", 150, 48000) == cache_key(" Hello there", "v", 150, 48000)
+    assert cache_key("Hello", "v", 150, 48000) != cache_key("Hello", "v", 200, 48000)
+    assert cache_key("Hello", "v", 150, 48000) != cache_key("Hello", "w", 150, 48000)
+    assert cache_key("Hello", "v", 150, 48000) != cache_key("Hello", "v", 150, 22050)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TTSCache(max_items=2)
+    for key in ("a", "b"):
+        cache.put(key, *_clip())
+    cache.get("a")
+    cache.put("c", *_clip())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cached_clip_is_a_read_only_copy():
+    cache = TTSCache(max_items=2)
+    pcm = np.full((100, 1), 7, dtype=np.int16)
+
+    stored, _sr = cache.put("k", pcm, 16000)
+    pcm[:] = 0  # the caller's array is not the cached one
+
+    assert stored is not pcm and int(stored.sum()) == 700
+    with pytest.raises(ValueError):
+        stored[0] = 1
+    assert int(cache.get("k")[0].sum()) == 700
+
+
+def test_disk_tier_survives_new_instance_and_is_capped(tmp_path):
+    cache = TTSCache(max_items=4, disk_dir=tmp_path)
+    cache.put("hello", *_clip(1000))
+
+    fresh = TTSCache(max_items=4, disk_dir=tmp_path)
+    pcm, sr = fresh.get("hello")
+    assert sr == 16000
+    assert np.array_equal(pcm[:, 0], np.arange(1000, dtype=np.int16))
+    assert fresh.stats()["disk_hits"] == 1
+
+    capped = TTSCache(max_items=4, disk_dir=tmp_path, disk_max_bytes=5000)
+    for i in range(5):
+        capped.put(f"k{i}", *_clip(1000))
+    assert capped.stats()["disk_bytes"] <= 5000
+    assert (tmp_path / "k4.wav").exists()
+
+
+def test_concurrent_misses_synthesize_once():
+    cache = TTSCache()
+    calls = []
+
+    def create():
+        calls.append(1)
+        time.sleep(0.05)
+        return _clip()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create("k", create))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] + stats["hits"] == 4
+
+
+def test_failed_synthesis_is_not_cached():
+    cache = TTSCache()
+
+    def boom():
+        raise RuntimeError("engine down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_create("k", boom)
+    assert cache.get("k") is None
+    assert cache.get_or_create("k", _clip)[1] == 16000
+
+
+@pytest.mark.asyncio
+async def test_tts_serves_repeated_phrase_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "TTS_PREWARM_PHRASES", ["Hello there."])
+    bus = Bus()
+    adapter = FakeAdapter()
+    cache = TTSCache(disk_dir=tmp_path)
+    tts = TTS(bus, adapter=adapter, cache=cache)
+    await tts.start()
+    await tts._prewarm_task
+    assert adapter.calls == ["Hello there."]
+
+    chunks = []
+
+    async def capture(payload):
+        chunks.append(payload)
+
+    bus.subscribe("tts.audio", capture)
+
+    for _ in range(2):
+        req = TTSRequest(text="Hello   there.")
+        await bus.publish(req.topic, req.dict())
+
+    assert adapter.calls == ["Hello there."]
+    assert len(chunks) == 2
+    # Each request gets its own buffer since playback releases it afterwards
+    assert chunks[0]["buffer_id"] != chunks[1]["buffer_id"]
+    for c in chunks:
+        assert c["duration_s"] == pytest.approx(0.1, abs=1e-3)
+        get_buffer_registry().release(c["buffer_id"])
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_misses_synthesize_once():
+    cache = TTSCache()
+    calls = []
+
+    async def create():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return _clip()
+
+    results = await asyncio.gather(*(cache.get_or_create_async("k", create) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(r[1] == 16000 for r in results)
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_tts_awaits_async_adapter_on_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "TTS_PREWARM_PHRASES", [])
+    bus = Bus()
+    adapter = FakeAsyncAdapter()
+    tts = TTS(bus, adapter=adapter, cache=TTSCache(disk_dir=tmp_path))
+    await tts.start()
+
+    chunks = []
+
+    async def capture(payload):
+        chunks.append(payload)
+
+    bus.subscribe("tts.audio", capture)
+
+    for _ in range(2):
+        req = TTSRequest(text="Hello there.")
+        await bus.publish(req.topic, req.dict())
+
+    # Synthesized once, on the loop's own thread rather than an executor
+    assert adapter.threads == [threading.get_ident()]
+    assert len(chunks) == 2
+    for c in chunks:
+        assert c["duration_s"] == pytest.approx(0.1, abs=1e-3)
+        get_buffer_registry().release(c["buffer_id"])
+
+
+@pytest.mark.asyncio
+async def test_prewarm_does_not_block_start(monkeypatch):
+    monkeypatch.setattr(Config, "TTS_PREWARM_PHRASES", ["Hello there.", "One moment."])
+    release = asyncio.Event()
+
+    class SlowAsyncAdapter(FakeAsyncAdapter):
+        async def synth_async(self, text):
+            await release.wait()  # e.g. the TTS server is down until its timeout
+            return await super().synth_async(text)
+
+    tts = TTS(Bus(), adapter=SlowAsyncAdapter(), cache=TTSCache())
+    await asyncio.wait_for(tts.start(), 1.0)
+    assert not tts._prewarm_task.done()
+
+    release.set()
+    await asyncio.wait_for(tts._prewarm_task, 1.0)
+    assert tts.cache.stats()["memory_items"] == 2
+    await tts.stop()
+
+
+@pytest.mark.asyncio
+async def test_async_adapter_output_decoded_off_the_loop(monkeypatch):
+    import assistant.core.tts.tts as tts_module
+
+    monkeypatch.setattr(Config, "TTS_PREWARM_PHRASES", [])
+    decode_threads = []
+    decode = tts_module._decode_wav
+
+    def recording_decode(path):
+        decode_threads.append(threading.get_ident())
+        return decode(path)
+
+    monkeypatch.setattr(tts_module, "_decode_wav", recording_decode)
+    tts = TTS(Bus(), adapter=FakeAsyncAdapter())
+    pcm, sr = await tts._clip("Hello there.")
+
+    assert sr == 48000 and len(pcm)
+    assert decode_threads and decode_threads[0] != threading.get_ident()
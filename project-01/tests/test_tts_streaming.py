@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+TTS Streaming Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for sentence-streamed TTS. Verifies sentence splitting and that a
+multi-sentence reply is published as ordered audio chunks under one trace.
+
+--------------------------------------------------------------------------
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from assistant.core.audio.buffers import get_buffer_registry
+from assistant.core.bus import Bus
+from assistant.core.contracts import TTSRequest
+from assistant.core.tts.tts import TTS, split_sentences
+
+
+class FakeAdapter:
+    """Writes a short WAV per call and records the order of requests."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.paths = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def synth(self, text: str) -> str:
+        import time
+        time.sleep(self.delay)
+        with self._lock:
+            self.calls.append(text)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        self.paths.append(path)
+        sf.write(path, np.zeros(480, dtype=np.float32), 48000)
+        return path
+
+
+def test_split_sentences():
+    assert split_sentences("Hello there! I am a fish. Who are you?") == [
+        "Hello there!", "I am a fish.", "Who are you?"
+    ]
+    # Short pieces are merged so playback is not choppy
+    assert split_sentences("Hi. Ok. I am a rhyming fish.") == ["Hi. Ok. I am a rhyming fish."]
+    # Closing quotes stay with their sentence
+    assert split_sentences('"Wow!" said the fish. That was fun.') == ['"Wow!" said the fish.', "That was fun."]
+    assert split_sentences("single sentence") == ["single sentence"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_reply_published_in_order():
+    bus = Bus()
+    adapter = FakeAdapter(delay=0.01)
+    tts = TTS(bus, adapter=adapter)
+    await tts.start()
+
+    chunks = []
+
+    async def capture(payload):
+        chunks.append(payload)
+
+    bus.subscribe("tts.audio", capture)
+
+    req = TTSRequest(text="First sentence here. Second sentence here. Third one is last.", stream=True)
+    await bus.publish(req.topic, req.dict())
+
+    assert [c["seq"] for c in chunks] == [0, 1, 2]
+    assert [c["final"] for c in chunks] == [False, False, True]
+    assert all(c["corr_id"] == req.corr_id for c in chunks)
+    assert adapter.calls == ["First sentence here.", "Second sentence here.", "Third one is last."]
+
+    for c in chunks:
+        assert get_buffer_registry().get(c["buffer_id"]).frames == 480
+        get_buffer_registry().release(c["buffer_id"])
+    # The adapter's WAV files are decoded once and removed
+    assert adapter.paths and not any(os.path.exists(p) for p in adapter.paths)
+
+
+@pytest.mark.asyncio
+async def test_non_streamed_reply_is_single_final_chunk():
+    bus = Bus()
+    adapter = FakeAdapter()
+    tts = TTS(bus, adapter=adapter)
+    await tts.start()
+
+    chunks = []
+
+    async def capture(payload):
+        chunks.append(payload)
+
+    bus.subscribe("tts.audio", capture)
+
+    req = TTSRequest(text="First sentence here. Second sentence here.", stream=False)
+    await bus.publish(req.topic, req.dict())
+
+    assert len(chunks) == 1
+    assert chunks[0]["seq"] == 0 and chunks[0]["final"] is True
+    get_buffer_registry().release(chunks[0]["buffer_id"])
+
+
+class FailingAdapter(FakeAdapter):
+    """Fails to synthesize any text containing `fail_on`."""
+
+    def __init__(self, fail_on: str):
+        super().__init__()
+        self.fail_on = fail_on
+
+    def synth(self, text: str) -> str:
+        if self.fail_on in text:
+            raise RuntimeError("engine error")
+        return super().synth(text)
+
+
+@pytest.mark.asyncio
+async def test_failed_segment_ends_stream_with_final_chunk():
+    bus = Bus()
+    tts = TTS(bus, adapter=FailingAdapter("Second"))
+    await tts.start()
+
+    chunks = []
+
+    async def capture(payload):
+        chunks.append(payload)
+
+    bus.subscribe("tts.audio", capture)
+
+    req = TTSRequest(text="First sentence here. Second sentence here. Third one is last.", stream=True)
+    await bus.publish(req.topic, req.dict())
+
+    # Chunk 0 played, segment 2 failed: a silent final chunk closes the reply
+    assert [(c["seq"], c["final"]) for c in chunks] == [(0, False), (1, True)]
+    assert all(c["corr_id"] == req.corr_id for c in chunks)
+    assert not get_buffer_registry().get(chunks[1]["buffer_id"]).pcm.any()
+    for c in chunks:
+        get_buffer_registry().release(c["buffer_id"])
+
+
+@pytest.mark.asyncio
+async def test_publish_error_discards_next_segment():
+    bus = Bus()
+    adapter = FakeAdapter(delay=0.05)
+    tts = TTS(bus, adapter=adapter)
+    await tts.start()
+
+    published = []
+
+    async def capture(payload):
+        published.append(payload["buffer_id"])
+
+    bus.subscribe("tts.audio", capture)
+    bus.publish = _raising_publish(bus.publish)
+    before = len(get_buffer_registry())
+
+    req = TTSRequest(text="First sentence here. Second sentence here. Third one is last.", stream=True)
+    with pytest.raises(RuntimeError):
+        await tts._on_request(req.dict())
+
+    await asyncio.sleep(0.1)  # the cancelled synthesis would have finished by now
+    # Only the published chunk is left; segment 2 was cancelled without a buffer
+    assert len(published) == 1
+    get_buffer_registry().release(published[0])
+    assert len(get_buffer_registry()) == before
+
+
+def _raising_publish(publish):
+    async def wrapper(topic, payload):
+        await publish(topic, payload)
+        if topic == "tts.audio":
+            raise RuntimeError("bus error")
+    return wrapper
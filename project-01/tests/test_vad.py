@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+VAD Tests
+--------------------------------------------------------------------------
+License:   MIT License
+
+Copyright 2025 - Jackson Lieb
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+--------------------------------------------------------------------------
+
+Tests for the VAD backends: vectorized framing, the energy gate, the
+adaptive noise floor, the NumPy backend and the benchmark helper.
+
+--------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pytest
+
+import soundfile as sf
+
+from assistant.core.audio.vad import (
+    FRAME_SIZE, SR, VAD, WEBRTCVAD_AVAILABLE, NumpyVAD, bench_vad, create_vad, frame_energy,
+)
+
+needs_webrtcvad = pytest.mark.skipif(not WEBRTCVAD_AVAILABLE, reason="webrtcvad not installed")
+
+
+def _speechlike(n_frames: int, amplitude: float = 8000.0) -> np.ndarray:
+    """Harmonic tone with a 4 Hz syllable envelope."""
+    t = np.arange(n_frames * FRAME_SIZE) / SR
+    voiced = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((150, 300, 450, 600, 900), 1))
+    env = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (amplitude * env * voiced / 2.3).astype(np.int16)
+
+
+def test_frame_energy_is_a_view_with_per_frame_energy():
+    audio = np.zeros(FRAME_SIZE * 3 + 7, dtype=np.int16)
+    audio[FRAME_SIZE:2 * FRAME_SIZE] = 100
+    frames, energy = frame_energy(audio)
+
+    assert frames.shape == (3, FRAME_SIZE)
+    assert np.shares_memory(frames, audio)
+    assert np.allclose(energy, [0.0, 10000.0, 0.0])
+
+
+@needs_webrtcvad
+def test_silence_never_reaches_webrtcvad():
+    vad = VAD(aggressiveness=2)
+    rng = np.random.default_rng(0)
+    quiet = (rng.standard_normal(FRAME_SIZE * 20) * 10).astype(np.int16)
+
+    flags = vad.process(quiet)
+    assert flags.dtype == bool and len(flags) == 20
+    assert not flags.any()
+    assert vad.frames_checked == 0
+    assert vad.frames_gated == 20
+
+
+@needs_webrtcvad
+def test_loud_frames_are_checked_and_agree_with_per_frame_calls():
+    vad = VAD(aggressiveness=2)
+    rng = np.random.default_rng(1)
+    audio = np.concatenate([
+        (rng.standard_normal(FRAME_SIZE * 10) * 10).astype(np.int16),
+        _speechlike(10),
+    ])
+
+    flags = vad.process(audio)
+    per_frame = [VAD(aggressiveness=2).is_speech(audio[i:i + FRAME_SIZE]) for i in range(0, len(audio), FRAME_SIZE)]
+
+    assert vad.frames_checked == 10
+    assert not flags[:10].any()
+    assert list(flags[10:]) == per_frame[10:]
+    assert flags[10:].any()
+
+
+@needs_webrtcvad
+def test_noise_floor_adapts_to_background():
+    vad = VAD(aggressiveness=2)
+    rng = np.random.default_rng(2)
+    vad.process((rng.standard_normal(FRAME_SIZE * 10) * 5).astype(np.int16))
+    low = vad.noise_floor
+    for _ in range(50):
+        vad.process((rng.standard_normal(FRAME_SIZE * 10) * 200).astype(np.int16))
+    assert vad.noise_floor > low * 10
+
+
+def test_numpy_vad_separates_speech_from_noise():
+    vad = NumpyVAD(aggressiveness=2, hangover=0)
+    rng = np.random.default_rng(3)
+    noise = (rng.standard_normal(FRAME_SIZE * 20) * 3000).astype(np.int16)
+
+    assert vad.process(_speechlike(20)).mean() > 0.9
+    assert vad.process(noise).mean() < 0.1
+
+
+def test_numpy_vad_hangover_bridges_short_gaps():
+    vad = NumpyVAD(aggressiveness=2, hangover=3)
+    gap = np.zeros(FRAME_SIZE * 5, dtype=np.int16)
+    vad.process(_speechlike(4))
+    flags = vad.process(gap)
+    assert list(flags) == [True, True, True, False, False]
+
+
+def test_create_vad_backends():
+    assert isinstance(create_vad("numpy"), NumpyVAD)
+    assert isinstance(create_vad("auto"), VAD if WEBRTCVAD_AVAILABLE else NumpyVAD)
+    with pytest.raises(ValueError):
+        create_vad("nope")
+
+
+def test_bench_vad_reports_throughput_and_agreement(tmp_path):
+    rng = np.random.default_rng(4)
+    audio = np.concatenate([
+        (rng.standard_normal(FRAME_SIZE * 20) * 10).astype(np.int16),
+        _speechlike(20),
+    ])
+    sf.write(str(tmp_path / "a.wav"), audio, SR, subtype="PCM_16")
+    sf.write(str(tmp_path / "b.wav"), audio, 8000, subtype="PCM_16")  # wrong rate, skipped
+
+    results = bench_vad([tmp_path / "a.wav", tmp_path / "b.wav"], backends=("numpy", "webrtc"))
+    assert results["numpy"]["frames"] == 40
+    assert results["numpy"]["frames_per_s"] > 0
+    assert results["numpy"]["agreement"] == 1.0
+    if WEBRTCVAD_AVAILABLE:
+        assert results["webrtc"]["agreement"] > 0.7